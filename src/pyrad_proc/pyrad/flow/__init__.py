@@ -11,10 +11,12 @@ Functions to control the Pyrad data processing flow
     :toctree: generated/
 
     main
+    main_period
     main_rt
 
 """
 
 from .flow_control import main, main_rt # noqa
+from .flow_control import main_period # noqa
 from .flow_control import main_gecsx # noqa
 __all__ = [s for s in dir() if not s.startswith('_')]
@@ -12,11 +12,33 @@ Auxiliary functions to control the Pyrad data processing flow
     _get_times_and_traj
     _initialize_datasets
     _process_datasets
+    _process_datasets_graph
+    _update_dataset_cfg
+    _get_radar_list_outputs
+    _get_radar_snapshot
+    _get_datasets_dependencies
+    _get_dataset_footprint
+    _datasets_conflict
+    _get_critical_path
     _postprocess_datasets
+    _read_checkpoint
+    _write_checkpoint
+    _get_period_chunks
+    _get_chunk_cfg_override
+    _merge_chunk_outputs
+    _merge_csv_file
     _wait_for_files
     _get_radars_data
+    _get_radars_data_pipeline
+    _get_radars_data_shared
+    _get_radar_list_nbytes
     _generate_dataset
+    _generate_dataset_timed
+    _generate_dataset_shared
     _generate_prod
+    _generate_prod_shared
+    _distributed_client_active
+    _distributed_client_local
     _create_cfg_dict
     _create_datacfg_dict
     _create_dscfg_dict
@@ -37,14 +59,22 @@ from datetime import datetime
 from datetime import timedelta
 import inspect
 import gc
+import math
 
 import queue
 import time
 import threading
 import glob
-from copy import deepcopy
+import shutil
+import socket
+from copy import deepcopy, copy
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures import wait, FIRST_COMPLETED
 import numpy as np
 
+import pyart
+
 try:
     from memory_profiler import profile as mprofile
     _MPROFILE_AVAILABLE = True
@@ -56,15 +86,22 @@ from pyrad import proc
 
 from ..io.config import read_config, DEFAULT_CONFIG
 from ..io.read_data_radar import get_data
-from ..io.write_data import write_to_s3
+from ..io.write_data import write_to_s3, write_checkpoint
 from ..io.io_aux import get_datetime, get_file_list, get_scan_list
 from ..io.io_aux import get_dataset_fields, get_datatype_fields
 from ..io.io_aux import get_new_rainbow_file_name, get_fieldname_pyart
 from ..io.trajectory import Trajectory
+from ..io.file_index import FileIndex
+from ..io.volume_cache import get_volume_cache
 from ..io.read_data_other import read_last_state, read_proc_periods
+from ..io.read_data_other import read_checkpoint
 
 from ..proc.process_aux import get_process_func
 from ..prod.product_aux import get_prodgen_func
+from ..util.shared_memory import radar_to_shared_memory, SharedRadar
+from ..util.shared_memory import unlink_shared_arrays
+
+from .telemetry import telemetry, flush_telemetry
 
 try:
     import dask
@@ -73,6 +110,12 @@ except ImportError:
 
 PROFILE_LEVEL = 0
 
+# types of the datasets that accumulate data over the whole processing
+# period. A processing containing them cannot be split in chunks
+_UNSPLITTABLE_DATASET_TYPES = (
+    'OCCURRENCE', 'TIMEAVG_STD', 'OCCURRENCE_PERIOD', 'MONITORING',
+    'GC_MONITORING', 'INTERCOMP', 'INTERCOMP_TIME_AVG')
+
 
 def profiler(level=1):
     """
@@ -136,6 +179,72 @@ def profiler(level=1):
     return profile_real_decorator
 
 
+def _get_volume_tags(args):
+    """
+    Gets the telemetry tags of the reading of a volume
+
+    Parameters
+    ----------
+    args : dict
+        the arguments of the call to _get_radars_data
+
+    Returns
+    -------
+    tags : dict
+        the volume time
+
+    """
+    return {'voltime': args['master_voltime']}
+
+
+def _get_dataset_tags(args):
+    """
+    Gets the telemetry tags of the generation of a dataset
+
+    Parameters
+    ----------
+    args : dict
+        the arguments of the call to _generate_dataset
+
+    Returns
+    -------
+    tags : dict
+        the dataset name and type, the processing status and the volume
+        time
+
+    """
+    return {
+        'dsname': args['dsname'],
+        'dstype': args['dscfg']['type'],
+        'proc_status': args['proc_status'],
+        'voltime': args['voltime']}
+
+
+def _get_product_tags(args):
+    """
+    Gets the telemetry tags of the generation of a product
+
+    Parameters
+    ----------
+    args : dict
+        the arguments of the call to _generate_prod
+
+    Returns
+    -------
+    tags : dict
+        the dataset name and type, the product name and type and the
+        volume time
+
+    """
+    dscfg = args['cfg'][args['dsname']]
+    return {
+        'dsname': args['dsname'],
+        'dstype': dscfg['type'],
+        'prdname': args['prdname'],
+        'prdtype': dscfg['products'][args['prdname']]['type'],
+        'voltime': args['voltime']}
+
+
 def _initialize_listener():
     """
     initialize the input listener
@@ -336,7 +445,7 @@ def _initialize_datasets(dataset_levels, cfg, traj=None, infostr=None):
 @profiler(level=1)
 def _process_datasets(dataset_levels, cfg, dscfg, radar_list, master_voltime,
                       traj=None, infostr=None, MULTIPROCESSING_DSET=False,
-                      MULTIPROCESSING_PROD=False):
+                      MULTIPROCESSING_PROD=False, prod_pool=None):
     """
     Processes the radar volumes for a particular time stamp.
 
@@ -359,11 +468,16 @@ def _process_datasets(dataset_levels, cfg, dscfg, radar_list, master_voltime,
         Information string about the actual data processing
         (e.g. 'RUN57'). This string is added to product files.
     MULTIPROCESSING_DSET : Bool
-        If true the generation of datasets at the same processing level will
-        be parallelized
+        If true the generation of datasets will be parallelized. Each dataset
+        is generated as soon as the datasets it depends on are available. The
+        datasets are generated by threads, or by the processes of the dask
+        client if there is one
     MULTIPROCESSING_PROD : Bool
         If true the generation of products from each dataset will be
         parallelized
+    prod_pool : ProductPool or None
+        If set the products of each dataset are generated concurrently by
+        this pool of processes
 
     Returns
     -------
@@ -373,77 +487,211 @@ def _process_datasets(dataset_levels, cfg, dscfg, radar_list, master_voltime,
         the modified trajectory object
 
     """
+    if MULTIPROCESSING_DSET:
+        dscfg, traj = _process_datasets_graph(
+            dataset_levels, cfg, dscfg, radar_list, master_voltime,
+            traj=traj, infostr=infostr,
+            MULTIPROCESSING_PROD=MULTIPROCESSING_PROD, prod_pool=prod_pool)
+        flush_telemetry()
+        return dscfg, traj
+
     for level in sorted(dataset_levels):
         print('-- Process level: {}'.format(level))
-        if MULTIPROCESSING_DSET:
-            jobs = []
-            make_global_list = []
-            substitute_object_list = []
-            fields_to_remove_list = []
-            for dataset in dataset_levels[level]:
-                print('--- Processing dataset: {}'.format(dataset))
-                make_global_list.append(dscfg[dataset]['MAKE_GLOBAL'])
-                substitute_object_list.append(
-                    dscfg[dataset]['SUBSTITUTE_OBJECT'])
-                fields_to_remove_list.append(
-                    dscfg[dataset]['FIELDS_TO_REMOVE'])
-
-                # delay the data hashing
-                radar_list_aux = dask.delayed(radar_list)
-                dscfg_aux = dask.delayed(dscfg[dataset])
-                jobs.append(dask.delayed(_generate_dataset)(
-                    dataset, cfg, dscfg_aux, proc_status=1,
-                    radar_list=radar_list_aux, voltime=master_voltime,
-                    trajectory=traj, runinfo=infostr,
-                    MULTIPROCESSING_PROD=MULTIPROCESSING_PROD))
-
+        for dataset in dataset_levels[level]:
+            print('--- Processing dataset: {}'.format(dataset))
             try:
-                jobs = dask.compute(*jobs)
-
-                # add new dataset to radar object if necessary
-                # update dataset config dictionary
-                for (i, (new_dataset, ind_rad, dsname,
-                         dscfg_aux)) in enumerate(jobs):
-                    dscfg[dsname] = dscfg_aux
-                    if new_dataset is not None:
-                        _add_dataset(
-                            new_dataset[0], radar_list, ind_rad,
-                            make_global=make_global_list[i],
-                            substitute_object=substitute_object_list[i],
-                            fields_to_remove=fields_to_remove_list[i])
-
-                del jobs
+                new_dataset, ind_rad, _, dscfg[dataset] = (
+                    _generate_dataset(
+                        dataset, cfg, dscfg[dataset], proc_status=1,
+                        radar_list=radar_list, voltime=master_voltime,
+                        trajectory=traj, runinfo=infostr,
+                        MULTIPROCESSING_PROD=MULTIPROCESSING_PROD,
+                        prod_pool=prod_pool))
+
+                # adds the first dataset generated to the object. Typically
+                # only one dataset is generated but gecsx generates two:
+                # The first one is a radar object and the second is a grid
+                # object.
+                if new_dataset is None:
+                    continue
+                _add_dataset(
+                    new_dataset[0], radar_list, ind_rad,
+                    make_global=dscfg[dataset]['MAKE_GLOBAL'],
+                    substitute_object=dscfg[dataset]['SUBSTITUTE_OBJECT'],
+                    fields_to_remove=dscfg[dataset]['FIELDS_TO_REMOVE'])
+
+                del new_dataset
+                gc.collect()
             except Exception as ee:
                 warn(str(ee))
                 traceback.print_exc()
-        else:
-            for dataset in dataset_levels[level]:
-                print('--- Processing dataset: {}'.format(dataset))
-                try:
-                    new_dataset, ind_rad, _, dscfg[dataset] = (
-                        _generate_dataset(
-                            dataset, cfg, dscfg[dataset], proc_status=1,
-                            radar_list=radar_list, voltime=master_voltime,
-                            trajectory=traj, runinfo=infostr,
-                            MULTIPROCESSING_PROD=MULTIPROCESSING_PROD))
-
-                    # adds the first dataset generated to the object. Typically
-                    # only one dataset is generated but gecsx generates two:
-                    # The first one is a radar object and the second is a grid
-                    # object.
-                    if new_dataset is None:
-                        continue
-                    _add_dataset(
-                        new_dataset[0], radar_list, ind_rad,
-                        make_global=dscfg[dataset]['MAKE_GLOBAL'],
-                        substitute_object=dscfg[dataset]['SUBSTITUTE_OBJECT'],
-                        fields_to_remove=dscfg[dataset]['FIELDS_TO_REMOVE'])
 
-                    del new_dataset
-                    gc.collect()
-                except Exception as ee:
-                    warn(str(ee))
-                    traceback.print_exc()
+    # manual garbage collection after processing each radar volume
+    gc.collect()
+
+    flush_telemetry()
+
+    return dscfg, traj
+
+
+def _process_datasets_graph(dataset_levels, cfg, dscfg, radar_list,
+                            master_voltime, traj=None, infostr=None,
+                            MULTIPROCESSING_PROD=False, prod_pool=None,
+                            nworkers=None):
+    """
+    Processes the radar volumes for a particular time stamp in parallel.
+    Instead of waiting for all the datasets of a processing level to be
+    generated, each dataset is launched as soon as all the datasets it
+    depends on have been generated. The datasets are generated by threads or,
+    if there is a dask distributed client, by its processes. Each dataset
+    receives a copy of the radar objects containing the outputs of the
+    datasets of lower processing levels already generated. The outputs of
+    all datasets are added to the radar objects at the end in the order of
+    the configuration. The critical path of the volume is printed at the
+    end.
+
+    Parameters
+    ----------
+    dataset_levels : dict
+        dictionary containing the list of data sets to be generated at each
+        processing level
+    cfg : dict
+        processing configuration dictionary
+    dscfg : dict
+        dictionary containing the configuration data for each dataset
+    radar_list : list of radar objects
+        The radar objects to be processed
+    master_voltime : datetime object
+        the reference radar volume time
+    traj : trajectory object
+        and object containing the trajectory
+    infostr : str
+        Information string about the actual data processing
+        (e.g. 'RUN57'). This string is added to product files.
+    MULTIPROCESSING_PROD : Bool
+        If true the generation of products from each dataset will be
+        parallelized
+    prod_pool : ProductPool or None
+        If set the products of each dataset are generated concurrently by
+        this pool of processes. Not used if the datasets are generated by
+        the dask client
+    nworkers : int or None
+        maximum number of datasets generated simultaneously by threads. If
+        None the default of the thread pool is used. Not used if the datasets
+        are generated by the dask client
+
+    Returns
+    -------
+    dscfg : dict
+        the modified configuration dictionary
+    traj : trajectory object
+        the modified trajectory object
+
+    """
+    dependencies = _get_datasets_dependencies(dataset_levels, dscfg)
+
+    # datasets are launched in order of processing level when possible
+    levels = sorted(dataset_levels)
+    dataset_order = [
+        dataset for level in levels for dataset in dataset_levels[level]]
+    dataset_level = {
+        dataset: level for level in levels
+        for dataset in dataset_levels[level]}
+    remaining = {
+        dataset: set(dependencies[dataset]) for dataset in dataset_order}
+
+    # each dataset receives its own copy of the radar objects with the
+    # outputs of the datasets of lower processing levels generated so far,
+    # added in the order of the configuration. The radar objects are thus
+    # not modified while it is generated and the result does not depend on
+    # the order in which the datasets finish
+    outputs = dict()
+    timing = dict()
+    jobs = dict()
+    shared_arrays = None
+    if _distributed_client_active():
+        # the datasets are generated by the processes of the dask client.
+        # The pool of product processes cannot be passed to them
+        from distributed import default_client
+        executor = default_client().get_executor(pure=False)
+        prod_pool = None
+
+        # the field data is passed to local processes through shared
+        # memory. Each field is copied only once per volume
+        if _distributed_client_local():
+            shared_arrays = dict()
+    else:
+        executor = ThreadPoolExecutor(
+            max_workers=nworkers, thread_name_prefix='pyrad_dset')
+    try:
+        with executor:
+            while remaining or jobs:
+                for dataset in dataset_order:
+                    if dataset not in remaining or remaining[dataset]:
+                        continue
+                    del remaining[dataset]
+                    print('--- Processing dataset: {}'.format(dataset))
+                    radar_list_dataset = _get_radar_list_outputs(
+                        radar_list,
+                        [(ds, outputs[ds]) for ds in dataset_order
+                         if ds in outputs and
+                         dataset_level[ds] < dataset_level[dataset]],
+                        dscfg, verbose=False)
+                    if shared_arrays is not None:
+                        radar_list_dataset = [
+                            radar_to_shared_memory(
+                                radar, shared_arrays=shared_arrays)
+                            for radar in radar_list_dataset]
+                    jobs[executor.submit(
+                        _generate_dataset_shared, dataset, cfg,
+                        dscfg[dataset], proc_status=1,
+                        radar_list=radar_list_dataset,
+                        voltime=master_voltime, trajectory=traj,
+                        runinfo=infostr,
+                        MULTIPROCESSING_PROD=MULTIPROCESSING_PROD,
+                        prod_pool=prod_pool)] = dataset
+                    del radar_list_dataset
+
+                if not jobs:
+                    # should never happen: dependencies are only with
+                    # datasets of lower processing levels
+                    warn('Unable to solve dependencies of datasets ' +
+                         ', '.join(remaining.keys()))
+                    break
+
+                done, _ = wait(jobs, return_when=FIRST_COMPLETED)
+                for job in done:
+                    dataset = jobs.pop(job)
+                    try:
+                        output, timing[dataset] = job.result()
+                        dataset_output = _update_dataset_cfg(
+                            dataset, output, dscfg)
+                        if dataset_output is not None:
+                            outputs[dataset] = dataset_output
+                    except Exception as ee:
+                        warn(str(ee))
+                        traceback.print_exc()
+
+                    # the dependent datasets do not have to wait for it
+                    for dataset_deps in remaining.values():
+                        dataset_deps.discard(dataset)
+    finally:
+        # all the datasets have finished
+        if shared_arrays is not None:
+            unlink_shared_arrays(shared_arrays)
+
+    # add the outputs to the radar objects in the order of the configuration
+    radar_list[:] = _get_radar_list_outputs(
+        radar_list,
+        [(ds, outputs[ds]) for ds in dataset_order if ds in outputs], dscfg)
+
+    critical_path = _get_critical_path(dependencies, timing)
+    if critical_path:
+        print('-- Critical path ({:.2f} s): {}'.format(
+            timing[critical_path[-1]][1] - timing[critical_path[0]][0],
+            ' -> '.join(['{} ({:.2f} s)'.format(
+                dataset, timing[dataset][1] - timing[dataset][0])
+                for dataset in critical_path])))
 
     # manual garbage collection after processing each radar volume
     gc.collect()
@@ -451,6 +699,301 @@ def _process_datasets(dataset_levels, cfg, dscfg, radar_list, master_voltime,
     return dscfg, traj
 
 
+def _update_dataset_cfg(dataset, output, dscfg):
+    """
+    Updates the configuration of a dataset with the output of its generation
+    and keeps track of the fields it modifies
+
+    Parameters
+    ----------
+    dataset : str
+        name of the dataset
+    output : tuple
+        the output of function _generate_dataset
+    dscfg : dict
+        dictionary containing the configuration data for each dataset
+
+    Returns
+    -------
+    dataset_output : tuple or None
+        the first dataset generated and the index of the radar object it
+        refers to. None if there is nothing to add to the radar objects
+
+    """
+    new_dataset, ind_rad, _, dscfg[dataset] = output
+    if new_dataset is None or not dscfg[dataset]['MAKE_GLOBAL']:
+        return None
+    new_dataset = new_dataset[0]
+    if not isinstance(new_dataset, dict) or 'radar_out' not in new_dataset:
+        return None
+
+    # keep track of the fields modified by the dataset to refine the
+    # dependencies in the next volumes
+    output_fields = set(new_dataset['radar_out'].fields.keys())
+    if dscfg[dataset]['FIELDS_TO_REMOVE'] is not None:
+        for field in dscfg[dataset]['FIELDS_TO_REMOVE']:
+            output_fields.add(get_fieldname_pyart(field))
+    dscfg[dataset]['output_fields'] = output_fields
+
+    return new_dataset, ind_rad
+
+
+def _get_radar_list_outputs(radar_list, outputs, dscfg, verbose=True):
+    """
+    Gets a copy of the radar objects with the outputs of some datasets
+    added. The radar objects passed are not modified and the field data is
+    not copied
+
+    Parameters
+    ----------
+    radar_list : list of radar objects
+        The radar objects
+    outputs : list of tuples
+        the name of each dataset, its first new dataset and the index of the
+        radar object it refers to, in the order in which they are added
+    dscfg : dict
+        dictionary containing the configuration data for each dataset
+    verbose : bool
+        If True the fields added and removed are printed
+
+    Returns
+    -------
+    radar_list_out : list of radar objects
+        the copy of the radar objects
+
+    """
+    radar_list_out = [_get_radar_snapshot(radar) for radar in radar_list]
+    for dataset, (new_dataset, ind_rad) in outputs:
+        try:
+            _add_dataset(
+                new_dataset, radar_list_out, ind_rad,
+                make_global=dscfg[dataset]['MAKE_GLOBAL'],
+                substitute_object=dscfg[dataset]['SUBSTITUTE_OBJECT'],
+                fields_to_remove=dscfg[dataset]['FIELDS_TO_REMOVE'],
+                verbose=verbose)
+        except (ValueError, KeyError, TypeError) as ee:
+            warn('Unable to add the output of dataset ' + dataset + ': ' +
+                 str(ee))
+
+        # the substitute object must not be modified by other datasets
+        radar_list_out[ind_rad] = _get_radar_snapshot(
+            radar_list_out[ind_rad])
+
+    return radar_list_out
+
+
+def _get_radar_snapshot(radar):
+    """
+    Gets a copy of a radar object with its own dictionary of fields. The
+    fields themselves are not copied
+
+    Parameters
+    ----------
+    radar : radar object or None
+        the radar object
+
+    Returns
+    -------
+    radar_snapshot : radar object or None
+        the copy of the radar object
+
+    """
+    if radar is None:
+        return None
+    radar_snapshot = copy(radar)
+    radar_snapshot.fields = dict(radar.fields)
+    return radar_snapshot
+
+
+def _get_datasets_dependencies(dataset_levels, dscfg):
+    """
+    Builds the dependency graph of the datasets. A dataset depends on a
+    dataset of a lower processing level if it uses fields that the other
+    adds to the radar objects, i.e. fields referred to with PROC data type
+    descriptors, if it uses a radar object that the other substitutes or if
+    both use the trajectory. The fields added by each dataset are known once
+    it has been generated. Until then it is assumed to generate any of the
+    PROC fields of the radar object.
+
+    Parameters
+    ----------
+    dataset_levels : dict
+        dictionary containing the list of data sets to be generated at each
+        processing level
+    dscfg : dict
+        dictionary containing the configuration data for each dataset
+
+    Returns
+    -------
+    dependencies : dict
+        dictionary containing for each dataset the set of datasets that have
+        to be generated before it
+
+    """
+    footprints = dict()
+    for level in dataset_levels:
+        for dataset in dataset_levels[level]:
+            footprints[dataset] = _get_dataset_footprint(dscfg[dataset])
+
+    dependencies = dict()
+    levels = sorted(dataset_levels)
+    for i, level in enumerate(levels):
+        for dataset in dataset_levels[level]:
+            dataset_deps = set()
+            for level_prev in levels[:i]:
+                for dataset_prev in dataset_levels[level_prev]:
+                    if _datasets_conflict(
+                            footprints[dataset_prev], footprints[dataset]):
+                        dataset_deps.add(dataset_prev)
+            dependencies[dataset] = dataset_deps
+
+    return dependencies
+
+
+def _get_dataset_footprint(dscfg):
+    """
+    Gets the radar objects and fields used and modified by a dataset
+
+    Parameters
+    ----------
+    dscfg : dict
+        dataset configuration dictionary
+
+    Returns
+    -------
+    footprint : dict
+        dictionary with the keys 'radars' (indices of the radar objects used),
+        'inputs' (Py-ART names of the fields used), 'proc_inputs' (Py-ART
+        names of the fields used that are generated by other datasets),
+        'outputs' (Py-ART names of the fields modified), 'substitute'
+        (whether the radar object is substituted) and 'trajectory' (whether
+        the trajectory is used). None means unknown, i.e. any radar or field
+
+    """
+    radars = None
+    inputs = None
+    proc_inputs = None
+    if 'datatype' in dscfg:
+        radars = set()
+        inputs = set()
+        proc_inputs = set()
+        for datatypedescr in dscfg['datatype']:
+            radarnr, datagroup, datatype, _, _ = get_datatype_fields(
+                datatypedescr)
+            radars.add(int(radarnr[5:8]) - 1)
+            if inputs is None:
+                continue
+            try:
+                field_name = get_fieldname_pyart(datatype)
+            except ValueError:
+                inputs = None
+                proc_inputs = None
+                continue
+            inputs.add(field_name)
+            if datagroup == 'PROC':
+                proc_inputs.add(field_name)
+
+    outputs = set()
+    if dscfg['MAKE_GLOBAL']:
+        outputs = dscfg.get('output_fields', None)
+
+    try:
+        proc_ds_func, _ = get_process_func(dscfg['type'], dscfg['dsname'])
+        if isinstance(proc_ds_func, str):
+            proc_ds_func = getattr(proc, proc_ds_func)
+        use_trajectory = (
+            'trajectory' in inspect.getfullargspec(proc_ds_func).args)
+    except Exception:
+        use_trajectory = True
+
+    return {
+        'radars': radars,
+        'inputs': inputs,
+        'proc_inputs': proc_inputs,
+        'outputs': outputs,
+        'substitute': bool(
+            dscfg['MAKE_GLOBAL'] and dscfg['SUBSTITUTE_OBJECT']),
+        'trajectory': use_trajectory}
+
+
+def _datasets_conflict(footprint_prev, footprint):
+    """
+    Checks whether a dataset has to wait for a dataset of a lower processing
+    level
+
+    Parameters
+    ----------
+    footprint_prev : dict
+        footprint of the dataset of lower processing level
+    footprint : dict
+        footprint of the dataset
+
+    Returns
+    -------
+    conflict : bool
+        True if the dataset has to be generated after the previous one
+
+    """
+    def _overlap(set1, set2):
+        if set1 is not None and not set1:
+            return False
+        if set2 is not None and not set2:
+            return False
+        if set1 is None or set2 is None:
+            return True
+        return bool(set1 & set2)
+
+    if footprint_prev['trajectory'] and footprint['trajectory']:
+        return True
+    if not _overlap(footprint_prev['radars'], footprint['radars']):
+        return False
+    if footprint_prev['substitute']:
+        return True
+
+    # the datasets whose output is not known yet may generate any field
+    # referred to with a PROC data type descriptor. The known outputs may
+    # also replace the fields read from the files
+    if footprint_prev['outputs'] is None:
+        return _overlap(footprint_prev['outputs'], footprint['proc_inputs'])
+    return _overlap(footprint_prev['outputs'], footprint['inputs'])
+
+
+def _get_critical_path(dependencies, timing):
+    """
+    Gets the chain of datasets that determined the processing time of a
+    volume
+
+    Parameters
+    ----------
+    dependencies : dict
+        dictionary containing for each dataset the set of datasets that have
+        to be generated before it
+    timing : dict
+        dictionary containing for each dataset generated its start and end
+        time (s)
+
+    Returns
+    -------
+    critical_path : list of str
+        the names of the datasets in the critical path in processing order
+
+    """
+    if not timing:
+        return []
+
+    dataset = max(timing, key=lambda ds: timing[ds][1])
+    critical_path = [dataset]
+    while True:
+        dataset_deps = [ds for ds in dependencies[dataset] if ds in timing]
+        if not dataset_deps:
+            break
+        dataset = max(dataset_deps, key=lambda ds: timing[ds][1])
+        critical_path.append(dataset)
+    critical_path.reverse()
+
+    return critical_path
+
+
 def _postprocess_datasets(dataset_levels, cfg, dscfg, traj=None, infostr=None):
     """
     Processes the radar volumes for a particular time stamp.
@@ -495,6 +1038,314 @@ def _postprocess_datasets(dataset_levels, cfg, dscfg, traj=None, infostr=None):
     return dscfg, traj
 
 
+def _read_checkpoint(cfg, cfgfile, starttime, endtime):
+    """
+    Reads the checkpoint of a processing and checks whether it can be used
+    to resume the processing of a period of time
+
+    Parameters
+    ----------
+    cfg : dict
+        processing configuration dictionary
+    cfgfile : str
+        path of the main config file
+    starttime, endtime : datetime object
+        start and end time of the data to be processed
+
+    Returns
+    -------
+    checkpoint : dict or None
+        the checkpoint. Its key 'status' is 'processing' if the processing
+        was interrupted after the volume 'last_voltime', 'processed' if all
+        volumes were processed but not the post-processing and 'done' if
+        the processing of the period was completed. It is 'done' as well if
+        the checkpoint belongs to a later period. None if there is no
+        checkpoint usable to resume the processing
+
+    """
+    fname = cfg['checkpointFile']
+    if fname is None:
+        warn('No checkpoint file defined. The processing cannot be resumed')
+        return None
+    if not os.path.isfile(fname):
+        print('- No checkpoint found in {}'.format(fname))
+        return None
+
+    checkpoint = read_checkpoint(fname)
+    if checkpoint is None:
+        return None
+    if checkpoint['cfgfile'] != cfgfile:
+        warn('Checkpoint file {} belongs to the processing {}'.format(
+            fname, checkpoint['cfgfile']))
+        return None
+
+    if (checkpoint['starttime'] == starttime and
+            checkpoint['endtime'] == endtime):
+        print('- Resuming processing from checkpoint of {}'.format(
+            checkpoint['last_voltime'].strftime('%Y-%m-%d %H:%M:%S')))
+        return checkpoint
+
+    if checkpoint['starttime'] >= endtime:
+        # the processing of a later period has already started
+        return {'status': 'done'}
+
+    print('- Checkpoint in {} is for another period. '.format(fname) +
+          'Processing from the start')
+    return None
+
+
+def _write_checkpoint(cfg, cfgfile, starttime, endtime, last_voltime,
+                      status='processing', dscfg=None, traj=None):
+    """
+    Writes the checkpoint of a processing
+
+    Parameters
+    ----------
+    cfg : dict
+        processing configuration dictionary
+    cfgfile : str
+        path of the main config file
+    starttime, endtime : datetime object
+        start and end time of the data to be processed
+    last_voltime : datetime object
+        reference time of the last volume processed
+    status : str
+        state of the processing. Can be 'processing', 'processed' or 'done'
+    dscfg : dict
+        dictionary containing the configuration data and the state of each
+        dataset. Not needed if the status is 'done'
+    traj : trajectory object
+        and object containing the trajectory
+
+    Returns
+    -------
+    fname : str
+        the name of the file where data has written
+
+    """
+    checkpoint = {
+        'cfgfile': cfgfile,
+        'starttime': starttime,
+        'endtime': endtime,
+        'last_voltime': last_voltime,
+        'status': status,
+        'dscfg': dscfg,
+        'traj': traj}
+    return write_checkpoint(checkpoint, cfg['checkpointFile'])
+
+
+def _get_period_chunks(starttime, endtime, chunk_length, cfg_list):
+    """
+    Splits a period of time into chunks that can be processed
+    independently. The boundaries of the chunks are aligned with the
+    averaging periods of the datasets (parameters 'period' and
+    'start_average') so that no average or accumulation is split between
+    two chunks. If a dataset accumulates data over the whole period (e.g.
+    monitoring, occurrence and intercomparison datasets) or averages over
+    periods that do not divide a day the period is processed as a single
+    chunk
+
+    Parameters
+    ----------
+    starttime, endtime : datetime object
+        start and end time of the data to be processed
+    chunk_length : float
+        desired length of the chunks (s). The chunks may be longer to be
+        aligned with the averaging periods
+    cfg_list : list of dict
+        the processing configuration dictionaries
+
+    Returns
+    -------
+    chunks : list of tuples
+        the start and end time of each chunk
+
+    """
+    alignments = set()
+    for cfg in cfg_list:
+        for datasetdescr in cfg['dataSetList']:
+            _, dataset = get_dataset_fields(datasetdescr)
+            if dataset not in cfg:
+                continue
+            if cfg[dataset].get('type', None) in _UNSPLITTABLE_DATASET_TYPES:
+                warn('Dataset {} accumulates data over the whole '.format(
+                     dataset) + 'processing period. The processing cannot '
+                     'be split')
+                return [(starttime, endtime)]
+            if 'period' in cfg[dataset]:
+                period = int(cfg[dataset]['period'])
+            else:
+                # the time averaging datasets use a default period
+                try:
+                    _, dsformat = get_process_func(
+                        cfg[dataset]['type'], dataset)
+                except (KeyError, ValueError):
+                    continue
+                if not isinstance(dsformat, list):
+                    dsformat = [dsformat]
+                if not any(fmt in ('TIMEAVG', 'GRID_TIMEAVG')
+                           for fmt in dsformat):
+                    continue
+                period = 3600
+            if period <= 0:
+                warn('Dataset {} averages over the whole '.format(dataset) +
+                     'processing period. The processing cannot be split')
+                return [(starttime, endtime)]
+            if 86400 % period != 0:
+                warn('Dataset {} averages over periods of {} s. '.format(
+                     dataset, period) + 'The processing cannot be split')
+                return [(starttime, endtime)]
+            alignments.add(
+                (period, int(cfg[dataset].get('start_average', 0))))
+
+    if not alignments:
+        # no averaging: the chunks can start at any second
+        alignments.add((1, 0))
+
+    # all aligned times are multiples of step seconds after midnight
+    step = 0
+    for period, offset in alignments:
+        step = math.gcd(math.gcd(step, period), offset)
+
+    def _next_aligned(dt):
+        """ first aligned time not earlier than dt or None """
+        date_00 = dt.replace(hour=0, minute=0, second=0, microsecond=0)
+        seconds_start = (
+            math.ceil((dt - date_00).total_seconds() / step) * step)
+        for seconds in range(
+                seconds_start, seconds_start + 86400 + step, step):
+            if all((seconds - offset) % period == 0
+                   for period, offset in alignments):
+                return date_00 + timedelta(seconds=seconds)
+        return None
+
+    chunks = []
+    chunk_start = starttime
+    while True:
+        chunk_end = _next_aligned(
+            chunk_start + timedelta(seconds=chunk_length))
+        if chunk_end is None:
+            warn('The averaging periods of the datasets are not '
+                 'compatible. The processing cannot be split')
+            return [(starttime, endtime)]
+        if chunk_end >= endtime:
+            break
+        chunks.append((chunk_start, chunk_end - timedelta(seconds=1)))
+        chunk_start = chunk_end
+    chunks.append((chunk_start, endtime))
+
+    return chunks
+
+
+def _get_chunk_cfg_override(cfg_list, chunkpath):
+    """
+    Gets the parameters of the config files to change so that a chunk of
+    a processing writes its products in its own directory
+
+    Parameters
+    ----------
+    cfg_list : list of dict
+        the processing configuration dictionaries. Typically the processing
+        and the post-processing
+    chunkpath : str
+        base directory of the products of the chunk
+
+    Returns
+    -------
+    cfg_override_list : list of dict
+        the parameters to change in each configuration. The products of the
+        i-th configuration are written in <chunkpath>/<i>/
+
+    """
+    basepath_list = [
+        os.path.join(chunkpath, str(i)) + '/' for i in range(len(cfg_list))]
+
+    # the products loaded from the output of any of the configurations are
+    # loaded from the chunk directory
+    basepath_dict = dict()
+    for i, cfg in enumerate(cfg_list):
+        basepath_dict[os.path.normpath(cfg['saveimgbasepath'])] = (
+            basepath_list[i])
+
+    cfg_override_list = []
+    for i, cfg in enumerate(cfg_list):
+        cfg_override = {
+            'saveimgbasepath': basepath_list[i],
+            'lastStateFile': None,
+            'checkpointFile': None}
+        if cfg['loadbasepath'] is not None:
+            cfg_override['loadbasepath'] = [
+                basepath_dict.get(os.path.normpath(loadbasepath), loadbasepath)
+                for loadbasepath in cfg['loadbasepath']]
+        cfg_override_list.append(cfg_override)
+
+    return cfg_override_list
+
+
+def _merge_chunk_outputs(chunk_basepath, basepath):
+    """
+    Moves the products of a chunk of a processing to their final directory.
+    The CSV files that already exist are completed with the lines of the
+    chunk. The other files that already exist are replaced. The chunks have
+    to be merged in chronological order
+
+    Parameters
+    ----------
+    chunk_basepath : str
+        base directory of the products of the chunk
+    basepath : str
+        base directory of the products of the processing
+
+    """
+    if not os.path.isdir(chunk_basepath):
+        return
+
+    for dirpath, dirnames, filenames in os.walk(chunk_basepath):
+        dirnames.sort()
+        relpath = os.path.relpath(dirpath, chunk_basepath)
+        destpath = os.path.normpath(os.path.join(basepath, relpath))
+        os.makedirs(destpath, exist_ok=True)
+        for fname in sorted(filenames):
+            src = os.path.join(dirpath, fname)
+            dest = os.path.join(destpath, fname)
+            if fname.endswith('.csv') and os.path.isfile(dest):
+                _merge_csv_file(src, dest)
+                os.remove(src)
+            else:
+                shutil.move(src, dest)
+
+    shutil.rmtree(chunk_basepath, ignore_errors=True)
+
+
+def _merge_csv_file(src, dest):
+    """
+    Appends the data lines of a CSV file to another. The comment lines
+    (starting with '#') and the header of the appended file are skipped
+
+    Parameters
+    ----------
+    src : str
+        the file to append
+    dest : str
+        the file to complete
+
+    """
+    header = None
+    with open(dest, 'r', newline='') as csvfile:
+        for line in csvfile:
+            if not line.startswith('#'):
+                header = line
+                break
+
+    with open(src, 'r', newline='') as csvfile_src:
+        lines = [line for line in csvfile_src if not line.startswith('#')]
+    if lines and lines[0] == header:
+        lines = lines[1:]
+
+    with open(dest, 'a', newline='') as csvfile:
+        csvfile.writelines(lines)
+
+
 def _wait_for_files(nowtime, datacfg, datatype_list, last_processed=None):
     """
     Waits for the master file and all files in a volume scan to be present
@@ -505,7 +1356,9 @@ def _wait_for_files(nowtime, datacfg, datatype_list, last_processed=None):
     nowtime : datetime object
         the current time
     datacfg : dict
-        dictionary containing the parameters to get the radar data
+        dictionary containing the parameters to get the radar data. If it
+        contains a file watcher under key 'file_watcher' the files are
+        looked up in its index
     last_processed : datetime or None
         The end time of the previously processed radar volume
 
@@ -520,6 +1373,7 @@ def _wait_for_files(nowtime, datacfg, datatype_list, last_processed=None):
 
     """
     endtime_loop = deepcopy(nowtime)
+    file_watcher = datacfg.get('file_watcher', None)
 
     nscans = 1
     if datacfg['ScanList'] is not None:
@@ -576,7 +1430,8 @@ def _wait_for_files(nowtime, datacfg, datatype_list, last_processed=None):
             rainbow_files.append(rainbow_file)
 
         # allow 30 s for the transfer of all datatype files
-        found_all = _wait_for_rainbow_datatypes(rainbow_files, period=30)
+        found_all = _wait_for_rainbow_datatypes(
+            rainbow_files, period=30, file_watcher=file_watcher)
         if found_all:
             return masterfile, masterdatatypedescr, last_processed
 
@@ -620,6 +1475,11 @@ def _wait_for_files(nowtime, datacfg, datatype_list, last_processed=None):
                 return masterfile, masterdatatypedescr, last_processed
             break
 
+        # wait for the next file to arrive instead of listing the
+        # directories again straight away
+        if file_watcher is not None:
+            file_watcher.wait(timeout=file_watcher.poll_period)
+
     if not found_all:
         # if not all scans available skip the volume
         str1 = (
@@ -638,7 +1498,8 @@ def _wait_for_files(nowtime, datacfg, datatype_list, last_processed=None):
             rainbow_files.append(rainbow_file)
 
     # allow 30 s for the transfer of all datatype files
-    found_all = _wait_for_rainbow_datatypes(rainbow_files, period=30)
+    found_all = _wait_for_rainbow_datatypes(
+        rainbow_files, period=30, file_watcher=file_watcher)
     if found_all:
         return masterfile, masterdatatypedescr, last_processed
 
@@ -651,7 +1512,7 @@ def _wait_for_files(nowtime, datacfg, datatype_list, last_processed=None):
     return None, None, get_datetime(masterfile, masterdatatypedescr)
 
 
-def _wait_for_rainbow_datatypes(rainbow_files, period=30):
+def _wait_for_rainbow_datatypes(rainbow_files, period=30, file_watcher=None):
     """
     waits until the files for all rainbow data types are present.
 
@@ -661,6 +1522,9 @@ def _wait_for_rainbow_datatypes(rainbow_files, period=30):
         a list containing the names of all the rainbow files to wait for
     period : int
         the time it has to wait (s)
+    file_watcher : FileWatcher or None
+        If not None the files are looked up in the index of the file watcher
+        and the function sleeps until new files arrive between checks
 
     Returns
     -------
@@ -684,7 +1548,10 @@ def _wait_for_rainbow_datatypes(rainbow_files, period=30):
 
         found_all = False
         for rainbow_file in rainbow_files:
-            filename = glob.glob(rainbow_file)
+            if file_watcher is None:
+                filename = glob.glob(rainbow_file)
+            else:
+                filename = file_watcher.glob(rainbow_file)
             if not filename:
                 found_all = False
                 break
@@ -692,10 +1559,15 @@ def _wait_for_rainbow_datatypes(rainbow_files, period=30):
         if found_all:
             return found_all
 
+        if file_watcher is not None:
+            file_watcher.wait(
+                timeout=max((wait_time - currenttime).total_seconds(), 0.))
+
     return found_all
 
 
 @profiler(level=2)
+@telemetry('get_radars_data', _get_volume_tags)
 def _get_radars_data(master_voltime, datatypesdescr_list, datacfg,
                      num_radars=1):
     """
@@ -758,10 +1630,184 @@ def _get_radars_data(master_voltime, datatypesdescr_list, datacfg,
     return radar_list
 
 
+def _get_radars_data_pipeline(master_voltime_list, datatypesdescr_list,
+                              datacfg, num_radars=1, read_ahead=1,
+                              max_memory=None, use_processes=False):
+    """
+    Generator that yields the radars data of each master volume in order
+    while the following volumes are being read in the background.
+
+    Parameters
+    ----------
+    master_voltime_list : list of datetime objects
+        reference times of the volumes to read
+    datatypesdescr_list : list of lists
+        List of the raw data types to get from each radar
+    datacfg : dict
+        dictionary containing the parameters to get the radar data
+    num_radars : int
+        number of radars to read
+    read_ahead : int
+        maximum number of volumes being read ahead of the volume that is
+        being processed. It is also the number of workers in the pool
+    max_memory : float or None
+        maximum memory (MB) used by the volumes read ahead, including those
+        still being read, whose size is estimated from the last volume read.
+        If exceeded no new reading is launched until some of the volumes
+        have been consumed. If None there is no limit
+    use_processes : bool
+        If true the volumes are read in a pool of processes and the field
+        data is passed back through shared memory. Otherwise a pool of
+        threads is used
+
+    Yields
+    ------
+    master_voltime : datetime object
+        reference time of the volume
+    radar_list : list
+        a list containing the radar objects
+
+    """
+    nvolumes = len(master_voltime_list)
+    read_ahead = max(int(read_ahead), 1)
+    if max_memory is not None:
+        max_memory = max_memory * 1024. * 1024.
+
+    if use_processes:
+        executor = ProcessPoolExecutor(max_workers=read_ahead)
+        read_func = _get_radars_data_shared
+    else:
+        executor = ThreadPoolExecutor(
+            max_workers=read_ahead, thread_name_prefix='pyrad_read_ahead')
+        read_func = _get_radars_data
+
+    pending = deque()
+    ind_next = 0
+    volume_nbytes = 0
+    try:
+        for master_voltime in master_voltime_list:
+            if not pending:
+                # nothing has been read ahead: read the current volume
+                pending.append(executor.submit(
+                    read_func, master_voltime_list[ind_next],
+                    datatypesdescr_list, datacfg, num_radars=num_radars))
+                ind_next += 1
+            future = pending.popleft()
+
+            # launch the reading of the next volumes
+            while ind_next < nvolumes and len(pending) < read_ahead:
+                if max_memory is not None and pending:
+                    # the volumes still being read are assumed to be as
+                    # large as the last volume read
+                    nbytes = 0
+                    for future_ahead in pending:
+                        if (future_ahead.done() and
+                                future_ahead.exception() is None):
+                            nbytes += _get_radar_list_nbytes(
+                                future_ahead.result())
+                        else:
+                            nbytes += volume_nbytes
+                    if nbytes >= max_memory:
+                        break
+                pending.append(executor.submit(
+                    read_func, master_voltime_list[ind_next],
+                    datatypesdescr_list, datacfg, num_radars=num_radars))
+                ind_next += 1
+
+            radar_list = future.result()
+            del future
+            if max_memory is not None:
+                volume_nbytes = _get_radar_list_nbytes(radar_list)
+
+            if use_processes:
+                # map the data in shared memory. It is freed once the radar
+                # objects are deleted
+                for i, radar in enumerate(radar_list):
+                    if isinstance(radar, SharedRadar):
+                        radar_list[i] = radar.to_radar()
+                        radar.unlink()
+
+            yield master_voltime, radar_list
+
+            del radar_list
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+        # free the shared memory of the volumes read but not processed
+        for future in pending:
+            if future.cancelled() or future.exception() is not None:
+                continue
+            for radar in future.result():
+                if isinstance(radar, SharedRadar):
+                    radar.unlink()
+
+
+def _get_radars_data_shared(master_voltime, datatypesdescr_list, datacfg,
+                            num_radars=1):
+    """
+    Get the radars data and copies the field data into shared memory. Used
+    to pass the radar objects read by a child process to its parent without
+    pickling the field data.
+
+    Parameters
+    ----------
+    master_voltime : datetime object
+        reference time
+    datatypesdescr_list : list of lists
+        List of the raw data types to get from each radar
+    datacfg : dict
+        dictionary containing the parameters to get the radar data
+    num_radars : int
+        number of radars to read
+
+    Returns
+    -------
+    radar_list : list
+        a list containing the SharedRadar objects
+
+    """
+    radar_list = _get_radars_data(
+        master_voltime, datatypesdescr_list, datacfg, num_radars=num_radars)
+    return [radar_to_shared_memory(radar) for radar in radar_list]
+
+
+def _get_radar_list_nbytes(radar_list):
+    """
+    Computes the memory used by the fields of the radar objects in a list
+
+    Parameters
+    ----------
+    radar_list : list
+        a list containing the radar objects
+
+    Returns
+    -------
+    nbytes : int
+        the number of bytes used by the field data
+
+    """
+    nbytes = 0
+    if radar_list is None:
+        return nbytes
+    for radar in radar_list:
+        if radar is None:
+            continue
+        if isinstance(radar, SharedRadar):
+            nbytes += radar.nbytes
+            continue
+        for field in radar.fields.values():
+            nbytes += field['data'].nbytes
+
+    return nbytes
+
+
 @profiler(level=2)
+@telemetry('generate_dataset', _get_dataset_tags)
 def _generate_dataset(dsname, cfg, dscfg, proc_status=0, radar_list=None,
                       voltime=None, trajectory=None, runinfo=None,
-                      MULTIPROCESSING_PROD=False):
+                      MULTIPROCESSING_PROD=False, prod_pool=None):
     """
     generates new datasets
 
@@ -786,6 +1832,9 @@ def _generate_dataset(dsname, cfg, dscfg, proc_status=0, radar_list=None,
     MULTIPROCESSING_PROD : Bool
         If true the generation of products from each dataset will be
         parallelized
+    prod_pool : ProductPool or None
+        If set the products of each dataset are generated concurrently by
+        this pool of processes
 
     Returns
     -------
@@ -800,7 +1849,11 @@ def _generate_dataset(dsname, cfg, dscfg, proc_status=0, radar_list=None,
 
 
     """
-    dscfg = deepcopy(dscfg)
+    # the nested dictionaries and lists (e.g. global_data) are copied so that
+    # the changes made by the processing functions do not reach the caller's
+    # configuration if they fail. The objects stored in them (e.g. the radar
+    # objects kept in global_data) are not copied at each volume
+    dscfg = _copy_containers(dscfg)
 
     dscfg['timeinfo'] = voltime
     try:
@@ -839,16 +1892,59 @@ def _generate_dataset(dsname, cfg, dscfg, proc_status=0, radar_list=None,
 
         # create the data set products
         if 'products' in dscfg:
-            if MULTIPROCESSING_PROD:
+            if prod_pool is not None:
+                # the radar object is passed once to all the workers through
+                # shared memory
+                dset_shared = dset
+                if (isinstance(dset, dict) and
+                        isinstance(dset.get('radar_out', None),
+                                   pyart.core.Radar)):
+                    dset_shared = dict(dset)
+                    dset_shared['radar_out'] = radar_to_shared_memory(
+                        dset['radar_out'])
+                try:
+                    prod_pool.run(
+                        _generate_prod_shared,
+                        [(dset_shared, cfg, product, prod_func,
+                          dscfg['dsname'], voltime)
+                         for product in dscfg['products']],
+                        runinfo=runinfo)
+                finally:
+                    if (isinstance(dset_shared, dict) and isinstance(
+                            dset_shared.get('radar_out', None),
+                            SharedRadar)):
+                        dset_shared['radar_out'].unlink()
+                del dset_shared
+
+            elif MULTIPROCESSING_PROD:
+                # if the products are generated in other processes of the
+                # local host the radar object is passed through shared
+                # memory. Remote workers receive a copy of it
+                dset_shared = dset
+                if (_distributed_client_local() and isinstance(dset, dict)
+                        and isinstance(dset.get('radar_out', None),
+                                       pyart.core.Radar)):
+                    dset_shared = dict(dset)
+                    dset_shared['radar_out'] = radar_to_shared_memory(
+                        dset['radar_out'])
+
+                # delay the data hashing
+                dset_aux = dask.delayed(dset_shared)
                 jobs = []
                 for product in dscfg['products']:
-                    # delay the data hashing
-                    new_dataset = dask.delayed(dset)
-                    jobs.append(dask.delayed(_generate_prod)(
-                        new_dataset, cfg, product, prod_func, dscfg['dsname'],
+                    jobs.append(dask.delayed(_generate_prod_shared)(
+                        dset_aux, cfg, product, prod_func, dscfg['dsname'],
                         voltime, runinfo=runinfo))
 
-                dask.compute(*jobs)
+                try:
+                    dask.compute(*jobs)
+                finally:
+                    if (isinstance(dset_shared, dict) and isinstance(
+                            dset_shared.get('radar_out', None),
+                            SharedRadar)):
+                        dset_shared['radar_out'].unlink()
+                del dset_aux
+                del dset_shared
 
             else:
                 for product in dscfg['products']:
@@ -860,7 +1956,176 @@ def _generate_dataset(dsname, cfg, dscfg, proc_status=0, radar_list=None,
     return new_dataset, ind_rad, dsname, dscfg
 
 
+def _copy_containers(obj):
+    """
+    copies the dictionaries and lists nested in an object. The other objects
+    are not copied but shared with the original
+
+    Parameters
+    ----------
+    obj : object
+        the object to copy
+
+    Returns
+    -------
+    obj_copy : object
+        the copied object
+
+    """
+    if isinstance(obj, dict):
+        return {key: _copy_containers(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_copy_containers(value) for value in obj]
+    return obj
+
+
+def _generate_dataset_timed(dsname, *args, **kwargs):
+    """
+    generates a new dataset keeping track of the time at which its generation
+    started and ended
+
+    Parameters
+    ----------
+    dsname : str
+        name of the dataset being generated
+    args, kwargs : arguments
+        The rest of arguments of function _generate_dataset
+
+    Returns
+    -------
+    output : tuple
+        The output of function _generate_dataset
+    dataset_timing : tuple
+        the start and end time (s) of the dataset generation
+
+    """
+    tstart = time.time()
+    output = _generate_dataset(dsname, *args, **kwargs)
+    return output, (tstart, time.time())
+
+
+def _generate_dataset_shared(dsname, *args, radar_list=None, **kwargs):
+    """
+    generates a new dataset from radar objects that may be in shared memory
+    keeping track of the time at which its generation started and ended
+
+    Parameters
+    ----------
+    dsname : str
+        name of the dataset being generated
+    radar_list : list of radar objects or SharedRadar
+        the radar objects. Those in shared memory are mapped without copying
+        the field data. The changes made to the field data are not seen by
+        the other processes
+    args, kwargs : arguments
+        The rest of arguments of function _generate_dataset
+
+    Returns
+    -------
+    output : tuple
+        The output of function _generate_dataset
+    dataset_timing : tuple
+        the start and end time (s) of the dataset generation
+
+    """
+    if radar_list is not None:
+        radar_list = [
+            radar.to_radar(copy_on_write=True)
+            if isinstance(radar, SharedRadar) else radar
+            for radar in radar_list]
+    return _generate_dataset_timed(
+        dsname, *args, radar_list=radar_list, **kwargs)
+
+
+def _generate_prod_shared(dataset, *args, **kwargs):
+    """
+    generates a product from a dataset the radar object of which may be in
+    shared memory
+
+    Parameters
+    ----------
+    dataset : object
+        the dataset object. If it is a dictionary containing a SharedRadar
+        under the key 'radar_out' the radar object is mapped from shared
+        memory
+    args, kwargs : arguments
+        The rest of arguments of function _generate_prod
+
+    Returns
+    -------
+    error : bool
+        False if the products could be generated
+
+    """
+    if (isinstance(dataset, dict) and
+            isinstance(dataset.get('radar_out', None), SharedRadar)):
+        dataset = dict(dataset)
+        dataset['radar_out'] = dataset['radar_out'].to_radar()
+    return _generate_prod(dataset, *args, **kwargs)
+
+
+def _distributed_client_active():
+    """
+    Checks whether dask computations are sent to a distributed client, i.e.
+    performed by other processes
+
+    Returns
+    -------
+    active : bool
+        True if there is a distributed client
+
+    """
+    try:
+        from distributed import default_client
+        default_client()
+    except (ImportError, ValueError):
+        return False
+    return True
+
+
+def _distributed_client_local():
+    """
+    Checks whether dask computations are sent to a distributed client the
+    workers of which run on the local host, i.e. have access to its shared
+    memory
+
+    Returns
+    -------
+    local : bool
+        True if there is a distributed client with a local cluster or with
+        all its workers on the local host
+
+    """
+    try:
+        from distributed import default_client, LocalCluster
+        client = default_client()
+    except (ImportError, ValueError):
+        return False
+
+    if isinstance(client.cluster, LocalCluster):
+        return True
+
+    local_hosts = {
+        'localhost', '127.0.0.1', '::1', socket.gethostname(),
+        socket.getfqdn()}
+    try:
+        local_hosts.add(socket.gethostbyname(socket.gethostname()))
+    except OSError:
+        pass
+
+    workers = client.scheduler_info().get('workers', dict())
+    if not workers:
+        return False
+    for address, worker in workers.items():
+        if address.startswith('inproc://'):
+            continue
+        if worker.get('host', None) not in local_hosts:
+            return False
+    return True
+
+
 @profiler(level=3)
+@telemetry('generate_prod', _get_product_tags)
 def _generate_prod(dataset, cfg, prdname, prdfunc, dsname, voltime,
                    runinfo=None):
     """
@@ -911,7 +2176,7 @@ def _generate_prod(dataset, cfg, prdname, prdfunc, dsname, voltime,
 
 
 @profiler(level=3)
-def _create_cfg_dict(cfgfile):
+def _create_cfg_dict(cfgfile, cfg_override=None):
     """
     creates a configuration dictionary
 
@@ -919,6 +2184,8 @@ def _create_cfg_dict(cfgfile):
     ----------
     cfgfile : str
         path of the main config file
+    cfg_override : dict or None
+        parameters replacing those read from the config files
 
     Returns
     -------
@@ -1117,6 +2384,10 @@ def _create_cfg_dict(cfgfile):
         if isinstance(cfg['BinFileParams']['datatype'], str):
             cfg['BinFileParams']['datatype'] = [
                 cfg['BinFileParams']['datatype']]
+
+    if cfg_override is not None:
+        cfg.update(cfg_override)
+
     return cfg
 
 
@@ -1154,6 +2425,7 @@ def _create_datacfg_dict(cfg):
     datacfg.update({'RadarName': cfg['RadarName']})
     datacfg.update({'RadarRes': cfg['RadarRes']})
     datacfg.update({'ScanPeriod': cfg['ScanPeriod']})
+    datacfg.update({'ScanReadWorkers': cfg.get('ScanReadWorkers', 1)})
     datacfg.update({'IconRunFreq': int(cfg['IconRunFreq'])})
     datacfg.update({'IconForecasted': int(cfg['IconForecasted'])})
     datacfg.update({'path_convention': cfg['path_convention']})
@@ -1163,6 +2435,19 @@ def _create_datacfg_dict(cfg):
     datacfg.update({'MFScale': cfg['MFScale']})
     datacfg.update({'DataTypeIDInFiles': cfg['DataTypeIDInFiles']})
     datacfg.update({'DataTypeIDInFilenames': cfg['DataTypeIDInFilenames']})
+
+    # persistent index of the data files
+    datacfg.update({'file_index': None})
+    if cfg.get('fileIndexFile', None) is not None:
+        datacfg['file_index'] = FileIndex(cfg['fileIndexFile'])
+
+    # cache of the decoded data files shared by the configurations
+    datacfg.update({'volume_cache': None})
+    if cfg.get('volumeCache', 0) or cfg.get('volumeCacheDir', None):
+        datacfg['volume_cache'] = get_volume_cache(
+            cachedir=cfg.get('volumeCacheDir', None),
+            mem_size=cfg.get('volumeCacheMemSize', 512.),
+            disk_size=cfg.get('volumeCacheDiskSize', 4096.))
     
     # Modify size of radar or radar spectra object
     datacfg.update({'elmin': cfg.get('elmin', None)})
@@ -1295,6 +2580,7 @@ def _create_dscfg_dict(cfg, dataset):
     dscfg.update({'dempath': cfg['dempath']})
     dscfg.update({'selfconsistencypath': cfg['selfconsistencypath']})
     dscfg.update({'iconpath': cfg['iconpath']})
+    dscfg.update({'gridIndexCacheDir': cfg['gridIndexCacheDir']})
     dscfg.update({'IconRunFreq': cfg['IconRunFreq']})
     dscfg.update({'IconForecasted': cfg['IconForecasted']})
     dscfg.update({'metranet_read_lib': cfg['metranet_read_lib']})
@@ -1327,6 +2613,10 @@ def _create_dscfg_dict(cfg, dataset):
     dscfg.update({'initialized': False})
     dscfg.update({'global_data': None})
 
+    # fields modified in the radar object by the dataset. Known once the
+    # dataset has been generated
+    dscfg.update({'output_fields': None})
+
     # Convert the following strings to string arrays
     strarr_list = ['datatype', 'FIELDS_TO_REMOVE']
     for param in strarr_list:
@@ -1576,7 +2866,8 @@ def _get_masterfile_list(datatypesdescr, starttimes, endtimes, datacfg,
 
 @profiler(level=3)
 def _add_dataset(new_dataset, radar_list, ind_rad, make_global=True,
-                 substitute_object=False, fields_to_remove=None):
+                 substitute_object=False, fields_to_remove=None,
+                 verbose=True):
     """
     adds a new field to an existing radar object
 
@@ -1592,6 +2883,8 @@ def _add_dataset(new_dataset, radar_list, ind_rad, make_global=True,
         if true the new object will substitute the previous one
     fields_to_remove : list or None
         List of fields to be removed from the object
+    verbose : bool
+        If True the changes made to the radar object are printed
 
     Returns
     -------
@@ -1608,30 +2901,39 @@ def _add_dataset(new_dataset, radar_list, ind_rad, make_global=True,
         return None
 
     if 'radar_out' not in new_dataset:
-        print('No radar_out field in new_dataset')
+        if verbose:
+            print('No radar_out field in new_dataset')
         return None
 
     if substitute_object:
-        print('Substituting object')
+        if verbose:
+            print('Substituting object')
         radar_list[ind_rad] = new_dataset['radar_out']
         return 0
 
+    # the fields are modified in a copy of the field dictionary so that
+    # datasets being generated concurrently never see it changing size
+    radar_aux = copy(radar_list[ind_rad])
+    radar_aux.fields = dict(radar_aux.fields)
     for field in new_dataset['radar_out'].fields:
-        print('Adding field: {}'.format(field))
-        radar_list[ind_rad].add_field(
+        if verbose:
+            print('Adding field: {}'.format(field))
+        radar_aux.add_field(
             field, new_dataset['radar_out'].fields[field],
             replace_existing=True)
 
-    if fields_to_remove is None:
-        return 0
+    if fields_to_remove is not None:
+        for field in fields_to_remove:
+            field_pyart = get_fieldname_pyart(field)
+            if verbose:
+                print('Removing field: {}'.format(field_pyart))
+            if field_pyart not in radar_aux.fields:
+                if verbose:
+                    print('Field {} not in radar object'.format(field_pyart))
+                continue
+            del radar_aux.fields[field_pyart]
 
-    for field in fields_to_remove:
-        field_pyart = get_fieldname_pyart(field)
-        print('Removing field: {}'.format(field_pyart))
-        if field_pyart not in radar_list[ind_rad].fields:
-            print('Field {} not in radar object'.format(field_pyart))
-            continue
-        del radar_list[ind_rad].fields[field_pyart]
+    radar_list[ind_rad].fields = radar_aux.fields
 
     return 0
 
@@ -8,6 +8,7 @@ functions to control the Pyrad data processing flow
     :toctree: generated/
 
     main
+    main_period
     main_rt
     main_cosmo
     main_cosmo_rt
@@ -22,9 +23,11 @@ from datetime import datetime
 from datetime import timedelta
 import gc
 import subprocess
+import shutil
 import queue
 import time
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 
 from pyart import __version__ as pyart_version
 from .. import version as pyrad_version
@@ -34,10 +37,18 @@ from .flow_aux import _create_cfg_dict, _create_datacfg_dict
 from .flow_aux import _get_times_and_traj, _get_datatype_list
 from .flow_aux import _get_datasets_list, _get_masterfile_list
 from .flow_aux import _wait_for_files, _get_radars_data
+from .flow_aux import _get_radars_data_pipeline
 from .flow_aux import _initialize_datasets
 from .flow_aux import _process_datasets, _postprocess_datasets
+from .flow_aux import _read_checkpoint, _write_checkpoint
+from .flow_aux import _get_period_chunks, _get_chunk_cfg_override
+from .flow_aux import _merge_chunk_outputs
+from .telemetry import start_telemetry, stop_telemetry
+from .telemetry import flush_telemetry, get_telemetry_env
+from .product_pool import ProductPool
 
 from ..io.io_aux import get_datetime
+from ..io.file_watcher import FileWatcher
 from ..io.read_data_other import read_last_state
 from ..io.write_data import write_last_state
 
@@ -55,10 +66,19 @@ except ImportError:
     _DASK_AVAILABLE = False
 
 
+class _NoVolumesError(ValueError):
+    """
+    Raised by main when there are no volumes to process in the period
+
+    """
+
+
 def main(cfgfile, starttime=None, endtime=None, trajfile="", trajtype='plane',
          flashnr=0, infostr="", MULTIPROCESSING_DSET=False,
          MULTIPROCESSING_PROD=False, PROFILE_MULTIPROCESSING=False,
-         USE_CHILD_PROCESS=False):
+         USE_CHILD_PROCESS=False, READ_AHEAD=0, READ_AHEAD_MAX_MEMORY=None,
+         READ_AHEAD_PROCESSES=False, TELEMETRY_FILE=None,
+         PROD_POOL_WORKERS=0, RESUME=False, CFG_OVERRIDE=None):
     """
     Main flow control. Processes radar data off-line over a period of time
     given either by the user, a trajectory file, or determined by the last
@@ -84,8 +104,11 @@ def main(cfgfile, starttime=None, endtime=None, trajfile="", trajtype='plane',
         Information string about the actual data processing
         (e.g. 'RUN57'). This string is added to product files.
     MULTIPROCESSING_DSET : Bool
-        If true the generation of datasets at the same processing level will
-        be parallelized
+        If true the generation of datasets will be parallelized. Each dataset
+        is generated as soon as the datasets it depends on are available. The
+        datasets are generated by threads, or by the processes of the dask
+        client if one is started (i.e. if MULTIPROCESSING_PROD or
+        USE_CHILD_PROCESS are also true)
     MULTIPROCESSING_PROD : Bool
         If true the generation of products from each dataset will be
         parallelized
@@ -95,6 +118,35 @@ def main(cfgfile, starttime=None, endtime=None, trajfile="", trajtype='plane',
         If true the reading and processing of the data will be performed by
         a child process controlled by dask. This is done to make sure all
         memory used is released.
+    READ_AHEAD : int
+        If larger than 0, number of volumes that are read in the background
+        while the current volume is processed. Not used if USE_CHILD_PROCESS
+        is true
+    READ_AHEAD_MAX_MEMORY : float or None
+        Maximum memory (MB) that the volumes read ahead and waiting to be
+        processed may use. If None there is no limit
+    READ_AHEAD_PROCESSES : Bool
+        If true the volumes are read ahead in a pool of processes instead of
+        a pool of threads
+    TELEMETRY_FILE : str or None
+        If set, the wall time, CPU time, memory and I/O of the reading of
+        each volume and of the generation of each dataset and product are
+        written to this file. If the file extension is '.prom' the totals
+        are written in Prometheus text format, otherwise one JSON line is
+        written per call. The calls done by the dask workers are included
+    PROD_POOL_WORKERS : int
+        If larger than 0, number of processes of a pool that lives for the
+        whole processing and generates the products of each dataset
+        concurrently. Takes precedence over MULTIPROCESSING_PROD. Not used
+        if USE_CHILD_PROCESS is true
+    RESUME : Bool
+        If true and the checkpoint file defined in the main config file
+        belongs to the same processing and period, the state of the
+        datasets is restored from it and the processing continues after
+        the last volume checkpointed. If the checkpoint belongs to a later
+        period nothing is processed
+    CFG_OVERRIDE : dict or None
+        parameters of the config files replacing those read from the files
 
     """
     print("- PYRAD version: {} (compiled {} by {})".format(
@@ -107,6 +159,46 @@ def main(cfgfile, starttime=None, endtime=None, trajfile="", trajtype='plane',
     # warnings.simplefilter('error')  # turn matching warnings into exceptions
     warnings.formatwarning = _warning_format  # define format
 
+    # the telemetry is started before the dask workers so that they inherit
+    # its configuration
+    if TELEMETRY_FILE is not None:
+        start_telemetry(TELEMETRY_FILE)
+        print('- Telemetry file: {}'.format(TELEMETRY_FILE))
+
+    # the product workers are started before any other thread or process
+    prod_pool = None
+    if PROD_POOL_WORKERS > 0 and not USE_CHILD_PROCESS:
+        prod_pool = ProductPool(nworkers=PROD_POOL_WORKERS)
+        print('- Number of product workers: {}'.format(PROD_POOL_WORKERS))
+
+    try:
+        _run_processing(
+            cfgfile, starttime, endtime, trajfile, trajtype, flashnr, infostr,
+            MULTIPROCESSING_DSET, MULTIPROCESSING_PROD,
+            PROFILE_MULTIPROCESSING, USE_CHILD_PROCESS, READ_AHEAD,
+            READ_AHEAD_MAX_MEMORY, READ_AHEAD_PROCESSES, TELEMETRY_FILE,
+            RESUME, CFG_OVERRIDE, prod_pool)
+    finally:
+        if prod_pool is not None:
+            prod_pool.close()
+
+
+def _run_processing(cfgfile, starttime, endtime, trajfile, trajtype, flashnr,
+                    infostr, MULTIPROCESSING_DSET, MULTIPROCESSING_PROD,
+                    PROFILE_MULTIPROCESSING, USE_CHILD_PROCESS, READ_AHEAD,
+                    READ_AHEAD_MAX_MEMORY, READ_AHEAD_PROCESSES,
+                    TELEMETRY_FILE, RESUME, CFG_OVERRIDE, prod_pool):
+    """
+    Processes the data once the product workers have been started. See main
+    for the parameters
+
+    Parameters
+    ----------
+    prod_pool : ProductPool or None
+        pool of processes generating the products. Closed by main if the
+        processing fails
+
+    """
     if ALLOW_USER_BREAK:
         input_queue = _initialize_listener()
 
@@ -138,7 +230,7 @@ def main(cfgfile, starttime=None, endtime=None, trajfile="", trajtype='plane',
         rprof.register()
         cprof.register()
 
-    cfg = _create_cfg_dict(cfgfile)
+    cfg = _create_cfg_dict(cfgfile, cfg_override=CFG_OVERRIDE)
     datacfg = _create_datacfg_dict(cfg)
 
     starttimes, endtimes, traj = _get_times_and_traj(
@@ -146,6 +238,16 @@ def main(cfgfile, starttime=None, endtime=None, trajfile="", trajtype='plane',
         last_state_file=cfg['lastStateFile'], trajtype=trajtype,
         flashnr=flashnr)
 
+    checkpoint = None
+    if RESUME:
+        checkpoint = _read_checkpoint(
+            cfg, cfgfile, starttimes[0], endtimes[-1])
+        if checkpoint is not None and checkpoint['status'] == 'done':
+            print('- Processing already done according to checkpoint')
+            if TELEMETRY_FILE is not None:
+                stop_telemetry()
+            return
+
     if infostr:
         print('- Info string : {}'.format(infostr))
 
@@ -162,7 +264,7 @@ def main(cfgfile, starttime=None, endtime=None, trajfile="", trajtype='plane',
 
     nvolumes = len(masterfilelist)
     if nvolumes == 0:
-        raise ValueError(
+        raise _NoVolumesError(
             "ERROR: Could not find any valid volumes between "
             "{} and {} for master scan '{}' and master data type '{}'".format(
                 starttimes[0].strftime('%Y-%m-%d %H:%M:%S'),
@@ -173,10 +275,39 @@ def main(cfgfile, starttime=None, endtime=None, trajfile="", trajtype='plane',
         starttimes[0].strftime("%Y-%m-%d %H:%M:%S")))
     print('- end time: {}'.format(endtimes[-1].strftime("%Y-%m-%d %H:%M:%S")))
 
-    # initial processing of the datasets
-    print('\n\n- Initializing datasets:')
-    dscfg, traj = _initialize_datasets(
-        dataset_levels, cfg, traj=traj, infostr=infostr)
+    if checkpoint is None:
+        # initial processing of the datasets
+        print('\n\n- Initializing datasets:')
+        dscfg, traj = _initialize_datasets(
+            dataset_levels, cfg, traj=traj, infostr=infostr)
+    else:
+        # restore the state of the datasets and skip the volumes already
+        # processed
+        dscfg = checkpoint['dscfg']
+        traj = checkpoint['traj']
+        masterfilelist = [
+            masterfile for masterfile in masterfilelist
+            if get_datetime(masterfile, masterdatatypedescr) >
+            checkpoint['last_voltime']]
+        print('- Number of volumes left to process: {}'.format(
+            len(masterfilelist)))
+
+    checkpoint_time = time.time()
+    master_voltime = None
+    if checkpoint is not None:
+        master_voltime = checkpoint['last_voltime']
+    user_break = False
+
+    # read the following volumes in the background while processing
+    radars_data = None
+    if READ_AHEAD > 0 and not USE_CHILD_PROCESS:
+        print(f'- Number of volumes read ahead: {READ_AHEAD}')
+        radars_data = _get_radars_data_pipeline(
+            [get_datetime(masterfile, masterdatatypedescr)
+             for masterfile in masterfilelist],
+            datatypesdescr_list, datacfg, num_radars=datacfg['NumRadars'],
+            read_ahead=READ_AHEAD, max_memory=READ_AHEAD_MAX_MEMORY,
+            use_processes=READ_AHEAD_PROCESSES)
 
     # process all data files in file list or until user interrupts processing
     for masterfile in masterfilelist:
@@ -185,6 +316,7 @@ def main(cfgfile, starttime=None, endtime=None, trajfile="", trajtype='plane',
             try:
                 input_queue.get_nowait()
                 warn('Program terminated by user')
+                user_break = True
                 break
             except queue.Empty:
                 pass
@@ -224,27 +356,55 @@ def main(cfgfile, starttime=None, endtime=None, trajfile="", trajtype='plane',
                 traceback.print_exc()
 
         else:
-            radar_list = _get_radars_data(
-                master_voltime, datatypesdescr_list, datacfg,
-                num_radars=datacfg['NumRadars'])
+            if radars_data is not None:
+                _, radar_list = next(radars_data)
+            else:
+                radar_list = _get_radars_data(
+                    master_voltime, datatypesdescr_list, datacfg,
+                    num_radars=datacfg['NumRadars'])
 
             # process all data sets
             dscfg, traj = _process_datasets(
                 dataset_levels, cfg, dscfg, radar_list, master_voltime,
                 traj=traj, infostr=infostr,
                 MULTIPROCESSING_DSET=MULTIPROCESSING_DSET,
-                MULTIPROCESSING_PROD=MULTIPROCESSING_PROD)
+                MULTIPROCESSING_PROD=MULTIPROCESSING_PROD,
+                prod_pool=prod_pool)
 
             # delete variables
             del radar_list
 
         gc.collect()
 
+        if (cfg['checkpointFile'] is not None and
+                time.time() - checkpoint_time >= cfg['checkpointPeriod']):
+            _write_checkpoint(
+                cfg, cfgfile, starttimes[0], endtimes[-1], master_voltime,
+                dscfg=dscfg, traj=traj)
+            checkpoint_time = time.time()
+
+    if radars_data is not None:
+        # stop the reading of pending volumes
+        radars_data.close()
+
+    if prod_pool is not None:
+        prod_pool.close()
+
+    if cfg['checkpointFile'] is not None and not user_break:
+        _write_checkpoint(
+            cfg, cfgfile, starttimes[0], endtimes[-1], master_voltime,
+            status='processed', dscfg=dscfg, traj=traj)
+
     # post-processing of the datasets
     print('\n\n- Post-processing datasets:')
     dscfg, traj = _postprocess_datasets(
         dataset_levels, cfg, dscfg, traj=traj, infostr=infostr)
 
+    if cfg['checkpointFile'] is not None and not user_break:
+        _write_checkpoint(
+            cfg, cfgfile, starttimes[0], endtimes[-1], master_voltime,
+            status='done')
+
     if PROFILE_MULTIPROCESSING:
         prof.unregister()
         rprof.unregister()
@@ -260,11 +420,186 @@ def main(cfgfile, starttime=None, endtime=None, trajfile="", trajtype='plane',
             profile_path + datetime.utcnow().strftime('%Y%m%d%H%M%S') +
             '_profile.png'))
 
+    if datacfg['volume_cache'] is not None:
+        print('- Volume cache: ' + str(datacfg['volume_cache'].get_stats()))
+
+    if TELEMETRY_FILE is not None:
+        stop_telemetry()
+
     print('- This is the end my friend! See you soon!')
 
 
+def main_period(cfgfile, starttime, endtime, postproc_cfgfile=None,
+                chunk_length=86400., nworkers=1, scheduler=None,
+                chunkpath=None, infostr="", **kwargs):
+    """
+    Processes a long period of time by splitting it into chunks that are
+    processed in parallel by a pool of local processes or by a dask
+    cluster. The boundaries of the chunks are aligned with the averaging
+    periods of the datasets so that no average or accumulation is split
+    between chunks. Each chunk is processed (and post-processed) as an
+    independent processing writing its products in its own directory. The
+    products of the chunks are then moved to the final directory in
+    chronological order, the CSV files written by several chunks being
+    concatenated.
+
+    Parameters
+    ----------
+    cfgfile : str
+        path of the main config file
+    starttime, endtime : datetime object
+        start and end time of the data to be processed
+    postproc_cfgfile : str or None
+        path of the main config file of the post-processing. If set each
+        chunk is post-processed after being processed
+    chunk_length : float
+        desired length of the chunks (s)
+    nworkers : int
+        number of chunks processed simultaneously by the local pool of
+        processes. Not used if scheduler is set
+    scheduler : str or None
+        address of the scheduler of a dask cluster. If set the chunks are
+        processed by the cluster. chunkpath must then be accessible from
+        all its nodes
+    chunkpath : str or None
+        directory where the products of each chunk are written before being
+        merged. If None it is the products directory (saveimgbasepath) of
+        the processing followed by '_chunks'
+    infostr : str
+        Information string about the actual data processing
+        (e.g. 'RUN57'). This string is added to product files.
+    kwargs : dict
+        other arguments passed to the function main processing each chunk
+        (e.g. MULTIPROCESSING_DSET)
+
+    Returns
+    -------
+    failed_chunks : list of tuples
+        start and end time of the chunks that could not be processed. Their
+        products are kept in chunkpath
+
+    """
+    print("- PYRAD version: {} (compiled {} by {})".format(
+        pyrad_version.version, pyrad_version.compile_date_time,
+        pyrad_version.username))
+    print("- PYART version: {}".format(pyart_version))
+
+    # Define behaviour of warnings
+    warnings.simplefilter('always')  # always print matching warnings
+    warnings.formatwarning = _warning_format  # define format
+
+    cfgfile_list = [cfgfile]
+    if postproc_cfgfile is not None:
+        cfgfile_list.append(postproc_cfgfile)
+    cfg_list = [_create_cfg_dict(cfgfile_aux) for cfgfile_aux in cfgfile_list]
+
+    chunks = _get_period_chunks(starttime, endtime, chunk_length, cfg_list)
+    print('- Number of chunks to process: {}'.format(len(chunks)))
+
+    if chunkpath is None:
+        chunkpath = cfg_list[0]['saveimgbasepath'].rstrip('/') + '_chunks/'
+
+    if scheduler is not None:
+        if not _DASK_AVAILABLE:
+            raise ValueError(
+                'dask is needed to process the chunks in a dask cluster')
+        executor = Client(scheduler)
+        print('- Chunks processed by dask cluster {}'.format(scheduler))
+    else:
+        executor = ProcessPoolExecutor(max_workers=nworkers)
+        print('- Number of chunks processed simultaneously: {}'.format(
+            nworkers))
+
+    # the Prometheus totals of the chunks are added to those of this process
+    telemetry_file = kwargs.get('TELEMETRY_FILE', None)
+    if telemetry_file is not None:
+        start_telemetry(telemetry_file)
+
+    jobs = []
+    for chunk_starttime, chunk_endtime in chunks:
+        chunk_basepath = os.path.join(
+            chunkpath, chunk_starttime.strftime('%Y%m%d%H%M%S'))
+        cfg_override_list = _get_chunk_cfg_override(cfg_list, chunk_basepath)
+        jobs.append((
+            chunk_starttime, chunk_endtime, chunk_basepath, cfg_override_list,
+            executor.submit(
+                _process_chunk, cfgfile_list, cfg_override_list,
+                chunk_starttime, chunk_endtime, infostr=infostr,
+                telemetry_env=get_telemetry_env(), **kwargs)))
+
+    # the chunks are merged in chronological order as soon as they are done
+    failed_chunks = []
+    try:
+        for (chunk_starttime, chunk_endtime, chunk_basepath,
+             cfg_override_list, job) in jobs:
+            try:
+                job.result()
+            except Exception as ee:
+                warn('Processing of chunk {} - {} failed: {}'.format(
+                    chunk_starttime.strftime('%Y-%m-%d %H:%M:%S'),
+                    chunk_endtime.strftime('%Y-%m-%d %H:%M:%S'), str(ee)))
+                failed_chunks.append((chunk_starttime, chunk_endtime))
+                continue
+
+            print('- Merging products of chunk {} - {}'.format(
+                chunk_starttime.strftime('%Y-%m-%d %H:%M:%S'),
+                chunk_endtime.strftime('%Y-%m-%d %H:%M:%S')))
+            for cfg, cfg_override in zip(cfg_list, cfg_override_list):
+                _merge_chunk_outputs(
+                    cfg_override['saveimgbasepath'], cfg['saveimgbasepath'])
+            shutil.rmtree(chunk_basepath, ignore_errors=True)
+            flush_telemetry()
+    finally:
+        if scheduler is not None:
+            executor.close()
+        else:
+            executor.shutdown(wait=True)
+        if telemetry_file is not None:
+            stop_telemetry()
+
+    print('- This is the end my friend! See you soon!')
+
+    return failed_chunks
+
+
+def _process_chunk(cfgfile_list, cfg_override_list, starttime, endtime,
+                   infostr="", telemetry_env=None, **kwargs):
+    """
+    Processes and post-processes a chunk of a period of time
+
+    Parameters
+    ----------
+    cfgfile_list : list of str
+        path of the main config files of the processing and, optionally,
+        of the post-processing
+    cfg_override_list : list of dict
+        parameters replacing those of each config file
+    starttime, endtime : datetime object
+        start and end time of the chunk
+    infostr : str
+        Information string about the actual data processing
+    telemetry_env : dict or None
+        the telemetry configuration of the processing of the period. If set
+        the telemetry of the chunk is added to it
+    kwargs : dict
+        other arguments of the function main
+
+    """
+    if telemetry_env is not None:
+        os.environ.update(telemetry_env)
+
+    for cfgfile, cfg_override in zip(cfgfile_list, cfg_override_list):
+        try:
+            main(cfgfile, starttime=starttime, endtime=endtime,
+                 infostr=infostr, CFG_OVERRIDE=cfg_override, **kwargs)
+        except _NoVolumesError as ee:
+            # no volumes to process in the chunk
+            warn(str(ee))
+
+
 def main_rt(cfgfile_list, starttime=None, endtime=None, infostr_list=None,
-            proc_period=60, proc_finish=None, hide_warnings=False):
+            proc_period=60, proc_finish=None, hide_warnings=False,
+            file_watch=None, telemetry_file=None, prod_pool_workers=0):
     """
     main flow control. Processes radar data in real time. The start and end
     processing times can be determined by the user. This function is inteded
@@ -288,6 +623,22 @@ def main_rt(cfgfile_list, starttime=None, endtime=None, infostr_list=None,
         if set to true it will hide the warnings during the pyrad processing
         this is useful when logging the outputs to log files, as they can
         become very large
+    file_watch : str or None
+        If set the data directories are followed by a file watcher that
+        keeps an index of the arriving files and the processing starts as
+        soon as new files arrive instead of waiting for the next processing
+        round. Can be 'inotify' or 'poll'. inotify only sees the files
+        written by the local host: use 'poll' for network file systems
+    telemetry_file : str or None
+        If set, the wall time, CPU time, memory and I/O of the reading of
+        each volume and of the generation of each dataset and product are
+        written to this file. If the file extension is '.prom' the totals
+        are written in Prometheus text format, otherwise one JSON line is
+        written per call. The calls done by the dask workers are included
+    prod_pool_workers : int
+        If larger than 0, number of processes of a pool that lives for the
+        whole processing and generates the products of each dataset
+        concurrently
 
     Returns
     -------
@@ -309,6 +660,50 @@ def main_rt(cfgfile_list, starttime=None, endtime=None, infostr_list=None,
         # exceptions
         warnings.formatwarning = _warning_format  # define format
 
+    file_watcher = None
+    if file_watch is not None:
+        file_watcher = FileWatcher(mode=file_watch)
+        print('- Watching data directories for new files. Mode: ' +
+              file_watcher.mode)
+
+    if telemetry_file is not None:
+        start_telemetry(telemetry_file)
+        print('- Telemetry file: ' + telemetry_file)
+
+    prod_pool = None
+    if prod_pool_workers > 0:
+        prod_pool = ProductPool(nworkers=prod_pool_workers)
+        print('- Number of product workers: ' + str(prod_pool_workers))
+
+    try:
+        return _run_processing_rt(
+            cfgfile_list, starttime, endtime, infostr_list, proc_period,
+            proc_finish, telemetry_file, file_watcher, prod_pool)
+    finally:
+        if prod_pool is not None:
+            prod_pool.close()
+
+
+def _run_processing_rt(cfgfile_list, starttime, endtime, infostr_list,
+                       proc_period, proc_finish, telemetry_file, file_watcher,
+                       prod_pool):
+    """
+    Processes radar data in real time once the product workers have been
+    started. See main_rt for the parameters
+
+    Parameters
+    ----------
+    file_watcher : FileWatcher or None
+        object watching the data directories for new files
+    prod_pool : ProductPool or None
+        pool of processes generating the products. Closed by main_rt
+
+    Returns
+    -------
+    end_proc : Boolean
+        If true the program has ended successfully
+
+    """
     # The processing will be allowed to run for a limited period
     if proc_finish is not None:
         startime_proc = datetime.utcnow()
@@ -336,6 +731,7 @@ def main_rt(cfgfile_list, starttime=None, endtime=None, infostr_list=None,
         else:
             infostr = ""
         datacfg = _create_datacfg_dict(cfg)
+        datacfg['file_watcher'] = file_watcher
 
         if infostr:
             print('- Info string : ' + infostr)
@@ -461,7 +857,7 @@ def main_rt(cfgfile_list, starttime=None, endtime=None, infostr_list=None,
             # process all data sets
             dscfg, traj = _process_datasets(
                 dataset_levels, cfg, dscfg, radar_list, master_voltime,
-                infostr=infostr)
+                infostr=infostr, prod_pool=prod_pool)
 
             last_processed_list[icfg] = master_voltime
             write_last_state(master_voltime, cfg['lastStateFile'])
@@ -490,6 +886,9 @@ def main_rt(cfgfile_list, starttime=None, endtime=None, infostr_list=None,
         proc_time = (nowtime_new - nowtime).total_seconds()
         if vol_processed:
             print('Processing time %s s\n' % proc_time)
+            if datacfg_list[0]['volume_cache'] is not None:
+                print('Volume cache: ' + str(
+                    datacfg_list[0]['volume_cache'].get_stats()))
 
         # if processing end time exceeded finalize processing
         if proc_finish is not None:
@@ -499,7 +898,11 @@ def main_rt(cfgfile_list, starttime=None, endtime=None, infostr_list=None,
                 break
 
         if proc_time < proc_period:
-            time.sleep(proc_period - proc_time)
+            if file_watcher is None:
+                time.sleep(proc_period - proc_time)
+            else:
+                # start a new processing round as soon as new files arrive
+                file_watcher.wait(timeout=proc_period - proc_time)
 
     # only do post processing if program properly terminated by user
     if end_proc:
@@ -523,6 +926,12 @@ def main_rt(cfgfile_list, starttime=None, endtime=None, infostr_list=None,
 
             gc.collect()
 
+    if file_watcher is not None:
+        file_watcher.close()
+
+    if telemetry_file is not None:
+        stop_telemetry()
+
     print('- This is the end my friend! See you soon!')
 
     return end_proc
@@ -613,7 +1022,8 @@ def main_cosmo(cfgfile, starttime=None, endtime=None, trajfile="", infostr=""):
 
 
 def main_cosmo_rt(cfgfile_list, starttime=None, endtime=None,
-                  infostr_list=None, proc_period=60, proc_finish=None):
+                  infostr_list=None, proc_period=60, proc_finish=None,
+                  file_watch=None, telemetry_file=None):
     """
     main flow control. Processes radar data in real time. The start and end
     processing times can be determined by the user. This function is inteded
@@ -633,6 +1043,18 @@ def main_cosmo_rt(cfgfile_list, starttime=None, endtime=None,
     proc_finish : int or None
         if set to a value the program will be forced to shut down after the
         value (in seconds) from start time has been exceeded
+    file_watch : str or None
+        If set the data directories are followed by a file watcher that
+        keeps an index of the arriving files and the processing starts as
+        soon as new files arrive instead of waiting for the next processing
+        round. Can be 'inotify' or 'poll'. inotify only sees the files
+        written by the local host: use 'poll' for network file systems
+    telemetry_file : str or None
+        If set, the wall time, CPU time, memory and I/O of the reading of
+        each volume and of the generation of each dataset and product are
+        written to this file. If the file extension is '.prom' the totals
+        are written in Prometheus text format, otherwise one JSON line is
+        written per call
 
     Returns
     -------
@@ -660,6 +1082,16 @@ def main_cosmo_rt(cfgfile_list, starttime=None, endtime=None,
 
         endtime_proc = startime_proc + timedelta(seconds=proc_finish)
 
+    file_watcher = None
+    if file_watch is not None:
+        file_watcher = FileWatcher(mode=file_watch)
+        print('- Watching data directories for new files. Mode: ' +
+              file_watcher.mode)
+
+    if telemetry_file is not None:
+        start_telemetry(telemetry_file)
+        print('- Telemetry file: ' + telemetry_file)
+
     if ALLOW_USER_BREAK:
         input_queue = _initialize_listener()
 
@@ -677,6 +1109,7 @@ def main_cosmo_rt(cfgfile_list, starttime=None, endtime=None,
         else:
             infostr = ""
         datacfg = _create_datacfg_dict(cfg)
+        datacfg['file_watcher'] = file_watcher
 
         if infostr:
             print('- Info string : ' + infostr)
@@ -834,7 +1267,17 @@ def main_cosmo_rt(cfgfile_list, starttime=None, endtime=None,
                 break
 
         if proc_time < proc_period:
-            time.sleep(proc_period - proc_time)
+            if file_watcher is None:
+                time.sleep(proc_period - proc_time)
+            else:
+                # start a new processing round as soon as new files arrive
+                file_watcher.wait(timeout=proc_period - proc_time)
+
+    if file_watcher is not None:
+        file_watcher.close()
+
+    if telemetry_file is not None:
+        stop_telemetry()
 
     print('- This is the end my friend! See you soon!')
 
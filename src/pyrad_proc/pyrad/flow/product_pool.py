@@ -0,0 +1,155 @@
+"""
+pyrad.flow.product_pool
+=======================
+
+Pool of long-lived processes used to generate the products of the datasets
+concurrently
+
+.. autosummary::
+    :toctree: generated/
+
+    ProductPool
+
+"""
+
+import io
+import traceback
+from warnings import warn
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+
+class ProductPool:
+    """
+    A pool of processes that lives for the whole processing. The plotting
+    libraries are imported and a figure is rendered by each worker when it
+    starts so that the first products of each worker do not pay for it. If a
+    worker dies the pool is restarted.
+
+    Attributes
+    ----------
+    nworkers : int
+        number of worker processes
+
+    """
+
+    def __init__(self, nworkers=4):
+        """
+        initalize the object
+
+        Parameters
+        ----------
+        nworkers : int
+            number of worker processes
+
+        """
+        self.nworkers = max(int(nworkers), 1)
+        self._executor = None
+        self._start()
+
+    def _start(self):
+        """ starts the worker processes and waits until they are ready """
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.nworkers, initializer=_init_worker)
+        wait([self._executor.submit(_worker_ready)
+              for _ in range(self.nworkers)])
+
+    def run(self, func, args_list, **kwargs):
+        """
+        Calls a function with each set of arguments in the worker processes
+        and waits until all calls have finished
+
+        Parameters
+        ----------
+        func : function
+            the function to call. It must be picklable
+        args_list : list of tuples
+            the positional arguments of each call
+        kwargs : dict
+            keyword arguments common to all the calls
+
+        Returns
+        -------
+        results : list
+            the output of each call. None if the call failed
+
+        """
+        try:
+            futures = [
+                self._executor.submit(func, *args, **kwargs)
+                for args in args_list]
+        except BrokenProcessPool as ee:
+            warn('Product pool broken: ' + str(ee) + '. Restarting it')
+            self.restart()
+            futures = [
+                self._executor.submit(func, *args, **kwargs)
+                for args in args_list]
+
+        broken = False
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except BrokenProcessPool as ee:
+                warn('Worker of product pool died: ' + str(ee))
+                broken = True
+                results.append(None)
+            except Exception as ee:
+                warn(str(ee))
+                traceback.print_exc()
+                results.append(None)
+
+        if broken:
+            self.restart()
+
+        return results
+
+    def restart(self):
+        """
+        Replaces the worker processes by new ones
+
+        """
+        self.close()
+        self._start()
+
+    def close(self):
+        """
+        Stops the worker processes once the pending calls have finished
+
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+def _init_worker():
+    """
+    Initializes a worker process: imports the plotting modules and renders
+    a small figure to build the font cache and the colormaps
+
+    """
+    import matplotlib as mpl
+    mpl.use('Agg')
+    import matplotlib.pyplot as plt
+
+    from .. import graph  # noqa: F401
+
+    try:
+        fig, ax = plt.subplots(figsize=(2, 2))
+        mesh = ax.pcolormesh(np.zeros((2, 2)))
+        fig.colorbar(mesh, ax=ax, label='dBZ')
+        ax.set_title('warm up')
+        fig.savefig(io.BytesIO(), format='png')
+        plt.close(fig)
+    except Exception as ee:
+        warn('Unable to warm up product worker: ' + str(ee))
+
+
+def _worker_ready():
+    """
+    Does nothing. Used to make sure the worker processes have started
+
+    """
+    return True
@@ -0,0 +1,582 @@
+"""
+pyrad.flow.telemetry
+====================
+
+Functions to record the wall time, CPU time, memory and I/O of the steps of
+the processing (reading the data, generating the datasets and the products)
+and to export them as JSON lines or as a Prometheus text file
+
+.. autosummary::
+    :toctree: generated/
+
+    start_telemetry
+    stop_telemetry
+    flush_telemetry
+    get_telemetry_env
+    telemetry
+
+"""
+
+import os
+import glob
+import json
+import time
+import inspect
+import datetime
+import threading
+import functools
+import itertools
+from warnings import warn
+
+try:
+    import resource
+    _RESOURCE_AVAILABLE = True
+except ImportError:
+    _RESOURCE_AVAILABLE = False
+
+# environment variables used to pass the telemetry configuration to the
+# processes started by the processing (e.g. dask workers)
+_TELEMETRY_FILE_ENV = 'PYRAD_TELEMETRY_FILE'
+_TELEMETRY_PID_ENV = 'PYRAD_TELEMETRY_PID'
+
+# minimum time between two writes of the Prometheus file (s)
+_PROMETHEUS_WRITE_PERIOD = 5.
+
+_SINK = None
+_SINK_PID = None
+_SINK_LOCK = threading.Lock()
+
+# number of the Prometheus outputs created by the current process. Used to
+# name the files with their totals
+_PART_COUNTER = itertools.count()
+
+
+def start_telemetry(fname):
+    """
+    Starts recording the telemetry of the processing. The format of the
+    output depends on the file extension: Prometheus text format if '.prom',
+    JSON lines otherwise. The JSON lines contain one record per call and
+    are also written by the processes started by the processing. The
+    Prometheus file contains the totals per step of the calls done in the
+    current process and is rewritten periodically. The other processes
+    (e.g. dask workers or processes started with the same file by a
+    processing already recording it) write their totals in files next to
+    it ('.part*.json') that are added when it is rewritten.
+
+    Parameters
+    ----------
+    fname : str
+        the output file
+
+    """
+    global _SINK, _SINK_PID
+
+    stop_telemetry()
+    # the process is part of a processing already recording the telemetry
+    # in this file
+    partial = os.environ.get(_TELEMETRY_FILE_ENV, None) == fname
+    if not partial:
+        dirname = os.path.dirname(fname)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        for fname_part in _get_part_files(fname):
+            try:
+                os.remove(fname_part)
+            except OSError:
+                pass
+        os.environ[_TELEMETRY_FILE_ENV] = fname
+        os.environ[_TELEMETRY_PID_ENV] = str(os.getpid())
+    with _SINK_LOCK:
+        _SINK = _create_sink(fname, partial=partial)
+        _SINK_PID = os.getpid()
+
+
+def stop_telemetry():
+    """
+    Stops recording the telemetry and writes the pending data
+
+    """
+    global _SINK, _SINK_PID
+
+    # the configuration inherited from another process is kept for the
+    # processes it starts
+    if os.environ.get(_TELEMETRY_PID_ENV, None) == str(os.getpid()):
+        os.environ.pop(_TELEMETRY_FILE_ENV, None)
+        os.environ.pop(_TELEMETRY_PID_ENV, None)
+    with _SINK_LOCK:
+        if _SINK is not None and _SINK_PID == os.getpid():
+            _SINK.close()
+        _SINK = None
+        _SINK_PID = None
+
+
+def flush_telemetry():
+    """
+    Writes the pending telemetry data. Called at the end of each volume
+
+    """
+    sink = _get_sink()
+    if sink is not None:
+        sink.flush()
+
+
+def get_telemetry_env():
+    """
+    Gets the environment variables with the telemetry configuration of the
+    processing. Used to pass it to processes that do not inherit the
+    environment of the current one (e.g. in a dask cluster)
+
+    Returns
+    -------
+    env : dict or None
+        the environment variables. None if the telemetry is not active
+
+    """
+    if _TELEMETRY_FILE_ENV not in os.environ:
+        return None
+    return {
+        key: os.environ[key] for key in (
+            _TELEMETRY_FILE_ENV, _TELEMETRY_PID_ENV) if key in os.environ}
+
+
+def telemetry(event, get_tags=None):
+    """
+    Function to be used as decorator to record the telemetry of the calls to
+    a function. Nothing is recorded if the telemetry has not been started
+
+    Parameters
+    ----------
+    event : str
+        name of the processing step
+    get_tags : function or None
+        function that receives the dictionary of the arguments of the call
+        (including the default values) and returns the dictionary of tags
+        of the record (e.g. dataset name, volume time)
+
+    Returns
+    -------
+    telemetry_decorator : function
+        the decorator
+
+    """
+    def telemetry_decorator(func):
+        """
+        real decorator
+
+        Parameters
+        ----------
+        func : function
+            function to measure
+
+        Returns
+        -------
+        wrapper : function
+            The function wrapper
+
+        """
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            """
+            wrapper
+
+            Parameters
+            ----------
+            args, kwargs : arguments
+                The arguments of the function
+
+            Returns
+            -------
+            The output of the function
+
+            """
+            sink = _get_sink()
+            if sink is None:
+                return func(*args, **kwargs)
+
+            tags = dict()
+            if get_tags is not None:
+                try:
+                    bound_args = signature.bind(*args, **kwargs)
+                    bound_args.apply_defaults()
+                    tags = get_tags(bound_args.arguments)
+                except (KeyError, TypeError, AttributeError) as ee:
+                    warn('Unable to get telemetry tags of ' + event + ': ' +
+                         str(ee))
+
+            counters_start = _get_counters()
+            status = 'ok'
+            try:
+                return func(*args, **kwargs)
+            except BaseException:
+                status = 'error'
+                raise
+            finally:
+                sink.record(
+                    event, tags, status, counters_start, _get_counters())
+        return wrapper
+    return telemetry_decorator
+
+
+def _get_sink():
+    """
+    Gets the telemetry output of the current process. In processes started
+    by the processing it is created from the environment variables
+
+    Returns
+    -------
+    sink : object or None
+        the telemetry output. None if the telemetry is not active
+
+    """
+    global _SINK, _SINK_PID
+
+    pid = os.getpid()
+    if _SINK_PID == pid:
+        return _SINK
+
+    fname = os.environ.get(_TELEMETRY_FILE_ENV, None)
+    with _SINK_LOCK:
+        if _SINK_PID != pid:
+            _SINK = None
+            if fname is not None:
+                _SINK = _create_sink(fname, partial=(
+                    os.environ.get(_TELEMETRY_PID_ENV, None) != str(pid)))
+            _SINK_PID = pid
+    return _SINK
+
+
+def _create_sink(fname, partial=False):
+    """
+    Creates the telemetry output corresponding to a file
+
+    Parameters
+    ----------
+    fname : str
+        the output file
+    partial : bool
+        if True the process only records part of the telemetry of the
+        processing. The Prometheus totals are then written in a separate
+        file to be added by the main process
+
+    Returns
+    -------
+    sink : object
+        the telemetry output
+
+    """
+    if fname.endswith('.prom'):
+        return _PrometheusSink(fname, partial=partial)
+    return _JsonLinesSink(fname)
+
+
+def _get_part_files(fname):
+    """
+    Gets the files with the Prometheus totals of the other processes
+
+    Parameters
+    ----------
+    fname : str
+        the Prometheus file
+
+    Returns
+    -------
+    fname_list : list of str
+        the files
+
+    """
+    return glob.glob(glob.escape(fname) + '.part*.json')
+
+
+def _get_counters():
+    """
+    Gets the current value of the resource counters. The CPU time and the
+    I/O are those of the current thread if the system provides them
+
+    Returns
+    -------
+    counters : dict
+        dictionary with the wall time, CPU time, peak resident memory and
+        bytes read and written
+
+    """
+    counters = {
+        'time': time.time(),
+        'wall': time.perf_counter(),
+        'cpu': time.thread_time(),
+        'rss_peak': None,
+        'read_bytes': None,
+        'write_bytes': None}
+
+    if _RESOURCE_AVAILABLE:
+        # ru_maxrss is in kB
+        counters['rss_peak'] = (
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024)
+
+    for fname in ('/proc/thread-self/io', '/proc/self/io'):
+        try:
+            with open(fname, 'r') as fid:
+                for line in fid:
+                    key, value = line.split(':')
+                    if key == 'rchar':
+                        counters['read_bytes'] = int(value)
+                    elif key == 'wchar':
+                        counters['write_bytes'] = int(value)
+            break
+        except (OSError, ValueError):
+            continue
+
+    return counters
+
+
+def _get_record(event, tags, status, counters_start, counters_end):
+    """
+    Gets the telemetry record of a call
+
+    Parameters
+    ----------
+    event : str
+        name of the processing step
+    tags : dict
+        tags of the call
+    status : str
+        'ok' or 'error'
+    counters_start, counters_end : dict
+        value of the resource counters at the start and at the end of the
+        call
+
+    Returns
+    -------
+    record : dict
+        the record
+
+    """
+    record = {
+        'event': event,
+        'start': datetime.datetime.fromtimestamp(
+            counters_start['time'], datetime.timezone.utc).isoformat(),
+        'status': status,
+        'pid': os.getpid()}
+    for key, value in tags.items():
+        if isinstance(value, datetime.datetime):
+            value = value.isoformat()
+        record[key] = value
+    record['wall_s'] = counters_end['wall'] - counters_start['wall']
+    record['cpu_s'] = counters_end['cpu'] - counters_start['cpu']
+    for key in ('rss_peak', 'read_bytes', 'write_bytes'):
+        record_key = key + '_delta' if key == 'rss_peak' else key
+        if counters_start[key] is None or counters_end[key] is None:
+            record[record_key] = None
+            continue
+        record[record_key] = counters_end[key] - counters_start[key]
+
+    return record
+
+
+class _JsonLinesSink:
+    """
+    Writes one JSON line per call. The file is opened in append mode so that
+    several processes can write to it
+
+    """
+
+    def __init__(self, fname):
+        self.fname = fname
+        self._lock = threading.Lock()
+        self._fid = open(fname, 'a', buffering=1)
+
+    def record(self, event, tags, status, counters_start, counters_end):
+        line = json.dumps(
+            _get_record(event, tags, status, counters_start, counters_end),
+            default=str)
+        with self._lock:
+            self._fid.write(line + '\n')
+
+    def flush(self):
+        with self._lock:
+            self._fid.flush()
+
+    def close(self):
+        with self._lock:
+            self._fid.close()
+
+
+class _PrometheusSink:
+    """
+    Keeps the totals per processing step and tags and writes them as a
+    Prometheus text file (e.g. for the textfile collector of node_exporter).
+    The volume time is not used as label. The time of the last volume
+    processed is exported as a separate metric. If partial the totals are
+    written in JSON in a file of their own, which is written at each call
+    since the process may end at any time, and are added to those of the
+    main process when it writes the Prometheus file
+
+    """
+
+    # metric name, record key, type, help
+    _METRICS = (
+        ('pyrad_calls_total', None, 'counter',
+         'Number of calls'),
+        ('pyrad_wall_seconds_total', 'wall_s', 'counter',
+         'Wall time spent'),
+        ('pyrad_cpu_seconds_total', 'cpu_s', 'counter',
+         'CPU time spent by the calling thread'),
+        ('pyrad_read_bytes_total', 'read_bytes', 'counter',
+         'Bytes read'),
+        ('pyrad_write_bytes_total', 'write_bytes', 'counter',
+         'Bytes written'),
+        ('pyrad_rss_peak_delta_bytes_max', 'rss_peak_delta', 'gauge',
+         'Maximum increase of the peak resident memory during a call'),
+        ('pyrad_last_wall_seconds', 'wall_s', 'gauge',
+         'Wall time of the last call'),
+    )
+
+    def __init__(self, fname, partial=False):
+        self.fname = fname
+        self.partial = partial
+        self._fname_part = (
+            f'{fname}.part{os.getpid()}_{next(_PART_COUNTER)}.json')
+        self._lock = threading.Lock()
+        self._totals = dict()
+        self._last_voltime = None
+        self._last_write = 0.
+
+    def record(self, event, tags, status, counters_start, counters_end):
+        record = _get_record(
+            event, tags, status, counters_start, counters_end)
+        labels = [('event', event), ('status', status)]
+        for key, value in sorted(tags.items()):
+            if key == 'voltime':
+                continue
+            labels.append((key, value))
+        labels = tuple(
+            (key, _escape_label(value)) for key, value in labels)
+        values = dict()
+        for name, key, _, _ in self._METRICS:
+            value = 1 if key is None else record[key]
+            if value is not None:
+                values[name] = value
+
+        with self._lock:
+            voltime = tags.get('voltime', None)
+            if isinstance(voltime, datetime.datetime):
+                self._last_voltime = voltime
+            self._add_totals(self._totals.setdefault(labels, dict()), values)
+            write = self.partial or (
+                time.monotonic() - self._last_write
+                > _PROMETHEUS_WRITE_PERIOD)
+        if write:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            if self.partial:
+                self._write_part()
+                return
+
+            all_totals = {
+                labels: dict(totals)
+                for labels, totals in self._totals.items()}
+            last_voltime = self._last_voltime
+            for fname_part in _get_part_files(self.fname):
+                try:
+                    with open(fname_part, 'r') as fid:
+                        part = json.load(fid)
+                except (OSError, ValueError):
+                    continue
+                for labels, totals in part['totals']:
+                    labels = tuple(tuple(label) for label in labels)
+                    self._add_totals(
+                        all_totals.setdefault(labels, dict()), totals)
+                if part['last_voltime'] is not None:
+                    voltime = datetime.datetime.fromisoformat(
+                        part['last_voltime'])
+                    if last_voltime is None or voltime > last_voltime:
+                        last_voltime = voltime
+
+            lines = []
+            for name, _, metric_type, help_str in self._METRICS:
+                lines.append(f'# HELP {name} {help_str}')
+                lines.append(f'# TYPE {name} {metric_type}')
+                for labels, totals in all_totals.items():
+                    if name not in totals:
+                        continue
+                    label_str = ','.join(
+                        f'{key}="{value}"' for key, value in labels)
+                    lines.append(f'{name}{{{label_str}}} {totals[name]}')
+            if last_voltime is not None:
+                name = 'pyrad_last_volume_timestamp_seconds'
+                lines.append(f'# HELP {name} Time of the last volume')
+                lines.append(f'# TYPE {name} gauge')
+                voltime = last_voltime.replace(tzinfo=datetime.timezone.utc)
+                lines.append(f'{name} {voltime.timestamp()}')
+
+            # the file is replaced atomically so that it is never read
+            # half written
+            fname_tmp = f'{self.fname}.{os.getpid()}.tmp'
+            with open(fname_tmp, 'w') as fid:
+                fid.write('\n'.join(lines) + '\n')
+            os.replace(fname_tmp, self.fname)
+            self._last_write = time.monotonic()
+
+    def close(self):
+        self.flush()
+
+    def _write_part(self):
+        """ writes the totals of the process in its own file """
+        last_voltime = None
+        if self._last_voltime is not None:
+            last_voltime = self._last_voltime.isoformat()
+        fname_tmp = self._fname_part + '.tmp'
+        with open(fname_tmp, 'w') as fid:
+            json.dump({
+                'totals': list(self._totals.items()),
+                'last_voltime': last_voltime}, fid)
+        os.replace(fname_tmp, self._fname_part)
+        self._last_write = time.monotonic()
+
+    @classmethod
+    def _add_totals(cls, totals, values):
+        """
+        Adds the values of some calls to the totals of a set of labels
+
+        Parameters
+        ----------
+        totals : dict
+            the totals per metric name. Modified in place
+        values : dict
+            the values per metric name
+
+        """
+        for name, _, metric_type, _ in cls._METRICS:
+            if name not in values:
+                continue
+            value = values[name]
+            if metric_type == 'counter':
+                totals[name] = totals.get(name, 0) + value
+            elif name.endswith('_max'):
+                totals[name] = max(totals.get(name, value), value)
+            else:
+                totals[name] = value
+
+
+def _escape_label(value):
+    """
+    Escapes a Prometheus label value
+
+    Parameters
+    ----------
+    value : object
+        the label value
+
+    Returns
+    -------
+    value_str : str
+        the escaped value
+
+    """
+    if value is None:
+        return ''
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace(
+        '\n', '\\n')
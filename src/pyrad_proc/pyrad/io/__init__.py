@@ -31,6 +31,7 @@ Reading icon data
 
     icon2radar_data
     icon2radar_coord
+    get_icon_bounds
     hzt2radar_data
     hzt2radar_coord
     get_icon_fields
@@ -64,6 +65,7 @@ Reading other data
     read_centroids
     read_proc_periods
     read_last_state
+    read_checkpoint
     read_status
     read_rad4alp_icon
     read_rad4alp_vis
@@ -88,7 +90,9 @@ Reading other data
     read_selfconsistency
     read_antenna_pattern
     read_meteorage
+    read_meteorage_chunks
     read_lightning
+    read_lightning_chunks
     read_lightning_traj
     read_lightning_all
     read_trt_scores
@@ -129,6 +133,7 @@ Writing data
     send_msg
     write_alarm_msg
     write_last_state
+    write_checkpoint
     write_smn
     write_trt_info
     write_trt_thundertracking_data
@@ -159,6 +164,25 @@ Writing data
     write_sun_retrieval
     write_fixed_angle
 
+Pyrad intermediate format
+=========================
+
+.. autosummary::
+    :toctree: generated/
+
+    write_npy_volume
+    read_npy_volume
+
+Time series store
+=================
+
+.. autosummary::
+    :toctree: generated/
+
+    is_ts_store
+    write_ts_store
+    read_ts_store
+    ts_store_to_csv
 
 Auxiliary functions
 ===================
@@ -207,6 +231,40 @@ TimeSeries
 
     TimeSeries
 
+File watcher
+============
+
+.. autosummary::
+    :toctree: generated/
+
+    FileWatcher
+
+File index
+==========
+
+.. autosummary::
+    :toctree: generated/
+
+    FileIndex
+
+Volume cache
+============
+
+.. autosummary::
+    :toctree: generated/
+
+    VolumeCache
+    get_volume_cache
+
+Grid index cache
+================
+
+.. autosummary::
+    :toctree: generated/
+
+    GridIndexCache
+    get_grid_index_cache
+
 """
 
 from .config import read_config # noqa
@@ -215,6 +273,7 @@ from .read_data_radar import get_data, add_field, interpol_field # noqa
 
 from .read_data_icon import read_icon_data, read_icon_coord # noqa
 from .read_data_icon import icon2radar_data, icon2radar_coord # noqa
+from .read_data_icon import get_icon_bounds # noqa
 from .read_data_icon import get_icon_fields # noqa
 
 from .read_data_dem import read_idrisi_data, read_idrisi_metadata # noqa
@@ -238,8 +297,10 @@ from .read_data_other import read_quantiles_ts, read_ml_ts, read_proc_periods #
 from .read_data_other import read_centroids_npz, read_mf_vis # noqa
 from .read_data_other import read_vpr_theo_parameters # noqa
 from .read_data_other import read_mch_xml_vad # noqa
+from .read_data_other import read_checkpoint # noqa
 
 from .read_data_sensor import read_lightning, read_lightning_traj # noqa
+from .read_data_sensor import read_lightning_chunks, read_meteorage_chunks # noqa
 from .read_data_sensor import get_sensor_data, read_smn, read_smn2 # noqa
 from .read_data_sensor import read_disdro_scattering, read_trt_data # noqa
 from .read_data_sensor import read_trt_traj_data, read_lightning_all # noqa
@@ -263,6 +324,7 @@ from .write_data import write_colocated_gates, write_colocated_data # noqa
 from .write_data import write_colocated_data_time_avg, write_cdf # noqa
 from .write_data import write_rhi_profile, write_field_coverage # noqa
 from .write_data import write_last_state, write_alarm_msg, send_msg # noqa
+from .write_data import write_checkpoint # noqa
 from .write_data import write_excess_gates, write_trt_cell_data # noqa
 from .write_data import write_histogram, write_quantiles, write_ts_lightning # noqa
 from .write_data import write_trt_cell_scores, write_trt_cell_lightning # noqa
@@ -273,6 +335,11 @@ from .write_data import write_multiple_points, write_vpr_theo_params # noqa
 from .write_data import write_multiple_points_grid, write_vpr_info # noqa
 from .write_data import write_vol_kml, write_vol_csv # noqa
 
+from .npy_volume import write_npy_volume, read_npy_volume # noqa
+
+from .timeseries_store import is_ts_store, write_ts_store, read_ts_store # noqa
+from .timeseries_store import ts_store_to_csv # noqa
+
 from .io_aux import get_save_dir, make_filename, get_new_rainbow_file_name # noqa
 from .io_aux import get_datetime, get_dataset_fields, map_hydro, map_Doppler # noqa
 from .io_aux import get_file_list, get_trtfile_list, get_datatype_fields # noqa
@@ -287,4 +354,12 @@ from .trajectory import Trajectory # noqa
 
 from .timeseries import TimeSeries # noqa
 
+from .file_watcher import FileWatcher # noqa
+
+from .file_index import FileIndex # noqa
+
+from .volume_cache import VolumeCache, get_volume_cache # noqa
+
+from .grid_index import GridIndexCache, get_grid_index_cache # noqa
+
 __all__ = [s for s in dir() if not s.startswith('_')]
@@ -87,11 +87,20 @@ _defaults_loc = {
     'NumRadars': 1,
     'TimeTol': 3600.0,
     'ScanList': None,
+    'ScanReadWorkers': 1,
     'DataTypeID': None,
 }
 
 _defaults_main = {
     'lastStateFile': None,
+    'fileIndexFile': None,
+    'volumeCache': 0,
+    'volumeCacheDir': None,
+    'volumeCacheMemSize': 512.,
+    'volumeCacheDiskSize': 4096.,
+    'gridIndexCacheDir': None,
+    'checkpointFile': None,
+    'checkpointPeriod': 600.,
     'datapath': None,
     'satpath': None,
     'iconpath': None,
@@ -0,0 +1,349 @@
+"""
+pyrad.io.file_index
+===================
+
+Persistent index of the contents of the data directories and of the date
+and time parsed from the file names. Used to avoid listing the same
+directories and parsing the same file names at each run
+
+.. autosummary::
+    :toctree: generated/
+
+    FileIndex
+
+"""
+
+import os
+import glob
+import time
+import fnmatch
+import sqlite3
+import datetime
+import threading
+from collections import OrderedDict
+
+from .file_watcher import _MTIME_RESOLUTION
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS dirs ('
+    'path TEXT PRIMARY KEY, mtime REAL, listed REAL)',
+    'CREATE TABLE IF NOT EXISTS files ('
+    'dir TEXT, name TEXT, PRIMARY KEY (dir, name)) WITHOUT ROWID',
+    'CREATE TABLE IF NOT EXISTS dates ('
+    'dir TEXT, datekey TEXT, name TEXT, fdatetime TEXT, '
+    'PRIMARY KEY (dir, datekey, name)) WITHOUT ROWID',
+)
+
+
+class FileIndex:
+    """
+    Index of the files in the data directories stored in an SQLite
+    database. The listing of a directory is reused as long as the
+    modification time of the directory does not change. The date and time
+    of each file name are parsed only once for each way of parsing them.
+
+    The index can be shared by several threads and processes. Each thread
+    opens its own connection to the database.
+
+    Attributes
+    ----------
+    dbfile : str
+        path of the SQLite database file
+    max_dirs : int
+        Maximum number of directories kept in memory in addition to the
+        database
+
+    """
+
+    def __init__(self, dbfile, max_dirs=256):
+        """
+        initalize the object
+
+        Parameters
+        ----------
+        dbfile : str
+            path of the SQLite database file. It is created if it does not
+            exist
+        max_dirs : int
+            Maximum number of directories kept in memory
+
+        """
+        self.dbfile = dbfile
+        self.max_dirs = max_dirs
+        self._init_state()
+
+    def _init_state(self):
+        """ initializes the connections and the in-memory cache """
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # directory -> (mtime, sorted list of file names)
+        self._dirs = OrderedDict()
+        # (directory, datekey) -> dict file name -> datetime
+        self._dates = dict()
+
+    def __deepcopy__(self, memo):
+        """ The index is shared by all the copies of the configuration """
+        return self
+
+    def __getstate__(self):
+        """ Only the configuration is sent to other processes """
+        return {'dbfile': self.dbfile, 'max_dirs': self.max_dirs}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_state()
+
+    def glob(self, pattern):
+        """
+        Returns the files matching a pattern. Equivalent to glob.glob. Only
+        the file name part of the pattern can contain wildcards. Otherwise
+        the search is delegated to glob.glob
+
+        Parameters
+        ----------
+        pattern : str
+            the pattern to match
+
+        Returns
+        -------
+        filelist : list of str
+            the files matching the pattern
+
+        """
+        dirname, basename = os.path.split(pattern)
+        if not dirname or not basename or glob.has_magic(dirname):
+            return glob.glob(pattern)
+
+        names = self._get_dir_index(os.path.normpath(dirname))
+        if names is None:
+            return []
+        if not basename.startswith('.'):
+            names = [name for name in names if not name.startswith('.')]
+
+        return [
+            os.path.join(dirname, name)
+            for name in fnmatch.filter(names, basename)]
+
+    def get_datetimes(self, filelist, datekey, parse_func):
+        """
+        Gets the date and time of a list of files. The date and time of the
+        files not yet indexed are obtained with parse_func and stored
+
+        Parameters
+        ----------
+        filelist : list of str
+            the files
+        datekey : str
+            identifier of the way the date and time are parsed from the file
+            name. Files parsed with different keys are stored separately
+        parse_func : function
+            function returning the date and time (or None) of a file
+
+        Returns
+        -------
+        fdatetimes : list of datetime or None
+            the date and time of each file
+
+        """
+        dir_dates = dict()
+        fdatetimes = []
+        for fname in filelist:
+            dirname, name = os.path.split(fname)
+            key = (os.path.normpath(dirname), datekey)
+            dates = dir_dates.get(key, None)
+            if dates is None:
+                dates = self._get_dir_dates(key)
+                dir_dates[key] = dates
+            if name not in dates:
+                dates[name] = parse_func(fname)
+                self._store_date(key, name, dates[name])
+            fdatetimes.append(dates[name])
+
+        self._commit()
+
+        return fdatetimes
+
+    def _get_connection(self):
+        """
+        Gets the connection to the database of the current thread
+
+        Returns
+        -------
+        conn : sqlite3 Connection
+            the connection
+
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.dbfile, timeout=60.)
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            conn.commit()
+            self._local.conn = conn
+        return conn
+
+    def _commit(self):
+        """ commits the pending changes of the current thread """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.commit()
+
+    def _get_dir_index(self, dirname):
+        """
+        Gets the names of the files in a directory. The directory is listed
+        only if it was modified since it was indexed
+
+        Parameters
+        ----------
+        dirname : str
+            the normalized path of the directory
+
+        Returns
+        -------
+        names : list of str or None
+            the sorted names of the files in the directory. None if the
+            directory does not exist
+
+        """
+        try:
+            mtime = os.stat(dirname).st_mtime
+        except OSError:
+            return None
+
+        with self._lock:
+            cached = self._dirs.get(dirname, None)
+            if cached is not None and cached[0] == mtime:
+                self._dirs.move_to_end(dirname)
+                return cached[1]
+
+        conn = self._get_connection()
+        row = conn.execute(
+            'SELECT mtime, listed FROM dirs WHERE path = ?',
+            (dirname,)).fetchone()
+        if row is not None and row[0] == mtime:
+            names = [
+                name for (name,) in conn.execute(
+                    'SELECT name FROM files WHERE dir = ? ORDER BY name',
+                    (dirname,))]
+            # a listing made right after a modification may have missed
+            # files created within the time resolution of the file system
+            if row[1] - mtime > _MTIME_RESOLUTION:
+                self._cache_dir(dirname, mtime, names)
+                return names
+
+        listed = time.time()
+        try:
+            names = sorted(os.listdir(dirname))
+        except OSError:
+            return None
+
+        with conn:
+            conn.execute('DELETE FROM files WHERE dir = ?', (dirname,))
+            conn.executemany(
+                'INSERT INTO files (dir, name) VALUES (?, ?)',
+                ((dirname, name) for name in names))
+            conn.execute(
+                'INSERT OR REPLACE INTO dirs (path, mtime, listed) '
+                'VALUES (?, ?, ?)', (dirname, mtime, listed))
+
+        if listed - mtime > _MTIME_RESOLUTION:
+            self._cache_dir(dirname, mtime, names)
+
+        return names
+
+    def _cache_dir(self, dirname, mtime, names):
+        """
+        Keeps the listing of a directory in memory
+
+        Parameters
+        ----------
+        dirname : str
+            the normalized path of the directory
+        mtime : float
+            the modification time of the directory
+        names : list of str
+            the names of the files in the directory
+
+        """
+        with self._lock:
+            self._dirs[dirname] = (mtime, names)
+            self._dirs.move_to_end(dirname)
+            while len(self._dirs) > self.max_dirs:
+                dirname_old, _ = self._dirs.popitem(last=False)
+                for key in [key for key in self._dates
+                            if key[0] == dirname_old]:
+                    del self._dates[key]
+
+    def _get_dir_dates(self, key):
+        """
+        Gets the date and time of the files of a directory already indexed
+
+        Parameters
+        ----------
+        key : tuple
+            the normalized path of the directory and the date key
+
+        Returns
+        -------
+        dates : dict
+            dictionary file name -> datetime
+
+        """
+        with self._lock:
+            dates = self._dates.get(key, None)
+        if dates is not None:
+            return dates
+
+        dates = dict()
+        for name, fdatetime in self._get_connection().execute(
+                'SELECT name, fdatetime FROM dates '
+                'WHERE dir = ? AND datekey = ?', key):
+            dates[name] = _str_to_datetime(fdatetime)
+
+        with self._lock:
+            if key[0] in self._dirs:
+                self._dates[key] = dates
+
+        return dates
+
+    def _store_date(self, key, name, fdatetime):
+        """
+        Stores the date and time of a file. The change is committed by
+        get_datetimes
+
+        Parameters
+        ----------
+        key : tuple
+            the normalized path of the directory and the date key
+        name : str
+            the file name
+        fdatetime : datetime or None
+            the date and time of the file
+
+        """
+        fdatetime_str = None
+        if fdatetime is not None:
+            fdatetime_str = fdatetime.isoformat()
+        self._get_connection().execute(
+            'INSERT OR REPLACE INTO dates (dir, datekey, name, fdatetime) '
+            'VALUES (?, ?, ?, ?)', (key[0], key[1], name, fdatetime_str))
+
+
+def _str_to_datetime(fdatetime_str):
+    """
+    Converts the date and time stored in the database into a datetime object
+
+    Parameters
+    ----------
+    fdatetime_str : str or None
+        the date and time in ISO format
+
+    Returns
+    -------
+    fdatetime : datetime or None
+        the date and time
+
+    """
+    if fdatetime_str is None:
+        return None
+    return datetime.datetime.fromisoformat(fdatetime_str)
@@ -0,0 +1,380 @@
+"""
+pyrad.io.file_watcher
+=====================
+
+In-memory index of the files arriving in the data directories. Used by the
+real time processing to find new files without listing the directories at
+each processing round
+
+.. autosummary::
+    :toctree: generated/
+
+    FileWatcher
+
+"""
+
+import os
+import glob
+import time
+import fnmatch
+from collections import OrderedDict
+from warnings import warn
+
+try:
+    import inotify_simple
+    _INOTIFY_AVAILABLE = True
+except ImportError:
+    _INOTIFY_AVAILABLE = False
+
+# time after a modification of a directory during which its modification
+# time is not trusted to detect new files (s). Covers file systems with a
+# coarse time resolution
+_MTIME_RESOLUTION = 2.
+
+
+class FileWatcher:
+    """
+    Keeps an index of the files present in the directories searched through
+    it. The index of a directory is built the first time it is searched.
+    It is then kept up to date with inotify events or, in polling mode, by
+    listing the directory again only when its modification time changes.
+
+    inotify only reports the changes made by the local host. The polling
+    mode has to be used for directories written by other hosts (e.g. NFS
+    shares).
+
+    Attributes
+    ----------
+    mode : str
+        The mode used to follow the directories. Can be 'inotify' or 'poll'
+    poll_period : float
+        Period at which the directories are checked in polling mode (s)
+    max_dirs : int
+        Maximum number of directories indexed. The directories that have not
+        been searched for the longest time are dropped first
+
+    """
+
+    def __init__(self, mode='inotify', poll_period=1., max_dirs=64):
+        """
+        initalize the object
+
+        Parameters
+        ----------
+        mode : str
+            The mode used to follow the directories. Can be 'inotify' or
+            'poll'. If inotify is not available polling is used
+        poll_period : float
+            Period at which the directories are checked in polling mode (s)
+        max_dirs : int
+            Maximum number of directories indexed
+
+        """
+        if mode not in ('inotify', 'poll'):
+            raise ValueError(
+                "Unknown file watcher mode '" + mode +
+                "'. Supported modes: 'inotify', 'poll'")
+        if mode == 'inotify' and not _INOTIFY_AVAILABLE:
+            warn('inotify_simple not available. '
+                 'The data directories will be polled')
+            mode = 'poll'
+
+        self.mode = mode
+        self.poll_period = poll_period
+        self.max_dirs = max_dirs
+
+        # directory -> set of file names
+        self._dirs = OrderedDict()
+        # directory -> last modification time (poll mode)
+        self._mtimes = dict()
+        # directory <-> inotify watch descriptor
+        self._wds = dict()
+        self._dirs_wd = dict()
+        self._inotify = None
+        if self.mode == 'inotify':
+            self._inotify = inotify_simple.INotify()
+            flags = inotify_simple.flags
+            self._watch_flags = (
+                flags.CLOSE_WRITE | flags.MOVED_TO | flags.MOVED_FROM |
+                flags.CREATE | flags.DELETE | flags.DELETE_SELF |
+                flags.MOVE_SELF)
+
+    def __deepcopy__(self, memo):
+        """ The index is shared by all the copies of the configuration """
+        return self
+
+    def __getstate__(self):
+        """ The inotify handle cannot be sent to other processes """
+        state = self.__dict__.copy()
+        state['mode'] = 'poll'
+        state['_dirs'] = OrderedDict()
+        state['_mtimes'] = dict()
+        state['_wds'] = dict()
+        state['_dirs_wd'] = dict()
+        state['_inotify'] = None
+        return state
+
+    def glob(self, pattern):
+        """
+        Returns the files matching a pattern. Equivalent to glob.glob. Only
+        the file name part of the pattern can contain wildcards. Otherwise
+        the search is delegated to glob.glob
+
+        Parameters
+        ----------
+        pattern : str
+            the pattern to match
+
+        Returns
+        -------
+        filelist : list of str
+            the files matching the pattern
+
+        """
+        dirname, basename = os.path.split(pattern)
+        if not dirname or not basename or glob.has_magic(dirname):
+            return glob.glob(pattern)
+
+        names = self._get_dir_index(dirname)
+        if names is None:
+            return []
+        if not basename.startswith('.'):
+            names = [name for name in names if not name.startswith('.')]
+
+        return [
+            os.path.join(dirname, name)
+            for name in fnmatch.filter(names, basename)]
+
+    def wait(self, timeout):
+        """
+        Waits until new files arrive in any of the indexed directories
+
+        Parameters
+        ----------
+        timeout : float
+            maximum time to wait (s)
+
+        Returns
+        -------
+        new_files : bool
+            True if new files have arrived. False if the time out was
+            reached
+
+        """
+        endtime = time.monotonic() + timeout
+        while True:
+            remaining = endtime - time.monotonic()
+            if remaining <= 0:
+                return False
+            if self.mode == 'inotify':
+                if self._read_events(timeout=remaining) > 0:
+                    return True
+                continue
+
+            time.sleep(min(self.poll_period, remaining))
+            if self._poll_dirs() > 0:
+                return True
+
+    def close(self):
+        """
+        Stops following the directories and clears the index
+
+        """
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+        self._dirs.clear()
+        self._mtimes.clear()
+        self._wds.clear()
+        self._dirs_wd.clear()
+
+    def _get_dir_index(self, dirname):
+        """
+        Gets the names of the files in a directory, indexing the directory
+        if it was not indexed yet
+
+        Parameters
+        ----------
+        dirname : str
+            the directory
+
+        Returns
+        -------
+        names : set of str or None
+            the names of the files in the directory. None if the directory
+            does not exist
+
+        """
+        key = os.path.normpath(dirname)
+        if self.mode == 'inotify':
+            self._read_events(timeout=0)
+        if key in self._dirs:
+            self._dirs.move_to_end(key)
+            if self.mode == 'poll':
+                self._refresh_dir(key)
+            return self._dirs.get(key, None)
+
+        if self.mode == 'inotify':
+            try:
+                wd = self._inotify.add_watch(key, self._watch_flags)
+            except OSError:
+                return None
+            self._wds[wd] = key
+            self._dirs_wd[key] = wd
+        else:
+            try:
+                self._mtimes[key] = os.stat(key).st_mtime
+            except OSError:
+                return None
+
+        names = _list_dir(key)
+        if names is None:
+            self._drop_dir(key)
+            return None
+        self._dirs[key] = names
+
+        while len(self._dirs) > self.max_dirs:
+            self._drop_dir(next(iter(self._dirs)))
+
+        return names
+
+    def _drop_dir(self, key):
+        """
+        Removes a directory from the index
+
+        Parameters
+        ----------
+        key : str
+            the directory
+
+        """
+        self._dirs.pop(key, None)
+        self._mtimes.pop(key, None)
+        wd = self._dirs_wd.pop(key, None)
+        if wd is None:
+            return
+        self._wds.pop(wd, None)
+        try:
+            self._inotify.rm_watch(wd)
+        except OSError:
+            # the watch has already been removed by the kernel
+            pass
+
+    def _refresh_dir(self, key):
+        """
+        Lists a directory again if it has been modified since the last time
+        it was listed (poll mode)
+
+        Parameters
+        ----------
+        key : str
+            the directory
+
+        Returns
+        -------
+        nnew : int
+            number of new files in the directory
+
+        """
+        try:
+            mtime = os.stat(key).st_mtime
+        except OSError:
+            self._drop_dir(key)
+            return 0
+
+        if (mtime == self._mtimes[key]
+                and time.time() - mtime > _MTIME_RESOLUTION):
+            return 0
+
+        names = _list_dir(key)
+        if names is None:
+            self._drop_dir(key)
+            return 0
+        nnew = len(names - self._dirs[key])
+        self._dirs[key] = names
+        self._mtimes[key] = mtime
+
+        return nnew
+
+    def _poll_dirs(self):
+        """
+        Checks all the indexed directories for new files (poll mode)
+
+        Returns
+        -------
+        nnew : int
+            number of new files
+
+        """
+        nnew = 0
+        for key in list(self._dirs.keys()):
+            nnew += self._refresh_dir(key)
+        return nnew
+
+    def _read_events(self, timeout=0):
+        """
+        Updates the index with the pending inotify events
+
+        Parameters
+        ----------
+        timeout : float
+            maximum time to wait for events (s)
+
+        Returns
+        -------
+        nnew : int
+            number of new files
+
+        """
+        flags = inotify_simple.flags
+        nnew = 0
+        for event in self._inotify.read(timeout=int(timeout * 1000)):
+            if event.mask & flags.Q_OVERFLOW:
+                # events have been lost. The directories are listed again
+                for key in list(self._dirs.keys()):
+                    names = _list_dir(key)
+                    if names is None:
+                        self._drop_dir(key)
+                        continue
+                    nnew += len(names - self._dirs[key])
+                    self._dirs[key] = names
+                continue
+
+            key = self._wds.get(event.wd, None)
+            if key is None or key not in self._dirs:
+                continue
+            if event.mask & (flags.DELETE_SELF | flags.MOVE_SELF
+                             | flags.IGNORED):
+                self._drop_dir(key)
+            elif event.mask & (flags.DELETE | flags.MOVED_FROM):
+                self._dirs[key].discard(event.name)
+            elif (event.mask & (flags.CLOSE_WRITE | flags.MOVED_TO)
+                  or event.mask & flags.CREATE and event.mask & flags.ISDIR):
+                # regular files are indexed once they have been written
+                if event.name not in self._dirs[key]:
+                    self._dirs[key].add(event.name)
+                    nnew += 1
+
+        return nnew
+
+
+def _list_dir(dirname):
+    """
+    Lists the contents of a directory
+
+    Parameters
+    ----------
+    dirname : str
+        the directory
+
+    Returns
+    -------
+    names : set of str or None
+        the names of the entries in the directory. None if the directory
+        could not be listed
+
+    """
+    try:
+        return set(os.listdir(dirname))
+    except OSError:
+        return None
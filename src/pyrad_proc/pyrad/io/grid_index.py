@@ -0,0 +1,275 @@
+"""
+pyrad.io.grid_index
+===================
+
+Cache of the position of the radar gates in the grids of the numerical
+weather prediction models and digital elevation models. The radar geometry
+and the model grids rarely change, so the nearest neighbours (or the
+interpolation weights) are computed once and the data of each new model
+run are then simply gathered
+
+.. autosummary::
+    :toctree: generated/
+
+    GridIndexCache
+    get_grid_index_cache
+    get_grid_index_key
+
+"""
+
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from warnings import warn
+
+import numpy as np
+
+# caches shared by all the datasets processed by the same process
+_GRID_INDEX_CACHES = dict()
+_GRID_INDEX_CACHES_LOCK = threading.Lock()
+
+# digest of the last arrays hashed. The arrays are kept referenced so that
+# their id is not reused
+_DIGESTS = OrderedDict()
+_DIGESTS_LOCK = threading.Lock()
+_MAX_DIGESTS = 2
+
+
+def get_grid_index_cache(cachedir=None, max_entries=16):
+    """
+    Gets the grid index cache of the current process corresponding to a
+    cache directory
+
+    Parameters
+    ----------
+    cachedir : str or None
+        directory where the indices are stored. If None they are only kept
+        in memory
+    max_entries : int
+        maximum number of indices kept in memory
+
+    Returns
+    -------
+    cache : GridIndexCache
+        the cache
+
+    """
+    with _GRID_INDEX_CACHES_LOCK:
+        cache = _GRID_INDEX_CACHES.get(cachedir, None)
+        if cache is None:
+            cache = GridIndexCache(cachedir=cachedir, max_entries=max_entries)
+            _GRID_INDEX_CACHES[cachedir] = cache
+    return cache
+
+
+def get_grid_index_key(kind, radar, *args):
+    """
+    Gets the key identifying the position of the gates of a radar in a grid
+
+    Parameters
+    ----------
+    kind : str
+        the type of index (e.g. 'icon', 'hzt', 'dem')
+    radar : Radar
+        the radar object. The key depends on its position and on the
+        range, azimuth and elevation of the gates
+    args : arrays or scalars
+        the description of the grid (coordinates) and the options used to
+        compute the index
+
+    Returns
+    -------
+    key : str
+        the key
+
+    """
+    hasher = hashlib.sha1(kind.encode('utf-8'))
+    for arr in (
+            radar.latitude['data'], radar.longitude['data'],
+            radar.altitude['data'], radar.range['data'],
+            radar.azimuth['data'], radar.elevation['data']) + args:
+        hasher.update(_get_digest(arr))
+    return hasher.hexdigest()
+
+
+class GridIndexCache:
+    """
+    Cache of the indices of the radar gates in a grid. The most recently
+    used indices are kept in memory. If a cache directory is given they are
+    also stored there as npz files so that other processes and later runs
+    can use them.
+
+    Attributes
+    ----------
+    cachedir : str or None
+        directory where the indices are stored
+    max_entries : int
+        maximum number of indices kept in memory
+    stats : dict
+        number of memory hits, disk hits and misses
+
+    """
+
+    def __init__(self, cachedir=None, max_entries=16):
+        """
+        initalize the object
+
+        Parameters
+        ----------
+        cachedir : str or None
+            directory where the indices are stored. If None they are only
+            kept in memory
+        max_entries : int
+            maximum number of indices kept in memory
+
+        """
+        self.cachedir = cachedir
+        self.max_entries = max_entries
+        self._init_state()
+        if self.cachedir is not None:
+            os.makedirs(self.cachedir, exist_ok=True)
+
+    def _init_state(self):
+        """ initializes the in-memory cache and the counters """
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+
+    def __deepcopy__(self, memo):
+        """ The cache is shared by all the copies of the configuration """
+        return self
+
+    def __getstate__(self):
+        """ Only the configuration is sent to other processes """
+        return {'cachedir': self.cachedir, 'max_entries': self.max_entries}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_state()
+
+    def get(self, key):
+        """
+        Gets an index
+
+        Parameters
+        ----------
+        key : str
+            the key of the index
+
+        Returns
+        -------
+        index : dict or None
+            dictionary of arrays describing the index. None if not in the
+            cache. The arrays must not be modified
+
+        """
+        with self._lock:
+            index = self._entries.get(key, None)
+            if index is not None:
+                self._entries.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return index
+
+        if self.cachedir is not None:
+            fname = self._get_fname(key)
+            try:
+                with np.load(fname) as npz:
+                    index = {name: npz[name] for name in npz.files}
+            except FileNotFoundError:
+                index = None
+            except (OSError, ValueError) as ee:
+                warn('Unable to read grid index ' + fname + ': ' + str(ee))
+                index = None
+
+        with self._lock:
+            if index is None:
+                self.stats['misses'] += 1
+                return None
+            self.stats['disk_hits'] += 1
+        self._put_memory(key, index)
+
+        return index
+
+    def put(self, key, index):
+        """
+        Stores an index
+
+        Parameters
+        ----------
+        key : str
+            the key of the index
+        index : dict
+            dictionary of arrays describing the index
+
+        """
+        for arr in index.values():
+            arr.flags.writeable = False
+        self._put_memory(key, index)
+        if self.cachedir is None:
+            return
+
+        fname = self._get_fname(key)
+        fname_tmp = f'{fname}.{os.getpid()}.{threading.get_ident()}.tmp.npz'
+        try:
+            np.savez(fname_tmp, **index)
+            os.replace(fname_tmp, fname)
+        except OSError as ee:
+            warn('Unable to write grid index ' + fname + ': ' + str(ee))
+            if os.path.isfile(fname_tmp):
+                os.remove(fname_tmp)
+
+    def _put_memory(self, key, index):
+        """ keeps an index in memory """
+        with self._lock:
+            self._entries[key] = index
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _get_fname(self, key):
+        """ file where an index is stored """
+        return os.path.join(self.cachedir, key + '.npz')
+
+
+def _get_digest(arr):
+    """
+    Gets the digest of the content of an array. The digest of the last
+    arrays hashed is reused
+
+    Parameters
+    ----------
+    arr : array or scalar
+        the data
+
+    Returns
+    -------
+    digest : bytes
+        the digest
+
+    """
+    if not isinstance(arr, np.ndarray):
+        return repr(arr).encode('utf-8')
+
+    with _DIGESTS_LOCK:
+        cached = _DIGESTS.get(id(arr), None)
+        if cached is not None and cached[0] is arr:
+            _DIGESTS.move_to_end(id(arr))
+            return cached[1]
+
+    data = np.ascontiguousarray(np.ma.getdata(arr))
+    hasher = hashlib.sha1(
+        (data.dtype.str + str(data.shape)).encode('utf-8'))
+    hasher.update(data.view(np.uint8).reshape(-1))
+    if np.ma.is_masked(arr):
+        hasher.update(np.packbits(np.ma.getmaskarray(arr)).tobytes())
+    digest = hasher.digest()
+
+    # only large arrays are worth keeping
+    if data.nbytes > 1e6:
+        with _DIGESTS_LOCK:
+            _DIGESTS[id(arr)] = (arr, digest)
+            while len(_DIGESTS) > _MAX_DIGESTS:
+                _DIGESTS.popitem(last=False)
+
+    return digest
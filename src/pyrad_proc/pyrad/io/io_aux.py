@@ -41,6 +41,10 @@ Auxiliary functions for reading/writing files
     _get_datetime
     find_date_in_file_name
     convert_pydda_to_pyart_grid
+    _read_csv_columns
+    _read_csv_chunks
+    _CommentFilter
+    _to_datetime_array
 
 """
 
@@ -51,7 +55,9 @@ import datetime
 
 from warnings import warn
 from copy import deepcopy
+from functools import partial
 import numpy as np
+import pandas as pd
 import pyart
 
 from pyart.config import get_metadata
@@ -2440,7 +2446,9 @@ def get_file_list(datadescriptor, starttimes, endtimes, cfg, scan=None):
     endtimes : array of datetime object
         end of time periods
     cfg: dictionary of dictionaries
-        configuration info to figure out where the data is
+        configuration info to figure out where the data is. If it contains
+        a file watcher under key 'file_watcher' or a file index under key
+        'file_index' the files are looked up in its index
     scan : str
         scan name
 
@@ -2458,6 +2466,7 @@ def get_file_list(datadescriptor, starttimes, endtimes, cfg, scan=None):
         datatype = 'dBZ'
 
     filelist = []
+    fileset = set()
     for starttime, endtime in zip(starttimes, endtimes):
         startdate = starttime.replace(
             hour=0, minute=0, second=0, microsecond=0)
@@ -2481,7 +2490,7 @@ def get_file_list(datadescriptor, starttimes, endtimes, cfg, scan=None):
                     warn("WARNING: Unknown datapath '%s'" % datapath)
                     continue
                 pattern = datapath + dayinfo + '*00' + datatype + '.*'
-                dayfilelist = glob.glob(pattern)
+                dayfilelist = _glob_file_list(pattern, cfg)
                 for filename in dayfilelist:
                     t_filelist.append(filename)
             elif datagroup == 'RAD4ALP':
@@ -2500,7 +2509,7 @@ def get_file_list(datadescriptor, starttimes, endtimes, cfg, scan=None):
                     warn("WARNING: Unknown datapath '%s'" % datapath)
                     continue
                 pattern = datapath + basename + '*.' + scan + '*'
-                dayfilelist = glob.glob(pattern)
+                dayfilelist = _glob_file_list(pattern, cfg)
                 for filename in dayfilelist:
                     t_filelist.append(filename)
             elif datagroup in ('RAD4ALPGRID', 'RAD4ALPGIF', 'RAD4ALPBIN'):
@@ -2517,7 +2526,7 @@ def get_file_list(datadescriptor, starttimes, endtimes, cfg, scan=None):
                     warn("WARNING: Unknown datapath '%s'" % datapath)
                     continue
                 pattern = datapath + basename + '*' + termination
-                dayfilelist = glob.glob(pattern)
+                dayfilelist = _glob_file_list(pattern, cfg)
                 for filename in dayfilelist:
                     t_filelist.append(filename)
             elif datagroup == 'SATGRID':
@@ -2531,7 +2540,7 @@ def get_file_list(datadescriptor, starttimes, endtimes, cfg, scan=None):
                     # warn("WARNING: Unknown datapath '%s'" % datapath)
                     continue
                 pattern = datapath + 'MSG?_ccs4_' + dayinfo + '*_rad_PLAX.nc'
-                dayfilelist = glob.glob(pattern)
+                dayfilelist = _glob_file_list(pattern, cfg)
                 for filename in dayfilelist:
                     t_filelist.append(filename)
             elif datagroup == 'SKYECHO':
@@ -2546,7 +2555,7 @@ def get_file_list(datadescriptor, starttimes, endtimes, cfg, scan=None):
                         fpath_strf)
                 datapath = (cfg['datapath'][ind_rad] + daydir + '/')
                 pattern = datapath + '*' + scan + '*'
-                dayfilelist = glob.glob(pattern)
+                dayfilelist = _glob_file_list(pattern, cfg)
                 for filename in dayfilelist:
                     t_filelist.append(filename)
             elif datagroup in ('ODIM', 'ODIMBIRDS', 'CFRADIAL', 'CFRADIAL2',
@@ -2567,7 +2576,7 @@ def get_file_list(datadescriptor, starttimes, endtimes, cfg, scan=None):
 
                     # check that M files exist. if not search P files
                     pattern = datapath + basename + '*' + scan + '*'
-                    dayfilelist = glob.glob(pattern)
+                    dayfilelist = _glob_file_list(pattern, cfg)
                     if not dayfilelist:
                         basename = ('P' + cfg['RadarRes'][ind_rad] +
                                     cfg['RadarName'][ind_rad] + dayinfo)
@@ -2588,7 +2597,7 @@ def get_file_list(datadescriptor, starttimes, endtimes, cfg, scan=None):
                             fpath_strf)
                     datapath = (cfg['datapath'][ind_rad] + daydir + '/')
                     pattern = datapath + '*' + scan + '*'
-                    dayfilelist = glob.glob(pattern)
+                    dayfilelist = _glob_file_list(pattern, cfg)
                 elif cfg['path_convention'][ind_rad] == 'RADARV':
                     try:
                         fpath_strf = dataset[
@@ -2601,7 +2610,7 @@ def get_file_list(datadescriptor, starttimes, endtimes, cfg, scan=None):
                             fpath_strf)
                     datapath = (cfg['datapath'][ind_rad] + scan + '/')
                     pattern = datapath + '/' + daydir + '/*'
-                    dayfilelist = glob.glob(pattern)
+                    dayfilelist = _glob_file_list(pattern, cfg)
                 else:
                     dayinfo = (
                         starttime +
@@ -2616,7 +2625,7 @@ def get_file_list(datadescriptor, starttimes, endtimes, cfg, scan=None):
 
                     # check that M files exist. if not search P files
                     pattern = datapath + basename + '*' + scan + '*'
-                    dayfilelist = glob.glob(pattern)
+                    dayfilelist = _glob_file_list(pattern, cfg)
                     if not dayfilelist:
                         basename = ('P' + cfg['RadarRes'][ind_rad] +
                                     cfg['RadarName'][ind_rad] + dayinfo)
@@ -2631,12 +2640,15 @@ def get_file_list(datadescriptor, starttimes, endtimes, cfg, scan=None):
                 for filename in dayfilelist:
                     t_filelist.append(filename)
             elif datagroup in ('CFRADIALPYRAD', 'ODIMPYRAD', 'PYRADGRID',
-                               'ODIMPYRADGRID', 'NETCDFSPECTRA', 'CSV'):
+                               'ODIMPYRADGRID', 'NETCDFSPECTRA', 'CSV',
+                               'NPYVOLPYRAD'):
                 termination = '.nc'
                 if datagroup in ('ODIMPYRAD', 'ODIMPYRADGRID'):
                     termination = '.h*'
                 elif datagroup == 'CSV':
                     termination = '.csv'
+                elif datagroup == 'NPYVOLPYRAD':
+                    termination = '.npyvol'
 
                 daydir = (
                     starttime + datetime.timedelta(days=i)).strftime(
@@ -2650,7 +2662,7 @@ def get_file_list(datadescriptor, starttimes, endtimes, cfg, scan=None):
                     warn("WARNING: Unknown datapath '%s'" % datapath)
                     continue
                 pattern = datapath + dayinfo + '*' + datatype + termination
-                dayfilelist = glob.glob(pattern)
+                dayfilelist = _glob_file_list(pattern, cfg)
                 for filename in dayfilelist:
                     t_filelist.append(filename)
             elif datagroup in ('GECSX'):
@@ -2663,7 +2675,7 @@ def get_file_list(datadescriptor, starttimes, endtimes, cfg, scan=None):
                     warn("WARNING: Unknown datapath '%s'" % datapath)
                     continue
                 pattern = datapath + '*' + datatype + termination
-                dayfilelist = glob.glob(pattern)
+                dayfilelist = _glob_file_list(pattern, cfg)
                 for filename in dayfilelist:
                     t_filelist.append(filename)
             elif datagroup in ('MFCFRADIAL', 'MFBIN', 'MFPNG', 'MFGRIB',
@@ -2679,7 +2691,7 @@ def get_file_list(datadescriptor, starttimes, endtimes, cfg, scan=None):
                         fpath_strf)
                 datapath = (cfg['datapath'][ind_rad] + daydir + '/')
                 pattern = datapath + '*' + scan + '*'
-                dayfilelist = glob.glob(pattern)
+                dayfilelist = _glob_file_list(pattern, cfg)
 
                 for filename in dayfilelist:
                     t_filelist.append(filename)
@@ -2704,7 +2716,7 @@ def get_file_list(datadescriptor, starttimes, endtimes, cfg, scan=None):
                         'MXPol-polar-' + starttime.strftime('%Y%m%d') + '-*-' +
                         scan + '*')
                     pattern = datapath + basename
-                    dayfilelist = glob.glob(pattern)
+                    dayfilelist = _glob_file_list(pattern, cfg)
                 else:
                     daydir = (
                         starttime + datetime.timedelta(days=i)).strftime(
@@ -2720,7 +2732,7 @@ def get_file_list(datadescriptor, starttimes, endtimes, cfg, scan=None):
                     pattern = (
                         datapath + 'MXPol-polar-' + dayinfo + '-*-' + scan
                         + '.nc')
-                    dayfilelist = glob.glob(pattern)
+                    dayfilelist = _glob_file_list(pattern, cfg)
                 for filename in dayfilelist:
                     t_filelist.append(filename)
             elif datagroup == 'ICONRAW':
@@ -2743,7 +2755,7 @@ def get_file_list(datadescriptor, starttimes, endtimes, cfg, scan=None):
                     warn("WARNING: Unknown datapath '%s'" % datapath)
                     continue
                 pattern = datapath + '*' + dayinfo + '*.nc'
-                dayfilelist = glob.glob(pattern)
+                dayfilelist = _glob_file_list(pattern, cfg)
                 for filename in dayfilelist:
                     t_filelist.append(filename)
 
@@ -2759,12 +2771,16 @@ def get_file_list(datadescriptor, starttimes, endtimes, cfg, scan=None):
                         filelist.append(
                             f"{str(filename)}::{tend.strftime('%Y-%m-%dT%H:%M:%S.%f')}")
         else:
-            for filename in t_filelist:
-                filenamestr = str(filename)
-                fdatetime = get_datetime(filenamestr, datadescriptor)
+            t_filelist = [str(filename) for filename in t_filelist]
+            fdatetimes = _get_file_datetimes(
+                t_filelist, cfg,
+                partial(get_datetime, datadescriptor=datadescriptor),
+                f'{datagroup}:{dataset}')
+            for filenamestr, fdatetime in zip(t_filelist, fdatetimes):
                 if fdatetime is not None:
                     if starttime <= fdatetime <= endtime:
-                        if filenamestr not in filelist:
+                        if filenamestr not in fileset:
+                            fileset.add(filenamestr)
                             filelist.append(filenamestr)
 
         if not filelist:
@@ -2775,6 +2791,65 @@ def get_file_list(datadescriptor, starttimes, endtimes, cfg, scan=None):
     return sorted(filelist)
 
 
+def _glob_file_list(pattern, cfg):
+    """
+    Gets the files matching a pattern. If the configuration contains a file
+    watcher or a file index the files are looked up in its index instead of
+    listing the directory
+
+    Parameters
+    ----------
+    pattern : str
+        the pattern to match
+    cfg : dict
+        configuration info. Can contain the keys 'file_watcher' and
+        'file_index'
+
+    Returns
+    -------
+    filelist : list of str
+        list of files matching the pattern
+
+    """
+    file_watcher = cfg.get('file_watcher', None)
+    if file_watcher is not None:
+        return file_watcher.glob(pattern)
+    file_index = cfg.get('file_index', None)
+    if file_index is not None:
+        return file_index.glob(pattern)
+    return glob.glob(pattern)
+
+
+def _get_file_datetimes(filelist, cfg, parse_func, datekey):
+    """
+    Gets the date and time of a list of files. If the configuration contains
+    a file index the date and time already parsed are taken from it
+
+    Parameters
+    ----------
+    filelist : list of str
+        the files
+    cfg : dict
+        configuration info. Can contain the key 'file_index'
+    parse_func : function
+        function returning the date and time of a file
+    datekey : str
+        identifier of the way the date and time are parsed from the file
+        names
+
+    Returns
+    -------
+    fdatetimes : iterable of datetime or None
+        the date and time of each file. Without file index they are parsed
+        as the iterable is consumed
+
+    """
+    file_index = cfg.get('file_index', None)
+    if file_index is None:
+        return map(parse_func, filelist)
+    return file_index.get_datetimes(filelist, datekey, parse_func)
+
+
 def get_rad4alp_dir(basepath, voltime, radar_name='A', radar_res='L',
                     scan='001', path_convention='MCH'):
     """
@@ -3060,7 +3135,8 @@ def get_datatype_fields(datadescriptor):
         else:
             datagroup = descrfields[1]
             if datagroup in ('CFRADIALPYRAD', 'ODIMPYRAD', 'PYRADGRID',
-                             'ODIMPYRADGRID', 'NETCDFSPECTRA', 'CSV', 'GECSX'):
+                             'ODIMPYRADGRID', 'NETCDFSPECTRA', 'CSV', 'GECSX',
+                             'NPYVOLPYRAD'):
                 descrfields2 = descrfields[2].split(',')
                 datatype = descrfields2[0]
                 dataset = descrfields2[1]
@@ -3092,7 +3168,8 @@ def get_datatype_fields(datadescriptor):
         radarnr = 'RADAR001'
         datagroup = descrfields[0]
         if datagroup in ('CFRADIALPYRAD', 'ODIMPYRAD', 'PYRADGRID',
-                         'ODIMPYRADGRID', 'NETCDFSPECTRA', 'CSV'):
+                         'ODIMPYRADGRID', 'NETCDFSPECTRA', 'CSV',
+                         'NPYVOLPYRAD'):
             descrfields2 = descrfields[1].split(',')
             datatype = descrfields2[0]
             dataset = descrfields2[1]
@@ -3662,7 +3739,7 @@ def _get_datetime(fname, datagroup, ftime_format=None):
     """
     bfile = os.path.basename(fname)
     if datagroup in ('RAINBOW', 'CFRADIALPYRAD', 'ODIMPYRAD', 'PYRADGRID',
-                     'ODIMPYRADGRID', 'NETCDFSPECTRA', 'CSV'):
+                     'ODIMPYRADGRID', 'NETCDFSPECTRA', 'CSV', 'NPYVOLPYRAD'):
         datetimestr = bfile[0:14]
         fdatetime = datetime.datetime.strptime(datetimestr, '%Y%m%d%H%M%S')
     elif datagroup in ('RAD4ALP', 'RAD4ALPGRID', 'RAD4ALPGIF', 'RAD4ALPBIN'):
@@ -3830,3 +3907,146 @@ def convert_pydda_to_pyart_grid(pydda_grid):
         },
     )
     return grid
+
+
+def _read_csv_columns(fname, dtypes, names=None, sep=',', comment='#',
+                      chunksize=None):
+    """
+    Reads columns of a csv file with a vectorised parser. Only the columns
+    requested are converted. The floats are converted exactly as with
+    float()
+
+    Parameters
+    ----------
+    fname : str or file object
+        the csv file
+    dtypes : dict
+        the columns to read and their data type. Dates should be read as
+        str and converted with _to_datetime_array
+    names : list of str or None
+        the names of all the columns of the file if it has no header. If
+        None the names are read from the first line
+    sep : str
+        the delimiter
+    comment : str or None
+        the lines starting with this character are ignored. Occurrences of
+        the character elsewhere in a line are kept
+    chunksize : int or None
+        if set the file is read in chunks of this number of rows
+
+    Returns
+    -------
+    data : DataFrame or iterator of DataFrames
+        the data read. An iterator over chunks of data if chunksize is set
+
+    """
+    if isinstance(fname, str):
+        if chunksize is not None:
+            return _read_csv_chunks(
+                fname, dtypes, names=names, sep=sep, comment=comment,
+                chunksize=chunksize)
+        with open(fname, 'r', newline='', encoding='utf-8') as csvfile:
+            return _read_csv_columns(
+                csvfile, dtypes, names=names, sep=sep, comment=comment)
+
+    if comment is not None:
+        fname = _CommentFilter(fname, comment)
+    try:
+        return pd.read_csv(
+            fname, sep=sep, names=names,
+            header=None if names is not None else 'infer',
+            usecols=list(dtypes.keys()), dtype=dtypes, chunksize=chunksize,
+            float_precision='round_trip')
+    except pd.errors.EmptyDataError:
+        data = pd.DataFrame({
+            name: pd.Series(dtype=dtype) for name, dtype in dtypes.items()})
+        if chunksize is None:
+            return data
+        return iter([data])
+
+
+def _read_csv_chunks(fname, dtypes, names=None, sep=',', comment='#',
+                     chunksize=None):
+    """
+    Reads a csv file in chunks keeping the file open until all the chunks
+    have been read. See _read_csv_columns for the parameters
+
+    """
+    with open(fname, 'r', newline='', encoding='utf-8') as csvfile:
+        yield from _read_csv_columns(
+            csvfile, dtypes, names=names, sep=sep, comment=comment,
+            chunksize=chunksize)
+
+
+class _CommentFilter:
+    """
+    File-like object that removes the lines starting with a comment
+    character from a csv file before it is parsed. Unlike the comment
+    parameter of pandas.read_csv the rest of the lines is kept untouched.
+    Binary files are decoded as UTF-8
+
+    Parameters
+    ----------
+    fid : file object
+        the csv file
+    comment : str
+        the comment character
+
+    """
+    mode = 'r'
+
+    def __init__(self, fid, comment):
+        self._fid = fid
+        self._pattern = re.compile(
+            '^' + re.escape(comment) + '[^\n]*(?:\n|$)', re.MULTILINE)
+
+    def read(self, size=-1):
+        """
+        Reads up to size characters, completed up to the end of the line,
+        skipping the comment lines. Returns an empty string at the end of
+        the file
+
+        """
+        while True:
+            data = self._fid.read(size)
+            if not data:
+                return ''
+            if isinstance(data, bytes):
+                if size is not None and size >= 0 and not data.endswith(
+                        b'\n'):
+                    data += self._fid.readline()
+                data = data.decode('utf-8')
+            elif size is not None and size >= 0 and not data.endswith('\n'):
+                data += self._fid.readline()
+            data = self._pattern.sub('', data)
+            if data:
+                return data
+
+    def __iter__(self):
+        for line in self._fid:
+            if isinstance(line, bytes):
+                line = line.decode('utf-8')
+            if not self._pattern.match(line):
+                yield line
+
+
+def _to_datetime_array(values, datetime_format):
+    """
+    Converts an array of date strings into an array of datetime objects
+
+    Parameters
+    ----------
+    values : array or Series of str
+        the dates
+    datetime_format : str
+        the format of the dates
+
+    Returns
+    -------
+    dates : array of datetime objects
+        the converted dates
+
+    """
+    return np.asarray(pd.to_datetime(
+        np.asarray(values, dtype=str), format=datetime_format).to_pydatetime(),
+        dtype=object)
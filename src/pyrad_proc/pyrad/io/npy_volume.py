@@ -0,0 +1,389 @@
+"""
+pyrad.io.npy_volume
+===================
+
+Functions to write and read radar volumes in the pyrad intermediate format:
+a directory containing the metadata of the volume in a JSON file and each
+field in a separate numpy file. Uncompressed fields are memory-mapped when
+read so that only the part of the data used is read from disk
+
+.. autosummary::
+    :toctree: generated/
+
+    write_npy_volume
+    read_npy_volume
+
+"""
+
+import io
+import os
+import json
+import zlib
+import shutil
+import inspect
+import datetime
+from warnings import warn
+
+import numpy as np
+
+import pyart
+from pyart.lazydict import LazyLoadDict
+
+# version of the format. Stored in the metadata file
+_NPY_VOLUME_VERSION = 1
+
+_METADATA_FILE = 'metadata.json'
+
+# returned by _encode for the values that cannot be stored in JSON
+_UNSUPPORTED = object()
+
+
+def write_npy_volume(fname, radar, field_names=None, compression=None,
+                     compression_opts=1):
+    """
+    Writes a radar object in the pyrad intermediate format. The volume is
+    written in a temporary directory that is renamed once complete
+
+    Parameters
+    ----------
+    fname : str
+        name of the output directory
+    radar : radar object
+        the radar object
+    field_names : list of str or None
+        the fields to write. If None all the fields are written
+    compression : str or None
+        Compression of the fields. Can be None or 'zlib'. Compressed fields
+        cannot be memory-mapped
+    compression_opts : int
+        The compression level. Default 1 (fastest)
+
+    Returns
+    -------
+    fname : str
+        the name of the directory written
+
+    """
+    if compression not in (None, 'zlib'):
+        warn('Unknown compression ' + str(compression) +
+             '. Fields will not be compressed')
+        compression = None
+    if field_names is None:
+        field_names = list(radar.fields.keys())
+
+    # the attributes of the radar object that can be passed to its
+    # constructor
+    metadata = {
+        'version': _NPY_VOLUME_VERSION,
+        'attributes': dict(),
+        'fields': dict()}
+    for attr_name in _get_radar_attributes():
+        value = getattr(radar, attr_name.lstrip('_'), None)
+        if value is None:
+            continue
+        value_json = _encode(value)
+        if value_json is not _UNSUPPORTED:
+            metadata['attributes'][attr_name] = value_json
+
+    tmpdir = f'{fname}.{os.getpid()}.tmp'
+    shutil.rmtree(tmpdir, ignore_errors=True)
+    os.makedirs(tmpdir)
+    for ind, field_name in enumerate(field_names):
+        if field_name not in radar.fields:
+            warn(field_name + ' not in radar object')
+            continue
+        field_dict = radar.fields[field_name]
+        data = field_dict['data']
+        field_meta = {
+            'file': f'{ind}.npy',
+            'mask_file': None,
+            'compression': compression,
+            'fill_value': None,
+            'metadata': dict()}
+        for key, value in field_dict.items():
+            if key == 'data':
+                continue
+            value_json = _encode(value)
+            if value_json is not _UNSUPPORTED:
+                field_meta['metadata'][key] = value_json
+        _save_array(
+            os.path.join(tmpdir, field_meta['file']), np.ma.getdata(data),
+            compression=compression, compression_opts=compression_opts)
+        if np.ma.is_masked(data):
+            field_meta['mask_file'] = f'{ind}_mask.npy'
+            _save_array(
+                os.path.join(tmpdir, field_meta['mask_file']),
+                np.ma.getmaskarray(data), compression=compression,
+                compression_opts=compression_opts)
+        if np.ma.isMaskedArray(data):
+            fill_value = _encode(data.fill_value)
+            if fill_value is not _UNSUPPORTED:
+                field_meta['fill_value'] = fill_value
+        metadata['fields'][field_name] = field_meta
+
+    with open(os.path.join(tmpdir, _METADATA_FILE), 'w') as fid:
+        json.dump(metadata, fid)
+
+    shutil.rmtree(fname, ignore_errors=True)
+    os.replace(tmpdir, fname)
+
+    return fname
+
+
+def read_npy_volume(fname, field_names=None):
+    """
+    Reads a radar volume in the pyrad intermediate format. The data of each
+    field is read only when used
+
+    Parameters
+    ----------
+    fname : str
+        name of the directory containing the volume
+    field_names : list of str or None
+        the fields to read. If None all the fields are read
+
+    Returns
+    -------
+    radar : radar object or None
+        the radar object. None if the volume could not be read
+
+    """
+    try:
+        with open(os.path.join(fname, _METADATA_FILE), 'r') as fid:
+            metadata = json.load(fid)
+    except (OSError, ValueError) as ee:
+        warn(str(ee))
+        warn('Unable to read file ' + fname)
+        return None
+
+    kwargs = {
+        attr_name: _decode(value)
+        for attr_name, value in metadata['attributes'].items()}
+
+    fields = dict()
+    for field_name, field_meta in metadata['fields'].items():
+        if field_names is not None and field_name not in field_names:
+            continue
+        field_dict = LazyLoadDict({
+            key: _decode(value)
+            for key, value in field_meta['metadata'].items()})
+        field_dict.set_lazy('data', _FieldLoader(fname, field_meta))
+        fields[field_name] = field_dict
+    kwargs['fields'] = fields
+
+    return pyart.core.Radar(**kwargs)
+
+
+class _FieldLoader:
+    """
+    Callable reading the data of a field. Used to load the fields lazily
+
+    """
+
+    def __init__(self, fname, field_meta):
+        self.fname = fname
+        self.field_meta = field_meta
+
+    def __call__(self):
+        data = _load_array(
+            os.path.join(self.fname, self.field_meta['file']),
+            compression=self.field_meta['compression'])
+        mask = np.ma.nomask
+        if self.field_meta['mask_file'] is not None:
+            mask = _load_array(
+                os.path.join(self.fname, self.field_meta['mask_file']),
+                compression=self.field_meta['compression'])
+        fill_value = None
+        if self.field_meta['fill_value'] is not None:
+            fill_value = _decode(self.field_meta['fill_value'])
+        return np.ma.masked_array(data, mask=mask, fill_value=fill_value)
+
+
+def _get_radar_attributes():
+    """
+    Gets the names of the arguments of the radar object constructor
+
+    Returns
+    -------
+    attr_names : list of str
+        the names of the arguments (except the fields)
+
+    """
+    return [
+        name for name in inspect.signature(
+            pyart.core.Radar.__init__).parameters
+        if name not in ('self', 'fields')]
+
+
+def _save_array(fname, data, compression=None, compression_opts=1):
+    """
+    Saves an array in a numpy file, optionally compressed
+
+    Parameters
+    ----------
+    fname : str
+        the file name
+    data : array
+        the data
+    compression : str or None
+        None or 'zlib'
+    compression_opts : int
+        the compression level
+
+    """
+    if compression is None:
+        np.save(fname, data)
+        return
+
+    buffer = io.BytesIO()
+    np.save(buffer, data)
+    with open(fname, 'wb') as fid:
+        fid.write(zlib.compress(buffer.getvalue(), compression_opts))
+
+
+def _load_array(fname, compression=None):
+    """
+    Loads an array saved with _save_array. Uncompressed arrays are
+    memory-mapped (copy-on-write)
+
+    Parameters
+    ----------
+    fname : str
+        the file name
+    compression : str or None
+        None or 'zlib'
+
+    Returns
+    -------
+    data : array
+        the data
+
+    """
+    if compression is None:
+        return np.asarray(np.load(fname, mmap_mode='c'))
+
+    with open(fname, 'rb') as fid:
+        return np.load(io.BytesIO(zlib.decompress(fid.read())))
+
+
+def _encode(value):
+    """
+    Converts a value into an object that can be written in JSON. Arrays
+    are stored with their type and mask and dates in ISO format. Values of
+    other types are skipped with a warning
+
+    Parameters
+    ----------
+    value : object
+        the value
+
+    Returns
+    -------
+    value_json : object
+        the value to write in JSON. _UNSUPPORTED if it cannot be stored
+
+    """
+    if isinstance(value, dict):
+        items = [
+            [_encode(key), _encode(val)] for key, val in value.items()]
+        return {'__dict__': [
+            item for item in items if _UNSUPPORTED not in item]}
+    if isinstance(value, (list, tuple)):
+        values = [_encode(val) for val in value]
+        return [val for val in values if val is not _UNSUPPORTED]
+    if isinstance(value, np.ndarray):
+        mask = None
+        if np.ma.is_masked(value):
+            mask = np.ma.getmaskarray(value).ravel().tolist()
+        data = np.ma.getdata(value)
+        if data.dtype.kind == 'S':
+            values = [val.decode('latin-1') for val in data.ravel()]
+        elif data.dtype.kind in ('M', 'm'):
+            values = data.view(np.int64).ravel().tolist()
+        elif data.dtype.kind in ('O', 'c'):
+            values = [_encode(val) for val in data.ravel().tolist()]
+            values = [
+                None if val is _UNSUPPORTED else val for val in values]
+        else:
+            values = data.ravel().tolist()
+        return {
+            '__ndarray__': values, 'dtype': data.dtype.str,
+            'shape': list(data.shape), 'mask': mask,
+            'masked': np.ma.isMaskedArray(value)}
+    if isinstance(value, (np.datetime64, np.timedelta64)):
+        return {'__scalar__': int(value.view(np.int64)),
+                'dtype': value.dtype.str}
+    if isinstance(value, np.generic):
+        return {'__scalar__': _encode(value.item()),
+                'dtype': value.dtype.str}
+    if isinstance(value, bytes):
+        return {'__bytes__': value.decode('latin-1')}
+    if isinstance(value, complex):
+        return {'__complex__': [value.real, value.imag]}
+    if isinstance(value, datetime.datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {'__date__': value.isoformat()}
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    warn('Unable to store metadata of type ' + type(value).__name__ +
+         ' in JSON. Value skipped')
+    return _UNSUPPORTED
+
+
+def _decode(value):
+    """
+    Converts a value read from JSON into the original object
+
+    Parameters
+    ----------
+    value : object
+        the value read
+
+    Returns
+    -------
+    value : object
+        the original value
+
+    """
+    if isinstance(value, list):
+        return [_decode(val) for val in value]
+    if not isinstance(value, dict):
+        return value
+    if '__dict__' in value:
+        return {
+            _decode(key): _decode(val) for key, val in value['__dict__']}
+    if '__ndarray__' in value:
+        dtype = np.dtype(value['dtype'])
+        values = value['__ndarray__']
+        if dtype.kind == 'S':
+            values = [val.encode('latin-1') for val in values]
+        elif dtype.kind in ('O', 'c'):
+            values = [_decode(val) for val in values]
+        if dtype.kind in ('M', 'm'):
+            data = np.array(values, dtype=np.int64).view(dtype)
+        else:
+            data = np.array(values, dtype=dtype)
+        data = data.reshape(value['shape'])
+        if not value['masked']:
+            return data
+        mask = np.ma.nomask
+        if value['mask'] is not None:
+            mask = np.array(value['mask'], dtype=bool).reshape(
+                value['shape'])
+        return np.ma.masked_array(data, mask=mask)
+    if '__scalar__' in value:
+        dtype = np.dtype(value['dtype'])
+        if dtype.kind in ('M', 'm'):
+            return np.array(value['__scalar__'], dtype=np.int64).view(
+                dtype)[()]
+        return dtype.type(_decode(value['__scalar__']))
+    if '__bytes__' in value:
+        return value['__bytes__'].encode('latin-1')
+    if '__complex__' in value:
+        return complex(*value['__complex__'])
+    if '__datetime__' in value:
+        return datetime.datetime.fromisoformat(value['__datetime__'])
+    if '__date__' in value:
+        return datetime.date.fromisoformat(value['__date__'])
+    return value
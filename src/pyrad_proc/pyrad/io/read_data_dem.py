@@ -11,6 +11,7 @@ Functions for reading data derived from Digital Elevation Models (DEM)
     read_idrisi_data
     read_idrisi_metadata
     _prepare_for_interpolation
+    _get_dem_index
 
 
 """
@@ -18,7 +19,6 @@ import pathlib
 from warnings import warn
 import numpy as np
 import pandas as pd
-from scipy.interpolate import RegularGridInterpolator
 
 # check existence of gdal
 try:
@@ -35,16 +35,19 @@ except ImportError:
 import pyart
 from pyart.config import get_metadata
 from .read_data_icon import _put_radar_in_swiss_coord
+from .grid_index import get_grid_index_cache, get_grid_index_key
 
 # from memory_profiler import profile
 
 # import time
 
 
-def dem2radar_data(radar, dem_data, slice_xy=True, field_name='visibility'):
+def dem2radar_data(radar, dem_data, slice_xy=True, field_name='visibility',
+                   index_cachedir=None):
     """
-    get the DEM value corresponding to each radar gate using nearest
-    neighbour interpolation
+    get the DEM value corresponding to each radar gate using bilinear
+    interpolation. The interpolation weights are computed once for each
+    radar geometry and DEM grid and kept in the grid index cache
 
     Parameters
     ----------
@@ -58,6 +61,9 @@ def dem2radar_data(radar, dem_data, slice_xy=True, field_name='visibility'):
         dimensions of the radar field
     field_names : str
         names of DEM fields to convert
+    index_cachedir : str or None
+        directory where the interpolation weights are stored. If None they
+        are only kept in memory
 
     Returns
     -------
@@ -68,29 +74,38 @@ def dem2radar_data(radar, dem_data, slice_xy=True, field_name='visibility'):
     # debugging
     # start_time = time.time()
 
-    x_radar, y_radar, _ = _put_radar_in_swiss_coord(radar)
-
-    (x_dem, y_dem, ind_xmin, ind_ymin, ind_xmax, ind_ymax) = (
-        _prepare_for_interpolation(
-            x_radar, y_radar, dem_data, slice_xy=slice_xy))
-
     if field_name not in dem_data:
         warn('DEM field ' + field_name + ' data not available')
         return None
 
+    dem_index = _get_dem_index(
+        radar, dem_data, slice_xy=slice_xy, index_cachedir=index_cachedir)
+    ind_xmin, ind_xmax, ind_ymin, ind_ymax = dem_index['bounds']
+
     values = dem_data[field_name]['data'][
         ind_xmin:ind_xmax + 1, ind_ymin:ind_ymax + 1]
 
-    # Note RegularGridInterpolator is 10x faster than NDNearestInterpolator
-    # and has the advantage of not extrapolating outside of grid domain
+    # Note: linear interpolation that does not extrapolate outside of grid
+    # domain. Unlike RegularGridInterpolator the grid points with zero
+    # weight are ignored so that a gate on a grid node or line next to a
+    # masked DEM value gets the value of the node or line
 
     # replace masked values with nans
     values = np.ma.filled(values, np.nan)
-    interp_func = RegularGridInterpolator(
-        (x_dem, y_dem), values, bounds_error=False)
 
     # interpolate
-    data_interp = interp_func((x_radar, y_radar))
+    ind_x = dem_index['ind_x']
+    ind_y = dem_index['ind_y']
+    weight_x = dem_index['weight_x']
+    weight_y = dem_index['weight_y']
+    data_interp = 0.
+    for ind_x_aux, ind_y_aux, weight in (
+            (ind_x, ind_y, (1. - weight_x) * (1. - weight_y)),
+            (ind_x, ind_y + 1, (1. - weight_x) * weight_y),
+            (ind_x + 1, ind_y, weight_x * (1. - weight_y)),
+            (ind_x + 1, ind_y + 1, weight_x * weight_y)):
+        data_interp = data_interp + np.where(
+            weight == 0., 0., values[ind_x_aux, ind_y_aux] * weight)
 
     del values
     # restore mask
@@ -551,6 +566,93 @@ def _prepare_for_interpolation(x_radar, y_radar, dem_coord, slice_xy=True):
     return (x_dem, y_dem, ind_xmin, ind_ymin, ind_xmax, ind_ymax)
 
 
+def _get_dem_index(radar, dem_coord, slice_xy=True, index_cachedir=None):
+    """
+    Gets the bilinear interpolation weights of each radar gate in the DEM
+    grid. The weights are taken from the grid index cache if they have
+    already been computed for the same radar geometry and DEM grid
+
+    Parameters
+    ----------
+    radar : Radar
+        the radar object containing the information on the position of the
+        radar gates
+    dem_coord : dict
+        dictionary containing the DEM coordinates
+    slice_xy : boolean
+        if true the horizontal plane of the DEM field is cut to the
+        dimensions of the radar field
+    index_cachedir : str or None
+        directory where the weights are stored. If None they are only kept
+        in memory
+
+    Returns
+    -------
+    dem_index : dict
+        dictionary containing the index of the lower grid point along x and y
+        of each gate within the DEM area used ('ind_x', 'ind_y'), the weight
+        of the upper grid point ('weight_x', 'weight_y', NaN outside of the
+        grid) and the limits of the area used ('bounds': ind_xmin, ind_xmax,
+        ind_ymin, ind_ymax)
+
+    """
+    cache = get_grid_index_cache(index_cachedir)
+    key = get_grid_index_key(
+        'dem', radar, dem_coord['x']['data'], dem_coord['y']['data'],
+        slice_xy)
+    dem_index = cache.get(key)
+    if dem_index is not None:
+        return dem_index
+
+    x_radar, y_radar, _ = _put_radar_in_swiss_coord(radar)
+
+    (x_dem, y_dem, ind_xmin, ind_ymin, ind_xmax, ind_ymax) = (
+        _prepare_for_interpolation(
+            x_radar, y_radar, dem_coord, slice_xy=slice_xy))
+
+    ind_x, weight_x = _get_linear_weights(x_dem, x_radar)
+    ind_y, weight_y = _get_linear_weights(y_dem, y_radar)
+
+    dem_index = {
+        'ind_x': ind_x,
+        'ind_y': ind_y,
+        'weight_x': weight_x,
+        'weight_y': weight_y,
+        'bounds': np.array(
+            [ind_xmin, ind_xmax, ind_ymin, ind_ymax], dtype=int)}
+    cache.put(key, dem_index)
+
+    return dem_index
+
+
+def _get_linear_weights(grid, points):
+    """
+    Gets the linear interpolation weights of points in a regular grid
+
+    Parameters
+    ----------
+    grid : 1D array
+        the grid coordinates in ascending order
+    points : array
+        the coordinates of the points
+
+    Returns
+    -------
+    ind : array of ints
+        index of the grid point below each point
+    weight : array of floats
+        weight of the grid point above each point. NaN if the point is out
+        of the grid
+
+    """
+    ind = np.searchsorted(grid, points) - 1
+    ind = np.clip(ind, 0, grid.size - 2)
+    weight = (points - grid[ind]) / (grid[ind + 1] - grid[ind])
+    weight[(points < grid[0]) | (points > grid[-1])] = np.nan
+
+    return ind.astype(np.min_scalar_type(grid.size)), weight
+
+
 def _proj4_str_to_dict(proj4str):
     # COnverts proj4 string to dict as can be used by part
     return dict(item.split("=") for item in proj4str.strip(' ').split("+")
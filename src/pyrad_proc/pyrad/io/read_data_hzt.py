@@ -12,13 +12,13 @@ Functions for reading HZT data
     get_iso0_field
     read_hzt_data
     _prepare_for_interpolation
+    _get_hzt_index
 
 """
 from warnings import warn
 import datetime
 import platform
 import numpy as np
-from scipy.interpolate import NearestNDInterpolator
 from scipy.spatial import cKDTree
 
 import pyart
@@ -35,13 +35,15 @@ except BaseException:
     _METRANETLIB_AVAILABLE = False
 
 from ..io.read_data_icon import _put_radar_in_swiss_coord
+from ..io.grid_index import get_grid_index_cache, get_grid_index_key
 
 
 def hzt2radar_data(radar, hzt_coord, hzt_data, slice_xy=True,
-                   field_name='height_over_iso0'):
+                   field_name='height_over_iso0', index_cachedir=None):
     """
     get the HZT value corresponding to each radar gate using nearest
-    neighbour interpolation
+    neighbour interpolation. The nearest neighbours are computed once for
+    each radar geometry and HZT grid and kept in the grid index cache
 
     Parameters
     ----------
@@ -57,6 +59,9 @@ def hzt2radar_data(radar, hzt_coord, hzt_data, slice_xy=True,
         dimensions of the radar field
     field_name : str
         name of HZT fields to convert (default height_over_iso0)
+    index_cachedir : str or None
+        directory where the nearest neighbours are stored. If None they are
+        only kept in memory
 
     Returns
     -------
@@ -64,19 +69,16 @@ def hzt2radar_data(radar, hzt_coord, hzt_data, slice_xy=True,
         list of dictionary with the HZT fields and metadata
 
     """
-    x_radar, y_radar, z_radar = _put_radar_in_swiss_coord(radar)
+    hzt_index = _get_hzt_index(
+        radar, hzt_coord, slice_xy=slice_xy, index_cachedir=index_cachedir)
+    ind_ymin, ind_ymax, ind_xmin, ind_xmax = hzt_index['bounds']
 
-    x_hzt, y_hzt, ind_xmin, ind_ymin, ind_xmax, ind_ymax = (
-        _prepare_for_interpolation(
-            x_radar, y_radar, hzt_coord, slice_xy=slice_xy))
+    values = np.asarray(hzt_data['HZT']['data'][
+        ind_ymin:ind_ymax + 1, ind_xmin:ind_xmax + 1]).reshape(-1)
 
-    values = hzt_data['HZT']['data'][
-        ind_ymin:ind_ymax + 1, ind_xmin:ind_xmax + 1].flatten()
-    # find interpolation function
-    interp_func = NearestNDInterpolator((y_hzt, x_hzt), values)
-
-    # interpolate
-    data_interp = interp_func((y_radar, x_radar))
+    # nearest neighbour
+    data_interp = values[hzt_index['ind']].reshape(radar.nrays, radar.ngates)
+    z_radar = radar.gate_altitude['data']
 
     # put field
     field_dict = get_metadata(field_name)
@@ -85,7 +87,8 @@ def hzt2radar_data(radar, hzt_coord, hzt_data, slice_xy=True,
     return field_dict
 
 
-def hzt2radar_coord(radar, hzt_coord, slice_xy=True, field_name=None):
+def hzt2radar_coord(radar, hzt_coord, slice_xy=True, field_name=None,
+                    index_cachedir=None):
     """
     Given the radar coordinates find the nearest HZT pixel
 
@@ -101,6 +104,9 @@ def hzt2radar_coord(radar, hzt_coord, slice_xy=True, field_name=None):
         dimensions of the radar field
     field_name : str
         name of the field
+    index_cachedir : str or None
+        directory where the nearest neighbours are stored. If None they are
+        only kept in memory
 
     Returns
     -------
@@ -112,15 +118,10 @@ def hzt2radar_coord(radar, hzt_coord, slice_xy=True, field_name=None):
     if field_name is None:
         field_name = get_field_name('hzt_index')
 
-    x_radar, y_radar, _ = _put_radar_in_swiss_coord(radar)
-
-    x_hzt, y_hzt, ind_xmin, ind_ymin, ind_xmax, _ = (
-        _prepare_for_interpolation(
-            x_radar, y_radar, hzt_coord, slice_xy=slice_xy))
-
-    tree = cKDTree(np.transpose((y_hzt, x_hzt)))
-    _, ind_vec = tree.query(
-        np.transpose((y_radar.flatten(), x_radar.flatten())), k=1)
+    hzt_index = _get_hzt_index(
+        radar, hzt_coord, slice_xy=slice_xy, index_cachedir=index_cachedir)
+    ind_ymin, _, ind_xmin, ind_xmax = hzt_index['bounds']
+    ind_vec = hzt_index['ind']
 
     # put the index in the original icon coordinates
     nx_hzt = len(hzt_coord['x']['data'])
@@ -323,3 +324,58 @@ def _prepare_for_interpolation(x_radar, y_radar, hzt_coord, slice_xy=True):
         np.broadcast_to(y_hzt.reshape(ny, 1), (ny, nx))).flatten()
 
     return x_hzt, y_hzt, ind_xmin, ind_ymin, ind_xmax, ind_ymax
+
+
+def _get_hzt_index(radar, hzt_coord, slice_xy=True, index_cachedir=None):
+    """
+    Gets the nearest HZT pixel of each radar gate. The index is taken from
+    the grid index cache if it has already been computed for the same radar
+    geometry and HZT grid
+
+    Parameters
+    ----------
+    radar : Radar
+        the radar object containing the information on the position of the
+        radar gates
+    hzt_coord : dict
+        dictionary containing the HZT coordinates
+    slice_xy : boolean
+        if true the horizontal plane of the HZT field is cut to the
+        dimensions of the radar field
+    index_cachedir : str or None
+        directory where the index is stored. If None it is only kept in
+        memory
+
+    Returns
+    -------
+    hzt_index : dict
+        dictionary containing the flat index of the nearest pixel within the
+        HZT area used ('ind') and the limits of the area used ('bounds':
+        ind_ymin, ind_ymax, ind_xmin, ind_xmax)
+
+    """
+    cache = get_grid_index_cache(index_cachedir)
+    key = get_grid_index_key(
+        'hzt', radar, hzt_coord['x']['data'], hzt_coord['y']['data'],
+        slice_xy)
+    hzt_index = cache.get(key)
+    if hzt_index is not None:
+        return hzt_index
+
+    x_radar, y_radar, _ = _put_radar_in_swiss_coord(radar)
+
+    x_hzt, y_hzt, ind_xmin, ind_ymin, ind_xmax, ind_ymax = (
+        _prepare_for_interpolation(
+            x_radar, y_radar, hzt_coord, slice_xy=slice_xy))
+
+    tree = cKDTree(np.transpose((y_hzt, x_hzt)))
+    _, ind_vec = tree.query(
+        np.transpose((y_radar.flatten(), x_radar.flatten())), k=1)
+
+    hzt_index = {
+        'ind': ind_vec.astype(np.min_scalar_type(x_hzt.size)),
+        'bounds': np.array(
+            [ind_ymin, ind_ymax, ind_xmin, ind_xmax], dtype=int)}
+    cache.put(key, hzt_index)
+
+    return hzt_index
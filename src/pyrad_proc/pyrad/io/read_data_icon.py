@@ -9,38 +9,53 @@ Functions for reading icon data
 
     icon2radar_data
     icon2radar_coord
+    get_icon_bounds
     get_icon_fields
     read_icon_data
     read_icon_coord
+    _get_icon_dataset
     _ncvar_to_dict
     _prepare_for_interpolation
+    _get_icon_index
     _put_radar_in_swiss_coord
 
 
 """
 
+import os
+import threading
+from collections import OrderedDict
 from warnings import warn
 import numpy as np
-from scipy.interpolate import NearestNDInterpolator
 from scipy.spatial import cKDTree
 import netCDF4
+from netCDF4 import num2date
 
 import pyart
 from pyart.config import get_metadata, get_field_name
 
 from ..io.io_aux import get_fieldname_icon
+from ..io.grid_index import get_grid_index_cache, get_grid_index_key
 
 # from memory_profiler import profile
 
 # import time
 
+# icon files kept open. Consecutive volumes usually use the same model run
+_ICON_DATASETS = OrderedDict()
+_ICON_DATASETS_LOCK = threading.RLock()
+_ICON_DATASETS_PID = None
+_MAX_ICON_DATASETS = 4
+
 
 def icon2radar_data(radar, icon_coord, icon_data, time_index=0,
                      slice_xy=True, slice_z=False,
-                     field_names=['temperature'], dtype=np.float32):
+                     field_names=['temperature'], dtype=np.float32,
+                     index_cachedir=None):
     """
     get the icon value corresponding to each radar gate using nearest
-    neighbour interpolation
+    neighbour interpolation. The nearest neighbours are computed once for
+    each radar geometry and icon grid and kept in the grid index cache
 
     Parameters
     ----------
@@ -63,6 +78,9 @@ def icon2radar_data(radar, icon_coord, icon_data, time_index=0,
         names of icon fields to convert (default temperature)
     dtype : numpy data type object
         the data type of the output data
+    index_cachedir : str or None
+        directory where the nearest neighbours are stored. If None they are
+        only kept in memory
 
     Returns
     -------
@@ -73,34 +91,45 @@ def icon2radar_data(radar, icon_coord, icon_data, time_index=0,
     # debugging
     # start_time = time.time()
 
-    x_radar, y_radar, z_radar = _put_radar_in_swiss_coord(radar)
-
-    (x_icon, y_icon, z_icon, ind_xmin, ind_ymin, ind_zmin, ind_xmax,
-     ind_ymax, ind_zmax) = _prepare_for_interpolation(
-         x_radar, y_radar, z_radar, icon_coord, slice_xy=slice_xy,
-         slice_z=slice_z)
+    icon_index = _get_icon_index(
+        radar, icon_coord, slice_xy=slice_xy, slice_z=slice_z,
+        index_cachedir=index_cachedir)
+    ind_zmin, ind_zmax, ind_ymin, ind_ymax, ind_xmin, ind_xmax = (
+        icon_index['bounds'])
+
+    # the icon data may contain only a time step and a part of the volume
+    if 'time_index' in icon_data:
+        if time_index != icon_data['time_index']:
+            warn('icon time step ' + str(time_index) + ' not read')
+            return None
+        time_index = 0
+    if 'bounds' in icon_data:
+        zmin, zmax, ymin, ymax, xmin, xmax = icon_data['bounds']
+        if (ind_zmin < zmin or ind_zmax > zmax or ind_ymin < ymin or
+                ind_ymax > ymax or ind_xmin < xmin or ind_xmax > xmax):
+            warn('icon data read does not cover the radar volume')
+            return None
+        ind_zmin -= zmin
+        ind_zmax -= zmin
+        ind_ymin -= ymin
+        ind_ymax -= ymin
+        ind_xmin -= xmin
+        ind_xmax -= xmin
 
     icon_fields = []
     for field in field_names:
         if field not in icon_data:
             warn('icon field ' + field + ' data not available')
         else:
-            values = icon_data[field]['data'][
+            values = np.asarray(icon_data[field]['data'][
                 time_index, ind_zmin:ind_zmax + 1, ind_ymin:ind_ymax + 1,
-                ind_xmin:ind_xmax + 1].flatten()
-            # find interpolation function
-            tree_options = {
-                'compact_nodes': False,
-                'balanced_tree': False
-            }
-            interp_func = NearestNDInterpolator(
-                (z_icon, y_icon, x_icon), values,
-                tree_options=tree_options)
+                ind_xmin:ind_xmax + 1]).reshape(-1)
 
-            del values
+            # nearest neighbour
+            data_interp = values[icon_index['ind']].reshape(
+                radar.nrays, radar.ngates)
 
-            # interpolate
-            data_interp = interp_func((z_radar, y_radar, x_radar))
+            del values
 
             # put field
             field_dict = get_metadata(field)
@@ -117,7 +146,7 @@ def icon2radar_data(radar, icon_coord, icon_data, time_index=0,
 
 
 def icon2radar_coord(radar, icon_coord, slice_xy=True, slice_z=False,
-                      field_name=None):
+                      field_name=None, index_cachedir=None):
     """
     Given the radar coordinates find the nearest icon model pixel
 
@@ -136,6 +165,9 @@ def icon2radar_coord(radar, icon_coord, slice_xy=True, slice_z=False,
         of the radar field
     field_name : str
         name of the field
+    index_cachedir : str or None
+        directory where the nearest neighbours are stored. If None they are
+        only kept in memory
 
     Returns
     -------
@@ -150,21 +182,12 @@ def icon2radar_coord(radar, icon_coord, slice_xy=True, slice_z=False,
     if field_name is None:
         field_name = get_field_name('icon_index')
 
-    x_radar, y_radar, z_radar = _put_radar_in_swiss_coord(radar)
-
-    (x_icon, y_icon, z_icon, ind_xmin, ind_ymin, ind_zmin, ind_xmax,
-     ind_ymax, _) = _prepare_for_interpolation(
-         x_radar, y_radar, z_radar, icon_coord, slice_xy=slice_xy,
-         slice_z=slice_z)
-
-    print('Generating tree')
-    # default scipy compact_nodes and balanced_tree = True
-    tree = cKDTree(
-        np.transpose((z_icon, y_icon, x_icon)), compact_nodes=False,
-        balanced_tree=False)
-    print('Tree generated')
-    _, ind_vec = tree.query(np.transpose(
-        (z_radar.flatten(), y_radar.flatten(), x_radar.flatten())), k=1)
+    icon_index = _get_icon_index(
+        radar, icon_coord, slice_xy=slice_xy, slice_z=slice_z,
+        index_cachedir=index_cachedir)
+    ind_zmin, _, ind_ymin, ind_ymax, ind_xmin, ind_xmax = (
+        icon_index['bounds'])
+    ind_vec = icon_index['ind']
 
     # put the index in the original icon coordinates
     nx_icon = len(icon_coord['x']['data'])
@@ -194,6 +217,41 @@ def icon2radar_coord(radar, icon_coord, slice_xy=True, slice_z=False,
     return icon_ind_field
 
 
+def get_icon_bounds(radar, icon_coord, slice_xy=True, slice_z=False,
+                    index_cachedir=None):
+    """
+    Gets the limits of the part of the icon volume covered by the radar.
+    Used to read only this part of the icon data
+
+    Parameters
+    ----------
+    radar : Radar
+        the radar object containing the information on the position of the
+        radar gates
+    icon_coord : dict
+        dictionary containing the icon coordinates
+    slice_xy : boolean
+        if true the horizontal plane of the icon field is cut to the
+        dimensions of the radar field
+    slice_z : boolean
+        if true the vertical plane of the icon field is cut to the dimensions
+        of the radar field
+    index_cachedir : str or None
+        directory where the nearest neighbours are stored. If None they are
+        only kept in memory
+
+    Returns
+    -------
+    bounds : array of ints
+        ind_zmin, ind_zmax, ind_ymin, ind_ymax, ind_xmin, ind_xmax
+
+    """
+    icon_index = _get_icon_index(
+        radar, icon_coord, slice_xy=slice_xy, slice_z=slice_z,
+        index_cachedir=index_cachedir)
+    return icon_index['bounds']
+
+
 def get_icon_fields(icon_data, icon_ind, time_index=0,
                      field_names=['temperature']):
     """
@@ -239,9 +297,12 @@ def get_icon_fields(icon_data, icon_ind, time_index=0,
 
 
 # @profile
-def read_icon_data(fname, field_names=['temperature'], celsius=True):
+def read_icon_data(fname, field_names=['temperature'], celsius=True,
+                   timeinfo=None, bounds=None):
     """
-    Reads icon data from a netcdf file
+    Reads icon data from a netcdf file. Only the time step and the part of
+    the domain required can be read. The file is kept open so that the
+    other time steps can be read without opening it again
 
     Parameters
     ----------
@@ -252,59 +313,86 @@ def read_icon_data(fname, field_names=['temperature'], celsius=True):
     celsius : Boolean
         if True and variable temperature converts data from Kelvin
         to Centigrade
+    timeinfo : datetime or None
+        if set only the time step closest to it is read
+    bounds : array of ints or None
+        if set only this part of the icon volume is read
+        (ind_zmin, ind_zmax, ind_ymin, ind_ymax, ind_xmin, ind_xmax, see
+        get_icon_bounds)
 
     Returns
     -------
     icon_data : dictionary
-        dictionary with the data and metadata
+        dictionary with the data and metadata. If only a part of the data
+        has been read the index of the time step read and the bounds are
+        stored in keys 'time_index' and 'bounds'
 
     """
-    # read the data
-    ncobj = netCDF4.Dataset(fname)
-    ncvars = ncobj.variables
-
-    # 4.1 Global attribute -> move to metadata dictionary
-    metadata = dict([(k, getattr(ncobj, k)) for k in ncobj.ncattrs()])
+    with _ICON_DATASETS_LOCK:
+        try:
+            ncobj = _get_icon_dataset(fname)
+        except EnvironmentError:
+            warn('Unable to read file ' + fname)
+            return None
+        ncvars = ncobj.variables
 
-    # read data for requested fields
-    icon_data = dict()
-    found = False
-    for field in field_names:
-        icon_name = get_fieldname_icon(field)
-        if icon_name not in ncvars:
-            warn(field + ' data not present in icon file ' + fname)
-        else:
-            var_data = _ncvar_to_dict(ncvars[icon_name], dtype='float16')
-
-            # remove dimension ensemble member of icon-1e
-            if var_data['data'].ndim == 5:
-                var_data['data'] = np.squeeze(var_data['data'], axis=1)
-
-            if field == 'temperature' and celsius:
-                var_data['data'] -= 273.15
-                var_data['units'] = 'degrees Celsius'
-            if field == 'vertical_wind_shear':
-                var_data['data'] *= 1000.
-                var_data['units'] = 'meters_per_second_per_km'
-            icon_data.update({field: var_data})
-            found = True
-            del var_data
-    if not found:
-        warn('No field available in icon file ' + fname)
-        ncobj.close()
-        return None
+        # 4.1 Global attribute -> move to metadata dictionary
+        metadata = dict([(k, getattr(ncobj, k)) for k in ncobj.ncattrs()])
 
-    # 4.2 put variables in dictionary
-    x_1 = _ncvar_to_dict(ncvars['x_1'])
-    y_1 = _ncvar_to_dict(ncvars['y_1'])
-    lon_1 = _ncvar_to_dict(ncvars['lon_1'])
-    lat_1 = _ncvar_to_dict(ncvars['lat_1'])
-    z_1 = _ncvar_to_dict(ncvars['z_1'])
-    z_bnds_1 = _ncvar_to_dict(ncvars['z_bnds_1'])
-    time_data = _ncvar_to_dict(ncvars['time'])
+        time_data = _ncvar_to_dict(ncvars['time'])
+
+        # hyperslab to read
+        index = [slice(None)] * 4
+        if timeinfo is not None:
+            dticon = num2date(time_data['data'][:], time_data['units'])
+            time_index = int(np.argmin(abs(dticon - timeinfo)))
+            index[0] = slice(time_index, time_index + 1)
+        if bounds is not None:
+            index[1:] = [
+                slice(bounds[0], bounds[1] + 1),
+                slice(bounds[2], bounds[3] + 1),
+                slice(bounds[4], bounds[5] + 1)]
+
+        # read data for requested fields
+        icon_data = dict()
+        found = False
+        for field in field_names:
+            icon_name = get_fieldname_icon(field)
+            if icon_name not in ncvars:
+                warn(field + ' data not present in icon file ' + fname)
+            else:
+                # dimension ensemble member of icon-1e
+                var_index = index
+                if ncvars[icon_name].ndim == 5:
+                    var_index = index[:1] + [slice(None)] + index[1:]
+                var_data = _ncvar_to_dict(
+                    ncvars[icon_name], dtype='float16',
+                    index=tuple(var_index))
+
+                # remove dimension ensemble member of icon-1e
+                if var_data['data'].ndim == 5:
+                    var_data['data'] = np.squeeze(var_data['data'], axis=1)
+
+                if field == 'temperature' and celsius:
+                    var_data['data'] -= 273.15
+                    var_data['units'] = 'degrees Celsius'
+                if field == 'vertical_wind_shear':
+                    var_data['data'] *= 1000.
+                    var_data['units'] = 'meters_per_second_per_km'
+                icon_data.update({field: var_data})
+                found = True
+                del var_data
+        if not found:
+            warn('No field available in icon file ' + fname)
+            return None
 
-    # close object
-    ncobj.close()
+        # 4.2 put variables in dictionary
+        x_1 = _ncvar_to_dict(ncvars['x_1'])
+        y_1 = _ncvar_to_dict(ncvars['y_1'])
+        lon_1 = _ncvar_to_dict(ncvars['lon_1'])
+        lat_1 = _ncvar_to_dict(ncvars['lat_1'])
+        z_1 = _ncvar_to_dict(ncvars['z_1'])
+        z_bnds_1 = _ncvar_to_dict(ncvars['z_bnds_1'])
 
     icon_data.update({
         'metadata': metadata,
@@ -316,6 +404,10 @@ def read_icon_data(fname, field_names=['temperature'], celsius=True):
         'lon': lon_1,
         'lat': lat_1
     })
+    if timeinfo is not None:
+        icon_data['time_index'] = time_index
+    if bounds is not None:
+        icon_data['bounds'] = np.array(bounds, dtype=int)
 
     return icon_data
 
@@ -380,11 +472,59 @@ def read_icon_coord(fname, zmin=None):
         return None
 
 
-def _ncvar_to_dict(ncvar, dtype=np.float32):
-    """ Convert a NetCDF Dataset variable to a dictionary. """
+def _get_icon_dataset(fname):
+    """
+    Gets the netcdf object of an icon file. The last files used are kept
+    open. A file is opened again if it has been modified. Must be called
+    with _ICON_DATASETS_LOCK held
+
+    Parameters
+    ----------
+    fname : str
+        name of the file
+
+    Returns
+    -------
+    ncobj : netCDF4.Dataset
+        the netcdf object
+
+    """
+    global _ICON_DATASETS_PID
+
+    # the files opened by the parent process cannot be used
+    if _ICON_DATASETS_PID != os.getpid():
+        _ICON_DATASETS.clear()
+        _ICON_DATASETS_PID = os.getpid()
+
+    fstat = os.stat(fname)
+    entry = _ICON_DATASETS.pop(fname, None)
+    if entry is not None:
+        ncobj, mtime, size = entry
+        if mtime == fstat.st_mtime_ns and size == fstat.st_size:
+            _ICON_DATASETS[fname] = entry
+            return ncobj
+        ncobj.close()
+
+    ncobj = netCDF4.Dataset(fname)
+    _ICON_DATASETS[fname] = (ncobj, fstat.st_mtime_ns, fstat.st_size)
+    while len(_ICON_DATASETS) > _MAX_ICON_DATASETS:
+        _, (ncobj_old, _, _) = _ICON_DATASETS.popitem(last=False)
+        ncobj_old.close()
+
+    return ncobj
+
+
+def _ncvar_to_dict(ncvar, dtype=np.float32, index=None):
+    """
+    Convert a NetCDF Dataset variable to a dictionary. If index is given
+    only this hyperslab of the variable is read
+    """
     # copy all attributes
     d = dict((k, getattr(ncvar, k)) for k in ncvar.ncattrs())
-    d.update({'data': ncvar[:]})
+    if index is None:
+        d.update({'data': ncvar[:]})
+    else:
+        d.update({'data': ncvar[index]})
     if '_FillValue' in d:
         d['data'] = np.ma.asarray(d['data'], dtype=dtype)
         d['data'] = np.ma.masked_values(d['data'], float(d['_FillValue']))
@@ -501,6 +641,70 @@ def _prepare_for_interpolation(x_radar, y_radar, z_radar, icon_coord,
             ind_zmin, ind_xmax, ind_ymax, ind_zmax)
 
 
+def _get_icon_index(radar, icon_coord, slice_xy=True, slice_z=False,
+                    index_cachedir=None):
+    """
+    Gets the nearest icon model pixel of each radar gate. The index is
+    taken from the grid index cache if it has already been computed for the
+    same radar geometry and icon grid
+
+    Parameters
+    ----------
+    radar : Radar
+        the radar object containing the information on the position of the
+        radar gates
+    icon_coord : dict
+        dictionary containing the icon coordinates
+    slice_xy, slice_z : boolean
+        if true the horizontal (vertical) plane of the icon field is cut to
+        the dimensions of the radar field
+    index_cachedir : str or None
+        directory where the index is stored. If None it is only kept in
+        memory
+
+    Returns
+    -------
+    icon_index : dict
+        dictionary containing the flat index of the nearest pixel within the
+        icon volume used ('ind') and the limits of the volume used
+        ('bounds': ind_zmin, ind_zmax, ind_ymin, ind_ymax, ind_xmin,
+        ind_xmax)
+
+    """
+    cache = get_grid_index_cache(index_cachedir)
+    key = get_grid_index_key(
+        'icon', radar, icon_coord['x']['data'], icon_coord['y']['data'],
+        icon_coord['hfl']['data'], slice_xy, slice_z)
+    icon_index = cache.get(key)
+    if icon_index is not None:
+        return icon_index
+
+    x_radar, y_radar, z_radar = _put_radar_in_swiss_coord(radar)
+
+    (x_icon, y_icon, z_icon, ind_xmin, ind_ymin, ind_zmin, ind_xmax,
+     ind_ymax, ind_zmax) = _prepare_for_interpolation(
+         x_radar, y_radar, z_radar, icon_coord, slice_xy=slice_xy,
+         slice_z=slice_z)
+
+    print('Generating tree')
+    # default scipy compact_nodes and balanced_tree = True
+    tree = cKDTree(
+        np.transpose((z_icon, y_icon, x_icon)), compact_nodes=False,
+        balanced_tree=False)
+    print('Tree generated')
+    _, ind_vec = tree.query(np.transpose(
+        (z_radar.flatten(), y_radar.flatten(), x_radar.flatten())), k=1)
+
+    icon_index = {
+        'ind': ind_vec.astype(np.min_scalar_type(z_icon.size)),
+        'bounds': np.array(
+            [ind_zmin, ind_zmax, ind_ymin, ind_ymax, ind_xmin, ind_xmax],
+            dtype=int)}
+    cache.put(key, icon_index)
+
+    return icon_index
+
+
 def _put_radar_in_swiss_coord(radar):
     """
     puts the Cartesian grid of the radar coordinates in Swiss coordinates
@@ -16,6 +16,7 @@ Functions for reading auxiliary data
     read_vpr_theo_parameters
     read_rhi_profile
     read_last_state
+    read_checkpoint
     read_status
     read_mch_xml_vad
     read_rad4alp_icon
@@ -37,12 +38,19 @@ Functions for reading auxiliary data
     read_intercomp_scores_ts_old_v0
     read_selfconsistency
     read_antenna_pattern
+    _get_monitoring_ts_arrays
+    _get_intercomp_scores_ts_arrays
+    _read_ts_incremental
 
 """
 
 import os
+import io
 import glob
+import threading
+from collections import OrderedDict
 import datetime
+import pickle
 import csv
 import xml.etree.ElementTree as et
 from warnings import warn
@@ -61,6 +69,18 @@ import pyart
 from pyart.config import get_fillvalue, get_metadata
 
 from .io_aux import get_fieldname_pyart, _get_datetime
+from .io_aux import _read_csv_columns, _to_datetime_array
+from .timeseries_store import is_ts_store, read_ts_store
+
+# samples of the time series read incrementally and position in the file up
+# to which they have been read
+_TS_TAIL_CACHE = OrderedDict()
+_TS_TAIL_CACHE_LOCK = threading.Lock()
+_MAX_TS_TAIL_CACHE = 64
+
+# number of bytes at the start of a csv file and before the last position
+# read used to check that the file has not been rewritten
+_TS_SIGNATURE_BYTES = 4096
 
 
 def read_centroids_npz(fname):
@@ -466,6 +486,32 @@ def read_last_state(fname):
         return None
 
 
+def read_checkpoint(fname):
+    """
+    Reads a file containing the checkpoint of the processing
+
+    Parameters
+    ----------
+    fname : str
+        name of the file to read
+
+    Returns
+    -------
+    checkpoint : dict
+        dictionary containing the state of the processing. None if the file
+        could not be read
+
+    """
+    try:
+        with open(fname, 'rb') as picklefile:
+            return pickle.load(picklefile)
+    except (EnvironmentError, pickle.UnpicklingError, EOFError,
+            AttributeError, ImportError) as ee:
+        warn(str(ee))
+        warn('Unable to read file ' + fname)
+        return None
+
+
 def read_status(voltime, cfg, ind_rad=0):
     """
     Reads rad4alp xml status file.
@@ -1080,6 +1126,14 @@ def read_timeseries(fname):
         containing the value. None otherwise
 
     """
+    if is_ts_store(fname):
+        data, _ = read_ts_store(fname, columns=['date', 'value'])
+        if data is None:
+            return None, None
+        # as in the csv files the dates are given to the second
+        date = [dtime.replace(microsecond=0) for dtime in data['date']]
+        return date, np.ma.masked_values(data['value'], get_fillvalue())
+
     try:
         with open(fname, 'r', newline='') as csvfile:
             # first count the lines
@@ -1219,7 +1273,7 @@ def read_ml_ts(fname):
         return None, None, None, None, None, None, None
 
 
-def read_monitoring_ts(fname, sort_by_date=False):
+def read_monitoring_ts(fname, sort_by_date=False, incremental=False):
     """
     Reads a monitoring time series contained in a csv file
 
@@ -1229,6 +1283,10 @@ def read_monitoring_ts(fname, sort_by_date=False):
         path of time series file
     sort_by_date : bool
         if True, the read data is sorted by date prior to exit
+    incremental : bool
+        if True, only the samples appended since the previous incremental
+        read of the file are parsed. The samples read before are kept in
+        memory
 
     Returns
     -------
@@ -1236,6 +1294,22 @@ def read_monitoring_ts(fname, sort_by_date=False):
         The read data. None otherwise
 
     """
+    if incremental:
+        date, data = _read_ts_incremental(fname, {
+            'date': str, 'NP': int, 'central_quantile': float,
+            'low_quantile': float, 'high_quantile': float}, '%Y%m%d%H%M%S')
+        if date is None:
+            return None, None, None, None, None
+        return _get_monitoring_ts_arrays(
+            date, data, sort_by_date=sort_by_date)
+
+    if is_ts_store(fname):
+        data, _ = read_ts_store(fname)
+        if data is None:
+            return None, None, None, None, None
+        return _get_monitoring_ts_arrays(
+            data['date'], data, sort_by_date=sort_by_date)
+
     try:
         with open(fname, 'r', newline='') as csvfile:
             if FCNTL_AVAIL:
@@ -1270,27 +1344,10 @@ def read_monitoring_ts(fname, sort_by_date=False):
                         else:
                             raise
 
-            # first count the lines
-            reader = csv.DictReader(
-                row for row in csvfile if not row.startswith('#'))
-            nrows = sum(1 for row in reader)
-            np_t = np.zeros(nrows, dtype=int)
-            central_quantile = np.ma.empty(nrows, dtype=float)
-            low_quantile = np.ma.empty(nrows, dtype=float)
-            high_quantile = np.ma.empty(nrows, dtype=float)
-            date = np.empty(nrows, dtype=datetime.datetime)
-
-            # now read the data
-            csvfile.seek(0)
-            reader = csv.DictReader(
-                row for row in csvfile if not row.startswith('#'))
-            for i, row in enumerate(reader):
-                date[i] = datetime.datetime.strptime(
-                    row['date'], '%Y%m%d%H%M%S')
-                np_t[i] = int(row['NP'])
-                central_quantile[i] = float(row['central_quantile'])
-                low_quantile[i] = float(row['low_quantile'])
-                high_quantile[i] = float(row['high_quantile'])
+            data = _read_csv_columns(csvfile, {
+                'date': str, 'NP': int, 'central_quantile': float,
+                'low_quantile': float, 'high_quantile': float})
+            date = _to_datetime_array(data['date'], '%Y%m%d%H%M%S')
 
             if FCNTL_AVAIL:
                 fcntl.flock(csvfile, fcntl.LOCK_UN)
@@ -1299,22 +1356,8 @@ def read_monitoring_ts(fname, sort_by_date=False):
 
             csvfile.close()
 
-            central_quantile = np.ma.masked_values(
-                central_quantile, get_fillvalue())
-            low_quantile = np.ma.masked_values(
-                low_quantile, get_fillvalue())
-            high_quantile = np.ma.masked_values(
-                high_quantile, get_fillvalue())
-
-            if sort_by_date:
-                ind = np.argsort(date)
-                date = date[ind]
-                np_t = np_t[ind]
-                central_quantile = central_quantile[ind]
-                low_quantile = low_quantile[ind]
-                high_quantile = high_quantile[ind]
-
-            return date, np_t, central_quantile, low_quantile, high_quantile
+            return _get_monitoring_ts_arrays(
+                date, data, sort_by_date=sort_by_date)
     except EnvironmentError as ee:
         warn(str(ee))
         warn('Unable to read file ' + fname)
@@ -1372,7 +1415,7 @@ def read_monitoring_ts_old(fname):
         return None, None, None, None, None
 
 
-def read_intercomp_scores_ts(fname, sort_by_date=False):
+def read_intercomp_scores_ts(fname, sort_by_date=False, incremental=False):
     """
     Reads a radar intercomparison scores csv file
 
@@ -1382,6 +1425,10 @@ def read_intercomp_scores_ts(fname, sort_by_date=False):
         path of time series file
     sort_by_date : bool
         if True, the read data is sorted by date prior to exit
+    incremental : bool
+        if True, only the samples appended since the previous incremental
+        read of the file are parsed. The samples read before are kept in
+        memory
 
     Returns
     -------
@@ -1391,6 +1438,29 @@ def read_intercomp_scores_ts(fname, sort_by_date=False):
         The read data. None otherwise
 
     """
+    if incremental:
+        date_vec, data = _read_ts_incremental(fname, {
+            'date': str, 'NP': int, 'mean_bias': float,
+            'median_bias': float, 'quant25_bias': float,
+            'quant75_bias': float, 'mode_bias': float, 'corr': float,
+            'slope_of_linear_regression': float,
+            'intercep_of_linear_regression': float,
+            'intercep_of_linear_regression_of_slope_1': float},
+            '%Y%m%d%H%M%S')
+        if date_vec is None:
+            return (None, None, None, None, None, None, None, None, None,
+                    None, None)
+        return _get_intercomp_scores_ts_arrays(
+            date_vec, data, sort_by_date=sort_by_date)
+
+    if is_ts_store(fname):
+        data, _ = read_ts_store(fname)
+        if data is None:
+            return (None, None, None, None, None, None, None, None, None,
+                    None, None)
+        return _get_intercomp_scores_ts_arrays(
+            data['date'], data, sort_by_date=sort_by_date)
+
     try:
         with open(fname, 'r', newline='') as csvfile:
             if FCNTL_AVAIL:
@@ -1425,81 +1495,20 @@ def read_intercomp_scores_ts(fname, sort_by_date=False):
                         else:
                             raise
 
-            # first count the lines
-            reader = csv.DictReader(
-                row for row in csvfile if not row.startswith('#'))
-            nrows = sum(1 for row in reader)
-
-            np_vec = np.zeros(nrows, dtype=int)
-            meanbias_vec = np.ma.empty(nrows, dtype=float)
-            medianbias_vec = np.ma.empty(nrows, dtype=float)
-            quant25bias_vec = np.ma.empty(nrows, dtype=float)
-            quant75bias_vec = np.ma.empty(nrows, dtype=float)
-            modebias_vec = np.ma.empty(nrows, dtype=float)
-            corr_vec = np.ma.empty(nrows, dtype=float)
-            slope_vec = np.ma.empty(nrows, dtype=float)
-            intercep_vec = np.ma.empty(nrows, dtype=float)
-            intercep_slope1_vec = np.ma.empty(nrows, dtype=float)
-            date_vec = np.empty(nrows, dtype=datetime.datetime)
-
-            # now read the data
-            csvfile.seek(0)
-            reader = csv.DictReader(
-                row for row in csvfile if not row.startswith('#'))
-            for i, row in enumerate(reader):
-                date_vec[i] = datetime.datetime.strptime(
-                    row['date'], '%Y%m%d%H%M%S')
-                np_vec[i] = int(row['NP'])
-                meanbias_vec[i] = float(row['mean_bias'])
-                medianbias_vec[i] = float(row['median_bias'])
-                quant25bias_vec[i] = float(row['quant25_bias'])
-                quant75bias_vec[i] = float(row['quant75_bias'])
-                modebias_vec[i] = float(row['mode_bias'])
-                corr_vec[i] = float(row['corr'])
-                slope_vec[i] = float(row['slope_of_linear_regression'])
-                intercep_vec[i] = float(row['intercep_of_linear_regression'])
-                intercep_slope1_vec[i] = float(
-                    row['intercep_of_linear_regression_of_slope_1'])
+            data = _read_csv_columns(csvfile, {
+                'date': str, 'NP': int, 'mean_bias': float,
+                'median_bias': float, 'quant25_bias': float,
+                'quant75_bias': float, 'mode_bias': float, 'corr': float,
+                'slope_of_linear_regression': float,
+                'intercep_of_linear_regression': float,
+                'intercep_of_linear_regression_of_slope_1': float})
+            date_vec = _to_datetime_array(data['date'], '%Y%m%d%H%M%S')
 
             fcntl.flock(csvfile, fcntl.LOCK_UN)
             csvfile.close()
 
-            meanbias_vec = np.ma.masked_values(
-                meanbias_vec, get_fillvalue())
-            medianbias_vec = np.ma.masked_values(
-                medianbias_vec, get_fillvalue())
-            quant25bias_vec = np.ma.masked_values(
-                quant25bias_vec, get_fillvalue())
-            quant75bias_vec = np.ma.masked_values(
-                quant75bias_vec, get_fillvalue())
-            modebias_vec = np.ma.masked_values(
-                modebias_vec, get_fillvalue())
-            corr_vec = np.ma.masked_values(
-                corr_vec, get_fillvalue())
-            slope_vec = np.ma.masked_values(
-                slope_vec, get_fillvalue())
-            intercep_vec = np.ma.masked_values(
-                intercep_vec, get_fillvalue())
-            intercep_slope1_vec = np.ma.masked_values(
-                intercep_slope1_vec, get_fillvalue())
-
-            if sort_by_date:
-                ind = np.argsort(date_vec)
-                date_vec = date_vec[ind]
-                np_vec = np_vec[ind]
-                meanbias_vec = meanbias_vec[ind]
-                medianbias_vec = medianbias_vec[ind]
-                quant25bias_vec = quant25bias_vec[ind]
-                quant75bias_vec = quant75bias_vec[ind]
-                modebias_vec = modebias_vec[ind]
-                corr_vec = corr_vec[ind]
-                slope_vec = slope_vec[ind]
-                intercep_vec = intercep_vec[ind]
-                intercep_slope1_vec = intercep_slope1_vec[ind]
-
-            return (date_vec, np_vec, meanbias_vec, medianbias_vec,
-                    quant25bias_vec, quant75bias_vec, modebias_vec, corr_vec,
-                    slope_vec, intercep_vec, intercep_slope1_vec)
+            return _get_intercomp_scores_ts_arrays(
+                date_vec, data, sort_by_date=sort_by_date)
     except EnvironmentError as ee:
         warn(str(ee))
         warn('Unable to read file ' + fname)
@@ -1795,3 +1804,218 @@ def read_antenna_pattern(fname, linear=False, twoway=False):
         pattern['attenuation'] = 10.**(pattern['attenuation'] / 10.)
 
     return pattern
+
+
+def _get_monitoring_ts_arrays(date, data, sort_by_date=False):
+    """
+    Gets the arrays of a monitoring time series from the columns read
+
+    Parameters
+    ----------
+    date : array of datetime objects
+        the dates
+    data : dict or DataFrame
+        the columns read
+    sort_by_date : bool
+        if True, the data is sorted by date
+
+    Returns
+    -------
+    date , np_t, central_quantile, low_quantile, high_quantile : tupple
+        The data
+
+    """
+    np_t = np.asarray(data['NP'])
+    central_quantile = np.ma.masked_values(
+        np.asarray(data['central_quantile']), get_fillvalue())
+    low_quantile = np.ma.masked_values(
+        np.asarray(data['low_quantile']), get_fillvalue())
+    high_quantile = np.ma.masked_values(
+        np.asarray(data['high_quantile']), get_fillvalue())
+
+    if sort_by_date:
+        ind = np.argsort(date)
+        date = date[ind]
+        np_t = np_t[ind]
+        central_quantile = central_quantile[ind]
+        low_quantile = low_quantile[ind]
+        high_quantile = high_quantile[ind]
+
+    return date, np_t, central_quantile, low_quantile, high_quantile
+
+
+def _get_intercomp_scores_ts_arrays(date_vec, data, sort_by_date=False):
+    """
+    Gets the arrays of a radar intercomparison scores time series from the
+    columns read
+
+    Parameters
+    ----------
+    date_vec : array of datetime objects
+        the dates
+    data : dict or DataFrame
+        the columns read
+    sort_by_date : bool
+        if True, the data is sorted by date
+
+    Returns
+    -------
+    date_vec, np_vec, meanbias_vec, medianbias_vec, quant25bias_vec,
+    quant75bias_vec, modebias_vec, corr_vec, slope_vec, intercep_vec,
+    intercep_slope1_vec : tupple
+        The data
+
+    """
+    np_vec = np.asarray(data['NP'])
+    (meanbias_vec, medianbias_vec, quant25bias_vec, quant75bias_vec,
+     modebias_vec, corr_vec, slope_vec, intercep_vec,
+     intercep_slope1_vec) = (
+         np.ma.masked_values(np.asarray(data[name]), get_fillvalue())
+         for name in (
+             'mean_bias', 'median_bias', 'quant25_bias', 'quant75_bias',
+             'mode_bias', 'corr', 'slope_of_linear_regression',
+             'intercep_of_linear_regression',
+             'intercep_of_linear_regression_of_slope_1'))
+
+    if sort_by_date:
+        ind = np.argsort(date_vec)
+        date_vec = date_vec[ind]
+        np_vec = np_vec[ind]
+        meanbias_vec = meanbias_vec[ind]
+        medianbias_vec = medianbias_vec[ind]
+        quant25bias_vec = quant25bias_vec[ind]
+        quant75bias_vec = quant75bias_vec[ind]
+        modebias_vec = modebias_vec[ind]
+        corr_vec = corr_vec[ind]
+        slope_vec = slope_vec[ind]
+        intercep_vec = intercep_vec[ind]
+        intercep_slope1_vec = intercep_slope1_vec[ind]
+
+    return (date_vec, np_vec, meanbias_vec, medianbias_vec,
+            quant25bias_vec, quant75bias_vec, modebias_vec, corr_vec,
+            slope_vec, intercep_vec, intercep_slope1_vec)
+
+
+def _read_ts_incremental(fname, dtypes, datetime_format):
+    """
+    Reads the columns of a time series file parsing only the samples
+    appended since the previous call. The whole file is parsed the first
+    time and whenever it has been rewritten
+
+    Parameters
+    ----------
+    fname : str
+        path of time series file. Either a csv file or a time series store
+    dtypes : dict
+        the columns to read and their data type. The dates are in column
+        'date'
+    datetime_format : str
+        the format of the dates in the csv file
+
+    Returns
+    -------
+    date : array of datetime objects
+        the dates. None if the file could not be read
+    data : dict of arrays
+        the other columns read. None if the file could not be read
+
+    """
+    key = (fname, tuple(dtypes.keys()))
+    with _TS_TAIL_CACHE_LOCK:
+        entry = _TS_TAIL_CACHE.pop(key, None)
+
+    try:
+        fstat = os.stat(fname)
+        if entry is not None and entry['inode'] != fstat.st_ino:
+            entry = None
+
+        if is_ts_store(fname):
+            # the store is replaced when rewritten
+            start = 0 if entry is None else entry['offset']
+            new_data, nrows = read_ts_store(
+                fname, columns=list(dtypes.keys()), start=start)
+            if new_data is None:
+                return None, None
+            if nrows < start:
+                entry = None
+                new_data, nrows = read_ts_store(
+                    fname, columns=list(dtypes.keys()))
+                if new_data is None:
+                    return None, None
+            new_date = new_data['date']
+            new_entry = {'inode': fstat.st_ino, 'offset': nrows}
+        else:
+            with open(fname, 'rb') as csvfile:
+                if FCNTL_AVAIL:
+                    try:
+                        fcntl.flock(csvfile, fcntl.LOCK_SH)
+                    except OSError:
+                        # No file locking is possible (NFS mount?)
+                        pass
+                head = csvfile.read(_TS_SIGNATURE_BYTES)
+                if entry is not None:
+                    # check that the part already read has not changed
+                    tail = b''
+                    if (fstat.st_size >= entry['offset'] and
+                            head.startswith(entry['head'])):
+                        csvfile.seek(entry['offset'] - len(entry['tail']))
+                        tail = csvfile.read(len(entry['tail']))
+                    if tail != entry['tail']:
+                        entry = None
+                offset = 0 if entry is None else entry['offset']
+                csvfile.seek(offset)
+                buf = csvfile.read()
+                if FCNTL_AVAIL:
+                    try:
+                        fcntl.flock(csvfile, fcntl.LOCK_UN)
+                    except OSError:
+                        pass
+
+            # only complete lines are parsed
+            buf = buf[:buf.rfind(b'\n') + 1]
+            if entry is not None and entry['header_line']:
+                header_line = entry['header_line']
+                new_data = _read_csv_columns(
+                    io.BytesIO(header_line + buf), dtypes)
+                tail = entry['tail'] + buf
+            else:
+                # the header has not been read yet
+                pos = 0
+                while buf.startswith(b'#', pos):
+                    pos = buf.index(b'\n', pos) + 1
+                header_line = buf[pos:buf.find(b'\n', pos) + 1]
+                new_data = _read_csv_columns(io.BytesIO(buf), dtypes)
+                tail = buf if entry is None else entry['tail'] + buf
+            new_date = _to_datetime_array(new_data['date'], datetime_format)
+
+            offset += len(buf)
+            new_entry = {
+                'inode': fstat.st_ino, 'offset': offset,
+                'head': head[:offset],
+                'tail': tail[-_TS_SIGNATURE_BYTES:],
+                'header_line': header_line}
+    except (OSError, ValueError) as ee:
+        warn(str(ee))
+        warn('Unable to read file ' + fname)
+        return None, None
+
+    new_data = {
+        name: np.asarray(new_data[name]) for name in dtypes
+        if name != 'date'}
+    if entry is None:
+        date = new_date
+        data = new_data
+    else:
+        date = np.concatenate((entry['date'], new_date))
+        data = {
+            name: np.concatenate((entry['data'][name], values))
+            for name, values in new_data.items()}
+
+    new_entry.update({'date': date, 'data': data})
+    with _TS_TAIL_CACHE_LOCK:
+        _TS_TAIL_CACHE[key] = new_entry
+        while len(_TS_TAIL_CACHE) > _MAX_TS_TAIL_CACHE:
+            _TS_TAIL_CACHE.popitem(last=False)
+
+    # the cached arrays must not be modified by the caller
+    return date.copy(), {name: values.copy() for name, values in data.items()}
@@ -45,12 +45,14 @@ Functions for reading radar data files
     get_data_rainbow
     get_data_rad4alp
     get_data_odim
+    get_odim_datasets
     get_data_odimgrid
     get_data_gamic
     add_field
     interpol_field
     crop_grid
     merge_grids
+    read_scans
 
 """
 
@@ -58,8 +60,12 @@ import glob
 import datetime
 import platform
 import os
+import threading
 from warnings import warn
 from copy import deepcopy
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 import numpy as np
 from scipy.interpolate import RegularGridInterpolator
@@ -70,6 +76,12 @@ try:
 except ImportError:
     _WRADLIB_AVAILABLE = False
 
+try:
+    import h5py
+    _H5PY_AVAILABLE = True
+except ImportError:
+    _H5PY_AVAILABLE = False
+
 import pyart
 
 # check existence of METRANET library
@@ -92,6 +104,23 @@ from .io_aux import find_icon_file, find_rad4alpicon_file
 from .io_aux import find_pyradicon_file, get_datatype_skyecho
 from .io_aux import get_rad4alp_prod_fname, get_rad4alp_grid_dir
 from .io_aux import get_rad4alp_dir
+from .io_aux import _glob_file_list, _get_file_datetimes
+
+from .npy_volume import read_npy_volume
+
+from ..util.radar_utils import join_radars
+
+# pools used to read the scans of a volume concurrently. Kept for the whole
+# processing
+_SCAN_EXECUTORS = dict()
+_SCAN_EXECUTORS_LOCK = threading.Lock()
+
+# the netCDF and HDF5 libraries are not thread safe. Their files are read
+# by one thread at a time
+_NETCDF_HDF5_LOCK = threading.Lock()
+
+# keys of the configuration used by get_data_odim
+_ODIM_CACHE_KEYS = ('DataTypeIDInFiles', 'MFScale', 'elmin', 'elmax')
 
 
 def get_data(voltime, datatypesdescr, cfg):
@@ -186,6 +215,13 @@ def get_data(voltime, datatypesdescr, cfg):
                 is stored and 'product' specifies the directroy where the
                 product is stored.
                 Example: ODIMPYRAD:dBZc,Att_ZPhi,SAVEVOL_dBZc
+            'NPYVOLPYRAD': pyrad intermediate format (a directory with one
+                numpy file per field) with the naming convention and
+                directory structure in which Pyrad saves the data. For such
+                datatypes 'dataset' specifies the directory where the dataset
+                is stored and 'product' specifies the directory where the
+                product is stored.
+                Example: NPYVOLPYRAD:dBZc,Att_ZPhi,SAVEVOL_dBZc
 
             'RAD4ALPGRID': METRANET format used for the operational MeteoSwiss
                 Cartesian products.
@@ -276,6 +312,9 @@ def get_data(voltime, datatypesdescr, cfg):
     datatype_odimpyrad = list()
     dataset_odimpyrad = list()
     product_odimpyrad = list()
+    datatype_npyvolpyrad = list()
+    dataset_npyvolpyrad = list()
+    product_npyvolpyrad = list()
     datatype_icon = list()
     datatype_rad4alpicon = list()
     datatype_cfradialicon = list()
@@ -362,6 +401,10 @@ def get_data(voltime, datatypesdescr, cfg):
             datatype_odimpyrad.append(datatype)
             dataset_odimpyrad.append(dataset)
             product_odimpyrad.append(product)
+        elif datagroup == 'NPYVOLPYRAD':
+            datatype_npyvolpyrad.append(datatype)
+            dataset_npyvolpyrad.append(dataset)
+            product_npyvolpyrad.append(product)
         elif datagroup == 'COSMO':
             datatype_icon.append(datatype)
         elif datagroup == 'RAD4ALPCOSMO':
@@ -442,6 +485,7 @@ def get_data(voltime, datatypesdescr, cfg):
     ndatatypes_cfradial2 = len(datatype_cfradial2)
     ndatatypes_cf1 = len(datatype_cf1)
     ndatatypes_odimpyrad = len(datatype_odimpyrad)
+    ndatatypes_npyvolpyrad = len(datatype_npyvolpyrad)
     ndatatypes_icon = len(datatype_icon)
     ndatatypes_rad4alpicon = len(datatype_rad4alpicon)
     ndatatypes_cfradialicon = len(datatype_cfradialicon)
@@ -643,6 +687,14 @@ def get_data(voltime, datatypesdescr, cfg):
             azi_min=azmin, azi_max=azmax, termination='.h*')
         radar = add_field(radar, radar_aux)
 
+    if ndatatypes_npyvolpyrad > 0:
+        radar_aux = merge_fields_pyrad(
+            cfg['loadbasepath'][ind_rad], cfg['loadname'][ind_rad], voltime,
+            datatype_npyvolpyrad, dataset_npyvolpyrad, product_npyvolpyrad,
+            rng_min=rmin, rng_max=rmax, ele_min=elmin, ele_max=elmax,
+            azi_min=azmin, azi_max=azmax, termination='.npyvol')
+        radar = add_field(radar, radar_aux)
+
     if ndatatypes_gecsx > 0:
         radar_aux = merge_fields_gecsx(
             cfg['gecsxbasepath'][ind_rad], cfg['gecsxname'][ind_rad],
@@ -1236,8 +1288,8 @@ def merge_scans_rainbow(basepath, scan_list, voltime, scan_period,
 
     """
 
-    radar = merge_fields_rainbow(
-        basepath, scan_list[0], voltime, datatype_list)
+    radar_list = [merge_fields_rainbow(
+        basepath, scan_list[0], voltime, datatype_list)]
 
     # merge scans into a single radar instance
     nscans = len(scan_list)
@@ -1262,13 +1314,7 @@ def merge_scans_rainbow(basepath, scan_list, voltime, scan_period,
             if radar_aux is None:
                 continue
 
-            if radar is None:
-                radar = radar_aux
-            else:
-                radar = pyart.util.radar_utils.join_radar(radar, radar_aux)
-
-    if radar is None:
-        return radar
+            radar_list.append(radar_aux)
 
     ind_rad = int(radarnr[5:8]) - 1
     rmin = None
@@ -1290,8 +1336,8 @@ def merge_scans_rainbow(basepath, scan_list, voltime, scan_period,
     if cfg['azmax'] is not None:
         azmax = cfg['azmax'][ind_rad]
 
-    return pyart.util.subset_radar(
-        radar, radar.fields.keys(), rng_min=rmin, rng_max=rmax, ele_min=elmin,
+    return join_radars(
+        radar_list, rng_min=rmin, rng_max=rmax, ele_min=elmin,
         ele_max=elmax, azi_min=azmin, azi_max=azmax)
 
 
@@ -1328,7 +1374,7 @@ def merge_scans_psr(basepath, basepath_psr, scan_list, voltime, scan_period,
     datadescriptor = radarnr + ':RAINBOW:dBZ'
     endtime = voltime + datetime.timedelta(minutes=scan_period)
 
-    radar = None
+    radar_list = []
     for scan in scan_list:
         filelist = get_file_list(datadescriptor, [voltime], [endtime],
                                  cfg, scan=scan)
@@ -1349,12 +1395,9 @@ def merge_scans_psr(basepath, basepath_psr, scan_list, voltime, scan_period,
         if radar_aux is None:
             continue
 
-        if radar is None:
-            radar = radar_aux
-        else:
-            radar = pyart.util.radar_utils.join_radar(radar, radar_aux)
+        radar_list.append(radar_aux)
 
-    return radar
+    return join_radars(radar_list)
 
 
 def merge_scans_psr_spectra(basepath, basepath_psr, scan_list, voltime,
@@ -1450,23 +1493,16 @@ def merge_scans_dem(basepath, scan_list, datatype_list, rng_min=None,
         radar object
 
     """
-    radar = None
+    radar_list = []
     for scan in scan_list:
         radar_aux = merge_fields_dem(basepath, scan, datatype_list)
         if radar_aux is None:
             continue
 
-        if radar is None:
-            radar = radar_aux
-            continue
-
-        radar = pyart.util.radar_utils.join_radar(radar, radar_aux)
-
-    if radar is None:
-        return radar
+        radar_list.append(radar_aux)
 
-    return pyart.util.subset_radar(
-        radar, radar.fields.keys(), rng_min=rng_min, rng_max=rng_max,
+    return join_radars(
+        radar_list, rng_min=rng_min, rng_max=rng_max,
         ele_min=ele_min, ele_max=ele_max, azi_min=azi_min, azi_max=azi_max)
 
 
@@ -1507,7 +1543,7 @@ def merge_scans_rad4alp(basepath, scan_list, radar_name, radar_res, voltime,
 
     timeinfo = voltime.strftime('%H%M')
 
-    radar = None
+    args_list = []
     for scan in scan_list:
         datapath, basename = get_rad4alp_dir(
             basepath, voltime, radar_name=radar_name, radar_res=radar_res,
@@ -1529,18 +1565,17 @@ def merge_scans_rad4alp(basepath, scan_list, radar_name, radar_res, voltime,
                 '*.' +
                 scan)
         else:
-            radar_aux = get_data_rad4alp(
-                filename[0], datatype_list, scan, cfg, ind_rad=ind_rad)
-
-            if radar_aux is None:
-                continue
-
-            if radar is None:
-                radar = radar_aux
-            else:
-                radar = pyart.util.radar_utils.join_radar(radar, radar_aux)
-    if radar is None:
-        return radar
+            args_list.append((filename[0], datatype_list, scan, cfg))
+
+    # the python METRANET reader holds the GIL. Its files are decoded in
+    # separate processes
+    use_processes = (
+        cfg['path_convention'][ind_rad] == 'LTE'
+        or cfg['metranet_read_lib'] == 'python')
+    radar_list = read_scans(
+        get_data_rad4alp, args_list, cfg, use_processes=use_processes,
+        cache_keys=('path_convention', 'metranet_read_lib'),
+        ind_rad=ind_rad)
 
     rmin = None
     rmax = None
@@ -1561,8 +1596,8 @@ def merge_scans_rad4alp(basepath, scan_list, radar_name, radar_res, voltime,
     if cfg['azmax'] is not None:
         azmax = cfg['azmax'][ind_rad]
 
-    return pyart.util.subset_radar(
-        radar, radar.fields.keys(), rng_min=rmin, rng_max=rmax, ele_min=elmin,
+    return join_radars(
+        radar_list, rng_min=rmin, rng_max=rmax, ele_min=elmin,
         ele_max=elmax, azi_min=azmin, azi_max=azmax)
 
 
@@ -1613,25 +1648,25 @@ def merge_scans_odim(basepath, scan_list, radar_name, radar_res, voltime,
         dy = dayinfo[2:]
         subf = f'M{radar_res}{radar_name}{yy}hdf{dy}'
         datapath = basepath + subf + '/'
-        filename = glob.glob(
-            f'{datapath}{basename}{timeinfo}*{scan_list[0]}*')
+        filename = _glob_file_list(
+            f'{datapath}{basename}{timeinfo}*{scan_list[0]}*', cfg)
         if not filename:
             if basename != '':
                 basename = f'P{radar_res}{radar_name}{dayinfo}'
             subf = f'P{radar_res}{radar_name}{yy}hdf{dy}'
             datapath = f'{basepath}{subf}/'
-            filename = glob.glob(
-                f'{datapath}{basename}{timeinfo}*{scan_list[0]}*')
+            filename = _glob_file_list(
+                f'{datapath}{basename}{timeinfo}*{scan_list[0]}*', cfg)
     elif cfg['path_convention'][ind_rad] == 'MCH':
         datapath = f'{basepath}{dayinfo}/{basename}/'
-        filename = glob.glob(
-            f'{datapath}{basename}{timeinfo}*{scan_list[0]}*')
+        filename = _glob_file_list(
+            f'{datapath}{basename}{timeinfo}*{scan_list[0]}*', cfg)
         if not filename:
             if basename != '':
                 basename = f'P{radar_res}{radar_name}{dayinfo}'
             datapath = f'{basepath}{dayinfo}/{basename}/'
-            filename = glob.glob(
-                f'{datapath}{basename}{timeinfo}*{scan_list[0]}*')
+            filename = _glob_file_list(
+                f'{datapath}{basename}{timeinfo}*{scan_list[0]}*', cfg)
     elif cfg['path_convention'][ind_rad] == 'ODIM':
         basename = ''
         fpath_strf = (
@@ -1639,24 +1674,26 @@ def merge_scans_odim(basepath, scan_list, radar_name, radar_res, voltime,
                 dataset_list[0].find("D") + 2:dataset_list[0].find("F") - 2])
         fdate_strf = dataset_list[0][dataset_list[0].find("F") + 2:-1]
         datapath = f'{basepath}{voltime.strftime(fpath_strf)}/'
-        filenames = glob.glob(f'{datapath}*{scan_list[0]}*')
+        filenames = _glob_file_list(f'{datapath}*{scan_list[0]}*', cfg)
+        fdatetimes = _get_file_datetimes(
+            filenames, cfg,
+            partial(find_date_in_file_name, date_format=fdate_strf),
+            f'date_format:{fdate_strf}')
         filename = []
-        for filename_aux in filenames:
-            fdatetime = find_date_in_file_name(
-                filename_aux, date_format=fdate_strf)
+        for filename_aux, fdatetime in zip(filenames, fdatetimes):
             if fdatetime == voltime:
                 filename = [filename_aux]
                 break
     else:
         datapath = f'{basepath}M{radar_res}{radar_name}/'
-        filename = glob.glob(
-            f'{datapath}{basename}{timeinfo}*{scan_list[0]}*')
+        filename = _glob_file_list(
+            f'{datapath}{basename}{timeinfo}*{scan_list[0]}*', cfg)
         if not filename:
             if basename != '':
                 basename = f'P{radar_res}{radar_name}{dayinfo}'
             datapath = f'{basepath}P{radar_res}{radar_name}/'
-            filename = glob.glob(
-                f'{datapath}{basename}{timeinfo}*{scan_list[0]}*')
+            filename = _glob_file_list(
+                f'{datapath}{basename}{timeinfo}*{scan_list[0]}*', cfg)
     if not filename:
         warn(f'No file found in {datapath[0]}{basename}{timeinfo}*.h*')
     else:
@@ -1667,11 +1704,13 @@ def merge_scans_odim(basepath, scan_list, radar_name, radar_res, voltime,
         # merge the elevations into a single radar instance
         for scan in scan_list[1:]:
             if cfg['path_convention'][ind_rad] == 'ODIM':
-                filenames = glob.glob(f'{datapath}*{scan}*')
+                filenames = _glob_file_list(f'{datapath}*{scan}*', cfg)
+                fdatetimes = _get_file_datetimes(
+                    filenames, cfg,
+                    partial(find_date_in_file_name, date_format=fdate_strf),
+                    f'date_format:{fdate_strf}')
                 filename = []
-                for filename_aux in filenames:
-                    fdatetime = find_date_in_file_name(
-                        filename_aux, date_format=fdate_strf)
+                for filename_aux, fdatetime in zip(filenames, fdatetimes):
                     if cfg['MasterScanTimeTol'][ind_rad] == 0:
                         if fdatetime == voltime:
                             filename = [filename_aux]
@@ -1691,7 +1730,8 @@ def merge_scans_odim(basepath, scan_list, radar_name, radar_res, voltime,
                             print(os.path.basename(filename[0]))
                             break
             else:
-                filename = glob.glob(f'{datapath}{basename}{timeinfo}*{scan}*')
+                filename = _glob_file_list(
+                    f'{datapath}{basename}{timeinfo}*{scan}*', cfg)
             if not filename:
                 warn(f'No file found in {datapath}{basename}{timeinfo}*.'
                      f'{scan}')
@@ -1703,36 +1743,28 @@ def merge_scans_odim(basepath, scan_list, radar_name, radar_res, voltime,
         return radar
 
     if cfg['DataTypeIDInFilenames'] is None:
-        for fname, scan in zip(flist, scan_list_aux):
-            radar_aux = get_data_odim(
-                fname, datatype_list, scan, cfg, ind_rad=ind_rad)
-            if radar_aux is None:
-                continue
-            if radar is None:
-                radar = radar_aux
-                continue
-            radar = pyart.util.radar_utils.join_radar(radar, radar_aux)
+        radar_list = read_scans(
+            get_data_odim,
+            [(fname, datatype_list, scan, cfg)
+             for fname, scan in zip(flist, scan_list_aux)],
+            cfg, cache_keys=_ODIM_CACHE_KEYS, ind_rad=ind_rad)
     else:
         for datatype in datatype_list:
             if datatype not in cfg['DataTypeIDInFilenames'].keys():
                 warn(f'No file contains data type {datatype}')
                 continue
-            nscans = 0
-            radar_aux = None
+            args_list = []
             for fname, scan in zip(flist, scan_list_aux):
                 if cfg['DataTypeIDInFilenames'][datatype] not in os.path.basename(fname):
                     continue
-                radar_aux2 = get_data_odim(
-                    fname, [datatype], scan, cfg, ind_rad=ind_rad)
-                if radar_aux2 is None:
-                    continue
-                if radar_aux is None:
-                    radar_aux = radar_aux2
-                    nscans += 1
-                    continue
-                radar_aux = pyart.util.radar_utils.join_radar(
-                    radar_aux, radar_aux2)
-                nscans += 1
+                args_list.append((fname, [datatype], scan, cfg))
+            scan_radar_list = [
+                radar_aux2 for radar_aux2 in read_scans(
+                    get_data_odim, args_list, cfg,
+                    cache_keys=_ODIM_CACHE_KEYS, ind_rad=ind_rad)
+                if radar_aux2 is not None]
+            nscans = len(scan_radar_list)
+            radar_aux = join_radars(scan_radar_list)
             if radar is None:
                 radar = radar_aux
                 nscans_expected = nscans
@@ -1755,9 +1787,7 @@ def merge_scans_odim(basepath, scan_list, radar_name, radar_res, voltime,
                         f'Fields will be adapted to {field_name} field size')
                     radar = add_field(radar_aux, radar)
                 print(f'nrays: {radar.nrays} ngates: {radar.ngates}')
-
-    if radar is None:
-        return radar
+        radar_list = [radar]
 
     rmin = None
     rmax = None
@@ -1778,8 +1808,8 @@ def merge_scans_odim(basepath, scan_list, radar_name, radar_res, voltime,
     if cfg['azmax'] is not None:
         azmax = cfg['azmax'][ind_rad]
 
-    return pyart.util.subset_radar(
-        radar, radar.fields.keys(), rng_min=rmin, rng_max=rmax, ele_min=elmin,
+    return join_radars(
+        radar_list, rng_min=rmin, rng_max=rmax, ele_min=elmin,
         ele_max=elmax, azi_min=azmin, azi_max=azmax)
 
 
@@ -2175,14 +2205,12 @@ def merge_scans_gamic(basepath, scan_list, radar_name, radar_res, voltime,
         azmax = cfg['azmax'][ind_rad]
 
     if len(scan_list) == 1:
-        if radar is None:
-            return radar
-
-        return pyart.util.subset_radar(
-            radar, radar.fields.keys(), rng_min=rmin, rng_max=rmax,
+        return join_radars(
+            [radar], rng_min=rmin, rng_max=rmax,
             ele_min=elmin, ele_max=elmax, azi_min=azmin, azi_max=azmax)
 
     # merge the elevations into a single radar instance
+    radar_list = [radar]
     for scan in scan_list[1:]:
         if cfg['path_convention'][ind_rad] == 'ODIM':
             filenames = glob.glob(datapath + '*' + scan + '*')
@@ -2215,16 +2243,10 @@ def merge_scans_gamic(basepath, scan_list, radar_name, radar_res, voltime,
             if radar_aux is None:
                 continue
 
-            if radar is None:
-                radar = radar_aux
-            else:
-                radar = pyart.util.radar_utils.join_radar(radar, radar_aux)
-
-    if radar is None:
-        return radar
+            radar_list.append(radar_aux)
 
-    return pyart.util.subset_radar(
-        radar, radar.fields.keys(), rng_min=rmin, rng_max=rmax, ele_min=elmin,
+    return join_radars(
+        radar_list, rng_min=rmin, rng_max=rmax, ele_min=elmin,
         ele_max=elmax, azi_min=azmin, azi_max=azmax)
 
 
@@ -2343,36 +2365,41 @@ def merge_scans_mfcfradial(basepath, scan_list, voltime, datatype_list,
     if not flist:
         return radar
     
+    # only the data that is going to be kept is read from the files
+    include_fields = [
+        get_fieldname_pyart(datatype) for datatype in datatype_list]
+    crop = any(cfg[key] is not None and cfg[key][ind_rad] is not None
+               for key in ('rmin', 'rmax', 'elmin', 'elmax', 'azmin', 'azmax'))
+
     if cfg['DataTypeIDInFilenames'] is None:
-        for fname, scan in zip(flist, scan_list_aux):
-            radar_aux = pyart.io.read_cfradial(fname, field_names=field_names)
-            if radar_aux is None:
-                continue
-            if radar is None:
-                radar = radar_aux
-                continue
-            radar = pyart.util.radar_utils.join_radar(radar, radar_aux)
+        # if the volume is cropped the fields are loaded when joining the
+        # scans and only the rays and gates kept are read. Radar objects
+        # with fields not yet loaded are not cached
+        # Radar objects with fields not yet loaded cannot be sent between
+        # processes. They are read by one thread at a time
+        radar_list = read_scans(
+            _read_cfradial_locked if crop else pyart.io.read_cfradial,
+            [(fname, ) for fname in flist], cfg, use_processes=not crop,
+            cache_keys=None if crop else (),
+            field_names=field_names, include_fields=include_fields,
+            delay_field_loading=crop)
     else:
         for datatype in datatype_list:
             if datatype not in cfg['DataTypeIDInFilenames'].keys():
                 warn(f'No file contains data type {datatype}')
                 continue
-            nscans = 0
-            radar_aux = None
-            for fname, scan in zip(flist, scan_list_aux):
+            args_list = []
+            for fname in flist:
                 if cfg['DataTypeIDInFilenames'][datatype] not in os.path.basename(fname):
                     continue
-                radar_aux2 = pyart.io.read_cfradial(
-                    fname, field_names=field_names)
-                if radar_aux2 is None:
-                    continue
-                if radar_aux is None:
-                    radar_aux = radar_aux2
-                    nscans += 1
-                    continue
-                radar_aux = pyart.util.radar_utils.join_radar(
-                    radar_aux, radar_aux2)
-                nscans += 1
+                args_list.append((fname, ))
+            scan_radar_list = [
+                radar_aux2 for radar_aux2 in read_scans(
+                    pyart.io.read_cfradial, args_list, cfg, cache_keys=(),
+                    field_names=field_names, include_fields=include_fields)
+                if radar_aux2 is not None]
+            nscans = len(scan_radar_list)
+            radar_aux = join_radars(scan_radar_list)
             if radar is None:
                 radar = radar_aux
                 nscans_expected = nscans
@@ -2395,9 +2422,7 @@ def merge_scans_mfcfradial(basepath, scan_list, voltime, datatype_list,
                         f'Fields will be adapted to {field_name} field size')
                     radar = add_field(radar_aux, radar)
                 print(f'nrays: {radar.nrays} ngates: {radar.ngates}')
-
-    if radar is None:
-        return radar
+        radar_list = [radar]
 
     rmin = None
     rmax = None
@@ -2418,8 +2443,8 @@ def merge_scans_mfcfradial(basepath, scan_list, voltime, datatype_list,
     if cfg['azmax'] is not None:
         azmax = cfg['azmax'][ind_rad]
 
-    return pyart.util.subset_radar(
-        radar, radar.fields.keys(), rng_min=rmin, rng_max=rmax, ele_min=elmin,
+    return join_radars(
+        radar_list, rng_min=rmin, rng_max=rmax, ele_min=elmin,
         ele_max=elmax, azi_min=azmin, azi_max=azmax)
 
 
@@ -2494,14 +2519,12 @@ def merge_scans_nexrad2(basepath, scan_list, radar_name, radar_res, voltime,
         azmax = cfg['azmax'][ind_rad]
 
     if len(scan_list) == 1:
-        if radar is None:
-            return radar
-
-        return pyart.util.subset_radar(
-            radar, radar.fields.keys(), rng_min=rmin, rng_max=rmax,
+        return join_radars(
+            [radar], rng_min=rmin, rng_max=rmax,
             ele_min=elmin, ele_max=elmax, azi_min=azmin, azi_max=azmax)
 
     # merge the elevations into a single radar instance
+    radar_list = [radar]
     for scan in scan_list[1:]:
         filenames = glob.glob(datapath + '*' + scan + '*')
         filename = []
@@ -2524,16 +2547,10 @@ def merge_scans_nexrad2(basepath, scan_list, radar_name, radar_res, voltime,
             if radar_aux is None:
                 continue
 
-            if radar is None:
-                radar = radar_aux
-            else:
-                radar = pyart.util.radar_utils.join_radar(radar, radar_aux)
+            radar_list.append(radar_aux)
 
-    if radar is None:
-        return radar
-
-    return pyart.util.subset_radar(
-        radar, radar.fields.keys(), rng_min=rmin, rng_max=rmax,
+    return join_radars(
+        radar_list, rng_min=rmin, rng_max=rmax,
         ele_min=elmin, ele_max=elmax, azi_min=azmin, azi_max=azmax)
 
 
@@ -2624,11 +2641,16 @@ def merge_scans_cfradial(basepath, scan_list, radar_name, radar_res, voltime,
             datapath = basepath + 'P' + radar_res + radar_name + '/'
             filename = glob.glob(
                 datapath + basename + timeinfo + '*' + scan_list[0] + '*')
+    # if a single scan is cropped only the rays and gates kept are read
+    crop = any(cfg[key] is not None and cfg[key][ind_rad] is not None
+               for key in ('rmin', 'rmax', 'elmin', 'elmax', 'azmin', 'azmax'))
     if not filename:
         warn('No file found in ' + datapath[0] + basename + timeinfo + '*.*')
     else:
-        radar = pyart.io.read_cfradial(filename[0], field_names=field_names,
-                                       include_fields = field_names.values())
+        radar = pyart.io.read_cfradial(
+            filename[0], field_names=field_names,
+            include_fields=list(field_names.values()),
+            delay_field_loading=crop and len(scan_list) == 1)
     rmin = None
     rmax = None
     elmin = None
@@ -2649,11 +2671,8 @@ def merge_scans_cfradial(basepath, scan_list, radar_name, radar_res, voltime,
         azmax = cfg['azmax'][ind_rad]
 
     if len(scan_list) == 1:
-        if radar is None:
-            return radar
-
-        return pyart.util.subset_radar(
-            radar, radar.fields.keys(), rng_min=rmin, rng_max=rmax,
+        return join_radars(
+            [radar], rng_min=rmin, rng_max=rmax,
             ele_min=elmin, ele_max=elmax, azi_min=azmin, azi_max=azmax)
 
     # merge the elevations into a single radar instance
@@ -2695,10 +2714,8 @@ def merge_scans_cfradial(basepath, scan_list, radar_name, radar_res, voltime,
             else:
                 radar = merge_radars(radar, radar_aux)
 
-    if radar is None:
-        return radar
-    return pyart.util.subset_radar(
-        radar, radar.fields.keys(), rng_min=rmin, rng_max=rmax,
+    return join_radars(
+        [radar], rng_min=rmin, rng_max=rmax,
         ele_min=elmin, ele_max=elmax, azi_min=azmin, azi_max=azmax)
 
     
@@ -2829,14 +2846,12 @@ def merge_scans_cfradial2(basepath, scan_list, radar_name, radar_res, voltime,
         azmax = cfg['azmax'][ind_rad]
 
     if len(scan_list) == 1:
-        if radar is None:
-            return radar
-
-        return pyart.util.subset_radar(
-            radar, radar.fields.keys(), rng_min=rmin, rng_max=rmax,
+        return join_radars(
+            [radar], rng_min=rmin, rng_max=rmax,
             ele_min=elmin, ele_max=elmax, azi_min=azmin, azi_max=azmax)
 
     # merge the elevations into a single radar instance
+    radar_list = [radar]
     for scan in scan_list[1:]:
         if cfg['path_convention'][ind_rad] == 'ODIM':
             filenames = glob.glob(datapath + '*' + scan + '*')
@@ -2891,16 +2906,10 @@ def merge_scans_cfradial2(basepath, scan_list, radar_name, radar_res, voltime,
                 filename[0], field_names=field_names)
             if radar_aux is None:
                 continue
-            if radar is None:
-                radar = radar_aux
-            else:
-                radar = pyart.util.radar_utils.join_radar(radar, radar_aux)
-
-    if radar is None:
-        return radar
+            radar_list.append(radar_aux)
 
-    return pyart.util.subset_radar(
-        radar, radar.fields.keys(), rng_min=rmin, rng_max=rmax,
+    return join_radars(
+        radar_list, rng_min=rmin, rng_max=rmax,
         ele_min=elmin, ele_max=elmax, azi_min=azmin, azi_max=azmax)
 
 
@@ -3094,14 +3103,12 @@ def merge_scans_cf1(basepath, scan_list, radar_name, radar_res, voltime,
         azmax = cfg['azmax'][ind_rad]
 
     if len(scan_list) == 1:
-        if radar is None:
-            return radar
-
-        return pyart.util.subset_radar(
-            radar, radar.fields.keys(), rng_min=rmin, rng_max=rmax,
+        return join_radars(
+            [radar], rng_min=rmin, rng_max=rmax,
             ele_min=elmin, ele_max=elmax, azi_min=azmin, azi_max=azmax)
 
     # merge the elevations into a single radar instance
+    radar_list = [radar]
     for scan in scan_list[1:]:
         if cfg['path_convention'][ind_rad] == 'ODIM':
             filenames = glob.glob(datapath + '*' + scan + '*')
@@ -3134,16 +3141,10 @@ def merge_scans_cf1(basepath, scan_list, radar_name, radar_res, voltime,
             if radar_aux is None:
                 continue
 
-            if radar is None:
-                radar = radar_aux
-            else:
-                radar = pyart.util.radar_utils.join_radar(radar, radar_aux)
-
-    if radar is None:
-        return radar
+            radar_list.append(radar_aux)
 
-    return pyart.util.subset_radar(
-        radar, radar.fields.keys(), rng_min=rmin, rng_max=rmax, ele_min=elmin,
+    return join_radars(
+        radar_list, rng_min=rmin, rng_max=rmax, ele_min=elmin,
         ele_max=elmax, azi_min=azmin, azi_max=azmax)
 
 
@@ -3175,7 +3176,7 @@ def merge_scans_mxpol(basepath, scan_list, voltime, datatype_list, cfg,
         radar object
 
     """
-    radar = None
+    radar_list = []
     for scan in scan_list:
         if cfg['path_convention'][ind_rad] == 'LTE':
             sub1 = str(voltime.year)
@@ -3209,14 +3210,7 @@ def merge_scans_mxpol(basepath, scan_list, voltime, datatype_list, cfg,
 
         radar_aux = get_data_mxpol(filename[0], datatype_list)
 
-        if radar is None:
-            radar = radar_aux
-            continue
-
-        radar = pyart.util.radar_utils.join_radar(radar, radar_aux)
-
-    if radar is None:
-        return radar
+        radar_list.append(radar_aux)
 
     rmin = None
     rmax = None
@@ -3237,8 +3231,8 @@ def merge_scans_mxpol(basepath, scan_list, voltime, datatype_list, cfg,
     if cfg['azmax'] is not None:
         azmax = cfg['azmax'][ind_rad]
 
-    return pyart.util.subset_radar(
-        radar, radar.fields.keys(), rng_min=rmin, rng_max=rmax, ele_min=elmin,
+    return join_radars(
+        radar_list, rng_min=rmin, rng_max=rmax, ele_min=elmin,
         ele_max=elmax, azi_min=azmin, azi_max=azmax)
 
 
@@ -3263,7 +3257,7 @@ def merge_scans_icon(voltime, datatype_list, cfg, ind_rad=0):
         radar object
 
     """
-    radar = None
+    radar_list = []
     for scan in cfg['ScanList'][ind_rad]:
         filename_list = list()
         for datatype in datatype_list:
@@ -3276,14 +3270,7 @@ def merge_scans_icon(voltime, datatype_list, cfg, ind_rad=0):
         if nfiles_valid > 0:
             radar_aux = merge_fields_icon(filename_list)
 
-            if radar is None:
-                radar = radar_aux
-            else:
-                radar = pyart.util.radar_utils.join_radar(
-                    radar, radar_aux)
-
-    if radar is None:
-        return radar
+            radar_list.append(radar_aux)
 
     rmin = None
     rmax = None
@@ -3304,8 +3291,8 @@ def merge_scans_icon(voltime, datatype_list, cfg, ind_rad=0):
     if cfg['azmax'] is not None:
         azmax = cfg['azmax'][ind_rad]
 
-    return pyart.util.subset_radar(
-        radar, radar.fields.keys(), rng_min=rmin, rng_max=rmax, ele_min=elmin,
+    return join_radars(
+        radar_list, rng_min=rmin, rng_max=rmax, ele_min=elmin,
         ele_max=elmax, azi_min=azmin, azi_max=azmax)
 
 
@@ -3333,7 +3320,7 @@ def merge_scans_icon_rad4alp(voltime, datatype, cfg, ind_rad=0):
     """
     # look for rad4alp ICON data. Data must be present in all scans
     # to consider the volume valid
-    radar = None
+    radar_list = []
     for scan in cfg['ScanList'][ind_rad]:
         # create the radar object where to store the data
         # taking as reference the metranet polar file
@@ -3360,13 +3347,7 @@ def merge_scans_icon_rad4alp(voltime, datatype, cfg, ind_rad=0):
         icon_dict = read_rad4alp_icon(filename, datatype)
         radar_aux.add_field(get_fieldname_pyart(datatype), icon_dict)
 
-        if radar is None:
-            radar = radar_aux
-        else:
-            radar = pyart.util.radar_utils.join_radar(radar, radar_aux)
-
-    if radar is None:
-        return radar
+        radar_list.append(radar_aux)
 
     rmin = None
     rmax = None
@@ -3387,8 +3368,8 @@ def merge_scans_icon_rad4alp(voltime, datatype, cfg, ind_rad=0):
     if cfg['azmax'] is not None:
         azmax = cfg['azmax'][ind_rad]
 
-    return pyart.util.subset_radar(
-        radar, radar.fields.keys(), rng_min=rmin, rng_max=rmax, ele_min=elmin,
+    return join_radars(
+        radar_list, rng_min=rmin, rng_max=rmax, ele_min=elmin,
         ele_max=elmax, azi_min=azmin, azi_max=azmax)
 
 
@@ -3423,7 +3404,7 @@ def merge_scans_dem_rad4alp(voltime, datatype, cfg, ind_rad=0):
     if vis_list is None:
         return None
 
-    radar = None
+    radar_list = []
     for scan in cfg['ScanList'][ind_rad]:
         # create the radar object where to store the data
         # taking as reference the metranet polar file
@@ -3448,13 +3429,7 @@ def merge_scans_dem_rad4alp(voltime, datatype, cfg, ind_rad=0):
         radar_aux.add_field(
             get_fieldname_pyart(datatype), vis_list[int(scan) - 1])
 
-        if radar is None:
-            radar = radar_aux
-        else:
-            radar = pyart.util.radar_utils.join_radar(radar, radar_aux)
-
-    if radar is None:
-        return radar
+        radar_list.append(radar_aux)
 
     rmin = None
     rmax = None
@@ -3475,8 +3450,8 @@ def merge_scans_dem_rad4alp(voltime, datatype, cfg, ind_rad=0):
     if cfg['azmax'] is not None:
         azmax = cfg['azmax'][ind_rad]
 
-    return pyart.util.subset_radar(
-        radar, radar.fields.keys(), rng_min=rmin, rng_max=rmax, ele_min=elmin,
+    return join_radars(
+        radar_list, rng_min=rmin, rng_max=rmax, ele_min=elmin,
         ele_max=elmax, azi_min=azmin, azi_max=azmax)
 
 
@@ -3515,7 +3490,7 @@ def merge_scans_other_rad4alp(voltime, datatype, cfg, ind_rad=0):
     prod_dict = pyart.config.get_metadata(prod_field)
     basename_prod = acronym + radar_name + dayinfo
 
-    radar = None
+    radar_list = []
     for scan in scan_list:
         # read product data file
         if cfg['path_convention'][ind_rad] == 'LTE':
@@ -3578,13 +3553,7 @@ def merge_scans_other_rad4alp(voltime, datatype, cfg, ind_rad=0):
         radar_aux.fields = dict()
         radar_aux.add_field(prod_field, prod_dict)
 
-        if radar is None:
-            radar = radar_aux
-        else:
-            radar = pyart.util.radar_utils.join_radar(radar, radar_aux)
-
-    if radar is None:
-        return radar
+        radar_list.append(radar_aux)
 
     rmin = None
     rmax = None
@@ -3605,8 +3574,8 @@ def merge_scans_other_rad4alp(voltime, datatype, cfg, ind_rad=0):
     if cfg['azmax'] is not None:
         azmax = cfg['azmax'][ind_rad]
 
-    return pyart.util.subset_radar(
-        radar, radar.fields.keys(), rng_min=rmin, rng_max=rmax, ele_min=elmin,
+    return join_radars(
+        radar_list, rng_min=rmin, rng_max=rmax, ele_min=elmin,
         ele_max=elmax, azi_min=azmin, azi_max=azmax)
 
 
@@ -3683,7 +3652,7 @@ def merge_scans_iq_rad4alp(basepath, basepath_iq, scan_list, radar_name,
     if 'mflossv' in cfg:
         mfloss_v = cfg['mflossv'][ind_rad]
 
-    radar = None
+    radar_list = []
     for scan in scan_list:
         datapath, basename = get_rad4alp_dir(
             basepath, voltime, radar_name=radar_name, radar_res=radar_res,
@@ -3766,13 +3735,7 @@ def merge_scans_iq_rad4alp(basepath, basepath_iq, scan_list, radar_name,
         if radar_aux is None:
             continue
 
-        if radar is None:
-            radar = radar_aux
-        else:
-            radar = pyart.util.radar_utils.join_radar(radar, radar_aux)
-
-    if radar is None:
-        return radar
+        radar_list.append(radar_aux)
 
     rmin = None
     rmax = None
@@ -3793,8 +3756,8 @@ def merge_scans_iq_rad4alp(basepath, basepath_iq, scan_list, radar_name,
     if cfg['azmax'] is not None:
         azmax = cfg['azmax'][ind_rad]
 
-    return pyart.util.subset_radar(
-        radar, radar.fields.keys(), rng_min=rmin, rng_max=rmax, ele_min=elmin,
+    return join_radars(
+        radar_list, rng_min=rmin, rng_max=rmax, ele_min=elmin,
         ele_max=elmax, azi_min=azmin, azi_max=azmax)
 
 
@@ -4357,7 +4320,7 @@ def merge_fields_pyrad(basepath, loadname, voltime, datatype_list,
                        termination='.nc'):
     """
     merge fields from Pyrad-generated files into a single radar object.
-    Accepted file types are CFRadial and ODIM.
+    Accepted file types are CFRadial, ODIM and the pyrad intermediate format.
 
     Parameters
     ----------
@@ -4381,7 +4344,7 @@ def merge_fields_pyrad(basepath, loadname, voltime, datatype_list,
         The limits of the grid [deg]. If None the limits will be the limits
         of the radar volume
     termination : str
-        file termination type. Can be '.nc' or '.h*'
+        file termination type. Can be '.nc', '.h*' or '.npyvol'
 
     Returns
     -------
@@ -4400,10 +4363,15 @@ def merge_fields_pyrad(basepath, loadname, voltime, datatype_list,
             datapath + fdatetime + '*' + datatype_list[i] + termination)
         if not filename:
             warn('No file found in ' + datapath + fdatetime + '*' +
-                 datatype_list[i] + '.nc')
+                 datatype_list[i] + termination)
             continue
 
-        if termination == '.nc':
+        if termination == '.npyvol':
+            # only the field of interest is read, when it is used
+            radar_aux = read_npy_volume(
+                filename[0],
+                field_names=[get_fieldname_pyart(datatype_list[i])])
+        elif termination == '.nc':
             try:
                 radar_aux = pyart.io.read_cfradial(filename[0])
             except (OSError, KeyError) as ee:
@@ -5040,6 +5008,16 @@ def get_data_odim(filename, datatype_list, scan_name, cfg, ind_rad=0):
         else:
             odim_field_names.update(get_datatype_odim(datatype))
 
+    # only the sweeps within the elevation limits are decoded
+    ele_min = None
+    ele_max = None
+    if cfg.get('elmin', None) is not None:
+        ele_min = cfg['elmin'][ind_rad]
+    if cfg.get('elmax', None) is not None:
+        ele_max = cfg['elmax'][ind_rad]
+    include_datasets = get_odim_datasets(
+        filename, ele_min=ele_min, ele_max=ele_max)
+
     try:
         if cfg['MFScale']:
             # assumes only a data type per file
@@ -5088,15 +5066,18 @@ def get_data_odim(filename, datatype_list, scan_name, cfg, ind_rad=0):
             radar = pyart.aux_io.read_odim_h5(
                 filename, field_names=odim_field_names, offset=offset,
                 gain=gain, nodata=nodata, undetect=undetect,
-                use_file_conversion=use_file_conversion, 
-                include_fields = odim_field_names.values())
+                use_file_conversion=use_file_conversion,
+                include_fields=list(odim_field_names.values()),
+                include_datasets=include_datasets)
 
             if datatype_list[0] == 'PhiDP':
                 radar.fields['differential_phase']['data'][
                     radar.fields['differential_phase']['data'] > 180.] -= 360.
         else:
             radar = pyart.aux_io.read_odim_h5(
-                filename, field_names=odim_field_names)
+                filename, field_names=odim_field_names,
+                include_fields=list(odim_field_names.values()),
+                include_datasets=include_datasets)
 
             if 'differential_phase' in radar.fields:
                 # make sure that data is within [-180, 180] deg
@@ -5107,6 +5088,12 @@ def get_data_odim(filename, datatype_list, scan_name, cfg, ind_rad=0):
         warn("Unable to read file '" + filename + ": (%s)" % str(ee))
         return None
 
+    if include_datasets is not None:
+        # keep the sweep numbers of the complete volume
+        radar.sweep_number['data'] = np.array(
+            sorted(int(dataset[7:]) - 1 for dataset in include_datasets),
+            dtype='int32')
+
     if ('Nh' not in datatype_list) and ('Nv' not in datatype_list):
         return radar
 
@@ -5181,6 +5168,58 @@ def get_data_odim(filename, datatype_list, scan_name, cfg, ind_rad=0):
     return radar
 
 
+def get_odim_datasets(filename, ele_min=None, ele_max=None):
+    """
+    Gets the datasets (sweeps) of an ODIM volume whose fixed elevation
+    angle is within the limits. Only the attributes of the file are read
+
+    Parameters
+    ----------
+    filename : str
+        name of the ODIM file
+    ele_min, ele_max : float or None
+        The elevation limits [deg]. If None there is no limit
+
+    Returns
+    -------
+    datasets : list of str or None
+        The names of the datasets to read. None if all the datasets have to
+        be read
+
+    """
+    if (ele_min is None and ele_max is None) or not _H5PY_AVAILABLE:
+        return None
+
+    try:
+        with h5py.File(filename, 'r') as hfile:
+            odim_object = hfile['what'].attrs['object']
+            if isinstance(odim_object, bytes):
+                odim_object = odim_object.decode('utf-8')
+            if odim_object not in ('PVOL', 'SCAN'):
+                return None
+            datasets = []
+            nsweeps = 0
+            for dataset in hfile:
+                if not dataset.startswith('dataset'):
+                    continue
+                nsweeps += 1
+                elangle = hfile[dataset]['where'].attrs['elangle']
+                if ele_min is not None and elangle < ele_min:
+                    continue
+                if ele_max is not None and elangle > ele_max:
+                    continue
+                datasets.append(dataset)
+    except (OSError, KeyError):
+        return None
+
+    # the file is read normally if it has to be read entirely or if none
+    # of its sweeps is within the limits
+    if not datasets or len(datasets) == nsweeps:
+        return None
+
+    return datasets
+
+
 def get_data_odimgrid(filename, datatype_list, cfg, mf_scale=False):
     """
     gets ODIM grid data
@@ -5297,9 +5336,11 @@ def get_data_gamic(filename, datatype_list, pulse_width):
     # gamic_field_names = dict()
     # for datatype in datatype_list:
     #     # gamic_field_names.update(get_datatype_gamic(datatype))
+    include_fields = [
+        get_fieldname_pyart(datatype) for datatype in datatype_list]
     try:
         radar = pyart.aux_io.read_gamic(
-            filename, pulse_width=pulse_width)
+            filename, pulse_width=pulse_width, include_fields=include_fields)
     except (ValueError, OSError) as ee:
         warn("Unable to read file '" + filename + ": (%s)" % str(ee))
         return None
@@ -5825,3 +5866,176 @@ def merge_grids(grid1, grid2):
         grid.add_field(field, field_dict)
 
     return grid
+
+
+def read_scans(read_func, args_list, cfg, use_processes=True,
+               cache_keys=None, **kwargs):
+    """
+    Reads the files of the scans of a volume. If cfg['ScanReadWorkers'] is
+    larger than 1 the files are decoded concurrently. The radar objects are
+    returned in the order of the arguments so that the merged volume does
+    not depend on the order in which the files have been decoded. If
+    cfg['volume_cache'] is defined and cache_keys is not None the radar
+    objects are taken from the volume cache when the files have already
+    been decoded with the same arguments
+
+    Parameters
+    ----------
+    read_func : function
+        the function reading one file. It must be picklable if
+        use_processes is True
+    args_list : list of tuples
+        the positional arguments of each call to read_func
+    cfg : dict
+        configuration dictionary. Can contain the keys 'ScanReadWorkers'
+        and 'volume_cache'
+    use_processes : bool
+        If True the files are decoded in a pool of processes. Otherwise a
+        pool of threads is used. Threads can only be used with thread safe
+        readers (e.g. the METRANET C library) that release the GIL. The
+        netCDF and HDF5 readers are not thread safe
+    cache_keys : tuple of str or None
+        the keys of cfg used by read_func. They are part of the
+        identification of the cached files. If None the volume cache is
+        not used
+    kwargs : dict
+        keyword arguments common to all the calls to read_func
+
+    Returns
+    -------
+    radar_list : list of radar objects
+        the output of read_func for each set of arguments
+
+    """
+    cache = cfg.get('volume_cache', None)
+    if cache is None or cache_keys is None:
+        return _read_scans(
+            read_func, args_list, cfg, use_processes=use_processes, **kwargs)
+
+    # the first argument is the file name. The configuration dictionary is
+    # identified by the keys used by read_func
+    cfg_values = {key: cfg.get(key, None) for key in cache_keys}
+    func_name = f'{read_func.__module__}.{read_func.__qualname__}'
+    radar_list = []
+    miss_list = []
+    for ind, args in enumerate(args_list):
+        key = cache.get_key(
+            args[0], func_name,
+            [arg for arg in args[1:] if arg is not cfg], cfg_values, kwargs)
+        radar = None
+        if key is not None:
+            radar = cache.get(key)
+        if radar is None:
+            miss_list.append((ind, key))
+        radar_list.append(radar)
+
+    if not miss_list:
+        return radar_list
+
+    radar_miss_list = _read_scans(
+        read_func, [args_list[ind] for ind, _ in miss_list], cfg,
+        use_processes=use_processes, **kwargs)
+    for (ind, key), radar in zip(miss_list, radar_miss_list):
+        if key is not None and radar is not None:
+            cache.put(key, radar)
+        radar_list[ind] = radar
+
+    return radar_list
+
+
+def _read_scans(read_func, args_list, cfg, use_processes=True, **kwargs):
+    """
+    Reads the files of the scans of a volume, concurrently if
+    cfg['ScanReadWorkers'] is larger than 1
+
+    Parameters
+    ----------
+    read_func : function
+        the function reading one file
+    args_list : list of tuples
+        the positional arguments of each call to read_func
+    cfg : dict
+        configuration dictionary
+    use_processes : bool
+        If True the files are decoded in a pool of processes, otherwise in a
+        pool of threads
+    kwargs : dict
+        keyword arguments common to all the calls to read_func
+
+    Returns
+    -------
+    radar_list : list of radar objects
+        the output of read_func for each set of arguments
+
+    """
+    nworkers = min(cfg.get('ScanReadWorkers', 1), len(args_list))
+    if nworkers <= 1:
+        return [read_func(*args, **kwargs) for args in args_list]
+
+    executor = _get_scan_executor(
+        cfg['ScanReadWorkers'], use_processes=use_processes)
+    try:
+        futures = [
+            executor.submit(read_func, *args, **kwargs) for args in args_list]
+        return [future.result() for future in futures]
+    except BrokenProcessPool as ee:
+        # a worker died. The pool is replaced and the files read in the
+        # current process
+        warn('Scan reading pool broken: ' + str(ee))
+        with _SCAN_EXECUTORS_LOCK:
+            _SCAN_EXECUTORS.pop((cfg['ScanReadWorkers'], use_processes), None)
+        executor.shutdown(wait=False)
+        return [read_func(*args, **kwargs) for args in args_list]
+
+
+def _read_cfradial_locked(filename, **kwargs):
+    """
+    Reads a CF/Radial file. The netCDF library is not thread safe so the
+    files are read by one thread at a time
+
+    Parameters
+    ----------
+    filename : str
+        name of the file to read
+    kwargs : dict
+        keyword arguments of function pyart.io.read_cfradial
+
+    Returns
+    -------
+    radar : Radar
+        the radar object
+
+    """
+    with _NETCDF_HDF5_LOCK:
+        return pyart.io.read_cfradial(filename, **kwargs)
+
+
+def _get_scan_executor(nworkers, use_processes=False):
+    """
+    Gets the pool used to read the scans. The pools are kept for the whole
+    processing so that the workers are started only once
+
+    Parameters
+    ----------
+    nworkers : int
+        number of workers of the pool
+    use_processes : bool
+        If True the pool is a pool of processes, otherwise of threads
+
+    Returns
+    -------
+    executor : Executor
+        the pool
+
+    """
+    key = (nworkers, use_processes)
+    with _SCAN_EXECUTORS_LOCK:
+        executor = _SCAN_EXECUTORS.get(key, None)
+        if executor is None:
+            if use_processes:
+                executor = ProcessPoolExecutor(max_workers=nworkers)
+            else:
+                executor = ThreadPoolExecutor(
+                    max_workers=nworkers, thread_name_prefix='pyrad_scan')
+            _SCAN_EXECUTORS[key] = executor
+    return executor
@@ -19,7 +19,9 @@ Functions for reading data from other sensors
     read_trt_traj_data
     read_trt_thundertracking_traj_data
     read_lightning
+    read_lightning_chunks
     read_meteorage
+    read_meteorage_chunks
     read_lightning_traj
     read_lightning_all
     get_sensor_data
@@ -33,6 +35,10 @@ Functions for reading data from other sensors
     read_radiosounding_wyoming
     read_radiosounding_igra
     read_fzl_igra
+    _read_lightning_csv
+    _lightning_data_to_arrays
+    _read_meteorage_csv
+    _meteorage_data_to_arrays
 """
 
 import os
@@ -40,7 +46,6 @@ import glob
 import datetime
 import csv
 from warnings import warn
-from copy import deepcopy
 import re
 from io import StringIO, BytesIO
 import pandas as pd
@@ -50,6 +55,8 @@ from zipfile import ZipFile
 
 from pyart.config import get_fillvalue
 
+from .io_aux import _read_csv_columns, _to_datetime_array
+
 
 def read_windmills_data(fname):
     """
@@ -648,59 +655,37 @@ def read_trt_scores(fname):
 
     """
     try:
-        with open(fname, 'r', newline='') as csvfile:
-            # first count the lines
-            reader = csv.DictReader(
-                (row for row in csvfile if not row.startswith('#')),
-                delimiter=',')
-            nrows = sum(1 for row in reader)
-
-            if nrows == 0:
-                warn('No data in file ' + fname)
-                return None, None, None, None, None, None, None, None
-
-            traj_ID = np.empty(nrows, dtype=int)
-            time_flash_density_max = np.empty(nrows, dtype=datetime.datetime)
-            flash_density_max_rank = np.empty(nrows, dtype=float)
-            flash_density_max_nflashes = np.empty(nrows, dtype=int)
-            flash_density_max_area = np.empty(nrows, dtype=float)
-            flash_density_max = np.empty(nrows, dtype=float)
-            time_rank_max = np.empty(nrows, dtype=datetime.datetime)
-            rank_max = np.empty(nrows, dtype=float)
-
-            # now read the data
-            csvfile.seek(0)
-            reader = csv.DictReader(
-                (row for row in csvfile if not row.startswith('#')),
-                delimiter=',')
-            for i, row in enumerate(reader):
-                traj_ID[i] = int(row['traj ID'])
-                time_flash_density_max[i] = datetime.datetime.strptime(
-                    row['max flash density time'], '%Y-%m-%d %H:%M:%S')
-                flash_density_max_rank[i] = float(
-                    row['max flash density rank'])
-                flash_density_max_nflashes[i] = int(
-                    row['max flash density flashes'])
-                flash_density_max_area[i] = float(
-                    row['max flash density area'])
-                flash_density_max[i] = float(
-                    row['max flash density'])
-                time_rank_max[i] = datetime.datetime.strptime(
-                    row['max rank time'], '%Y-%m-%d %H:%M:%S')
-                rank_max[i] = row['max rank']
-
-            csvfile.close()
-
-            return (
-                traj_ID, time_flash_density_max, flash_density_max_rank,
-                flash_density_max_nflashes, flash_density_max_area,
-                flash_density_max, time_rank_max, rank_max)
-
-    except EnvironmentError as ee:
+        data = _read_csv_columns(fname, {
+            'traj ID': int, 'max flash density time': str,
+            'max flash density rank': float,
+            'max flash density flashes': int,
+            'max flash density area': float, 'max flash density': float,
+            'max rank time': str, 'max rank': float})
+    except (EnvironmentError, ValueError) as ee:
         warn(str(ee))
         warn('Unable to read file ' + fname)
         return None, None, None, None, None, None, None, None
 
+    if data.empty:
+        warn('No data in file ' + fname)
+        return None, None, None, None, None, None, None, None
+
+    traj_ID = data['traj ID'].to_numpy()
+    time_flash_density_max = _to_datetime_array(
+        data['max flash density time'], '%Y-%m-%d %H:%M:%S')
+    flash_density_max_rank = data['max flash density rank'].to_numpy()
+    flash_density_max_nflashes = data['max flash density flashes'].to_numpy()
+    flash_density_max_area = data['max flash density area'].to_numpy()
+    flash_density_max = data['max flash density'].to_numpy()
+    time_rank_max = _to_datetime_array(
+        data['max rank time'], '%Y-%m-%d %H:%M:%S')
+    rank_max = data['max rank'].to_numpy()
+
+    return (
+        traj_ID, time_flash_density_max, flash_density_max_rank,
+        flash_density_max_nflashes, flash_density_max_area,
+        flash_density_max, time_rank_max, rank_max)
+
 
 def read_trt_cell_lightning(fname):
     """
@@ -726,57 +711,34 @@ def read_trt_cell_lightning(fname):
 
     """
     try:
-        with open(fname, 'r', newline='') as csvfile:
-            # first count the lines
-            reader = csv.DictReader(
-                (row for row in csvfile if not row.startswith('#')),
-                delimiter=',')
-            nrows = sum(1 for row in reader)
-
-            if nrows == 0:
-                warn('No data in file ' + fname)
-                return None, None, None, None, None, None, None, None
-
-            traj_ID = np.empty(nrows, dtype=int)
-            time_cell = np.empty(nrows, dtype=datetime.datetime)
-            lon_cell = np.empty(nrows, dtype=float)
-            lat_cell = np.empty(nrows, dtype=float)
-            area_cell = np.empty(nrows, dtype=float)
-            rank_cell = np.empty(nrows, dtype=float)
-            nflashes_cell = np.ma.empty(nrows, dtype=float)
-            flash_dens_cell = np.ma.empty(nrows, dtype=float)
-
-            # now read the data
-            csvfile.seek(0)
-            reader = csv.DictReader(
-                (row for row in csvfile if not row.startswith('#')),
-                delimiter=',')
-            for i, row in enumerate(reader):
-                traj_ID[i] = int(row['traj_ID'])
-                time_cell[i] = datetime.datetime.strptime(
-                    row['yyyymmddHHMM'], '%Y%m%d%H%M')
-                lon_cell[i] = float(row['lon'])
-                lat_cell[i] = float(row['lat'])
-                area_cell[i] = float(row['area'])
-                rank_cell[i] = float(row['RANKr'])
-                nflashes_cell[i] = float(row['nflashes'])
-                flash_dens_cell[i] = float(row['flash_dens'])
-
-            csvfile.close()
-
-            nflashes_cell = np.ma.masked_values(nflashes_cell, get_fillvalue())
-            flash_dens_cell = np.ma.masked_values(
-                flash_dens_cell, get_fillvalue())
-
-            return (
-                traj_ID, time_cell, lon_cell, lat_cell, area_cell, rank_cell,
-                nflashes_cell, flash_dens_cell)
-
-    except EnvironmentError as ee:
+        data = _read_csv_columns(fname, {
+            'traj_ID': int, 'yyyymmddHHMM': str, 'lon': float, 'lat': float,
+            'area': float, 'RANKr': float, 'nflashes': float,
+            'flash_dens': float})
+    except (EnvironmentError, ValueError) as ee:
         warn(str(ee))
         warn('Unable to read file ' + fname)
         return None, None, None, None, None, None, None, None
 
+    if data.empty:
+        warn('No data in file ' + fname)
+        return None, None, None, None, None, None, None, None
+
+    traj_ID = data['traj_ID'].to_numpy()
+    time_cell = _to_datetime_array(data['yyyymmddHHMM'], '%Y%m%d%H%M')
+    lon_cell = data['lon'].to_numpy()
+    lat_cell = data['lat'].to_numpy()
+    area_cell = data['area'].to_numpy()
+    rank_cell = data['RANKr'].to_numpy()
+    nflashes_cell = np.ma.masked_values(
+        data['nflashes'].to_numpy(), get_fillvalue())
+    flash_dens_cell = np.ma.masked_values(
+        data['flash_dens'].to_numpy(), get_fillvalue())
+
+    return (
+        traj_ID, time_cell, lon_cell, lat_cell, area_cell, rank_cell,
+        nflashes_cell, flash_dens_cell)
+
 
 def read_trt_data(fname):
     """
@@ -836,148 +798,19 @@ def read_trt_data(fname):
     A tupple containing the read values. None otherwise
 
     """
+    fieldnames = [
+        'traj_ID', 'yyyymmddHHMM', 'lon', 'lat', 'ell_L', 'ell_S', 'ell_or',
+        'area', 'vel_x', 'vel_y', 'det', 'RANKr', 'CG-', 'CG+', 'CG', '%CG+',
+        'ET45', 'ET45m', 'ET15', 'ET15m', 'VIL', 'maxH', 'maxHm', 'POH',
+        'RANK', 'Dvel_x', 'Dvel_y']
+    nfields = len(fieldnames)
     try:
         with open(fname, 'r', newline='') as csvfile:
-            # first count the lines
-            reader = csv.DictReader(
-                (row for row in csvfile if (
-                    not row.startswith('#') and
-                    not row.startswith('@') and not row.startswith(" ")
-                    and row)),
-                fieldnames=[
-                    'traj_ID', 'yyyymmddHHMM', 'lon', 'lat', 'ell_L', 'ell_S',
-                    'ell_or', 'area', 'vel_x', 'vel_y', 'det', 'RANKr', 'CG-',
-                    'CG+', 'CG', '%CG+', 'ET45', 'ET45m', 'ET15', 'ET15m',
-                    'VIL', 'maxH', 'maxHm', 'POH', 'RANK', 'Dvel_x',
-                    'Dvel_y'],
-                restkey='cell_contour_lon-lat',
-                delimiter=';')
-            nrows = sum(1 for row in reader)
-
-            if nrows == 0:
-                warn('No data in file ' + fname)
-                return (
-                    None, None, None, None, None, None, None, None, None,
-                    None, None, None, None, None, None, None, None, None,
-                    None, None, None, None, None, None, None, None, None,
-                    None)
-
-            traj_ID = np.empty(nrows, dtype=int)
-            yyyymmddHHMM = np.empty(nrows, dtype=datetime.datetime)
-            lon = np.empty(nrows, dtype=float)
-            lat = np.empty(nrows, dtype=float)
-            ell_L = np.empty(nrows, dtype=float)
-            ell_S = np.empty(nrows, dtype=float)
-            ell_or = np.empty(nrows, dtype=float)
-            area = np.empty(nrows, dtype=float)
-            vel_x = np.ma.empty(nrows, dtype=float)
-            vel_y = np.ma.empty(nrows, dtype=float)
-            det = np.ma.empty(nrows, dtype=float)
-            RANKr = np.empty(nrows, dtype=int)
-            CG_n = np.empty(nrows, dtype=int)
-            CG_p = np.empty(nrows, dtype=int)
-            CG = np.empty(nrows, dtype=int)
-            CG_percent_p = np.ma.empty(nrows, dtype=float)
-            ET45 = np.ma.empty(nrows, dtype=float)
-            ET45m = np.ma.empty(nrows, dtype=float)
-            ET15 = np.ma.empty(nrows, dtype=float)
-            ET15m = np.ma.empty(nrows, dtype=float)
-            VIL = np.ma.empty(nrows, dtype=float)
-            maxH = np.ma.empty(nrows, dtype=float)
-            maxHm = np.ma.empty(nrows, dtype=float)
-            POH = np.ma.empty(nrows, dtype=float)
-            RANK = np.ma.empty(nrows, dtype=float)
-            Dvel_x = np.ma.empty(nrows, dtype=float)
-            Dvel_y = np.ma.empty(nrows, dtype=float)
-
-            # now read the data
-            csvfile.seek(0)
-            reader = csv.DictReader(
-                (row for row in csvfile if (
+            rows = [
+                row.rstrip('\r\n').split(';') for row in csvfile if (
                     not row.startswith('#') and
                     not row.startswith('@') and not row.startswith(" ")
-                    and row)),
-                fieldnames=[
-                    'traj_ID', 'yyyymmddHHMM', 'lon', 'lat', 'ell_L', 'ell_S',
-                    'ell_or', 'area', 'vel_x', 'vel_y', 'det', 'RANKr', 'CG-',
-                    'CG+', 'CG', '%CG+', 'ET45', 'ET45m', 'ET15', 'ET15m',
-                    'VIL', 'maxH', 'maxHm', 'POH', 'RANK', 'Dvel_x',
-                    'Dvel_y'],
-                restkey='cell_contour_lon-lat',
-                delimiter=';')
-            cell_contour = []
-            for i, row in enumerate(reader):
-                traj_ID[i] = int(row['traj_ID'])
-                yyyymmddHHMM[i] = datetime.datetime.strptime(
-                    row['yyyymmddHHMM'].strip(), '%Y%m%d%H%M')
-                lon[i] = float(row['lon'].strip())
-                lat[i] = float(row['lat'].strip())
-                ell_L[i] = float(row['ell_L'].strip())
-                ell_S[i] = float(row['ell_S'].strip())
-                ell_or[i] = float(row['ell_or'].strip())
-                area[i] = float(row['area'].strip())
-                vel_x[i] = float(row['vel_x'].strip())
-                vel_y[i] = float(row['vel_y'].strip())
-                det[i] = float(row['det'].strip())
-                RANKr[i] = int(row['RANKr'].strip())
-                CG_n[i] = int(row['CG-'].strip())
-                CG_p[i] = int(row['CG+'].strip())
-                CG[i] = int(row['CG'].strip())
-                CG_percent_p[i] = float(row['%CG+'].strip())
-                ET45[i] = float(row['ET45'].strip())
-                ET45m[i] = float(row['ET45m'].strip())
-                ET15[i] = float(row['ET15'].strip())
-                ET15m[i] = float(row['ET15m'].strip())
-                VIL[i] = float(row['VIL'].strip())
-                maxH[i] = float(row['maxH'].strip())
-                maxHm[i] = float(row['maxHm'].strip())
-                POH[i] = float(row['POH'].strip())
-                RANK[i] = float(row['RANK'].strip())
-                Dvel_x[i] = float(row['Dvel_x'].strip())
-                Dvel_y[i] = float(row['Dvel_y'].strip())
-
-                cell_contour_list_aux = row['cell_contour_lon-lat']
-                nele = len(cell_contour_list_aux) - 1
-                cell_contour_list = []
-                for j in range(nele):
-                    cell_contour_list.append(
-                        float(cell_contour_list_aux[j].strip()))
-                cell_contour_dict = {
-                    'lon': cell_contour_list[0::2],
-                    'lat': cell_contour_list[1::2]
-                }
-                cell_contour.append(cell_contour_dict)
-
-            csvfile.close()
-
-            lon = np.ma.masked_invalid(lon)
-            lat = np.ma.masked_invalid(lat)
-            ell_L = np.ma.masked_invalid(ell_L)
-            ell_S = np.ma.masked_invalid(ell_S)
-            ell_or = np.ma.masked_invalid(ell_or)
-            area = np.ma.masked_invalid(area)
-            vel_x = np.ma.masked_invalid(vel_x)
-            vel_y = np.ma.masked_invalid(vel_y)
-            det = np.ma.masked_invalid(det)
-            CG_percent_p = np.ma.masked_invalid(CG_percent_p)
-            ET45 = np.ma.masked_invalid(ET45)
-            ET45m = np.ma.masked_invalid(ET45m)
-            ET15 = np.ma.masked_invalid(ET15)
-            ET15m = np.ma.masked_invalid(ET15m)
-            VIL = np.ma.masked_invalid(VIL)
-            maxH = np.ma.masked_invalid(maxH)
-            maxHm = np.ma.masked_invalid(maxHm)
-            POH = np.ma.masked_invalid(POH)
-            RANK = np.ma.masked_invalid(RANK)
-            Dvel_x = np.ma.masked_invalid(Dvel_x)
-            Dvel_y = np.ma.masked_invalid(Dvel_y)
-
-            return (
-                traj_ID, yyyymmddHHMM, lon, lat, ell_L, ell_S, ell_or, area,
-                vel_x, vel_y, det, RANKr, CG_n, CG_p, CG, CG_percent_p, ET45,
-                ET45m, ET15, ET15m, VIL, maxH, maxHm, POH, RANK, Dvel_x,
-                Dvel_y, cell_contour)
-
+                    and row.strip())]
     except EnvironmentError as ee:
         warn(str(ee))
         warn('Unable to read file ' + fname)
@@ -986,6 +819,47 @@ def read_trt_data(fname):
             None, None, None, None, None, None, None, None, None, None, None,
             None, None, None, None, None, None)
 
+    if not rows:
+        warn('No data in file ' + fname)
+        return (
+            None, None, None, None, None, None, None, None, None,
+            None, None, None, None, None, None, None, None, None,
+            None, None, None, None, None, None, None, None, None,
+            None)
+
+    # the cell description has a fixed number of fields. It is followed by
+    # the cell contour
+    values = np.char.strip(np.array([row[:nfields] for row in rows]))
+    data = dict(zip(fieldnames, values.T))
+
+    traj_ID = data['traj_ID'].astype(int)
+    yyyymmddHHMM = _to_datetime_array(data['yyyymmddHHMM'], '%Y%m%d%H%M')
+    RANKr = data['RANKr'].astype(int)
+    CG_n = data['CG-'].astype(int)
+    CG_p = data['CG+'].astype(int)
+    CG = data['CG'].astype(int)
+    (lon, lat, ell_L, ell_S, ell_or, area, vel_x, vel_y, det, CG_percent_p,
+     ET45, ET45m, ET15, ET15m, VIL, maxH, maxHm, POH, RANK, Dvel_x,
+     Dvel_y) = (
+         np.ma.masked_invalid(data[field].astype(float)) for field in (
+             'lon', 'lat', 'ell_L', 'ell_S', 'ell_or', 'area', 'vel_x',
+             'vel_y', 'det', '%CG+', 'ET45', 'ET45m', 'ET15', 'ET15m',
+             'VIL', 'maxH', 'maxHm', 'POH', 'RANK', 'Dvel_x', 'Dvel_y'))
+
+    # the last element of the contour is empty
+    cell_contour = []
+    for row in rows:
+        cell_contour_list = [float(val) for val in row[nfields:-1]]
+        cell_contour.append({
+            'lon': cell_contour_list[0::2],
+            'lat': cell_contour_list[1::2]})
+
+    return (
+        traj_ID, yyyymmddHHMM, lon, lat, ell_L, ell_S, ell_or, area,
+        vel_x, vel_y, det, RANKr, CG_n, CG_p, CG, CG_percent_p, ET45,
+        ET45m, ET15, ET15m, VIL, maxH, maxHm, POH, RANK, Dvel_x,
+        Dvel_y, cell_contour)
+
 
 def read_trt_traj_data(fname):
     """
@@ -1389,63 +1263,44 @@ def read_lightning(fname, filter_data=True):
 
     """
     try:
-        # get date from file name
-        bfile = os.path.basename(fname)
-        datetimestr = bfile[0:6]
-        fdatetime = datetime.datetime.strptime(datetimestr, '%y%m%d')
-
-        with open(fname, 'r', newline='') as csvfile:
-            # first count the lines
-            reader = csv.DictReader(
-                csvfile, fieldnames=['flashnr', 'time', 'time_in_flash',
-                                     'lat', 'lon', 'alt', 'dBm'],
-                delimiter=' ')
-            nrows = sum(1 for row in reader)
-
-            flashnr = np.ma.empty(nrows, dtype=int)
-            time_in_flash = np.ma.empty(nrows, dtype=float)
-            lat = np.ma.empty(nrows, dtype=float)
-            lon = np.ma.empty(nrows, dtype=float)
-            alt = np.ma.empty(nrows, dtype=float)
-            dBm = np.ma.empty(nrows, dtype=float)
+        fdatetime, data = _read_lightning_csv(fname)
+    except (EnvironmentError, ValueError) as ee:
+        warn(str(ee))
+        warn('Unable to read file ' + fname)
+        return None, None, None, None, None, None, None
 
-            # now read the data
-            csvfile.seek(0)
-            reader = csv.DictReader(
-                csvfile, fieldnames=['flashnr', 'time', 'time_in_flash',
-                                     'lat', 'lon', 'alt', 'dBm'],
-                delimiter=' ')
+    return _lightning_data_to_arrays(data, fdatetime, filter_data=filter_data)
 
-            time_data = []
-            for i, row in enumerate(reader):
-                flashnr[i] = int(row['flashnr'])
-                time_data.append(fdatetime + datetime.timedelta(
-                    seconds=float(row['time'])))
-                time_in_flash[i] = float(row['time_in_flash'])
-                lat[i] = float(row['lat'])
-                lon[i] = float(row['lon'])
-                alt[i] = float(row['alt'])
-                dBm[i] = float(row['dBm'])
 
-            time_data = np.array(time_data)
+def read_lightning_chunks(fname, chunksize=1000000, filter_data=True):
+    """
+    Reads lightning data contained in a text file in chunks of rows. Used
+    to process large files without loading them completely in memory. See
+    read_lightning for the file format
 
-            if filter_data:
-                flashnr_aux = deepcopy(flashnr)
-                flashnr = flashnr[flashnr_aux > 0]
-                time_data = time_data[flashnr_aux > 0]
-                time_in_flash = time_in_flash[flashnr_aux > 0]
-                lat = lat[flashnr_aux > 0]
-                lon = lon[flashnr_aux > 0]
-                alt = alt[flashnr_aux > 0]
-                dBm = dBm[flashnr_aux > 0]
+    Parameters
+    ----------
+    fname : str
+        path of time series file
+    chunksize : int
+        the number of rows read at once
+    filter_data : Boolean
+        if True filter noise (flashnr = 0)
 
-            csvfile.close()
+    Yields
+    ------
+    flashnr, time_data, time_in_flash, lat, lon, alt, dBm : tupple
+        A tupple containing the values read in each chunk
 
-            return flashnr, time_data, time_in_flash, lat, lon, alt, dBm
-    except EnvironmentError as ee:
+    """
+    try:
+        fdatetime, reader = _read_lightning_csv(fname, chunksize=chunksize)
+        for data in reader:
+            yield _lightning_data_to_arrays(
+                data, fdatetime, filter_data=filter_data)
+    except (EnvironmentError, ValueError) as ee:
         warn(str(ee))
         warn('Unable to read file ' + fname)
-        return None, None, None, None, None, None, None
 
 
 def read_meteorage(fname):
@@ -1479,64 +1334,43 @@ def read_meteorage(fname):
 
     """
     try:
-        with open(fname, 'r', newline='') as csvfile:
-            # first count the lines
-            reader = csv.DictReader(
-                csvfile, fieldnames=['date', 'lon', 'lat', 'intens', 'ns',
-                                     'mode', 'intra', 'ax', 'ki2', 'ecc',
-                                     'incl', 'sind', 'par1', 'par2', 'par3',
-                                     'par4'],
-                delimiter='|')
-            nrows = sum(1 for row in reader)
+        data = _read_meteorage_csv(fname)
+    except (EnvironmentError, ValueError) as ee:
+        warn(str(ee))
+        warn('Unable to read file ' + fname)
+        return (
+            None, None, None, None, None, None, None, None, None, None, None,
+            None)
 
-            stroke_time = np.empty(nrows, dtype=datetime.datetime)
-            lon = np.empty(nrows, dtype=float)
-            lat = np.empty(nrows, dtype=float)
-            intens = np.empty(nrows, dtype=float)
-            ns = np.empty(nrows, dtype=int)
-            mode = np.empty(nrows, dtype=int)
-            intra = np.empty(nrows, dtype=int)
-            ax = np.empty(nrows, dtype=float)
-            ki2 = np.empty(nrows, dtype=float)
-            ecc = np.empty(nrows, dtype=float)
-            incl = np.empty(nrows, dtype=float)
-            sind = np.empty(nrows, dtype=int)
+    return _meteorage_data_to_arrays(data)
 
-            # now read the data
-            csvfile.seek(0)
-            reader = csv.DictReader(
-                csvfile, fieldnames=['date', 'lon', 'lat', 'intens', 'ns',
-                                     'mode', 'intra', 'ax', 'ki2', 'ecc',
-                                     'incl', 'sind', 'par1', 'par2', 'par3',
-                                     'par4'],
-                delimiter='|')
 
-            for i, row in enumerate(reader):
-                stroke_time[i] = datetime.datetime.strptime(
-                    row['date'], '%d.%m.%Y %H:%M:%S.%f UTC')
-                lon[i] = float(row['lon'])
-                lat[i] = float(row['lat'])
-                intens[i] = float(row['intens'])
-                ns[i] = int(row['ns'])
-                mode[i] = int(row['mode'])
-                intra[i] = int(row['intra'])
-                ax[i] = float(row['ax'])
-                ki2[i] = float(row['ki2'])
-                ecc[i] = float(row['ecc'])
-                incl[i] = float(row['incl'])
-                sind[i] = int(float(row['sind'])) - 1
+def read_meteorage_chunks(fname, chunksize=1000000):
+    """
+    Reads METEORAGE lightning data contained in a text file in chunks of
+    rows. Used to process large files without loading them completely in
+    memory. See read_meteorage for the file format
 
-            csvfile.close()
+    Parameters
+    ----------
+    fname : str
+        path of time series file
+    chunksize : int
+        the number of rows read at once
 
-            return (
-                stroke_time, lon, lat, intens, ns, mode, intra, ax, ki2, ecc,
-                incl, sind)
-    except EnvironmentError as ee:
+    Yields
+    ------
+    stroke_time, lon, lat, intens, ns, mode, intra, ax, ki2, ecc, incl,
+    sind : tupple
+        A tupple containing the values read in each chunk
+
+    """
+    try:
+        for data in _read_meteorage_csv(fname, chunksize=chunksize):
+            yield _meteorage_data_to_arrays(data)
+    except (EnvironmentError, ValueError) as ee:
         warn(str(ee))
         warn('Unable to read file ' + fname)
-        return (
-            None, None, None, None, None, None, None, None, None, None, None,
-            None)
 
 
 def read_lightning_traj(fname):
@@ -2381,3 +2215,127 @@ def read_fzl_igra(station, dtime):
             slope = (temp[i] - temp[i-1])/(height[i] - height[i-1])
             fzl = - temp[i] / slope + height[i]
             return fzl
+
+
+def _read_lightning_csv(fname, chunksize=None):
+    """
+    Reads the columns of a lightning data file
+
+    Parameters
+    ----------
+    fname : str
+        path of time series file
+    chunksize : int or None
+        if set the file is read in chunks of this number of rows
+
+    Returns
+    -------
+    fdatetime : datetime object
+        the date of the data, obtained from the file name
+    data : DataFrame or iterator of DataFrames
+        the data read
+
+    """
+    # get date from file name
+    bfile = os.path.basename(fname)
+    datetimestr = bfile[0:6]
+    fdatetime = datetime.datetime.strptime(datetimestr, '%y%m%d')
+
+    data = _read_csv_columns(
+        fname, {
+            'flashnr': int, 'time': float, 'time_in_flash': float,
+            'lat': float, 'lon': float, 'alt': float, 'dBm': float},
+        names=['flashnr', 'time', 'time_in_flash', 'lat', 'lon', 'alt',
+               'dBm'],
+        sep=' ', comment=None, chunksize=chunksize)
+
+    return fdatetime, data
+
+
+def _lightning_data_to_arrays(data, fdatetime, filter_data=True):
+    """
+    Converts the lightning data read into arrays
+
+    Parameters
+    ----------
+    data : DataFrame
+        the data read
+    fdatetime : datetime object
+        the date of the data
+    filter_data : Boolean
+        if True filter noise (flashnr = 0)
+
+    Returns
+    -------
+    flashnr, time_data, time_in_flash, lat, lon, alt, dBm : tupple
+        A tupple containing the read values
+
+    """
+    if filter_data:
+        data = data[data['flashnr'].to_numpy() > 0]
+
+    time_data = (
+        pd.Timestamp(fdatetime) +
+        pd.to_timedelta(data['time'].to_numpy(), unit='s').round('us'))
+
+    return (
+        np.ma.asarray(data['flashnr'].to_numpy()),
+        np.asarray(time_data.to_pydatetime(), dtype=object),
+        np.ma.asarray(data['time_in_flash'].to_numpy()),
+        np.ma.asarray(data['lat'].to_numpy()),
+        np.ma.asarray(data['lon'].to_numpy()),
+        np.ma.asarray(data['alt'].to_numpy()),
+        np.ma.asarray(data['dBm'].to_numpy()))
+
+
+def _read_meteorage_csv(fname, chunksize=None):
+    """
+    Reads the columns of a METEORAGE lightning data file
+
+    Parameters
+    ----------
+    fname : str
+        path of time series file
+    chunksize : int or None
+        if set the file is read in chunks of this number of rows
+
+    Returns
+    -------
+    data : DataFrame or iterator of DataFrames
+        the data read
+
+    """
+    return _read_csv_columns(
+        fname, {
+            'date': str, 'lon': float, 'lat': float, 'intens': float,
+            'ns': int, 'mode': int, 'intra': int, 'ax': float, 'ki2': float,
+            'ecc': float, 'incl': float, 'sind': float},
+        names=['date', 'lon', 'lat', 'intens', 'ns', 'mode', 'intra', 'ax',
+               'ki2', 'ecc', 'incl', 'sind', 'par1', 'par2', 'par3', 'par4'],
+        sep='|', comment=None, chunksize=chunksize)
+
+
+def _meteorage_data_to_arrays(data):
+    """
+    Converts the METEORAGE lightning data read into arrays
+
+    Parameters
+    ----------
+    data : DataFrame
+        the data read
+
+    Returns
+    -------
+    stroke_time, lon, lat, intens, ns, mode, intra, ax, ki2, ecc, incl,
+    sind : tupple
+        A tupple containing the read values
+
+    """
+    return (
+        _to_datetime_array(data['date'], '%d.%m.%Y %H:%M:%S.%f UTC'),
+        data['lon'].to_numpy(), data['lat'].to_numpy(),
+        data['intens'].to_numpy(), data['ns'].to_numpy(),
+        data['mode'].to_numpy(), data['intra'].to_numpy(),
+        data['ax'].to_numpy(), data['ki2'].to_numpy(),
+        data['ecc'].to_numpy(), data['incl'].to_numpy(),
+        data['sind'].to_numpy().astype(int) - 1)
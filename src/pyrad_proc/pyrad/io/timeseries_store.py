@@ -0,0 +1,337 @@
+"""
+pyrad.io.timeseries_store
+=========================
+
+Append-only binary store for the time series written by pyrad. The columns
+of the time series are kept in extendable HDF5 datasets so that new samples
+are appended without rewriting the file and the readers convert the data
+without parsing text. Files with extension .h5 passed to the time series
+writers and readers use this store instead of csv
+
+.. autosummary::
+    :toctree: generated/
+
+    is_ts_store
+    write_ts_store
+    read_ts_store
+    ts_store_to_csv
+
+"""
+
+import os
+import csv
+import datetime
+from contextlib import contextmanager
+from warnings import warn
+
+import numpy as np
+
+try:
+    import fcntl
+    _FCNTL_AVAILABLE = True
+except ImportError:
+    _FCNTL_AVAILABLE = False
+
+try:
+    import h5py
+    _H5PY_AVAILABLE = True
+except ImportError:
+    _H5PY_AVAILABLE = False
+
+# extension of the files using the store
+TS_STORE_EXT = 'h5'
+
+# datetime columns are stored as microseconds since this epoch
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+# number of rows of the chunks of the HDF5 datasets
+_CHUNK_ROWS = 1024
+
+
+def is_ts_store(fname):
+    """
+    Checks whether a time series file uses the binary store
+
+    Parameters
+    ----------
+    fname : str
+        the file name
+
+    Returns
+    -------
+    is_store : bool
+        True if the file uses the binary store
+
+    """
+    return fname.endswith('.' + TS_STORE_EXT)
+
+
+def write_ts_store(fname, data, header='', datetime_formats=None,
+                   rewrite=False):
+    """
+    Appends samples to a time series store. The file is created if it does
+    not exist. The samples become visible to the readers only once they have
+    been completely written
+
+    Parameters
+    ----------
+    fname : str
+        the file name
+    data : dict of arrays
+        the columns of the samples to append. Their order is the order of
+        the columns in the csv export. Columns of datetime objects are
+        supported
+    header : str
+        the comment lines written at the top of the csv export
+    datetime_formats : dict or None
+        format of the datetime columns in the csv export
+    rewrite : bool
+        if True a new file is created
+
+    Returns
+    -------
+    fname : str or None
+        the name of the file written. None if it could not be written
+
+    """
+    if not _H5PY_AVAILABLE:
+        warn('h5py is required to write time series file ' + fname)
+        return None
+    if datetime_formats is None:
+        datetime_formats = dict()
+
+    datetime_columns = [
+        name for name, values in data.items()
+        if isinstance(np.atleast_1d(values)[0], datetime.datetime)]
+    columns = {
+        name: _to_store_array(values) for name, values in data.items()}
+    nsamples = len(next(iter(columns.values())))
+
+    with _lock(fname, exclusive=True):
+        if rewrite or not os.path.isfile(fname):
+            # a new file appears complete to the readers
+            fname_tmp = f'{fname}.{os.getpid()}.tmp'
+            with h5py.File(fname_tmp, 'w') as h5file:
+                h5file.attrs['header'] = header
+                h5file.attrs['columns'] = list(columns.keys())
+                h5file.attrs['nrows'] = 0
+                for name, values in columns.items():
+                    dset = h5file.create_dataset(
+                        name, shape=(0,), maxshape=(None,),
+                        dtype=values.dtype, chunks=(_CHUNK_ROWS,))
+                    if name in datetime_columns:
+                        dset.attrs['units'] = (
+                            'microseconds since ' + _EPOCH.isoformat())
+                        dset.attrs['csv_format'] = datetime_formats.get(
+                            name, '%Y-%m-%d %H:%M:%S')
+                _append_rows(h5file, columns, nsamples)
+            os.replace(fname_tmp, fname)
+            return fname
+
+        with h5py.File(fname, 'a') as h5file:
+            missing = [
+                name for name in h5file.attrs['columns']
+                if name not in columns]
+            if missing:
+                warn('Columns ' + ', '.join(missing) + ' missing. ' +
+                     'Unable to append data to ' + fname)
+                return None
+            _append_rows(h5file, columns, nsamples)
+
+    return fname
+
+
+def read_ts_store(fname, columns=None, start=0):
+    """
+    Reads a time series store
+
+    Parameters
+    ----------
+    fname : str
+        the file name
+    columns : list of str or None
+        the columns to read. If None all the columns are read
+    start : int
+        index of the first sample read. Used to read only the samples
+        appended since a previous read
+
+    Returns
+    -------
+    data : dict of arrays or None
+        the columns read. Datetime columns are arrays of datetime objects.
+        None if the file could not be read
+    nrows : int
+        the total number of samples in the file
+
+    """
+    if not _H5PY_AVAILABLE:
+        warn('h5py is required to read time series file ' + fname)
+        return None, 0
+
+    try:
+        with _lock(fname, exclusive=False):
+            with h5py.File(fname, 'r') as h5file:
+                nrows = int(h5file.attrs['nrows'])
+                if columns is None:
+                    columns = list(h5file.attrs['columns'])
+                data = dict()
+                for name in columns:
+                    dset = h5file[name]
+                    values = dset[start:nrows]
+                    if 'units' in dset.attrs:
+                        values = _from_store_datetime(values)
+                    data[name] = values
+    except (OSError, KeyError) as ee:
+        warn(str(ee))
+        warn('Unable to read file ' + fname)
+        return None, 0
+
+    return data, nrows
+
+
+def ts_store_to_csv(fname, fname_csv=None):
+    """
+    Exports a time series store to a csv file with the same layout as the
+    csv files written by pyrad
+
+    Parameters
+    ----------
+    fname : str
+        the file name of the store
+    fname_csv : str or None
+        the name of the csv file. If None the extension of the store is
+        replaced by csv
+
+    Returns
+    -------
+    fname_csv : str or None
+        the name of the csv file written. None if the store could not be
+        read
+
+    """
+    if fname_csv is None:
+        fname_csv = os.path.splitext(fname)[0] + '.csv'
+
+    data, _ = read_ts_store(fname)
+    if data is None:
+        return None
+    with _lock(fname, exclusive=False):
+        with h5py.File(fname, 'r') as h5file:
+            header = h5file.attrs['header']
+            datetime_formats = {
+                name: h5file[name].attrs['csv_format']
+                for name in data if 'csv_format' in h5file[name].attrs}
+
+    for name, fmt in datetime_formats.items():
+        data[name] = [dtime.strftime(fmt) for dtime in data[name]]
+
+    with open(fname_csv, 'w', newline='') as csvfile:
+        csvfile.write(header)
+        writer = csv.writer(csvfile)
+        writer.writerow(data.keys())
+        writer.writerows(zip(*[
+            values if isinstance(values, list) else values.tolist()
+            for values in data.values()]))
+
+    return fname_csv
+
+
+def _append_rows(h5file, columns, nsamples):
+    """
+    Appends samples to the datasets of an open store. The number of rows is
+    updated last so that readers never see partially written samples
+
+    Parameters
+    ----------
+    h5file : h5py.File
+        the open file
+    columns : dict of arrays
+        the columns to append
+    nsamples : int
+        the number of samples
+
+    """
+    nrows = int(h5file.attrs['nrows'])
+    for name in h5file.attrs['columns']:
+        dset = h5file[name]
+        dset.resize((nrows + nsamples,))
+        dset[nrows:] = columns[name]
+    h5file.flush()
+    h5file.attrs['nrows'] = nrows + nsamples
+    h5file.flush()
+
+
+def _to_store_array(values):
+    """
+    Converts a column into an array that can be stored
+
+    Parameters
+    ----------
+    values : array like
+        the column
+
+    Returns
+    -------
+    values : array
+        the array. Datetime objects are converted into microseconds since
+        the epoch
+
+    """
+    values = np.ma.getdata(np.atleast_1d(np.asarray(values)))
+    if isinstance(values[0], datetime.datetime):
+        return (
+            values.astype('datetime64[us]') -
+            np.datetime64(_EPOCH, 'us')).astype(np.int64)
+    return values
+
+
+def _from_store_datetime(values):
+    """
+    Converts the stored microseconds since the epoch into datetime objects
+
+    Parameters
+    ----------
+    values : array of ints
+        the stored values
+
+    Returns
+    -------
+    dates : array of datetime objects
+        the dates
+
+    """
+    return (
+        np.datetime64(_EPOCH, 'us') +
+        values.astype('timedelta64[us]')).astype(object)
+
+
+@contextmanager
+def _lock(fname, exclusive=True):
+    """
+    Locks a time series store. The lock is taken on a separate file so that
+    it also protects the creation and replacement of the store
+
+    Parameters
+    ----------
+    fname : str
+        the file name of the store
+    exclusive : bool
+        if True an exclusive (write) lock is taken, otherwise a shared one
+
+    """
+    if not _FCNTL_AVAILABLE:
+        yield
+        return
+
+    lockfname = fname + '.lock'
+    if not exclusive and not os.path.isfile(lockfname):
+        # nothing has been written yet
+        yield
+        return
+    with open(lockfname, 'a') as lockfile:
+        fcntl.flock(
+            lockfile, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lockfile, fcntl.LOCK_UN)
@@ -437,13 +437,6 @@ class Trajectory():
             raise Exception("ERROR: Could not find|open trajectory file '" +
                             self.filename + "'")
 
-        recording_started = True
-        if self.starttime is not None:
-            recording_started = False
-        recording_check_stop = False
-        if self.endtime is not None:
-            recording_check_stop = True
-
         if flashnr > 0:
             flashnr_vec_aux = deepcopy(flashnr_vec)
             flashnr_vec = flashnr_vec[flashnr_vec_aux == flashnr]
@@ -454,27 +447,34 @@ class Trajectory():
             alt = alt[flashnr_vec_aux == flashnr]
             dBm = dBm[flashnr_vec_aux == flashnr]
 
-        for i, dBm_val in enumerate(dBm):
-
-            if not recording_started:
-                if time[i] < self.starttime:
-                    continue
-                recording_started = True
-
-            if recording_check_stop:
-                if time[i] > self.endtime:
-                    break
-
-            self.flashnr_vec = np.append(self.flashnr_vec, [flashnr_vec[i]])
-            self.time_vector = np.append(self.time_vector, [time[i]])
-            self.time_in_flash = np.append(
-                self.time_in_flash, [time_in_flash[i]])
-
-            self.wgs84_lat_deg = np.append(self.wgs84_lat_deg, [lat[i]])
-            self.wgs84_lon_deg = np.append(self.wgs84_lon_deg, [lon[i]])
-            self.wgs84_alt_m = np.append(self.wgs84_alt_m, [alt[i]])
-
-            self.dBm = np.append(self.dBm, [dBm_val])
+        # the recording starts at the first sample not before the start
+        # time and stops at the first sample after the end time
+        ind_start = 0
+        if self.starttime is not None:
+            ind_started = np.where(time >= self.starttime)[0]
+            ind_start = time.size
+            if ind_started.size > 0:
+                ind_start = ind_started[0]
+        ind_end = time.size
+        if self.endtime is not None:
+            ind_stop = np.where(time[ind_start:] > self.endtime)[0]
+            if ind_stop.size > 0:
+                ind_end = ind_start + ind_stop[0]
+
+        self.flashnr_vec = np.append(
+            self.flashnr_vec, flashnr_vec[ind_start:ind_end])
+        self.time_vector = np.append(
+            self.time_vector, time[ind_start:ind_end])
+        self.time_in_flash = np.append(
+            self.time_in_flash, time_in_flash[ind_start:ind_end])
+
+        self.wgs84_lat_deg = np.append(
+            self.wgs84_lat_deg, lat[ind_start:ind_end])
+        self.wgs84_lon_deg = np.append(
+            self.wgs84_lon_deg, lon[ind_start:ind_end])
+        self.wgs84_alt_m = np.append(self.wgs84_alt_m, alt[ind_start:ind_end])
+
+        self.dBm = np.append(self.dBm, dBm[ind_start:ind_end])
 
         self.nsamples = len(self.time_vector)
 
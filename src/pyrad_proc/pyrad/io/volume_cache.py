@@ -0,0 +1,421 @@
+"""
+pyrad.io.volume_cache
+=====================
+
+Cache of the decoded radar data files. Used to avoid decoding the same
+files again when several configurations process the same volumes
+
+.. autosummary::
+    :toctree: generated/
+
+    VolumeCache
+    get_volume_cache
+
+"""
+
+import os
+import json
+import pickle
+import shutil
+import hashlib
+import threading
+from copy import deepcopy
+from collections import OrderedDict
+from warnings import warn
+
+import numpy as np
+
+# caches shared by all the configurations processed by the same process
+_VOLUME_CACHES = dict()
+_VOLUME_CACHES_LOCK = threading.Lock()
+
+
+def get_volume_cache(cachedir=None, mem_size=512., disk_size=4096.):
+    """
+    Gets the volume cache of the current process corresponding to a cache
+    directory. The cache is created the first time it is requested so that
+    all the configurations processed by the process share it
+
+    Parameters
+    ----------
+    cachedir : str or None
+        directory where the decoded files are stored. If None the files are
+        only kept in memory
+    mem_size : float
+        maximum size of the data kept in memory [MB]
+    disk_size : float
+        maximum size of the data stored in the cache directory [MB]
+
+    Returns
+    -------
+    cache : VolumeCache
+        the cache
+
+    """
+    with _VOLUME_CACHES_LOCK:
+        cache = _VOLUME_CACHES.get(cachedir, None)
+        if cache is None:
+            cache = VolumeCache(
+                cachedir=cachedir, mem_size=mem_size, disk_size=disk_size)
+            _VOLUME_CACHES[cachedir] = cache
+    return cache
+
+
+class VolumeCache:
+    """
+    Cache of the radar objects obtained by decoding data files. The entries
+    are identified by the path, modification time and size of the file and
+    by the arguments used to decode it (data types, scan, reader options),
+    so that a file modified after being cached is decoded again.
+
+    The radar objects most recently stored are kept in memory. If a cache
+    directory is given they are also stored there, one directory per entry
+    with the metadata pickled and each field as numpy files that are
+    memory-mapped (copy-on-write) when read. The entries read from the
+    directory are not copied to memory. The directory can be shared by
+    several processes. The least recently used entries are removed when the
+    size limits are exceeded.
+
+    Attributes
+    ----------
+    cachedir : str or None
+        directory where the decoded files are stored
+    mem_size : float
+        maximum size of the data kept in memory [MB]
+    disk_size : float
+        maximum size of the data stored in the cache directory [MB]
+    stats : dict
+        number of memory hits, disk hits and misses
+
+    """
+
+    def __init__(self, cachedir=None, mem_size=512., disk_size=4096.):
+        """
+        initalize the object
+
+        Parameters
+        ----------
+        cachedir : str or None
+            directory where the decoded files are stored. If None the files
+            are only kept in memory
+        mem_size : float
+            maximum size of the data kept in memory [MB]
+        disk_size : float
+            maximum size of the data stored in the cache directory [MB]
+
+        """
+        self.cachedir = cachedir
+        self.mem_size = mem_size
+        self.disk_size = disk_size
+        self._init_state()
+        if self.cachedir is not None:
+            os.makedirs(self.cachedir, exist_ok=True)
+
+    def _init_state(self):
+        """ initializes the in-memory cache and the counters """
+        self._lock = threading.Lock()
+        # key -> (radar, size in bytes)
+        self._entries = OrderedDict()
+        self._mem_used = 0
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+
+    def __deepcopy__(self, memo):
+        """ The cache is shared by all the copies of the configuration """
+        return self
+
+    def __getstate__(self):
+        """ Only the configuration is sent to other processes """
+        return {
+            'cachedir': self.cachedir, 'mem_size': self.mem_size,
+            'disk_size': self.disk_size}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_state()
+
+    def get_key(self, filename, *args, **kwargs):
+        """
+        Gets the key of the entry corresponding to a file decoded with some
+        arguments
+
+        Parameters
+        ----------
+        filename : str
+            the data file
+        args, kwargs : arguments
+            the other arguments used to decode the file. They must be
+            serializable in JSON. Other objects are only identified by their
+            type
+
+        Returns
+        -------
+        key : str or None
+            the key of the entry. None if the file does not exist
+
+        """
+        try:
+            fstat = os.stat(filename)
+        except OSError:
+            return None
+
+        key_str = json.dumps(
+            [os.path.abspath(filename), fstat.st_mtime_ns, fstat.st_size,
+             args, kwargs],
+            sort_keys=True, default=lambda value: type(value).__name__)
+        return hashlib.sha1(key_str.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """
+        Gets a copy of the radar object of an entry. The fields of entries
+        read from the cache directory are copy-on-write views of the
+        memory-mapped files, so that only the data used are read and the
+        changes made by the caller are not written to the cache
+
+        Parameters
+        ----------
+        key : str
+            the key of the entry
+
+        Returns
+        -------
+        radar : radar object or None
+            the radar object. None if the entry is not in the cache
+
+        """
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats['memory_hits'] += 1
+        if entry is not None:
+            return deepcopy(entry[0])
+
+        # the radar object read is not shared with anyone else. It is not
+        # kept in memory since copying it would read the whole files
+        radar = self._read_entry(key)
+        with self._lock:
+            if radar is None:
+                self.stats['misses'] += 1
+                return None
+            self.stats['disk_hits'] += 1
+
+        return radar
+
+    def put(self, key, radar):
+        """
+        Stores a radar object in the cache
+
+        Parameters
+        ----------
+        key : str
+            the key of the entry
+        radar : radar object
+            the radar object. It is copied
+
+        """
+        if radar is None:
+            return
+
+        radar = deepcopy(radar)
+        self._put_memory(key, radar)
+        if self.cachedir is not None:
+            self._write_entry(key, radar)
+
+    def get_stats(self):
+        """
+        Gets the hit and miss counters and the memory used
+
+        Returns
+        -------
+        stats : dict
+            the counters
+
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats['memory_used_MB'] = self._mem_used / 1e6
+            stats['memory_entries'] = len(self._entries)
+        return stats
+
+    def _put_memory(self, key, radar):
+        """
+        Keeps a radar object in memory, removing the least recently used
+        ones if the memory limit is exceeded
+
+        Parameters
+        ----------
+        key : str
+            the key of the entry
+        radar : radar object
+            the radar object
+
+        """
+        size = _get_radar_size(radar)
+        if size > self.mem_size * 1e6:
+            return
+        with self._lock:
+            old_entry = self._entries.pop(key, None)
+            if old_entry is not None:
+                self._mem_used -= old_entry[1]
+            self._entries[key] = (radar, size)
+            self._mem_used += size
+            while self._mem_used > self.mem_size * 1e6:
+                _, (_, size_old) = self._entries.popitem(last=False)
+                self._mem_used -= size_old
+
+    def _get_entry_dir(self, key):
+        """ directory of an entry in the cache directory """
+        return os.path.join(self.cachedir, key[:2], key)
+
+    def _read_entry(self, key):
+        """
+        Reads an entry from the cache directory
+
+        Parameters
+        ----------
+        key : str
+            the key of the entry
+
+        Returns
+        -------
+        radar : radar object or None
+            the radar object. None if the entry is not in the directory
+
+        """
+        if self.cachedir is None:
+            return None
+        entrydir = self._get_entry_dir(key)
+        metafile = os.path.join(entrydir, 'meta.pkl')
+        try:
+            with open(metafile, 'rb') as fid:
+                radar, fields = pickle.load(fid)
+            for ind, (field_name, field_dict) in enumerate(fields.items()):
+                # views of the memory-mapped files. The data are read when
+                # used
+                data = np.asarray(np.load(
+                    os.path.join(entrydir, f'{ind}.npy'), mmap_mode='c'))
+                maskfile = os.path.join(entrydir, f'{ind}_mask.npy')
+                mask = np.ma.nomask
+                if os.path.isfile(maskfile):
+                    mask = np.asarray(np.load(maskfile, mmap_mode='c'))
+                field_dict['data'] = np.ma.masked_array(
+                    data, mask=mask, fill_value=field_dict.pop(
+                        '_fill_value', None))
+                radar.fields[field_name] = field_dict
+            # the access time is used to evict the least recently used
+            # entries
+            os.utime(metafile)
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError) as ee:
+            if os.path.isdir(entrydir):
+                warn('Unable to read volume cache entry ' + entrydir +
+                     ': ' + str(ee))
+            return None
+
+        return radar
+
+    def _write_entry(self, key, radar):
+        """
+        Writes an entry in the cache directory
+
+        Parameters
+        ----------
+        key : str
+            the key of the entry
+        radar : radar object
+            the radar object
+
+        """
+        entrydir = self._get_entry_dir(key)
+        if os.path.isdir(entrydir):
+            return
+        tmpdir = f'{entrydir}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            os.makedirs(tmpdir, exist_ok=True)
+            fields = dict()
+            for ind, (field_name, field_dict) in enumerate(
+                    radar.fields.items()):
+                data = field_dict['data']
+                np.save(os.path.join(tmpdir, f'{ind}.npy'),
+                        np.ma.getdata(data))
+                if np.ma.is_masked(data):
+                    np.save(os.path.join(tmpdir, f'{ind}_mask.npy'),
+                            np.ma.getmaskarray(data))
+                fields[field_name] = {
+                    key_field: value for key_field, value in field_dict.items()
+                    if key_field != 'data'}
+                if np.ma.isMaskedArray(data):
+                    fields[field_name]['_fill_value'] = data.fill_value
+
+            radar_meta = radar.fields
+            radar.fields = dict()
+            try:
+                with open(os.path.join(tmpdir, 'meta.pkl'), 'wb') as fid:
+                    pickle.dump((radar, fields), fid)
+            finally:
+                radar.fields = radar_meta
+
+            # the entry appears complete to the other processes
+            os.replace(tmpdir, entrydir)
+        except OSError as ee:
+            warn('Unable to write volume cache entry ' + entrydir + ': ' +
+                 str(ee))
+            shutil.rmtree(tmpdir, ignore_errors=True)
+            return
+
+        self._evict_disk()
+
+    def _evict_disk(self):
+        """
+        Removes the least recently used entries of the cache directory
+        until its size is below the limit
+
+        """
+        entries = []
+        total_size = 0
+        for subdir in os.scandir(self.cachedir):
+            if not subdir.is_dir():
+                continue
+            for entry in os.scandir(subdir.path):
+                if not entry.is_dir() or entry.name.endswith('.tmp'):
+                    continue
+                try:
+                    size = sum(
+                        fentry.stat().st_size
+                        for fentry in os.scandir(entry.path))
+                    atime = os.stat(
+                        os.path.join(entry.path, 'meta.pkl')).st_mtime
+                except OSError:
+                    continue
+                entries.append((atime, size, entry.path))
+                total_size += size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self.disk_size * 1e6:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total_size -= size
+
+
+def _get_radar_size(radar):
+    """
+    Gets the memory used by the fields of a radar object
+
+    Parameters
+    ----------
+    radar : radar object
+        the radar object
+
+    Returns
+    -------
+    size : int
+        the size [bytes]
+
+    """
+    size = 0
+    for field_dict in radar.fields.values():
+        data = field_dict['data']
+        size += np.ma.getdata(data).nbytes
+        if np.ma.is_masked(data):
+            size += np.ma.getmaskarray(data).nbytes
+    return size
@@ -17,6 +17,7 @@ Functions for writing pyrad output data
     send_msg
     write_alarm_msg
     write_last_state
+    write_checkpoint
     write_smn
     write_timeseries_point
     write_trt_info
@@ -54,6 +55,7 @@ from __future__ import print_function
 import glob
 import csv
 import os
+import pickle
 
 from urllib.parse import urlparse
 from warnings import warn
@@ -77,6 +79,7 @@ from pyart.core import antenna_to_cartesian, cartesian_to_geographic_aeqd
 from pyart.graph.cm import cmap_d
 
 from .io_aux import generate_field_name_str
+from .timeseries_store import is_ts_store, write_ts_store
 
 try:
     import simplekml
@@ -624,6 +627,39 @@ def write_last_state(datetime_last, fname):
         return None
 
 
+def write_checkpoint(checkpoint, fname):
+    """
+    writes the checkpoint of the processing. The file is replaced atomically
+    so that a crash while writing does not corrupt the previous checkpoint
+
+    Parameters
+    ----------
+    checkpoint : dict
+        dictionary containing the state of the processing
+    fname : str
+        file name where to store the data
+
+    Returns
+    -------
+    fname : str
+        the name of the file where data has written
+
+    """
+    fname_tmp = fname + '.tmp'
+    try:
+        with open(fname_tmp, 'wb') as picklefile:
+            pickle.dump(checkpoint, picklefile,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(fname_tmp, fname)
+
+        return fname
+    except (EnvironmentError, pickle.PicklingError, TypeError,
+            AttributeError) as ee:
+        warn(str(ee))
+        warn('Unable to write on file ' + fname)
+        return None
+
+
 def write_smn(datetime_vec, value_avg_vec, value_std_vec, fname):
     """
     writes SwissMetNet data in format datetime,avg_value, std_value
@@ -1704,6 +1740,35 @@ def write_ts_polar_data(dataset, fname):
     """
     filelist = glob.glob(fname)
     nsamples = len(dataset['used_antenna_coordinates_az_el_r'][0])
+    if is_ts_store(fname):
+        if nsamples > 1:
+            start_time = dataset['time'][0]
+        else:
+            start_time = dataset['time']
+        header = (
+            '# Weather radar timeseries data file\n' +
+            '# Comment lines are preceded by "#"\n' +
+            '# Description: \n' +
+            '# Time series of a weather radar data over a fixed location.\n' +
+            '# Location [lon, lat, alt]: ' +
+            str(dataset['point_coordinates_WGS84_lon_lat_alt']) + '\n' +
+            '# Nominal antenna coordinates used [az, el, r]: ' +
+            str(dataset['antenna_coordinates_az_el_r']) + '\n' +
+            '# Data: ' + generate_field_name_str(dataset['datatype']) + '\n' +
+            '# Fill Value: ' + str(get_fillvalue()) + '\n' +
+            '# Start: ' + start_time.strftime('%Y-%m-%d %H:%M:%S UTC') +
+            '\n' +
+            '#\n')
+        return write_ts_store(
+            fname, {
+                'date': dataset['time'],
+                'az': dataset['used_antenna_coordinates_az_el_r'][0],
+                'el': dataset['used_antenna_coordinates_az_el_r'][1],
+                'r': dataset['used_antenna_coordinates_az_el_r'][2],
+                'value': np.ma.filled(
+                    dataset['value'], fill_value=get_fillvalue())},
+            header=header)
+
     if not filelist:
         with open(fname, 'w', newline='') as csvfile:
             if nsamples > 1:
@@ -1800,6 +1865,32 @@ def write_ts_grid_data(dataset, fname):
         the name of the file where data has written
 
     """
+    if is_ts_store(fname):
+        header = (
+            '# Gridded data timeseries data file\n' +
+            '# Comment lines are preceded by "#"\n' +
+            '# Description: \n' +
+            '# Time series of a gridded data over a fixed location.\n' +
+            '# Nominal location [lon, lat, alt]: ' +
+            str(dataset['point_coordinates_WGS84_lon_lat_alt']) + '\n' +
+            '# Grid points used [iz, iy, ix]: ' +
+            str(dataset['grid_points_iz_iy_ix']) + '\n' +
+            '# Data: ' + generate_field_name_str(dataset['datatype']) + '\n' +
+            '# Fill Value: ' + str(get_fillvalue()) + '\n' +
+            '# Start: ' +
+            dataset['time'].strftime('%Y-%m-%d %H:%M:%S UTC') + '\n' +
+            '#\n')
+        return write_ts_store(
+            fname, {
+                'date': dataset['time'],
+                'lon': dataset['used_coordinates_WGS84_lon_lat_alt'][0],
+                'lat': dataset['used_coordinates_WGS84_lon_lat_alt'][1],
+                'alt': dataset['used_coordinates_WGS84_lon_lat_alt'][2],
+                'value': np.ma.filled(
+                    dataset['value'], fill_value=get_fillvalue())},
+            header=header,
+            datetime_formats={'date': '%Y-%m-%d %H:%M:%S.%f'})
+
     filelist = glob.glob(fname)
     if not filelist:
         with open(fname, 'w', newline='') as csvfile:
@@ -2086,6 +2177,38 @@ def write_monitoring_ts(start_time, np_t, values, quantiles, datatype, fname,
         values_aux = values.filled(fill_value=get_fillvalue())
         np_t_aux = np_t
 
+    header = ('# Weather radar monitoring timeseries data file\n' +
+              '# Comment lines are preceded by "#"\n' +
+              '# Description: \n' +
+              '# Time series of a monitoring of weather radar data.\n' +
+              '# Quantiles: ' +
+              str(quantiles[1]) +
+              ', ' +
+              str(quantiles[0]) +
+              ', ' +
+              str(quantiles[2]) +
+              ' percent.\n' +
+              '# Data: ' +
+              generate_field_name_str(datatype) +
+              '\n' +
+              '# Fill Value: ' +
+              str(get_fillvalue()) +
+              '\n' +
+              '# Start: ' +
+              start_time_aux[0].strftime('%Y-%m-%d %H:%M:%S UTC') +
+              '\n' +
+              '#\n')
+
+    if is_ts_store(fname):
+        return write_ts_store(
+            fname, {
+                'date': start_time_aux, 'NP': np_t_aux,
+                'central_quantile': values_aux[:, 1],
+                'low_quantile': values_aux[:, 0],
+                'high_quantile': values_aux[:, 2]},
+            header=header, datetime_formats={'date': '%Y%m%d%H%M%S'},
+            rewrite=rewrite)
+
     if rewrite:
         file_exists = False
     else:
@@ -2129,27 +2252,7 @@ def write_monitoring_ts(start_time, np_t, values, quantiles, datatype, fname,
                         else:
                             raise
 
-            csvfile.write('# Weather radar monitoring timeseries data file\n' +
-                          '# Comment lines are preceded by "#"\n' +
-                          '# Description: \n' +
-                          '# Time series of a monitoring of weather radar data.\n' +
-                          '# Quantiles: ' +
-                          str(quantiles[1]) +
-                          ', ' +
-                          str(quantiles[0]) +
-                          ', ' +
-                          str(quantiles[2]) +
-                          ' percent.\n' +
-                          '# Data: ' +
-                          generate_field_name_str(datatype) +
-                          '\n' +
-                          '# Fill Value: ' +
-                          str(get_fillvalue()) +
-                          '\n' +
-                          '# Start: ' +
-                          start_time_aux[0].strftime('%Y-%m-%d %H:%M:%S UTC') +
-                          '\n' +
-                          '#\n')
+            csvfile.write(header)
 
             fieldnames = ['date', 'NP', 'central_quantile', 'low_quantile',
                           'high_quantile']
@@ -2330,6 +2433,35 @@ def write_intercomp_scores_ts(start_time, stats, field_name, fname,
         start_time_aux = np.asarray(start_time)
         np_t = stats['npoints']
 
+    header = (
+        '# Weather radar intercomparison scores timeseries file\n' +
+        '# Comment lines are preceded by "#"\n' +
+        '# Description: \n' +
+        '# Time series of the intercomparison between two radars.\n' +
+        '# Radar 1: ' + rad1_name + '\n' +
+        '# Radar 2: ' + rad2_name + '\n' +
+        '# Field name: ' + field_name + '\n' +
+        '# Fill Value: ' + str(get_fillvalue()) + '\n' +
+        '# Start: ' + start_time_aux[0].strftime(
+            '%Y-%m-%d %H:%M:%S UTC') + '\n' +
+        '#\n')
+
+    if is_ts_store(fname):
+        return write_ts_store(
+            fname, {
+                'date': start_time_aux, 'NP': np_t,
+                'mean_bias': meanbias,
+                'median_bias': medianbias,
+                'quant25_bias': quant25bias,
+                'quant75_bias': quant75bias,
+                'mode_bias': modebias,
+                'corr': corr,
+                'slope_of_linear_regression': slope,
+                'intercep_of_linear_regression': intercep,
+                'intercep_of_linear_regression_of_slope_1': intercep_slope_1},
+            header=header, datetime_formats={'date': '%Y%m%d%H%M%S'},
+            rewrite=rewrite)
+
     if rewrite:
         file_exists = False
     else:
@@ -2374,18 +2506,7 @@ def write_intercomp_scores_ts(start_time, stats, field_name, fname,
                             raise
 
 
-            csvfile.write(
-                '# Weather radar intercomparison scores timeseries file\n' +
-                '# Comment lines are preceded by "#"\n' +
-                '# Description: \n' +
-                '# Time series of the intercomparison between two radars.\n' +
-                '# Radar 1: ' + rad1_name + '\n' +
-                '# Radar 2: ' + rad2_name + '\n' +
-                '# Field name: ' + field_name + '\n' +
-                '# Fill Value: ' + str(get_fillvalue()) + '\n' +
-                '# Start: ' + start_time_aux[0].strftime(
-                    '%Y-%m-%d %H:%M:%S UTC') + '\n' +
-                '#\n')
+            csvfile.write(header)
 
             fieldnames = ['date', 'NP', 'mean_bias', 'median_bias',
                           'quant25_bias', 'quant75_bias', 'mode_bias', 'corr',
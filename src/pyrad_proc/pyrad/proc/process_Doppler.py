@@ -43,6 +43,7 @@ from ..io.io_aux import get_datatype_fields, get_fieldname_pyart, convert_pydda_
 from ..io import read_radiosounding_igra
 from .process_grid import process_grid
 from ..util import compute_average_vad
+from ..util.radar_utils import get_radar_skeleton
 
 
 def process_turbulence(procstatus, dscfg, radar_list=None):
@@ -150,8 +151,7 @@ def process_turbulence(procstatus, dscfg, radar_list=None):
 
     rng_res = (radar.range['data'][1] - radar.range['data'][0]) / 1000.
 
-    radar_out = deepcopy(radar)
-    radar_out.fields = dict()
+    radar_out = get_radar_skeleton(radar)
     radar_out.add_field(refl_field, deepcopy(radar.fields[refl_field]))
     radar_out.add_field(width_field, deepcopy(radar.fields[width_field]))
     radar_out.fields[refl_field]['data'][
@@ -285,8 +285,7 @@ def process_dealias_fourdd(procstatus, dscfg, radar_list=None):
                 mask, corr_vel_dict['data'])
 
     # prepare for exit
-    radar_out = deepcopy(radar)
-    radar_out.fields = dict()
+    radar_out = get_radar_skeleton(radar)
     radar_out.add_field(corr_vel_field, corr_vel_dict)
     new_dataset = {'radar_out': radar_out}
 
@@ -378,8 +377,7 @@ def process_dealias_region_based(procstatus, dscfg, radar_list=None):
         vel_field=vel_field, corr_vel_field=corr_vel_field)
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field(corr_vel_field, corr_vel_dict)
 
     return new_dataset, ind_rad
@@ -447,8 +445,7 @@ def process_dealias_unwrap_phase(procstatus, dscfg, radar_list=None):
         vel_field=vel_field, corr_vel_field=corr_vel_field, skip_checks=False)
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field(corr_vel_field, corr_vel_dict)
 
     return new_dataset, ind_rad
@@ -575,8 +572,7 @@ def process_radial_velocity(procstatus, dscfg, radar_list=None):
         np.cos(ele_2D_rad) + np.sin(ele_2D_rad) * v_speed)
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field('velocity', r_speed)
 
     return new_dataset, ind_rad
@@ -637,8 +633,7 @@ def process_wind_vel(procstatus, dscfg, radar_list=None):
         wind_field=wind_field)
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field(wind_field, wind)
 
     return new_dataset, ind_rad
@@ -697,8 +692,7 @@ def process_windshear(procstatus, dscfg, radar_list=None):
         windshear_field=windshear_field)
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field(windshear_field, windshear)
 
     return new_dataset, ind_rad
@@ -757,8 +751,7 @@ def process_windshear_lidar(procstatus, dscfg, radar_list=None):
         windshear_field=windshear_field)
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field(windshear_field, windshear)
 
     return new_dataset, ind_rad
@@ -823,8 +816,7 @@ def process_vad(procstatus, dscfg, radar_list=None):
          vel_diff_field='velocity_difference')
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field('eastward_wind_component', u_vel_dict)
     new_dataset['radar_out'].add_field('northward_wind_component', v_vel_dict)
     new_dataset['radar_out'].add_field('vertical_wind_component', w_vel_dict)
@@ -22,6 +22,7 @@ determined points or regions of interest.
     process_moving_azimuthal_average
     process_radar_resampling
     _get_values_antenna_pattern
+    _get_resampling_index
     _create_target_radar
 
 """
@@ -50,12 +51,17 @@ from ..io.io_aux import get_datatype_fields, get_fieldname_pyart
 from ..io.read_data_sensor import read_trt_traj_data
 from ..io.read_data_other import read_antenna_pattern
 from ..io.read_data_icon import _put_radar_in_swiss_coord
+from ..io.grid_index import get_grid_index_cache, get_grid_index_key
 from ..util.radar_utils import belongs_roi_indices
 from ..util.radar_utils import get_fixed_rng_data, get_cercle_coords
 from ..util.radar_utils import get_box_coords
-from ..util.stat_utils import quantiles_weighted
+from ..util.radar_utils import get_radar_skeleton
+from ..util.stat_utils import quantiles_weighted_segments
 from ..proc.process_traj import _get_gates_antenna_pattern
 
+# number of synthetic radar gates whose statistics are computed at once
+_RESAMPLING_CHUNK_SIZE = 20000
+
 
 def get_process_func(dataset_type, dsname):
     """
@@ -1256,8 +1262,7 @@ def process_keep_roi(procstatus, dscfg, radar_list=None):
     inds_rng = inds_rng[inds]
 
     # prepare new radar object output
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     for field_name in field_names:
         field_dict = deepcopy(radar.fields[field_name])
         field_dict['data'][:] = np.ma.masked
@@ -1516,7 +1521,7 @@ def process_roi(procstatus, dscfg, radar_list=None):
     alt = radar.gate_altitude['data'][inds_ray, inds_rng]
 
     # prepare new radar object output
-    new_dataset = {'radar_out': deepcopy(radar)}
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
 
     new_dataset['radar_out'].range['data'] = radar.range['data'][inds_rng]
     new_dataset['radar_out'].ngates = inds_rng.size
@@ -1560,7 +1565,6 @@ def process_roi(procstatus, dscfg, radar_list=None):
     new_dataset['radar_out'].gate_z['data'] = np.expand_dims(
         radar.gate_z['data'][inds_ray, inds_rng], axis=0)
 
-    new_dataset['radar_out'].fields = dict()
     for field_name in field_names:
         field_dict = deepcopy(radar.fields[field_name])
         field_dict['data'] = np.expand_dims(
@@ -1822,7 +1826,7 @@ def process_roi2(procstatus, dscfg, radar_list=None):
 
     # prepare new radar object output
     new_dataset = {
-        'radar_out': deepcopy(radar),
+        'radar_out': get_radar_skeleton(radar),
         'rng_res': radar.range['data'][1] - radar.range['data'][0]
     }
 
@@ -1870,7 +1874,6 @@ def process_roi2(procstatus, dscfg, radar_list=None):
     new_dataset['radar_out'].gate_z['data'] = np.expand_dims(
         radar.gate_z['data'][inds_ray, inds_rng], axis=0)
 
-    new_dataset['radar_out'].fields = dict()
     for field_name in field_names:
         field_dict = deepcopy(radar.fields[field_name])
         field_dict['data'] = np.expand_dims(
@@ -2078,21 +2081,19 @@ def process_moving_azimuthal_average(procstatus, dscfg, radar_list=None):
         warn("Fields not available in radar data")
         return None, None
 
-    radar_out = deepcopy(radar)
     # At the moment only PPI scans are supported
-    if radar_out.scan_type != 'ppi':
+    if radar.scan_type != 'ppi':
         warn('Error: unsupported scan type.')
         return None, None
 
     # keep only fields of interest
-    radar_out.fields = dict()
+    radar_out = get_radar_skeleton(radar)
     for field_name in field_names:
-        radar_out.add_field(field_name, radar.fields[field_name])
+        radar_out.add_field(field_name, deepcopy(radar.fields[field_name]))
 
     # average radar data
     for sweep in range(radar_out.nsweeps):
-        radar_aux = deepcopy(radar_out)
-        radar_aux = radar_aux.extract_sweeps([sweep])
+        radar_aux = radar_out.extract_sweeps([sweep])
 
         for ind_ray_sweep, angle in enumerate(radar_aux.azimuth['data']):
             ind_ray = (
@@ -2415,7 +2416,8 @@ def process_radar_resampling(procstatus, dscfg, radar_list=None):
             'distance_upper_bound': distance_upper_bound,
             'use_cKDTree': use_cKDTree,
             'data_is_log': data_is_log,
-            'change_antenna_pattern': change_antenna_pattern})
+            'change_antenna_pattern': change_antenna_pattern,
+            'index_cachedir': dscfg.get('gridIndexCacheDir', None)})
 
         dscfg['global_data'] = trdict
         dscfg['initialized'] = True
@@ -2456,7 +2458,10 @@ def process_radar_resampling(procstatus, dscfg, radar_list=None):
 
 def _get_values_antenna_pattern(radar, tadict, field_names):
     """
-    Get the values of a synthetic radar
+    Get the values of a synthetic radar. The gates of the observations radar
+    contributing to each synthetic radar gate and their antenna weights are
+    computed only once for each radar geometry. The statistics of all the
+    synthetic radar gates are then computed at once
 
     Parameters
     ----------
@@ -2473,36 +2478,15 @@ def _get_values_antenna_pattern(radar, tadict, field_names):
         The synthetic radar
 
     """
-    is_azimuth_antenna = tadict['is_azimuth_antenna']
-    scan_angles = tadict['scan_angles']
-    radar_antenna_atsameplace = tadict['radar_antenna_atsameplace']
-    nan_value = tadict['nan_value']
-    use_nans = tadict['use_nans']
-    weight_threshold = tadict['weight_threshold']
     target_radar = tadict['target_radar']
-    max_altitude = tadict['max_altitude']
-    latlon_tol = tadict['latlon_tol']
-    alt_tol = tadict['alt_tol']
-    distance_upper_bound = tadict['distance_upper_bound']
-    use_cKDTree = tadict['use_cKDTree']
-    data_is_log = tadict['data_is_log']
-    change_antenna_pattern = tadict['change_antenna_pattern']
 
-    # find closest radar gate to target
-    x_radar, y_radar, z_radar = _put_radar_in_swiss_coord(radar)
-    x_target, y_target, z_target = _put_radar_in_swiss_coord(target_radar)
-
-    tree = cKDTree(
-        np.transpose(
-            (x_radar.flatten(), y_radar.flatten(), z_radar.flatten())),
-        compact_nodes=False, balanced_tree=False)
-    _, ind_vec = tree.query(np.transpose(
-        (x_target.flatten(), y_target.flatten(), z_target.flatten())), k=1)
+    resampling_index = _get_resampling_index(radar, tadict)
 
     # temporary solution to get right time:
     target_radar.time['data'][:] = radar.time['data'][0]
 
-    if not change_antenna_pattern:
+    if not tadict['change_antenna_pattern']:
+        ind_vec = resampling_index['ind_vec']
         for field_name in field_names:
             if field_name not in radar.fields:
                 warn(
@@ -2518,159 +2502,213 @@ def _get_values_antenna_pattern(radar, tadict, field_names):
 
         return target_radar
 
-    # Find closest azimuth and elevation ray to target radar
-    rad_ind_rays, rad_ind_rngs = np.unravel_index(
-        ind_vec, (radar.nrays, radar.ngates))
-    for sample, (rad_ind_ray, rad_ind_rng) in enumerate(
-            zip(rad_ind_rays, rad_ind_rngs)):
+    indptr = resampling_index['indptr']
+    gate_ind = resampling_index['gate_ind']
+    weights = resampling_index['weights']
+    nsamples = indptr.size - 1
+    for field_name in field_names:
+        if field_name not in radar.fields:
+            warn("Datatype '%s' not available in radar data" % field_name)
+            continue
+        values = np.ma.asarray(radar.fields[field_name]['data']).reshape(-1)[
+            gate_ind]
+        if tadict['use_nans'][field_name]:
+            values = values.filled(tadict['nan_value'][field_name])
+
+        for ind_start in range(0, nsamples, _RESAMPLING_CHUNK_SIZE):
+            ind_end = min(ind_start + _RESAMPLING_CHUNK_SIZE, nsamples)
+            avg, qvals, nvals_valid = quantiles_weighted_segments(
+                values, weights, indptr[ind_start:ind_end + 1],
+                quantiles=tadict['quantiles'],
+                weight_threshold=tadict['weight_threshold'],
+                data_is_log=tadict['data_is_log'][field_name])
+
+            samples = np.arange(ind_start, ind_end)
+            has_data = np.logical_not(np.ma.getmaskarray(avg))
+            trad_ind_rays, trad_ind_rngs = np.unravel_index(
+                samples[has_data], (target_radar.nrays, target_radar.ngates))
+
+            # average field
+            target_radar.fields['avg_' + field_name]['data'][
+                trad_ind_rays, trad_ind_rngs] = np.ma.getdata(avg)[has_data]
+
+            # npoints field
+            target_radar.fields['npoints_' + field_name]['data'][
+                trad_ind_rays, trad_ind_rngs] = nvals_valid[has_data]
+
+            # quantile fields
+            for i, quant in enumerate(tadict['quantiles']):
+                has_quant = np.logical_not(np.ma.getmaskarray(qvals[:, i]))
+                trad_ind_rays, trad_ind_rngs = np.unravel_index(
+                    samples[has_quant],
+                    (target_radar.nrays, target_radar.ngates))
+                quant_field = (
+                    'quant' + '{:02d}'.format(int(100 * quant)) + '_' +
+                    field_name)
+                target_radar.fields[quant_field]['data'][
+                    trad_ind_rays, trad_ind_rngs] = (
+                        np.ma.getdata(qvals[:, i])[has_quant])
 
-        # measure time
-        tstart = time()
+    return target_radar
 
-        trad_ind_ray, trad_ind_rng = np.unravel_index(
-            sample, (target_radar.nrays, target_radar.ngates))
 
-        if radar_antenna_atsameplace:
-            # ==============================================================
-            # Radar and scanning antenna are at the SAME place
-            # ==============================================================
+def _get_resampling_index(radar, tadict):
+    """
+    Gets the gates of the observations radar used to compute the value of
+    each gate of the synthetic radar. The index is taken from the grid index
+    cache if it has already been computed for the same geometry of both
+    radars
 
-            # ==============================================================
-            # Get sample at bin
-            if is_azimuth_antenna:
-                angles = radar.azimuth['data']
-                angles_scan = radar.elevation['data']
-                ray_angle = radar.azimuth['data'][rad_ind_ray]
-            else:
-                angles = radar.elevation['data']
-                angles_scan = radar.azimuth['data']
-                ray_angle = radar.elevation['data'][rad_ind_ray]
+    Parameters
+    ----------
+    radar : radar object
+        The radar volume with the data
+    tadict : dict
+        A dictionary containing parameters useful for radar re-sampling
+
+    Returns
+    -------
+    resampling_index : dict
+        dictionary containing the flat index of the closest observations
+        radar gate to each synthetic radar gate ('ind_vec'). If the antenna
+        pattern is changed it contains also the flat indices of the
+        observations radar gates used for each synthetic radar gate
+        ('gate_ind') and their weight ('weights') in compressed sparse row
+        format: the gates of synthetic radar gate i are
+        gate_ind[indptr[i]:indptr[i+1]]
 
-            d_angle = np.abs(angles - ray_angle)
+    """
+    target_radar = tadict['target_radar']
+    scan_angles = tadict['scan_angles']
+    weightvec = tadict['weightvec']
+    radar_antenna_atsameplace = tadict['radar_antenna_atsameplace']
+
+    cache = get_grid_index_cache(tadict.get('index_cachedir', None))
+    key = get_grid_index_key(
+        'antenna_pattern', radar, target_radar.latitude['data'],
+        target_radar.longitude['data'], target_radar.altitude['data'],
+        target_radar.range['data'], target_radar.azimuth['data'],
+        target_radar.elevation['data'], scan_angles, weightvec,
+        tadict['change_antenna_pattern'], radar_antenna_atsameplace,
+        tadict['is_azimuth_antenna'], tadict['max_altitude'],
+        tadict['latlon_tol'], tadict['alt_tol'],
+        tadict['distance_upper_bound'], tadict['use_cKDTree'])
+    resampling_index = cache.get(key)
+    if resampling_index is not None:
+        return resampling_index
+
+    # find closest radar gate to target
+    x_radar, y_radar, z_radar = _put_radar_in_swiss_coord(radar)
+    x_target, y_target, z_target = _put_radar_in_swiss_coord(target_radar)
+
+    tree = cKDTree(
+        np.transpose(
+            (x_radar.flatten(), y_radar.flatten(), z_radar.flatten())),
+        compact_nodes=False, balanced_tree=False)
+    _, ind_vec = tree.query(np.transpose(
+        (x_target.flatten(), y_target.flatten(), z_target.flatten())), k=1)
+
+    if not tadict['change_antenna_pattern']:
+        resampling_index = {'ind_vec': ind_vec}
+        cache.put(key, resampling_index)
+        return resampling_index
+
+    # Find closest azimuth and elevation ray to target radar
+    rad_ind_rays, rad_ind_rngs = np.unravel_index(
+        ind_vec, (radar.nrays, radar.ngates))
+
+    if radar_antenna_atsameplace:
+        # ==================================================================
+        # Radar and scanning antenna are at the SAME place
+        # ==================================================================
+        if tadict['is_azimuth_antenna']:
+            angles = radar.azimuth['data']
+            angles_scan = radar.elevation['data']
+        else:
+            angles = radar.elevation['data']
+            angles_scan = radar.azimuth['data']
+
+        # rays of the observations radar at each scan angle of the
+        # synthetic radar for each ray of the observations radar used
+        rad_rays, ind_rays = np.unique(rad_ind_rays, return_inverse=True)
+        scan_rays = np.zeros((rad_rays.size, scan_angles.size), dtype=int)
+        is_valid = np.zeros(rad_rays.size, dtype=bool)
+        for i, rad_ray in enumerate(rad_rays):
+            d_angle = np.abs(angles - angles[rad_ray])
             ray_inds = np.where(d_angle < 0.09)[0]
             angles_sortind = np.argsort(angles_scan[ray_inds])
 
             ray_inds = ray_inds[angles_sortind]
             angles_sorted = angles_scan[ray_inds]
 
-            # Set default values
             if ((scan_angles.size != angles_sorted.size) or
                     (np.max(np.abs(scan_angles - angles_sorted)) > 0.1)):
                 warn("Scan angle mismatch!")
                 continue
+            scan_rays[i, :] = ray_inds
+            is_valid[i] = True
+
+        is_valid = is_valid[ind_rays]
+        gate_ind = (
+            scan_rays[ind_rays[is_valid], :] * radar.ngates +
+            rad_ind_rngs[is_valid, np.newaxis])
+        weights = np.tile(weightvec, np.count_nonzero(is_valid))
+        lengths = is_valid * scan_angles.size
+    else:
+        # ==================================================================
+        # Radar and scanning antenna are NOT at the same place
+        # ==================================================================
+        gate_ind = []
+        weights = []
+        lengths = np.zeros(ind_vec.size, dtype=int)
+        for sample in range(ind_vec.size):
+            # measure time
+            tstart = time()
+
+            trad_ind_ray, trad_ind_rng = np.unravel_index(
+                sample, (target_radar.nrays, target_radar.ngates))
 
-            w_vec = tadict['weightvec']
-            for field_name in field_names:
-                if field_name not in radar.fields:
-                    warn("Datatype '%s' not available in radar data" %
-                         field_name)
-                    continue
-                values = radar.fields[field_name]['data'][
-                    ray_inds, rad_ind_rng]
-                if use_nans[field_name]:
-                    values_ma = np.ma.getmaskarray(values)
-                    values[values_ma] = nan_value[field_name]
-
-                try:
-                    (avg, qvals, nvals_valid) = quantiles_weighted(
-                        values,
-                        weight_vector=deepcopy(w_vec),
-                        quantiles=tadict['quantiles'],
-                        weight_threshold=weight_threshold,
-                        data_is_log=data_is_log[field_name])
-                except Exception as ee:
-                    warn(str(ee))
-                    continue
-
-                if avg is None:
-                    continue
-
-                # average field
-                target_radar.fields['avg_' + field_name]['data'][
-                    trad_ind_ray, trad_ind_rng] = avg
-
-                # npoints field
-                target_radar.fields['npoints_' + field_name]['data'][
-                    trad_ind_ray, trad_ind_rng] = nvals_valid
-
-                # quantile fields
-                for quant, val in zip(tadict['quantiles'], qvals):
-                    if val is None:
-                        continue
-                    quant_field = (
-                        'quant' + '{:02d}'.format(int(100 * quant)) + '_' +
-                        field_name)
-                    target_radar.fields[quant_field]['data'][
-                        trad_ind_ray, trad_ind_rng] = val
-
-        else:
-            # ================================================================
-            # Radar and scanning antenna are NOT at the same place
-            # ================================================================
             ray_inds, rng_inds, w_inds = _get_gates_antenna_pattern(
                 radar, target_radar,
                 target_radar.azimuth['data'][trad_ind_ray],
                 target_radar.range['data'][trad_ind_rng],
                 target_radar.time['data'][trad_ind_ray], scan_angles,
-                alt_tol=alt_tol, latlon_tol=latlon_tol,
-                max_altitude=max_altitude,
-                distance_upper_bound=distance_upper_bound,
-                use_cKDTree=use_cKDTree)
-
-            w_vec = tadict['weightvec'][w_inds]
-            for field_name in field_names:
-                if field_name not in radar.fields:
-                    warn("Datatype '%s' not available in radar data" %
-                         field_name)
-                    continue
-                values = radar.fields[field_name]['data'][ray_inds, rng_inds]
-                if use_nans[field_name]:
-                    values_ma = np.ma.getmaskarray(values)
-                    values[values_ma] = nan_value[field_name]
-
-                try:
-                    (avg, qvals, nvals_valid) = quantiles_weighted(
-                        values,
-                        weight_vector=deepcopy(w_vec),
-                        quantiles=tadict['quantiles'],
-                        weight_threshold=weight_threshold,
-                        data_is_log=data_is_log[field_name])
-                except Exception as ee:
-                    warn(str(ee))
-                    continue
-
-                if avg is None:
-                    continue
-
-                # average field
-                target_radar.fields['avg_' + field_name]['data'][
-                    trad_ind_ray, trad_ind_rng] = avg
-
-                # npoints field
-                target_radar.fields['npoints_' + field_name]['data'][
-                    trad_ind_ray, trad_ind_rng] = nvals_valid
-
-                # quantile fields
-                for quant, val in zip(tadict['quantiles'], qvals):
-                    if val is None:
-                        continue
-                    quant_field = (
-                        'quant' + '{:02d}'.format(int(100 * quant)) + '_' +
-                        field_name)
-                    target_radar.fields[quant_field]['data'][
-                        trad_ind_ray, trad_ind_rng] = val
+                alt_tol=tadict['alt_tol'], latlon_tol=tadict['latlon_tol'],
+                max_altitude=tadict['max_altitude'],
+                distance_upper_bound=tadict['distance_upper_bound'],
+                use_cKDTree=tadict['use_cKDTree'])
+
+            if len(ray_inds) != len(w_inds):
+                warn("ERROR: Unexpected size of weight vector "
+                     "(%d instead of %d)" % (len(w_inds), len(ray_inds)))
+            else:
+                gate_ind.append(
+                    np.asarray(ray_inds) * radar.ngates +
+                    np.asarray(rng_inds))
+                weights.append(weightvec[w_inds])
+                lengths[sample] = len(ray_inds)
 
             tend = time()
 
             print(
-                'original radar indices (azi, rng): ' + str(rad_ind_ray) + ', '
-                + str(rad_ind_rng) + ' target radar indices (azi, rng): '
-                + str(trad_ind_ray) + ', ' + str(trad_ind_rng)
-                + ' Samples done: ' + str(sample) + '/'
-                + str(rad_ind_rngs.size) + ' Time used: ' + str(tend - tstart),
-                end="\r", flush=True)
-
-    return target_radar
+                'original radar indices (azi, rng): ' +
+                str(rad_ind_rays[sample]) + ', ' + str(rad_ind_rngs[sample]) +
+                ' target radar indices (azi, rng): ' + str(trad_ind_ray) +
+                ', ' + str(trad_ind_rng) + ' Samples done: ' + str(sample) +
+                '/' + str(ind_vec.size) + ' Time used: ' +
+                str(tend - tstart), end="\r", flush=True)
+
+        gate_ind = np.concatenate(gate_ind + [np.array([], dtype=int)])
+        weights = np.concatenate(weights + [np.array([], dtype=float)])
+
+    resampling_index = {
+        'ind_vec': ind_vec,
+        'indptr': np.concatenate(([0], np.cumsum(lengths))),
+        'gate_ind': gate_ind.reshape(-1).astype(int),
+        'weights': weights.reshape(-1)}
+    cache.put(key, resampling_index)
+
+    return resampling_index
 
 
 def _create_target_radar(radar, dscfg, fixed_angle_val, info, field_names,
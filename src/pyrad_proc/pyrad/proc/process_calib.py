@@ -37,7 +37,8 @@ from ..io.read_data_other import read_excess_gates
 from ..io.read_data_radar import interpol_field
 
 from ..util.radar_utils import get_closest_solar_flux, get_histogram_bins
-from ..util.radar_utils import find_ray_index, find_rng_index
+from ..util.radar_utils import find_ray_indexes, find_rng_indexes
+from ..util.radar_utils import get_radar_skeleton
 
 
 def process_correct_bias(procstatus, dscfg, radar_list=None):
@@ -97,8 +98,7 @@ def process_correct_bias(procstatus, dscfg, radar_list=None):
         new_field_name = 'corrected_' + field_name
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field(new_field_name, corrected_field)
 
     return new_dataset, ind_rad
@@ -168,8 +168,7 @@ def process_correct_noise_rhohv(procstatus, dscfg, radar_list=None):
         nh_field=nh, nv_field=nv, rhohv_field='cross_correlation_ratio')
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field('cross_correlation_ratio', rhohv)
 
     return new_dataset, ind_rad
@@ -319,8 +318,7 @@ def process_gc_monitoring(procstatus, dscfg, radar_list=None):
         bin_centers = bin_edges[:-1] + step / 2.
 
         # create histogram object from radar object
-        radar_aux = deepcopy(radar)
-        radar_aux.fields = dict()
+        radar_aux = get_radar_skeleton(radar)
         radar_aux.range['data'] = bin_centers
         radar_aux.ngates = nbins
         radar_aux.nrays = 1
@@ -340,27 +338,17 @@ def process_gc_monitoring(procstatus, dscfg, radar_list=None):
             rng_tol = dscfg.get('rng_tol', 50.)
 
             # get indexes of gates close to target
-            ngc = np.size(dscfg['global_data']['ray_ind'])
-
-            ray_ind = np.ma.masked_all(ngc, dtype=int)
-            rng_ind = np.ma.masked_all(ngc, dtype=int)
-            for i in range(ngc):
-                ind_ray_rad = find_ray_index(
-                    radar.elevation['data'], radar.azimuth['data'],
-                    dscfg['global_data']['ele'][i],
-                    dscfg['global_data']['azi'][i],
-                    ele_tol=ele_tol, azi_tol=azi_tol)
-                if ind_ray_rad is None:
-                    continue
-                ind_rng_rad = find_rng_index(
-                    radar.range['data'], dscfg['global_data']['rng'][i],
-                    rng_tol=rng_tol)
-                if ind_rng_rad is None:
-                    continue
-                ray_ind[i] = ind_ray_rad
-                rng_ind[i] = ind_rng_rad
-            ray_ind = ray_ind.compressed()
-            rng_ind = rng_ind.compressed()
+            ray_ind = find_ray_indexes(
+                radar.elevation['data'], radar.azimuth['data'],
+                dscfg['global_data']['ele'], dscfg['global_data']['azi'],
+                ele_tol=ele_tol, azi_tol=azi_tol)
+            rng_ind = find_rng_indexes(
+                radar.range['data'], dscfg['global_data']['rng'],
+                rng_tol=rng_tol)
+            is_valid = np.logical_not(np.logical_or(
+                np.ma.getmaskarray(ray_ind), np.ma.getmaskarray(rng_ind)))
+            ray_ind = ray_ind.data[is_valid]
+            rng_ind = rng_ind.data[is_valid]
             field = field[ray_ind, rng_ind].compressed()
 
         # put gates with values off limits to limit
@@ -515,8 +503,7 @@ def process_occurrence(procstatus, dscfg, radar_list=None):
                     return None, None
 
         # prepare field number of samples and occurrence
-        radar_aux = deepcopy(radar)
-        radar_aux.fields = dict()
+        radar_aux = get_radar_skeleton(radar)
 
         npoints_dict = pyart.config.get_metadata('number_of_samples')
         npoints_dict['data'] = np.ma.ones(
@@ -762,8 +749,7 @@ def process_time_avg_std(procstatus, dscfg, radar_list=None):
         field = np.ma.masked_where(mask, field)
         field = np.ma.asarray(field)
 
-        radar_aux = deepcopy(radar)
-        radar_aux.fields = dict()
+        radar_aux = get_radar_skeleton(radar)
 
         sum_dict = pyart.config.get_metadata('sum')
         sum_dict['data'] = field
@@ -924,8 +910,7 @@ def process_occurrence_period(procstatus, dscfg, radar_list=None):
             warn('Unable to compute frequency of occurrence. Missing data')
             return None, None
 
-        radar_aux = deepcopy(radar)
-        radar_aux.fields = dict()
+        radar_aux = get_radar_skeleton(radar)
         radar_aux.add_field('occurrence', radar.fields['occurrence'])
         radar_aux.add_field(
             'number_of_samples', radar.fields['number_of_samples'])
@@ -1981,30 +1966,33 @@ def process_sunscan(procstatus, dscfg, radar_list=None):
         time = num2date(radar.time['data'], radar.time['units'],
                         radar.time['calendar'])
 
+        # get sun position at each ray
+        elev_sun = np.empty(radar.nrays)
+        azim_sun = np.empty(radar.nrays)
         for ray in range(radar.nrays):
             if _PYSOLAR_AVAILABLE and sun_position == 'pysolar':
-                elev_sun, azim_sun = pyart.correct.sun_position_pysolar(
-                    time[ray], radar.latitude['data'][0],
-                    radar.longitude['data'][0])
+                elev_sun[ray], azim_sun[ray] = (
+                    pyart.correct.sun_position_pysolar(
+                        time[ray], radar.latitude['data'][0],
+                        radar.longitude['data'][0]))
             else:
-                elev_sun, azim_sun = pyart.correct.sun_position_mfr(
+                elev_sun[ray], azim_sun[ray] = pyart.correct.sun_position_mfr(
                     time[ray], radar.latitude['data'][0],
                     radar.longitude['data'][0], refraction=True)
 
-            # azshift?
-            delev = np.ma.abs(radar.elevation['data'][ray] - elev_sun)
-            dazim = np.ma.abs(
-                (radar.azimuth['data'][ray] - azim_sun) *
-                np.ma.cos(elev_sun * np.pi / 180.))
-            if dazim > 360.:
-                dazim -= 360.
-
-            sundist[ray] = np.sqrt((dazim - azoff)**2 + (delev - eloff)**2)
-            sunpwrmat[ray] = (par[0] + par[1] * dazim + par[2] * delev +
-                              par[3] * dazim**2 + par[4] * delev**2)
-            sunvalmat[ray] = sunvol[ray]
-            sunpos_el[ray] = elev_sun
-            sunpos_az[ray] = azim_sun
+        # azshift?
+        delev = np.ma.abs(radar.elevation['data'] - elev_sun)
+        dazim = np.ma.abs(
+            (radar.azimuth['data'] - azim_sun) *
+            np.ma.cos(elev_sun * np.pi / 180.))
+        dazim[dazim > 360.] -= 360.
+
+        sundist[:] = np.sqrt((dazim - azoff)**2 + (delev - eloff)**2)
+        sunpwrmat[:] = (par[0] + par[1] * dazim + par[2] * delev +
+                        par[3] * dazim**2 + par[4] * delev**2)
+        sunvalmat[:] = sunvol
+        sunpos_el[:] = elev_sun
+        sunpos_az[:] = azim_sun
 
         # Second noise estimation: removal of sunpower influence
         if do_second_noise_est == 'Yes':
@@ -13,7 +13,6 @@ Functions to manage DEM data
 
 """
 
-from copy import deepcopy
 from warnings import warn
 
 import numpy as np
@@ -22,6 +21,7 @@ import pyart
 
 from ..io.io_aux import get_datatype_fields, get_fieldname_pyart
 from ..io.read_data_dem import read_dem, dem2radar_data
+from ..util.radar_utils import get_radar_skeleton, get_blocked_gates
 
 # from memory_profiler import profile
 
@@ -94,7 +94,8 @@ def process_dem(procstatus, dscfg, radar_list=None):
 
             if regular_grid:
                 dscfg['global_data']['dem_field'] = dem2radar_data(
-                    radar, dem_data, field_name)
+                    radar, dem_data, field_name=field_name,
+                    index_cachedir=dscfg.get('gridIndexCacheDir', None))
 
             dscfg['initialized'] = 1
 
@@ -109,14 +110,15 @@ def process_dem(procstatus, dscfg, radar_list=None):
         print('DEM field already in memory')
         dem_field = dscfg['global_data']['dem_fields']
     else:
-        dem_field = dem2radar_data(radar, dem_data, field_name=field_name)
+        dem_field = dem2radar_data(
+            radar, dem_data, field_name=field_name,
+            index_cachedir=dscfg.get('gridIndexCacheDir', None))
         if dem_field is None:
             warn('Unable to obtain DEM fields')
             return None, None
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field(field_name, dem_field)
 
     return new_dataset, ind_rad
@@ -179,14 +181,10 @@ def process_visibility(procstatus, dscfg, radar_list=None):
 
     # if a gate has visibility 0 all the subsequent gates in the ray
     # are set to 0
-    for ray in range(radar.nrays):
-        ind = np.where(vis_dict['data'][ray, :] == 0.)[0]
-        if ind.size > 0:
-            vis_dict['data'][ray, ind[0]:] = 0.
+    vis_dict['data'][get_blocked_gates(vis_dict['data'] == 0.)] = 0.
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field('visibility', vis_dict)
 
     return new_dataset, ind_rad
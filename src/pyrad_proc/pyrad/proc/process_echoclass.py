@@ -44,6 +44,7 @@ from ..io.io_aux import get_datatype_fields, get_fieldname_pyart
 from ..io.io_aux import get_file_list, get_datetime
 from ..io.read_data_other import read_centroids
 from ..io.read_data_sensor import read_fzl_igra
+from ..util.radar_utils import get_radar_skeleton, get_neighbour_data
 
 if (importlib.util.find_spec('sklearn_extra') and
         importlib.util.find_spec('sklearn')):
@@ -145,8 +146,7 @@ def process_echo_id(procstatus, dscfg, radar_list=None):
     id_field.update({'_FillValue': 0})
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field('radar_echo_id', id_field)
 
     return new_dataset, ind_rad
@@ -235,8 +235,7 @@ def process_birds_id(procstatus, dscfg, radar_list=None):
     id_field['data'] = echo_id
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field('radar_echo_id', id_field)
 
     return new_dataset, ind_rad
@@ -296,8 +295,7 @@ def process_clt_to_echo_id(procstatus, dscfg, radar_list=None):
     id_field['data'] = echo_id
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field('radar_echo_id', id_field)
 
     return new_dataset, ind_rad
@@ -356,8 +354,7 @@ def process_vstatus_to_echo_id(procstatus, dscfg, radar_list=None):
     id_field['data'] = echo_id
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field('radar_echo_id', id_field)
 
     return new_dataset, ind_rad
@@ -420,8 +417,7 @@ def process_hydro_mf_to_echo_id(procstatus, dscfg, radar_list=None):
     id_field['data'] = echo_id
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field('radar_echo_id', id_field)
 
     return new_dataset, ind_rad
@@ -499,8 +495,7 @@ def process_hydro_mf_to_hydro(procstatus, dscfg, radar_list=None):
     hydro_field['data'] = hydro
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field(
         'radar_echo_classification', hydro_field)
 
@@ -564,8 +559,7 @@ def process_echo_filter(procstatus, dscfg, radar_list=None):
     mask = np.ma.isin(
         radar.fields[echoid_field]['data'], echo_type, invert=True)
 
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
 
     for datatypedescr in dscfg['datatype']:
         radarnr, _, datatype, _, _ = get_datatype_fields(datatypedescr)
@@ -652,8 +646,7 @@ def process_cdf(procstatus, dscfg, radar_list=None):
         warn('Unable to compute CDF. Missing field')
         return None, None
 
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
 
     new_dataset['radar_out'].add_field(field_name, radar.fields[field_name])
     if echoid_field is not None:
@@ -740,8 +733,7 @@ def process_gatefilter(procstatus, dscfg, radar_list=None):
         return None, None
     radar = radar_list[ind_rad]
 
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
 
     # filter gates based upon field parameters
     radar_aux = deepcopy(radar)
@@ -816,8 +808,7 @@ def process_filter_snr(procstatus, dscfg, radar_list=None):
         return None, None
     radar = radar_list[ind_rad]
 
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
 
     if snr_field not in radar.fields:
         warn('Unable to filter dataset according to SNR. Missing SNR field')
@@ -917,8 +908,7 @@ def process_filter_vel_diff(procstatus, dscfg, radar_list=None):
         return None, None
     radar = radar_list[ind_rad]
 
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
 
     if vel_diff_field not in radar.fields:
         warn('Unable to filter dataset according to valid velocity. ' +
@@ -1002,8 +992,7 @@ def process_filter_visibility(procstatus, dscfg, radar_list=None):
         return None, None
     radar = radar_list[ind_rad]
 
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
 
     if vis_field not in radar.fields:
         warn('Unable to filter dataset according to visibility. ' +
@@ -1117,7 +1106,6 @@ def process_outlier_filter(procstatus, dscfg, radar_list=None):
         # find gates suspected to be outliers
         sweep_start = radar.sweep_start_ray_index['data'][sweep]
         sweep_end = radar.sweep_end_ray_index['data'][sweep]
-        nrays_sweep = radar.rays_per_sweep['data'][sweep]
         data_sweep = field['data'][sweep_start:sweep_end + 1, :]
 
         # check if all elements in array are masked
@@ -1131,32 +1119,19 @@ def process_outlier_filter(procstatus, dscfg, radar_list=None):
             np.ma.logical_or(
                 data_sweep < percent_vals[0], data_sweep > percent_vals[1]))
 
-        for i, ind_ray in enumerate(ind_rays):
-            ind_rng = ind_rngs[i]
-            # find neighbours of suspected outlier gate
-            data_cube = []
-            for ray_nb in range(-nb, nb + 1):
-                for rng_nb in range(-nb, nb + 1):
-                    if ray_nb == 0 and rng_nb == 0:
-                        continue
-                    if ((ind_ray + ray_nb >= 0) and
-                            (ind_ray + ray_nb < nrays_sweep) and
-                            (ind_rng + rng_nb >= 0) and
-                            (ind_rng + rng_nb < radar.ngates)):
-                        if (data_sweep[ind_ray + ray_nb,
-                                       ind_rng + rng_nb] is not np.ma.masked):
-                            data_cube.append(
-                                data_sweep[ind_ray + ray_nb, ind_rng + rng_nb])
-
-            # remove data far from median of neighbours or with not enough
-            # valid neighbours
-            if len(data_cube) < nb_min:
-                field_out['data'][
-                    sweep_start + ind_ray, ind_rng] = np.ma.masked
-            elif (abs(np.ma.median(data_cube) -
-                      data_sweep[ind_ray, ind_rng]) > threshold):
-                field_out['data'][sweep_start +
-                                  ind_ray, ind_rng] = np.ma.masked
+        # find neighbours of suspected outlier gates
+        data_cube = get_neighbour_data(data_sweep, ind_rays, ind_rngs, nb=nb)
+
+        # remove data far from median of neighbours or with not enough
+        # valid neighbours
+        is_outlier = np.logical_or(
+            np.ma.count(data_cube, axis=1) < nb_min,
+            np.ma.filled(np.ma.abs(
+                np.ma.median(data_cube, axis=1) -
+                data_sweep[ind_rays, ind_rngs]) > threshold, False))
+        field_out['data'][
+            sweep_start + ind_rays[is_outlier],
+            ind_rngs[is_outlier]] = np.ma.masked
 
     if field_name.startswith('corrected_'):
         new_field_name = field_name
@@ -1166,8 +1141,7 @@ def process_outlier_filter(procstatus, dscfg, radar_list=None):
     else:
         new_field_name = 'corrected_' + field_name
 
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field(new_field_name, field_out)
 
     return new_dataset, ind_rad
@@ -1225,8 +1199,7 @@ def process_filter_vol2bird(procstatus, dscfg, radar_list=None):
     mask = np.ma.getmaskarray(np.ma.masked_greater(
         radar.fields[echoid_field]['data'], 0))
 
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
 
     for datatypedescr in dscfg['datatype']:
         radarnr, _, datatype, _, _ = get_datatype_fields(datatypedescr)
@@ -1344,8 +1317,7 @@ def process_gate_filter_vol2bird(procstatus, dscfg, radar_list=None):
         mask = np.ma.getmaskarray(radar.fields[vel_field]['data'])
         echoid['data'][(mask) & (echoid['data'] < 1)] = -4
 
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field(echoid_field, echoid)
 
     return new_dataset, ind_rad
@@ -1558,8 +1530,7 @@ def process_hydroclass(procstatus, dscfg, radar_list=None):
                 temp_field=temp_field)
 
         # prepare for exit
-        new_dataset = {'radar_out': deepcopy(radar)}
-        new_dataset['radar_out'].fields = dict()
+        new_dataset = {'radar_out': get_radar_skeleton(radar)}
         if ARM_VERSION:
             new_dataset['radar_out'].add_field(
                 'radar_echo_classification', fields_dict)
@@ -1637,8 +1608,7 @@ def process_hydroclass(procstatus, dscfg, radar_list=None):
 
         # prepare for exit
         hydro_field = 'radar_echo_classification'
-        new_dataset = {'radar_out': deepcopy(radar)}
-        new_dataset['radar_out'].fields = dict()
+        new_dataset = {'radar_out': get_radar_skeleton(radar)}
         hydro = pyart.config.get_metadata(hydro_field)
         hydro['data'] = np.ma.masked_all(
             (radar.nrays, radar.ngates), dtype=np.uint8)
@@ -2446,8 +2416,7 @@ def process_melting_layer(procstatus, dscfg, radar_list=None):
     if ml_dict is None:
         return None, None
 
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field('melting_layer', ml_dict)
     if iso0_dict is not None:
         new_dataset['radar_out'].add_field('height_over_iso0', iso0_dict)
@@ -2549,76 +2518,21 @@ def process_zdr_column(procstatus, dscfg, radar_list=None):
     zdr_valid = np.logical_not(np.ma.getmaskarray(zdr_dict['data']))
 
     hlowerleft, hupperright = pyart.retrieve._get_res_vol_sides(radar)
-    ind_ang_sorted = np.argsort(radar.fixed_angle['data'])
-
-    # get number of suspected ZDR columns
-    lat_cols = np.array([], dtype=int)
-    lon_cols = np.array([], dtype=int)
-    zdr_cols = np.array([], dtype=int)
-
-    g_lat = radar.gate_latitude['data']
-    g_lon = radar.gate_longitude['data']
-    for ind_ray in range(radar.nrays):
-        # Get bins with negative temperatures
-        ind_rngs = np.where(
-            radar.fields[temp_field]['data'][ind_ray, :] < 0.)[0]
-        if ind_rngs.size == 0:
-            continue
 
-        # Segment negative temperatures and get start of each segment
-        cons_list = np.split(ind_rngs, np.where(np.diff(ind_rngs) != 1)[0] + 1)
-        for ind_rngs_cell in cons_list:
-            if not zdr_valid[ind_ray, ind_rngs_cell[0]]:
-                continue
-
-            ind_ray_col = ind_ray
-            ind_rng_col = ind_rngs_cell[0]
-
-            # extract data around point:
-            ind_rays, ind_rngs = np.where(np.logical_and.reduce((
-                np.logical_and(
-                    g_lat >= g_lat[ind_ray_col, ind_rng_col] - latlon_tol,
-                    g_lat <= g_lat[ind_ray_col, ind_rng_col] + latlon_tol),
-                np.logical_and(
-                    g_lon >= g_lon[ind_ray_col, ind_rng_col] - latlon_tol,
-                    g_lon <= g_lon[ind_ray_col, ind_rng_col] + latlon_tol),
-                zdr_valid)))
-
-            # get ZDR column height for each radar sweep
-            h_low = np.ma.masked_all(radar.nsweeps)
-            h_high = np.ma.masked_all(radar.nsweeps)
-            for sweep in range(radar.nsweeps):
-                ind = np.where(np.logical_and(
-                    ind_rays >= radar.sweep_start_ray_index['data'][sweep],
-                    ind_rays <= radar.sweep_end_ray_index['data'][sweep]))[0]
-                if ind.size == 0:
-                    continue
-
-                h_low[sweep] = np.min(
-                    hlowerleft[ind_rays[ind], ind_rngs[ind]])
-                h_high[sweep] = np.max(
-                    hupperright[ind_rays[ind], ind_rngs[ind]])
-
-            # order data by elevation angle
-            h_low = h_low[ind_ang_sorted]
-            h_high = h_high[ind_ang_sorted]
-
-            # get the first segment of continuous ZDR valid values
-            ind_valid = np.where(np.ma.getmaskarray(h_low) == 0)[0]
-            ind_valid = np.split(
-                ind_valid, np.where(np.diff(ind_valid) != 1)[0] + 1)[0]
-
-            # compute ZDR column
-            zdr_col = h_high[ind_valid[-1]] - h_low[ind_valid[0]]
-
-            # put data in output array
-            lat_cols = np.append(
-                lat_cols,
-                radar.gate_latitude['data'][ind_ray_col, ind_rng_col])
-            lon_cols = np.append(
-                lon_cols,
-                radar.gate_longitude['data'][ind_ray_col, ind_rng_col])
-            zdr_cols = np.append(zdr_cols, zdr_col)
+    # get suspected ZDR columns: start of each segment of consecutive
+    # bins with negative temperatures if the ZDR is valid there
+    temp_neg = np.ma.getdata(radar.fields[temp_field]['data']) < 0.
+    is_start = np.logical_and(
+        temp_neg,
+        np.logical_not(np.pad(temp_neg[:, :-1], ((0, 0), (1, 0)))))
+    ind_rays_col, ind_rngs_col = np.where(
+        np.logical_and(is_start, zdr_valid))
+
+    lat_cols = radar.gate_latitude['data'][ind_rays_col, ind_rngs_col]
+    lon_cols = radar.gate_longitude['data'][ind_rays_col, ind_rngs_col]
+    zdr_cols = _get_zdr_column_height(
+        radar, zdr_valid, ind_rays_col, ind_rngs_col, hlowerleft,
+        hupperright, latlon_tol=latlon_tol)
 
     zdr_col_dict = pyart.config.get_metadata(
         'differential_reflectivity_column_height')
@@ -2636,6 +2550,132 @@ def process_zdr_column(procstatus, dscfg, radar_list=None):
     return new_dataset, ind_rad
 
 
+def _get_zdr_column_height(radar, zdr_valid, ind_rays_col, ind_rngs_col,
+                           hlowerleft, hupperright, latlon_tol=0.025,
+                           chunk_size=2000):
+    """
+    Computes the height of suspected ZDR columns. The gates with valid ZDR
+    are sorted once into lat/lon cells so that the gates around all the
+    suspected columns are found at once
+
+    Parameters
+    ----------
+    radar : Radar
+        the radar object
+    zdr_valid : 2D array of bools
+        True where the ZDR is valid for a ZDR column
+    ind_rays_col, ind_rngs_col : array of ints
+        the ray and range indices of the base of each suspected ZDR column
+    hlowerleft, hupperright : 2D array of floats
+        the altitude of the lower and upper side of the resolution volume
+        of each gate
+    latlon_tol : float
+        the tolerance in latitude and longitude defining the region around
+        each suspected ZDR column [deg]
+    chunk_size : int
+        the number of suspected ZDR columns processed at once
+
+    Returns
+    -------
+    zdr_cols : array of floats
+        the height of the ZDR columns [m]. It is computed from the first
+        sweeps (in increasing elevation order) that have valid ZDR around
+        the base of the column
+
+    """
+    ncols = ind_rays_col.size
+    zdr_cols = np.empty(ncols, dtype=float)
+    if ncols == 0:
+        return zdr_cols
+
+    g_lat = radar.gate_latitude['data']
+    g_lon = radar.gate_longitude['data']
+    ind_rays_valid, ind_rngs_valid = np.where(zdr_valid)
+    lat_valid = g_lat[ind_rays_valid, ind_rngs_valid]
+    lon_valid = g_lon[ind_rays_valid, ind_rngs_valid]
+
+    # position of each sweep when ordered by elevation angle
+    ind_ang_sorted = np.argsort(radar.fixed_angle['data'])
+    sweep_pos = np.empty(radar.nsweeps, dtype=int)
+    sweep_pos[ind_ang_sorted] = np.arange(radar.nsweeps)
+    ray_pos = np.full(radar.nrays, -1, dtype=int)
+    for sweep in range(radar.nsweeps):
+        ray_pos[radar.sweep_start_ray_index['data'][sweep]:
+                radar.sweep_end_ray_index['data'][sweep] + 1] = (
+                    sweep_pos[sweep])
+    gate_pos = ray_pos[ind_rays_valid]
+    h_low_valid = hlowerleft[ind_rays_valid, ind_rngs_valid]
+    h_high_valid = hupperright[ind_rays_valid, ind_rngs_valid]
+
+    # sort the gates with valid ZDR into lat/lon cells slightly larger
+    # than the tolerance. The gates around a column base are in the 3x3
+    # cells centred on the cell of the base
+    cell_size = 1.001 * latlon_tol
+    lat0 = np.min(lat_valid)
+    lon0 = np.min(lon_valid)
+    cell_lat = np.floor((lat_valid - lat0) / cell_size).astype(int) + 1
+    cell_lon = np.floor((lon_valid - lon0) / cell_size).astype(int) + 1
+    ncells_lon = np.max(cell_lon) + 2
+    ind_sorted = np.argsort(cell_lat * ncells_lon + cell_lon, kind='stable')
+    cells_sorted = (cell_lat * ncells_lon + cell_lon)[ind_sorted]
+
+    lat_col = g_lat[ind_rays_col, ind_rngs_col]
+    lon_col = g_lon[ind_rays_col, ind_rngs_col]
+    cell_col = (
+        (np.floor((lat_col - lat0) / cell_size).astype(int) + 1) *
+        ncells_lon + np.floor((lon_col - lon0) / cell_size).astype(int) + 1)
+    cell_offsets = np.array([
+        dlat * ncells_lon + dlon for dlat in (-1, 0, 1)
+        for dlon in (-1, 0, 1)])
+
+    for ind_start in range(0, ncols, chunk_size):
+        ind_end = min(ind_start + chunk_size, ncols)
+        cols = np.arange(ind_start, ind_end)
+
+        # gates in the cells around each column base
+        cells = (
+            cell_col[cols, np.newaxis] + cell_offsets[np.newaxis, :]).ravel()
+        starts = np.searchsorted(cells_sorted, cells, side='left')
+        counts = np.searchsorted(cells_sorted, cells, side='right') - starts
+        ind_col = np.repeat(np.repeat(cols, cell_offsets.size), counts)
+        ind_gate = ind_sorted[
+            np.repeat(starts - np.cumsum(counts) + counts, counts) +
+            np.arange(ind_col.size)]
+
+        # keep those in the lat/lon box around the column base
+        in_box = np.logical_and.reduce((
+            lat_valid[ind_gate] >= lat_col[ind_col] - latlon_tol,
+            lat_valid[ind_gate] <= lat_col[ind_col] + latlon_tol,
+            lon_valid[ind_gate] >= lon_col[ind_col] - latlon_tol,
+            lon_valid[ind_gate] <= lon_col[ind_col] + latlon_tol,
+            gate_pos[ind_gate] >= 0))
+        ind_col = ind_col[in_box] - ind_start
+        ind_gate = ind_gate[in_box]
+
+        # ZDR column limits for each sweep ordered by elevation angle
+        h_low = np.full((cols.size, radar.nsweeps), np.inf)
+        h_high = np.full((cols.size, radar.nsweeps), -np.inf)
+        np.minimum.at(
+            h_low, (ind_col, gate_pos[ind_gate]), h_low_valid[ind_gate])
+        np.maximum.at(
+            h_high, (ind_col, gate_pos[ind_gate]), h_high_valid[ind_gate])
+
+        # get the first segment of sweeps with valid ZDR values
+        has_data = np.isfinite(h_low)
+        ind_first = np.argmax(has_data, axis=1)
+        is_end = np.logical_and(
+            np.logical_not(has_data),
+            np.arange(radar.nsweeps) > ind_first[:, np.newaxis])
+        ind_last = np.where(
+            np.any(is_end, axis=1), np.argmax(is_end, axis=1),
+            radar.nsweeps) - 1
+
+        ind = np.arange(cols.size)
+        zdr_cols[cols] = h_high[ind, ind_last] - h_low[ind, ind_first]
+
+    return zdr_cols
+
+
 class ScanObject:
     """generates scan object containing all required radar parameters"""
 
@@ -34,12 +34,13 @@ from ..io.io_aux import find_hzt_file, find_iso0_file, find_iso0_grib_file
 from ..io.io_aux import get_fieldname_pyart
 from ..io.read_data_icon import read_icon_data, read_icon_coord
 from ..io.read_data_icon import icon2radar_data, icon2radar_coord
-from ..io.read_data_icon import get_icon_fields
+from ..io.read_data_icon import get_icon_fields, get_icon_bounds
 from ..io.read_data_radar import interpol_field
 from ..io.read_data_hzt import read_hzt_data, hzt2radar_data, hzt2radar_coord
 from ..io.read_data_hzt import get_iso0_field
 from ..io.read_data_iso0_mf import read_iso0_mf_data, read_iso0_grib_data
 from ..io.read_data_iso0_mf import iso2radar_data, grib2radar_data
+from ..util.radar_utils import get_radar_skeleton
 
 # from memory_profiler import profile
 
@@ -60,7 +61,8 @@ def process_icon(procstatus, dscfg, radar_list=None):
             arbitrary data type
         keep_in_memory : int. Dataset keyword
             if set keeps the icon data dict, the icon coordinates dict and
-            the icon field in radar coordinates in memory
+            the icon field in radar coordinates in memory. Only the time
+            step and the part of the icon volume used are kept
         regular_grid : int. Dataset keyword
             if set it is assume that the radar has a grid constant in time and
             there is no need to compute a new icon field if the icon
@@ -149,11 +151,29 @@ def process_icon(procstatus, dscfg, radar_list=None):
             dscfg['initialized'] = 1
 
         icon_coord = dscfg['global_data']['icon_coord']
-        if fname != dscfg['global_data']['icon_fname']:
+        # only the part of the icon volume covered by the radar is read
+        bounds = get_icon_bounds(
+            radar, icon_coord,
+            index_cachedir=dscfg.get('gridIndexCacheDir', None))
+
+        # only one time step is kept in memory
+        icon_data = dscfg['global_data']['icon_data']
+        if fname == dscfg['global_data']['icon_fname']:
+            dticon = num2date(
+                icon_data['time']['data'][:], icon_data['time']['units'])
+            time_index = np.argmin(abs(dticon - dscfg['timeinfo']))
+            if (time_index != icon_data['time_index'] or
+                    not np.array_equal(bounds, icon_data['bounds'])):
+                icon_data = None
+        else:
+            icon_data = None
+
+        if icon_data is None:
             # debugging
             # start_time2 = time.time()
             icon_data = read_icon_data(
-                fname, field_names=field_names, celsius=True)
+                fname, field_names=field_names, celsius=True,
+                timeinfo=dscfg['timeinfo'], bounds=bounds)
             # print(" reading icon takes %s seconds " %
             #      (time.time() - start_time2))
             if icon_data is None:
@@ -164,31 +184,34 @@ def process_icon(procstatus, dscfg, radar_list=None):
             dscfg['global_data']['icon_fname'] = fname
         else:
             print('raw icon data already in memory')
-            icon_data = dscfg['global_data']['icon_data']
     else:
         icon_coord = read_icon_coord(
             dscfg['iconpath'][ind_rad] + 'rad2icon/' + model +
             '_MDR_3D_const.nc', zmin=zmin)
+        # only the part of the icon volume covered by the radar is read
+        bounds = get_icon_bounds(
+            radar, icon_coord,
+            index_cachedir=dscfg.get('gridIndexCacheDir', None))
 
         # debugging
         # start_time2 = time.time()
         icon_data = read_icon_data(
-            fname, field_names=field_names, celsius=True)
+            fname, field_names=field_names, celsius=True,
+            timeinfo=dscfg['timeinfo'], bounds=bounds)
         # print(" reading icon takes %s seconds " %
         #      (time.time() - start_time2))
         if icon_data is None:
             warn('icon data not found')
             return None, None
 
-    dticon = num2date(
-        icon_data['time']['data'][:], icon_data['time']['units'])
-    time_index = np.argmin(abs(dticon - dscfg['timeinfo']))
+    time_index = icon_data['time_index']
 
     if keep_in_memory and regular_grid:
         if time_index != dscfg['global_data']['time_index']:
             icon_fields = icon2radar_data(
                 radar, icon_coord, icon_data, time_index=time_index,
-                field_names=field_names)
+                field_names=field_names,
+                index_cachedir=dscfg.get('gridIndexCacheDir', None))
             if icon_fields is None:
                 warn('Unable to obtain icon fields')
                 return None, None
@@ -201,14 +224,14 @@ def process_icon(procstatus, dscfg, radar_list=None):
     else:
         icon_fields = icon2radar_data(
             radar, icon_coord, icon_data, time_index=time_index,
-            field_names=field_names)
+            field_names=field_names,
+            index_cachedir=dscfg.get('gridIndexCacheDir', None))
         if icon_fields is None:
             warn('Unable to obtain icon fields')
             return None, None
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
 
     for field in icon_fields:
         for field_name in field:
@@ -328,7 +351,9 @@ def process_hzt(procstatus, dscfg, radar_list=None):
 
     if keep_in_memory and regular_grid:
         if time_index != dscfg['global_data']['time_index']:
-            iso0_field = hzt2radar_data(radar, hzt_coord, hzt_data)
+            iso0_field = hzt2radar_data(
+                radar, hzt_coord, hzt_data,
+                index_cachedir=dscfg.get('gridIndexCacheDir', None))
             if iso0_field is None:
                 warn('Unable to obtain heigth over iso0 field')
                 return None, None
@@ -339,14 +364,15 @@ def process_hzt(procstatus, dscfg, radar_list=None):
             print('HZT field already in memory')
             iso0_field = dscfg['global_data']['iso0_field']
     else:
-        iso0_field = hzt2radar_data(radar, hzt_coord, hzt_data)
+        iso0_field = hzt2radar_data(
+            radar, hzt_coord, hzt_data,
+            index_cachedir=dscfg.get('gridIndexCacheDir', None))
         if iso0_field is None:
             warn('Unable to obtain HZT fields')
             return None, None
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field('height_over_iso0', iso0_field)
 
     return new_dataset, ind_rad
@@ -426,8 +452,7 @@ def process_iso0_mf(procstatus, dscfg, radar_list=None):
         return None, None
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field('height_over_iso0', iso0_field)
 
     return new_dataset, ind_rad
@@ -505,8 +530,7 @@ def process_iso0_grib(procstatus, dscfg, radar_list=None):
         return None, None
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field(field_name, iso0_field)
 
     return new_dataset, ind_rad
@@ -620,9 +644,10 @@ def process_icon_lookup_table(procstatus, dscfg, radar_list=None):
                 dscfg['iconpath'][ind_rad] + 'rad2icon/' + model +
                 '_MDR_3D_const.nc', zmin=zmin)
             print('icon coordinates files read')
-            icon_ind_field = icon2radar_coord(radar, icon_coord)
-            icon_radar = deepcopy(radar)
-            icon_radar.fields = dict()
+            icon_ind_field = icon2radar_coord(
+                radar, icon_coord,
+                index_cachedir=dscfg.get('gridIndexCacheDir', None))
+            icon_radar = get_radar_skeleton(radar)
             icon_radar.add_field('icon_index', icon_ind_field)
             print('icon index field added')
 
@@ -679,8 +704,7 @@ def process_icon_lookup_table(procstatus, dscfg, radar_list=None):
     dscfg['global_data']['icon_fname'] = fname
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
 
     if not regular_grid:
         radar_aux = deepcopy(dscfg['global_data']['icon_radar'])
@@ -788,9 +812,10 @@ def process_hzt_lookup_table(procstatus, dscfg, radar_list=None):
                 'x': hzt_data['x'],
                 'y': hzt_data['y']
             }
-            hzt_ind_field = hzt2radar_coord(radar, hzt_coord)
-            hzt_radar = deepcopy(radar)
-            hzt_radar.fields = dict()
+            hzt_ind_field = hzt2radar_coord(
+                radar, hzt_coord,
+                index_cachedir=dscfg.get('gridIndexCacheDir', None))
+            hzt_radar = get_radar_skeleton(radar)
             hzt_radar.add_field('hzt_index', hzt_ind_field)
 
         dscfg['global_data'] = {
@@ -836,8 +861,7 @@ def process_hzt_lookup_table(procstatus, dscfg, radar_list=None):
     dscfg['global_data']['hzt_fname'] = fname
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
 
     if not regular_grid:
         radar_aux = deepcopy(dscfg['global_data']['hzt_radar'])
@@ -1070,11 +1094,11 @@ def process_icon_coord(procstatus, dscfg, radar_list=None):
         return None, None
 
     icon_ind_field = icon2radar_coord(
-        radar, icon_coord, slice_xy=True, slice_z=False)
+        radar, icon_coord, slice_xy=True, slice_z=False,
+        index_cachedir=dscfg.get('gridIndexCacheDir', None))
 
     # prepare for exit
-    radar_obj = deepcopy(radar)
-    radar_obj.fields = dict()
+    radar_obj = get_radar_skeleton(radar)
     radar_obj.add_field('icon_index', icon_ind_field)
 
     new_dataset = {
@@ -1143,11 +1167,11 @@ def process_hzt_coord(procstatus, dscfg, radar_list=None):
         'y': hzt_data['y']
     }
 
-    hzt_ind_field = hzt2radar_coord(radar, hzt_coord)
+    hzt_ind_field = hzt2radar_coord(
+        radar, hzt_coord, index_cachedir=dscfg.get('gridIndexCacheDir', None))
 
     # prepare for exit
-    radar_obj = deepcopy(radar)
-    radar_obj.fields = dict()
+    radar_obj = get_radar_skeleton(radar)
     radar_obj.add_field('hzt_index', hzt_ind_field)
 
     new_dataset = {
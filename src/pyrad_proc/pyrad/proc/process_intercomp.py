@@ -36,7 +36,9 @@ from ..io.read_data_other import read_colocated_data_time_avg
 from ..io.read_data_radar import interpol_field
 
 from ..util.radar_utils import time_avg_range, get_range_bins_to_avg
+from ..util.radar_utils import get_range_window_data
 from ..util.radar_utils import find_colocated_indexes
+from ..util.radar_utils import get_radar_skeleton
 
 
 def process_time_stats(procstatus, dscfg, radar_list=None):
@@ -124,8 +126,7 @@ def process_time_stats(procstatus, dscfg, radar_list=None):
         npoints_dict['data'] = np.ma.asarray(
             np.logical_not(np.ma.getmaskarray(field['data'])), dtype=int)
 
-        radar_aux = deepcopy(radar)
-        radar_aux.fields = dict()
+        radar_aux = get_radar_skeleton(radar)
         radar_aux.add_field(field_name, field)
         radar_aux.add_field('number_of_samples', npoints_dict)
 
@@ -430,8 +431,7 @@ def process_time_stats2(procstatus, dscfg, radar_list=None):
         npoints_dict['data'] = np.ma.asarray(
             np.logical_not(np.ma.getmaskarray(field['data'])), dtype=int)
 
-        radar_aux = deepcopy(radar)
-        radar_aux.fields = dict()
+        radar_aux = get_radar_skeleton(radar)
         radar_aux.add_field(field_name, field)
         radar_aux.add_field('number_of_samples', npoints_dict)
 
@@ -649,8 +649,7 @@ def process_time_avg(procstatus, dscfg, radar_list=None):
         field['data'] = field['data'].filled(fill_value=0.)
         field['data'] = np.ma.asarray(field['data'])
 
-        radar_aux = deepcopy(radar)
-        radar_aux.fields = dict()
+        radar_aux = get_radar_skeleton(radar)
         radar_aux.add_field(field_name, field)
         npoints_dict = pyart.config.get_metadata('number_of_samples')
         npoints_dict['data'] = np.ma.ones(
@@ -830,8 +829,7 @@ def process_weighted_time_avg(procstatus, dscfg, radar_list=None):
 
         field['data'] *= refl_field['data']
 
-        radar_aux = deepcopy(radar)
-        radar_aux.fields = dict()
+        radar_aux = get_radar_skeleton(radar)
         radar_aux.add_field(field_name, field)
         radar_aux.add_field(refl_name, refl_field)
 
@@ -1083,8 +1081,7 @@ def process_time_avg_flag(procstatus, dscfg, radar_list=None):
                     temp_ref='height_over_iso0')
                 time_avg_flag['data'][mask_fzl] += 10000
 
-        radar_aux = deepcopy(radar)
-        radar_aux.fields = dict()
+        radar_aux = get_radar_skeleton(radar)
         radar_aux.add_field('time_avg_flag', time_avg_flag)
 
         # first volume: initialize start and end time of averaging
@@ -1319,12 +1316,10 @@ def process_colocated_gates(procstatus, dscfg, radar_list=None):
         elmin=elmin, elmax=elmax, azmin=azrad2min, azmax=azrad2max,
         visib_field=visib_field, intersec_field=coloc_gates_field)
 
-    new_rad1 = deepcopy(radar1)
-    new_rad1.fields = dict()
+    new_rad1 = get_radar_skeleton(radar1)
     new_rad1.add_field('colocated_gates', gate_coloc_rad1_dict)
 
-    new_rad2 = deepcopy(radar2)
-    new_rad2.fields = dict()
+    new_rad2 = get_radar_skeleton(radar2)
     new_rad2.add_field('colocated_gates', gate_coloc_rad2_dict)
 
     coloc_rad1_dict, new_rad1.fields['colocated_gates'] = (
@@ -1534,63 +1529,31 @@ def process_intercomp(procstatus, dscfg, radar_list=None):
         rad2_ray_ind = rad2_ray_ind[isvalid]
         rad2_rng_ind = rad2_rng_ind[isvalid]
 
-        # if averaging required loop over valid gates and average
+        # if averaging required average over the valid gates
         if avg_rad1:
-            ngates_valid = len(rad1_ray_ind)
-            val1_vec = np.ma.masked_all(ngates_valid, dtype=float)
-            is_valid_avg = np.zeros(ngates_valid, dtype=bool)
-            for i in range(ngates_valid):
-                if rad1_rng_ind[i] + avg_rad_lim[1] >= radar1.ngates:
-                    continue
-                if rad1_rng_ind[i] + avg_rad_lim[0] < 0:
-                    continue
-                ind_rng = list(range(rad1_rng_ind[i] + avg_rad_lim[0],
-                                     rad1_rng_ind[i] + avg_rad_lim[1] + 1))
-
-                if np.any(np.ma.getmaskarray(
-                        rad1_field[rad1_ray_ind[i], ind_rng])):
-                    continue
-
-                val1_vec[i] = np.ma.asarray(np.ma.mean(
-                    rad1_field[rad1_ray_ind[i], ind_rng]))
-
-                is_valid_avg[i] = True
+            val1_win, is_valid_avg = get_range_window_data(
+                rad1_field, rad1_ray_ind, rad1_rng_ind, avg_rad_lim)
 
             rad1_ray_ind = rad1_ray_ind[is_valid_avg]
             rad1_rng_ind = rad1_rng_ind[is_valid_avg]
             rad2_ray_ind = rad2_ray_ind[is_valid_avg]
             rad2_rng_ind = rad2_rng_ind[is_valid_avg]
 
-            val1_vec = val1_vec[is_valid_avg]
+            val1_vec = np.ma.asarray(
+                np.ma.mean(val1_win[is_valid_avg], axis=1), dtype=float)
             val2_vec = rad2_field[rad2_ray_ind, rad2_rng_ind]
 
         elif avg_rad2:
-            ngates_valid = len(rad2_ray_ind)
-            val2_vec = np.ma.masked_all(ngates_valid, dtype=float)
-            is_valid_avg = np.zeros(ngates_valid, dtype=bool)
-            for i in range(ngates_valid):
-                if rad2_rng_ind[i] + avg_rad_lim[1] >= radar2.ngates:
-                    continue
-                if rad2_rng_ind[i] + avg_rad_lim[0] < 0:
-                    continue
-                ind_rng = list(range(rad2_rng_ind[i] + avg_rad_lim[0],
-                                     rad2_rng_ind[i] + avg_rad_lim[1] + 1))
-
-                if np.any(np.ma.getmaskarray(
-                        rad2_field[rad2_ray_ind[i], ind_rng])):
-                    continue
-
-                val2_vec[i] = np.ma.asarray(np.ma.mean(
-                    rad2_field[rad2_ray_ind[i], ind_rng]))
-
-                is_valid_avg[i] = True
+            val2_win, is_valid_avg = get_range_window_data(
+                rad2_field, rad2_ray_ind, rad2_rng_ind, avg_rad_lim)
 
             rad1_ray_ind = rad1_ray_ind[is_valid_avg]
             rad1_rng_ind = rad1_rng_ind[is_valid_avg]
             rad2_ray_ind = rad2_ray_ind[is_valid_avg]
             rad2_rng_ind = rad2_rng_ind[is_valid_avg]
 
-            val2_vec = val2_vec[is_valid_avg]
+            val2_vec = np.ma.asarray(
+                np.ma.mean(val2_win[is_valid_avg], axis=1), dtype=float)
             val1_vec = rad1_field[rad1_ray_ind, rad1_rng_ind]
         else:
             val1_vec = val1_vec[isvalid]
@@ -1888,107 +1851,81 @@ def process_intercomp_time_avg(procstatus, dscfg, radar_list=None):
         rad2_ray_ind = rad2_ray_ind[isvalid]
         rad2_rng_ind = rad2_rng_ind[isvalid]
 
-        # if averaging required loop over valid gates and average
+        # if averaging required average over the valid gates
         # only if all gates valid
         if avg_rad1:
-            ngates_valid = len(rad1_ray_ind)
-            refl1_vec = np.ma.masked_all(ngates_valid, dtype=float)
-            phidp1_vec = np.ma.masked_all(ngates_valid, dtype=float)
-            flag1_vec = np.ma.masked_all(ngates_valid, dtype=int)
-            is_valid_avg = np.zeros(ngates_valid, dtype=bool)
-            for i in range(ngates_valid):
-                if rad1_rng_ind[i] + avg_rad_lim[1] >= radar1.ngates:
-                    continue
-                if rad1_rng_ind[i] + avg_rad_lim[0] < 0:
-                    continue
-                ind_rng = list(range(rad1_rng_ind[i] + avg_rad_lim[0],
-                                     rad1_rng_ind[i] + avg_rad_lim[1] + 1))
-
-                if np.any(np.ma.getmaskarray(
-                        refl1[rad1_ray_ind[i], ind_rng])):
-                    continue
-                if np.any(np.ma.getmaskarray(
-                        phidp1[rad1_ray_ind[i], ind_rng])):
-                    continue
-
-                refl1_vec[i] = np.ma.asarray(np.ma.mean(
-                    refl1[rad1_ray_ind[i], ind_rng]))
-                phidp1_vec[i] = np.ma.asarray(np.ma.mean(
-                    phidp1[rad1_ray_ind[i], ind_rng]))
-
-                rad1_flag = flag1[rad1_ray_ind[i], ind_rng]
-
-                rad1_excess_phi = rad1_flag % 100
-                rad1_clt = ((rad1_flag - rad1_excess_phi) % 10000) / 100
-                rad1_prec = (
-                    ((rad1_flag - rad1_clt * 100 - rad1_excess_phi) %
-                     1000000) / 10000)
-
-                flag1_vec[i] = int(
-                    10000 * np.max(rad1_prec) + 100 * np.max(rad1_clt) +
-                    np.max(rad1_excess_phi))
-                is_valid_avg[i] = True
+            refl1_win, is_valid_refl = get_range_window_data(
+                refl1, rad1_ray_ind, rad1_rng_ind, avg_rad_lim)
+            phidp1_win, is_valid_phidp = get_range_window_data(
+                phidp1, rad1_ray_ind, rad1_rng_ind, avg_rad_lim)
+            flag1_win, _ = get_range_window_data(
+                flag1, rad1_ray_ind, rad1_rng_ind, avg_rad_lim)
+            is_valid_avg = np.logical_and(is_valid_refl, is_valid_phidp)
 
             rad1_ray_ind = rad1_ray_ind[is_valid_avg]
             rad1_rng_ind = rad1_rng_ind[is_valid_avg]
             rad2_ray_ind = rad2_ray_ind[is_valid_avg]
             rad2_rng_ind = rad2_rng_ind[is_valid_avg]
 
-            refl1_vec = refl1_vec[is_valid_avg]
-            phidp1_vec = phidp1_vec[is_valid_avg]
-            flag1_vec = flag1_vec[is_valid_avg]
+            refl1_vec = np.ma.asarray(
+                np.ma.mean(refl1_win[is_valid_avg], axis=1), dtype=float)
+            phidp1_vec = np.ma.asarray(
+                np.ma.mean(phidp1_win[is_valid_avg], axis=1), dtype=float)
+
+            # the flag of the window is the highest value of each of its
+            # components
+            rad1_flag = flag1_win[is_valid_avg]
+            rad1_excess_phi = rad1_flag % 100
+            rad1_clt = ((rad1_flag - rad1_excess_phi) % 10000) / 100
+            rad1_prec = (
+                ((rad1_flag - rad1_clt * 100 - rad1_excess_phi) %
+                 1000000) / 10000)
+            flag1_vec = np.ma.asarray(
+                10000 * np.ma.max(rad1_prec, axis=1) +
+                100 * np.ma.max(rad1_clt, axis=1) +
+                np.ma.max(rad1_excess_phi, axis=1))
+            flag1_vec = np.ma.masked_where(
+                np.ma.getmaskarray(flag1_vec),
+                flag1_vec.filled(0).astype(int))
 
             refl2_vec = refl2[rad2_ray_ind, rad2_rng_ind]
             phidp2_vec = phidp2[rad2_ray_ind, rad2_rng_ind]
             flag2_vec = flag2[rad2_ray_ind, rad2_rng_ind]
 
         elif avg_rad2:
-            ngates_valid = len(rad2_ray_ind)
-            refl2_vec = np.ma.masked_all(ngates_valid, dtype=float)
-            phidp2_vec = np.ma.masked_all(ngates_valid, dtype=float)
-            flag2_vec = np.ma.masked_all(ngates_valid, dtype=int)
-            is_valid_avg = np.zeros(ngates_valid, dtype=bool)
-            for i in range(ngates_valid):
-                if rad2_rng_ind[i] + avg_rad_lim[1] >= radar2.ngates:
-                    continue
-                if rad2_rng_ind[i] + avg_rad_lim[0] < 0:
-                    continue
-                ind_rng = list(range(rad2_rng_ind[i] + avg_rad_lim[0],
-                                     rad2_rng_ind[i] + avg_rad_lim[1] + 1))
-
-                if np.any(np.ma.getmaskarray(
-                        refl2[rad2_ray_ind[i], ind_rng])):
-                    continue
-                if np.any(np.ma.getmaskarray(
-                        phidp2[rad2_ray_ind[i], ind_rng])):
-                    continue
-
-                refl2_vec[i] = np.ma.asarray(np.ma.mean(
-                    refl2[rad2_ray_ind[i], ind_rng]))
-                phidp2_vec[i] = np.ma.asarray(np.ma.mean(
-                    phidp2[rad2_ray_ind[i], ind_rng]))
-
-                rad2_flag = flag2[rad2_ray_ind[i], ind_rng]
-
-                rad2_excess_phi = rad2_flag % 100
-                rad2_clt = ((rad2_flag - rad2_excess_phi) % 10000) / 100
-                rad2_prec = (
-                    ((rad2_flag - rad2_clt * 100 - rad2_excess_phi) %
-                     1000000) / 10000)
-
-                flag2_vec[i] = int(
-                    10000 * np.max(rad2_prec) + 100 * np.max(rad2_clt) +
-                    np.max(rad2_excess_phi))
-                is_valid_avg[i] = True
+            refl2_win, is_valid_refl = get_range_window_data(
+                refl2, rad2_ray_ind, rad2_rng_ind, avg_rad_lim)
+            phidp2_win, is_valid_phidp = get_range_window_data(
+                phidp2, rad2_ray_ind, rad2_rng_ind, avg_rad_lim)
+            flag2_win, _ = get_range_window_data(
+                flag2, rad2_ray_ind, rad2_rng_ind, avg_rad_lim)
+            is_valid_avg = np.logical_and(is_valid_refl, is_valid_phidp)
 
             rad1_ray_ind = rad1_ray_ind[is_valid_avg]
             rad1_rng_ind = rad1_rng_ind[is_valid_avg]
             rad2_ray_ind = rad2_ray_ind[is_valid_avg]
             rad2_rng_ind = rad2_rng_ind[is_valid_avg]
 
-            refl2_vec = refl2_vec[is_valid_avg]
-            phidp2_vec = phidp2_vec[is_valid_avg]
-            flag2_vec = flag2_vec[is_valid_avg]
+            refl2_vec = np.ma.asarray(
+                np.ma.mean(refl2_win[is_valid_avg], axis=1), dtype=float)
+            phidp2_vec = np.ma.asarray(
+                np.ma.mean(phidp2_win[is_valid_avg], axis=1), dtype=float)
+
+            # the flag of the window is the highest value of each of its
+            # components
+            rad2_flag = flag2_win[is_valid_avg]
+            rad2_excess_phi = rad2_flag % 100
+            rad2_clt = ((rad2_flag - rad2_excess_phi) % 10000) / 100
+            rad2_prec = (
+                ((rad2_flag - rad2_clt * 100 - rad2_excess_phi) %
+                 1000000) / 10000)
+            flag2_vec = np.ma.asarray(
+                10000 * np.ma.max(rad2_prec, axis=1) +
+                100 * np.ma.max(rad2_clt, axis=1) +
+                np.ma.max(rad2_excess_phi, axis=1))
+            flag2_vec = np.ma.masked_where(
+                np.ma.getmaskarray(flag2_vec),
+                flag2_vec.filled(0).astype(int))
 
             refl1_vec = refl1[rad1_ray_ind, rad1_rng_ind]
             phidp1_vec = phidp1[rad1_ray_ind, rad1_rng_ind]
@@ -2178,8 +2115,7 @@ def process_fields_diff(procstatus, dscfg, radar_list=None):
         radar2.fields[field_name_2]['data'])
     field_diff['long_name'] = field_name_1 + ' - ' + field_name_2
 
-    rad_diff = deepcopy(radar1)
-    rad_diff.fields = dict()
+    rad_diff = get_radar_skeleton(radar1)
     rad_diff.add_field('fields_difference', field_diff)
 
     new_dataset = {'radar_out': rad_diff}
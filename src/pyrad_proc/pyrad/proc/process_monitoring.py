@@ -29,7 +29,8 @@ from ..io.read_data_other import read_selfconsistency
 from ..io.read_data_sensor import read_fzl_igra
 from ..io.read_data_radar import interpol_field
 
-from ..util.radar_utils import get_histogram_bins
+from ..util.radar_utils import get_histogram_bins, compute_histogram_rays
+from ..util.radar_utils import get_radar_skeleton
 from ..util.stat_utils import ratio_bootstrapping
 
 
@@ -247,8 +248,7 @@ def process_selfconsistency_kdp_phidp(procstatus, dscfg, radar_list=None):
             phidpsim_field=phidpsim_field, temp_ref=temp_ref)
 
         # prepare for exit
-        new_dataset = {'radar_out': deepcopy(radar)}
-        new_dataset['radar_out'].fields = dict()
+        new_dataset = {'radar_out': get_radar_skeleton(radar)}
 
         new_dataset['radar_out'].add_field(kdpsim_field, kdpsim)
         new_dataset['radar_out'].add_field(phidpsim_field, phidpsim)
@@ -544,8 +544,7 @@ def process_selfconsistency_bias(procstatus, dscfg, radar_list=None):
                     selfconsistency_dict['kdp'])
 
         # prepare for exit
-        new_dataset = {'radar_out': deepcopy(radar)}
-        new_dataset['radar_out'].fields = dict()
+        new_dataset = {'radar_out': get_radar_skeleton(radar)}
 
         new_dataset['radar_out'].add_field('reflectivity_bias', refl_bias)
 
@@ -980,8 +979,7 @@ def process_estimate_phidp0(procstatus, dscfg, radar_list=None):
         refl_field=refl_field)
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
 
     new_dataset['radar_out'].add_field('system_differential_phase', phidp0)
     new_dataset['radar_out'].add_field(
@@ -1128,8 +1126,7 @@ def process_rhohv_rain(procstatus, dscfg, radar_list=None):
         refl_field=refl_field, temp_ref=temp_ref)
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field(
         'cross_correlation_ratio_in_rain', rhohv_rain)
 
@@ -1317,8 +1314,7 @@ def process_zdr_precip(procstatus, dscfg, radar_list=None):
         temp_ref=temp_ref)
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
 
     new_dataset['radar_out'].add_field(
         'differential_reflectivity_in_precipitation', zdr_precip)
@@ -1469,8 +1465,7 @@ def process_zdr_snow(procstatus, dscfg, radar_list=None):
         kdp_field=kdp_field, refl_field=refl_field)
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
 
     new_dataset['radar_out'].add_field(
         'differential_reflectivity_in_snow', zdr_snow)
@@ -1586,8 +1581,7 @@ def process_monitoring(procstatus, dscfg, radar_list=None):
                         radar.time['data'][
                             ind_start_old:ind_start_old + nrays_sweep])
 
-        radar_hist = deepcopy(radar_aux)
-        radar_hist.fields = dict()
+        radar_hist = get_radar_skeleton(radar_aux)
         radar_hist.range['data'] = bin_centers
         radar_hist.ngates = nbins
 
@@ -1604,9 +1598,7 @@ def process_monitoring(procstatus, dscfg, radar_list=None):
         ind = np.where(np.logical_and(mask is False, field > bin_centers[-1]))
         field[ind] = bin_centers[-1]
 
-        for ray in range(radar_aux.nrays):
-            field_dict['data'][ray, :], bin_edges = np.histogram(
-                field[ray, :].compressed(), bins=bin_edges)
+        field_dict['data'][:] = compute_histogram_rays(field, bin_edges)
 
         radar_hist.add_field(field_name, field_dict)
         start_time = pyart.graph.common.generate_radar_time_begin(radar_hist)
@@ -32,6 +32,7 @@ import pyart
 
 from ..io.io_aux import get_datatype_fields
 from ..io.read_data_sensor import read_fzl_igra
+from ..util.radar_utils import get_radar_skeleton
 
 # Ignore warning in process_phidp_kdp_Maesaka
 warnings.filterwarnings(
@@ -134,8 +135,7 @@ def process_correct_phidp0(procstatus, dscfg, radar_list=None):
         phidp = radar.fields[phidp_field]
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field(phidp_field, phidp)
 
     return new_dataset, ind_rad
@@ -235,8 +235,7 @@ def process_smooth_phidp_single_window(procstatus, dscfg, radar_list=None):
         phidp_field=phidp_field)
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field(phidp_field, phidp)
 
     return new_dataset, ind_rad
@@ -344,8 +343,7 @@ def process_smooth_phidp_double_window(procstatus, dscfg, radar_list=None):
         phidp_field=phidp_field)
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field(phidp_field, phidp)
 
     return new_dataset, ind_rad
@@ -541,8 +539,7 @@ def process_phidp_kdp_Maesaka(procstatus, dscfg, radar_list=None):
     phidpf['data'] = np.ma.masked_where(mask, phidpf['data'])
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar_aux)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar_aux)}
     new_dataset['radar_out'].add_field(phidp_field, phidpf)
     new_dataset['radar_out'].add_field(kdp_field, kdp)
 
@@ -813,8 +810,7 @@ def process_phidp_kdp_lp(procstatus, dscfg, radar_list=None):
     phidp['data'] = np.ma.masked_where(mask, phidp['data'])
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field(phidp_field, phidp)
     new_dataset['radar_out'].add_field(kdp_field, kdp)
 
@@ -888,8 +884,7 @@ def process_kdp_leastsquare_single_window(procstatus, dscfg, radar_list=None):
         kdp_field=kdp_field, vectorize=vectorize)
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field(kdp_field, kdp)
 
     return new_dataset, ind_rad
@@ -978,8 +973,7 @@ def process_kdp_leastsquare_double_window(procstatus, dscfg, radar_list=None):
         vectorize=vectorize)
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field(kdp_field, kdp)
 
     return new_dataset, ind_rad
@@ -1095,8 +1089,7 @@ def process_phidp_kdp_Vulpiani(procstatus, dscfg, radar_list=None):
         prefilter_psidp=False, filter_opt=None, parallel=parallel)
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field(kdp_field, kdp_dict)
     if get_phidp:
         new_dataset['radar_out'].add_field(phidpr_field, phidpr_dict)
@@ -1197,8 +1190,7 @@ def process_phidp_kdp_Kalman(procstatus, dscfg, radar_list=None):
         pcov=0, prefilter_psidp=False, filter_opt=None, parallel=parallel)
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field(kdp_field, kdp_dict)
     if get_phidp:
         new_dataset['radar_out'].add_field(phidpr_field, phidpr_dict)
@@ -1334,8 +1326,7 @@ def process_attenuation(procstatus, dscfg, radar_list=None):
                 pida_field=None, corr_zdr_field=None, temp_ref=temp_ref))
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
 
     new_dataset['radar_out'].add_field('specific_attenuation', spec_at)
     new_dataset['radar_out'].add_field('path_integrated_attenuation', pia)
@@ -39,6 +39,7 @@ from ..io.read_data_radar import interpol_field
 from ..io.read_data_other import read_rhi_profile, read_vpr_theo_parameters
 
 from ..util.radar_utils import time_avg_range
+from ..util.radar_utils import get_radar_skeleton
 
 
 def process_ccor(procstatus, dscfg, radar_list=None):
@@ -96,8 +97,7 @@ def process_ccor(procstatus, dscfg, radar_list=None):
         ccor_field=ccor_field)
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field(ccor_field, ccor)
 
     return new_dataset, ind_rad
@@ -194,8 +194,7 @@ def process_signal_power(procstatus, dscfg, radar_list=None):
         lradome=lradome, refl_field=refl_field, pwr_field=pwr_field)
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field(pwr_field, s_pwr)
 
     return new_dataset, ind_rad
@@ -316,8 +315,7 @@ def process_rcs_pr(procstatus, dscfg, radar_list=None):
         lradome=lradome, refl_field=refl_field, rcs_field=rcs_field)
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field(rcs_field, rcs_dict)
 
     return new_dataset, ind_rad
@@ -396,8 +394,7 @@ def process_rcs(procstatus, dscfg, radar_list=None):
         refl_field=refl_field, rcs_field=rcs_field)
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field(rcs_field, rcs_dict)
 
     return new_dataset, ind_rad
@@ -464,8 +461,7 @@ def process_vol_refl(procstatus, dscfg, radar_list=None):
         vol_refl_field=vol_refl_field)
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field(vol_refl_field, vol_refl_dict)
 
     return new_dataset, ind_rad
@@ -530,8 +526,7 @@ def process_snr(procstatus, dscfg, radar_list=None):
         snr_field=snr_field)
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field(snr_field, snr)
 
     return new_dataset, ind_rad
@@ -615,8 +610,7 @@ def process_radial_noise_hs(procstatus, dscfg, radar_list=None):
         get_noise_pos=get_noise_pos)
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field(noise_field, noise)
     if noise_pos is not None:
         new_dataset['radar_out'].add_field(noise_pos_field, noise_pos)
@@ -698,8 +692,7 @@ def process_radial_noise_ivic(procstatus, dscfg, radar_list=None):
         get_noise_pos=get_noise_pos)
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field(noise_field, noise)
     if noise_pos is not None:
         new_dataset['radar_out'].add_field(noise_pos_field, noise_pos)
@@ -754,8 +747,7 @@ def process_l(procstatus, dscfg, radar_list=None):
         l_field='logarithmic_cross_correlation_ratio')
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field(
         'logarithmic_cross_correlation_ratio', comp_l)
 
@@ -814,8 +806,7 @@ def process_cdr(procstatus, dscfg, radar_list=None):
         cdr_field='circular_depolarization_ratio')
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field('circular_depolarization_ratio', cdr)
 
     return new_dataset, ind_rad
@@ -1115,8 +1106,7 @@ def process_vpr(procstatus, dscfg, radar_list=None):
             iso0_field=iso0_field, temp_ref=temp_ref)
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field(corr_refl_field, refl_corr)
     new_dataset['radar_out'].add_field(corr_field, vpr_corr)
     new_dataset.update({'vpr_theo_dict': vpr_theo_dict})
@@ -1385,8 +1375,7 @@ def process_rainrate(procstatus, dscfg, radar_list=None):
             dscfg['RR_METHOD'])
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field('radar_estimated_rain_rate', rain)
 
     return new_dataset, ind_rad
@@ -1465,8 +1454,7 @@ def process_rainfall_accumulation(procstatus, dscfg, radar_list=None):
         rr_acu_dict = pyart.config.get_metadata(rr_acu_name)
         rr_acu_dict['data'] = field_data
 
-        radar_aux = deepcopy(radar)
-        radar_aux.fields = dict()
+        radar_aux = get_radar_skeleton(radar)
         radar_aux.add_field(rr_acu_name, rr_acu_dict)
 
         # first volume: initialize start and end time of averaging
@@ -1631,8 +1619,7 @@ def process_bird_density(procstatus, dscfg, radar_list=None):
         bird_density_field='bird_density')
 
     # prepare for exit
-    new_dataset = {'radar_out': deepcopy(radar)}
-    new_dataset['radar_out'].fields = dict()
+    new_dataset = {'radar_out': get_radar_skeleton(radar)}
     new_dataset['radar_out'].add_field('bird_density', bird_density_dict)
 
     return new_dataset, ind_rad
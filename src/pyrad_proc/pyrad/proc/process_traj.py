@@ -49,6 +49,7 @@ from ..io.read_data_other import read_antenna_pattern
 
 from ..util.stat_utils import quantiles_weighted
 from ..util.radar_utils import belongs_roi_indices, find_nearest_gate
+from ..util.radar_utils import get_radar_skeleton
 
 
 def process_trajectory(procstatus, dscfg, radar_list=None, trajectory=None):
@@ -158,8 +159,7 @@ def process_traj_trt(procstatus, dscfg, radar_list=None, trajectory=None):
         return None, None
 
     # keep locally only field of interest in radar object
-    radar = deepcopy(radar_list[ind_rad])
-    radar.fields = dict()
+    radar = get_radar_skeleton(radar_list[ind_rad])
     nfields_available = 0
     for field_name in field_names:
         if field_name not in radar_list[ind_rad].fields:
@@ -303,8 +303,7 @@ def process_traj_trt_contour(procstatus, dscfg, radar_list=None,
         return None, None
 
     # keep locally only field of interest in radar object
-    radar = deepcopy(radar_list[ind_rad])
-    radar.fields = dict()
+    radar = get_radar_skeleton(radar_list[ind_rad])
     nfields_available = 0
     for field_name in field_names:
         if field_name not in radar_list[ind_rad].fields:
@@ -404,8 +403,7 @@ def process_traj_lightning(procstatus, dscfg, radar_list=None,
         return None, None
 
     # keep locally only field of interest in radar object
-    radar = deepcopy(radar_list[ind_rad])
-    radar.fields = dict()
+    radar = get_radar_skeleton(radar_list[ind_rad])
     nfields_available = 0
     for field_name in field_names:
         if field_name not in radar_list[ind_rad].fields:
@@ -649,8 +647,7 @@ def process_traj_atplane(procstatus, dscfg, radar_list=None, trajectory=None):
         return None, None
 
     # keep locally only field of interest in radar object
-    radar = deepcopy(radar_list[ind_rad])
-    radar.fields = dict()
+    radar = get_radar_skeleton(radar_list[ind_rad])
     nfields_available = 0
     for field_name in field_names:
         if field_name not in radar_list[ind_rad].fields:
@@ -949,8 +946,7 @@ def process_traj_antenna_pattern(procstatus, dscfg, radar_list=None,
         return None, None
 
     # keep locally only field of interest in radar object
-    radar = deepcopy(radar_list[ind_rad])
-    radar.fields = dict()
+    radar = get_radar_skeleton(radar_list[ind_rad])
     nfields_available = 0
     for field_name in field_names:
         if field_name not in radar_list[ind_rad].fields:
@@ -51,6 +51,10 @@ def generate_intercomp_products(dataset, prdcfg):
                 'rewrite': Bool
                     If true rewrites the csv file containing the statistics.
                     Default False
+                'ts_format': str
+                    Format of the file containing the statistics. Can be
+                    'csv' or 'h5' (binary store to which the new samples are
+                    appended). Default 'csv'
                 'npoints_min': int
                     The minimum number of points to consider the statistics
                     valid and therefore use the data point in the plotting.
@@ -245,7 +249,8 @@ def generate_intercomp_products(dataset, prdcfg):
             prdcfg['prdname'], timeinfo=None)
 
         csvfname = make_filename(
-            'ts', prdcfg['dstype'], prdcfg['voltype'], ['csv'],
+            'ts', prdcfg['dstype'], prdcfg['voltype'],
+            [prdcfg.get('ts_format', 'csv')],
             prdcfginfo=rad1_name + '-' + rad2_name,
             timeinfo=csvtimeinfo_file, timeformat=timeformat)[0]
 
@@ -259,7 +264,9 @@ def generate_intercomp_products(dataset, prdcfg):
         (date_vec, np_vec, meanbias_vec, medianbias_vec, quant25bias_vec,
          quant75bias_vec, modebias_vec, corr_vec, slope_vec, intercep_vec,
          intercep_slope1_vec) = (
-             read_intercomp_scores_ts(csvfname, sort_by_date=sort_by_date))
+             read_intercomp_scores_ts(
+                 csvfname, sort_by_date=sort_by_date,
+                 incremental=not rewrite))
 
         if date_vec is None:
             warn(
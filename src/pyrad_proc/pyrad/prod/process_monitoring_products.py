@@ -130,6 +130,10 @@ def generate_monitoring_products(dataset, prdcfg):
                 rewrite: Bool
                     If true the csv file containing the statistics is
                     rewritten
+                ts_format: str
+                    Format of the file containing the statistics. Can be
+                    'csv' or 'h5' (binary store to which the new samples are
+                    appended). Default 'csv'
                 add_data_in_fname: Bool
                     If true and the data used is cumulative the year is
                     written in the csv file name and the plot file name
@@ -381,7 +385,8 @@ def generate_monitoring_products(dataset, prdcfg):
             prdcfg['prdname'], timeinfo=csvtimeinfo_path)
 
         csvfname = make_filename(
-            'ts', prdcfg['dstype'], prdcfg['voltype'], ['csv'],
+            'ts', prdcfg['dstype'], prdcfg['voltype'],
+            [prdcfg.get('ts_format', 'csv')],
             timeinfo=csvtimeinfo_file, timeformat=timeformat,
             runinfo=prdcfg['runinfo'])[0]
 
@@ -403,7 +408,8 @@ def generate_monitoring_products(dataset, prdcfg):
         print('saved CSV file: ' + csvfname)
 
         date, np_t_vec, cquant_vec, lquant_vec, hquant_vec = (
-            read_monitoring_ts(csvfname, sort_by_date=sort_by_date))
+            read_monitoring_ts(
+                csvfname, sort_by_date=sort_by_date, incremental=not rewrite))
 
         if date is None:
             warn(
@@ -628,7 +634,8 @@ def generate_monitoring_products(dataset, prdcfg):
         print('saved CSV file: ' + csvfname)
 
         date, np_t_vec, cquant_vec, lquant_vec, hquant_vec = (
-            read_monitoring_ts(csvfname, sort_by_date=sort_by_date))
+            read_monitoring_ts(
+                csvfname, sort_by_date=sort_by_date, incremental=not rewrite))
 
         if date is None:
             warn(
@@ -122,6 +122,10 @@ def generate_timeseries_products(dataset, prdcfg):
                 vmin, vmax: float
                     The limits of the Y-axis. If none they will be obtained
                     from the Py-ART config file.
+                ts_format: str
+                    Format of the time series file. Can be 'csv' or 'h5'
+                    (binary store to which the new samples are appended).
+                    Default 'csv'
         'PLOT_CUMULATIVE_POINT': Plots a time series of radar data
             accumulation at a particular point.
             User defined parameters:
@@ -243,9 +247,9 @@ def generate_timeseries_products(dataset, prdcfg):
             timeinfo=timeinfo)
 
         csvfname = make_filename(
-            'ts', prdcfg['dstype'], dataset['datatype'], ['csv'],
-            prdcfginfo=gateinfo, timeinfo=timeinfo,
-            timeformat=timeformat)[0]
+            'ts', prdcfg['dstype'], dataset['datatype'],
+            [prdcfg.get('ts_format', 'csv')], prdcfginfo=gateinfo,
+            timeinfo=timeinfo, timeformat=timeformat)[0]
 
         csvfname = savedir + csvfname
 
@@ -30,6 +30,7 @@ from ..io.write_data import write_last_state, write_histogram, write_quantiles
 from ..io.write_data import write_fixed_angle, write_monitoring_ts
 from ..io.write_data import write_alarm_msg, write_timeseries_point, send_msg
 from ..io.write_data import write_vol_kml, write_vol_csv
+from ..io.npy_volume import write_npy_volume
 from ..io.read_data_dem import read_dem
 
 from ..io.read_data_other import read_monitoring_ts
@@ -511,11 +512,14 @@ def generate_vol_products(dataset, prdcfg):
                     the X-axis. If None, they are obtained from the Py-ART
                     config file
         'SAVEALL': Saves radar volume data including all or a list of user-
-            defined fields in a C/F radial or ODIM file
+            defined fields in a C/F radial or ODIM file or in the pyrad
+            intermediate format
             User defined parameters:
                 file_type: str
-                    The type of file used to save the data. Can be 'nc' or
-                    'h5'. Default 'nc'
+                    The type of file used to save the data. Can be 'nc',
+                    'h5' or 'npyvol' (pyrad intermediate format, a directory
+                    with one numpy file per field that can be read lazily
+                    with the NPYVOLPYRAD data descriptor). Default 'nc'
                 datatypes: list of str or None
                     The list of data types to save. If it is None, all fields
                     in the radar object will be saved
@@ -525,11 +529,13 @@ def generate_vol_products(dataset, prdcfg):
                 compression: str
                     For ODIM file formats, the type of compression. Can be any
                     of the allowed compression types for hdf5 files. Default
-                    gzip
+                    gzip. For the npyvol format it can be None (the fields
+                    are memory-mapped when read) or 'zlib'. Default None
                 compression_opts: any
                     The compression options allowed by the hdf5. Depends on
                     the type of compression. Default 6 (The gzip compression
-                    level).
+                    level). For the npyvol format the zlib compression level.
+                    Default 1
         'SAVEALL_VOL' : Same as before but can be used in a mixed GRID/VOL
             dataset, as there is no ambiguity with SAVEALL for VOL datasets
         'SAVESTATE': Saves the last processed data in a file. Used for real-
@@ -569,11 +575,11 @@ def generate_vol_products(dataset, prdcfg):
                     the type of compression. Default 6 (The gzip compression
                     level).
         'SAVEVOL': Saves one field of a radar volume data in a C/F radial or
-            ODIM file
+            ODIM file or in the pyrad intermediate format
             User defined parameters:
                 file_type: str
-                    The type of file used to save the data. Can be 'nc' or
-                    'h5'. Default 'nc'
+                    The type of file used to save the data. Can be 'nc',
+                    'h5' or 'npyvol'. Default 'nc'
                 physical: Bool
                     If True the data will be saved in physical units (floats).
                     Otherwise it will be quantized and saved as binary.
@@ -581,11 +587,13 @@ def generate_vol_products(dataset, prdcfg):
                 compression: str
                     For ODIM file formats, the type of compression. Can be any
                     of the allowed compression types for hdf5 files. Default
-                    gzip
+                    gzip. For the npyvol format it can be None or 'zlib'.
+                    Default None
                 compression_opts: any
                     The compression options allowed by the hdf5. Depends on
                     the type of compression. Default 6 (The gzip compression
-                    level).
+                    level). For the npyvol format the zlib compression level.
+                    Default 1
         'SAVEVOL_CSV': Saves one field of a radar volume data in a CSV file
             User defined parameters:
                 ignore_masked: bool
@@ -641,6 +649,10 @@ def generate_vol_products(dataset, prdcfg):
                 rewrite: Bool
                     If true the csv file containing the statistics is
                     rewritten
+                ts_format: str
+                    Format of the file containing the statistics. Can be
+                    'csv' or 'h5' (binary store to which the new samples are
+                    appended). Default 'csv'
                 add_data_in_fname: Bool
                     If true and the data used is cumulative the year is
                     written in the csv file name and the plot file name
@@ -3215,7 +3227,8 @@ def generate_vol_products(dataset, prdcfg):
             prdcfg['prdname'], timeinfo=csvtimeinfo_path)
 
         csvfname = make_filename(
-            'ts', prdcfg['dstype'], prdcfg['voltype'], ['csv'],
+            'ts', prdcfg['dstype'], prdcfg['voltype'],
+            [prdcfg.get('ts_format', 'csv')],
             timeinfo=csvtimeinfo_file, timeformat=timeformat,
             runinfo=prdcfg['runinfo'])[0]
 
@@ -3238,7 +3251,8 @@ def generate_vol_products(dataset, prdcfg):
         print('saved CSV file: ' + csvfname)
 
         date, np_t_vec, cquant_vec, lquant_vec, hquant_vec = (
-            read_monitoring_ts(csvfname, sort_by_date=sort_by_date))
+            read_monitoring_ts(
+                csvfname, sort_by_date=sort_by_date, incremental=not rewrite))
 
         if date is None:
             warn(
@@ -3504,6 +3518,11 @@ def generate_vol_products(dataset, prdcfg):
             pyart.aux_io.write_odim_h5(
                 fname, new_dataset,
                 compression=compression, compression_opts=compression_opts)
+        elif file_type == 'npyvol':
+            write_npy_volume(
+                fname, new_dataset,
+                compression=prdcfg.get('compression', None),
+                compression_opts=prdcfg.get('compression_opts', 1))
         else:
             warn('Data could not be saved. ' +
                  'Unknown saving file type ' + file_type)
@@ -3555,6 +3574,11 @@ def generate_vol_products(dataset, prdcfg):
                 fname, dataset['radar_out'], field_names=field_names,
                 compression=compression,
                 compression_opts=compression_opts)
+        elif file_type == 'npyvol':
+            write_npy_volume(
+                fname, dataset['radar_out'], field_names=field_names,
+                compression=prdcfg.get('compression', None),
+                compression_opts=prdcfg.get('compression_opts', 1))
         else:
             warn('Data could not be saved. ' +
                  'Unknown saving file type ' + file_type)
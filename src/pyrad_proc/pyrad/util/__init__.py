@@ -22,8 +22,14 @@ Radar Utilities
     find_contiguous_times
     join_time_series
     get_range_bins_to_avg
+    get_range_window_data
+    get_neighbour_data
     find_ray_index
     find_rng_index
+    find_ray_indexes
+    find_rng_indexes
+    find_first_rng_index
+    get_blocked_gates
     find_nearest_gate
     find_colocated_indexes
     get_fixed_rng_data
@@ -39,6 +45,7 @@ Radar Utilities
     compute_2d_stats
     compute_histogram
     compute_histogram_sweep
+    compute_histogram_rays
     belongs_roi_indices
     get_cercle_coords
     get_box_coords
@@ -46,16 +53,33 @@ Radar Utilities
     project_to_vertical
 
     quantiles_weighted
+    quantiles_weighted_segments
     ratio_bootstrapping
     compute_average_vad
+    get_radar_skeleton
+    join_radars
+
+Shared Memory
+=============
+
+.. autosummary::
+    :toctree: generated/
+
+    radar_to_shared_memory
+    unlink_shared_arrays
+    SharedRadar
 """
 
 from .radar_utils import time_avg_range, get_closest_solar_flux # noqa
 from .radar_utils import create_sun_hits_field, create_sun_retrieval_field # noqa
 from .radar_utils import compute_histogram, compute_histogram_sweep # noqa
+from .radar_utils import compute_histogram_rays # noqa
 from .radar_utils import compute_quantiles, compute_quantiles_sweep # noqa
 from .radar_utils import compute_quantiles_from_hist, get_range_bins_to_avg # noqa
+from .radar_utils import get_range_window_data, get_neighbour_data # noqa
 from .radar_utils import find_ray_index, find_rng_index, find_nearest_gate # noqa
+from .radar_utils import find_ray_indexes, find_rng_indexes # noqa
+from .radar_utils import find_first_rng_index, get_blocked_gates # noqa
 from .radar_utils import find_colocated_indexes, find_contiguous_times # noqa
 from .radar_utils import compute_2d_hist, compute_1d_stats, compute_2d_stats # noqa
 from .radar_utils import time_series_statistics, join_time_series # noqa
@@ -64,8 +88,13 @@ from .radar_utils import project_to_vertical, get_data_along_rng # noqa
 from .radar_utils import get_data_along_azi, get_data_along_ele # noqa
 from .radar_utils import get_fixed_rng_data, get_cercle_coords # noqa
 from .radar_utils import get_box_coords, compute_profile_stats # noqa
-from .radar_utils import compute_average_vad # noqa
+from .radar_utils import compute_average_vad, get_radar_skeleton # noqa
+from .radar_utils import join_radars # noqa
 
 from .stat_utils import quantiles_weighted, ratio_bootstrapping #noqa
+from .stat_utils import quantiles_weighted_segments #noqa
+
+from .shared_memory import radar_to_shared_memory, SharedRadar # noqa
+from .shared_memory import unlink_shared_arrays # noqa
 
 __all__ = [s for s in dir() if not s.startswith('_')]
@@ -16,11 +16,17 @@ Miscellaneous functions dealing with radar data
     find_contiguous_times
     join_time_series
     get_range_bins_to_avg
+    get_range_window_data
+    get_neighbour_data
     get_cercle_coords
     get_box_coords
     belongs_roi_indices
     find_ray_index
     find_rng_index
+    find_ray_indexes
+    find_rng_indexes
+    find_first_rng_index
+    get_blocked_gates
     find_ang_index
     find_nearest_gate
     find_colocated_indexes
@@ -34,6 +40,7 @@ Miscellaneous functions dealing with radar data
     compute_quantiles_sweep
     compute_histogram
     compute_histogram_sweep
+    compute_histogram_rays
     get_histogram_bins
     compute_2d_stats
     compute_1d_stats
@@ -42,6 +49,8 @@ Miscellaneous functions dealing with radar data
     compute_profile_stats
     project_to_vertical
     compute_average_vad
+    get_radar_skeleton
+    join_radars
 """
 from warnings import warn
 from copy import deepcopy
@@ -662,6 +671,92 @@ def get_range_bins_to_avg(rad1_rng, rad2_rng):
     return avg_rad1, avg_rad2, avg_rad_lim
 
 
+def get_range_window_data(field, ray_ind, rng_ind, avg_rad_lim):
+    """
+    Gets the data of the range windows around a set of gates
+
+    Parameters
+    ----------
+    field : 2D masked array
+        the field data (nrays, ngates)
+    ray_ind, rng_ind : array of ints
+        the ray and range indices of the gates
+    avg_rad_lim : list of 2 ints
+        the limits of the window in number of range bins relative to the
+        gate, as returned by get_range_bins_to_avg
+
+    Returns
+    -------
+    data : 2D masked array
+        the data of the window of each gate (ngates, nbins)
+    is_valid : array of bools
+        True if the window is within the radar range and none of its data
+        is masked
+
+    """
+    ray_ind = np.asarray(ray_ind, dtype=int)
+    rng_ind = np.asarray(rng_ind, dtype=int)
+    ngates = field.shape[1]
+
+    is_valid = np.logical_and(
+        rng_ind + avg_rad_lim[1] < ngates, rng_ind + avg_rad_lim[0] >= 0)
+    ind_rng = np.clip(
+        rng_ind[:, np.newaxis] +
+        np.arange(avg_rad_lim[0], avg_rad_lim[1] + 1), 0, ngates - 1)
+    data = np.ma.asarray(field)[ray_ind[:, np.newaxis], ind_rng]
+    is_valid = np.logical_and(
+        is_valid, np.logical_not(np.any(np.ma.getmaskarray(data), axis=1)))
+
+    return data, is_valid
+
+
+def get_neighbour_data(field, ray_ind, rng_ind, nb=2, exclude_centre=True):
+    """
+    Gets the data of the gates surrounding a set of gates
+
+    Parameters
+    ----------
+    field : 2D masked array
+        the field data (nrays, ngates)
+    ray_ind, rng_ind : array of ints
+        the ray and range indices of the gates
+    nb : int
+        the number of neighbours to each side in azimuth and range. I.e. 2
+        corresponds to a window of 5x5 gates
+    exclude_centre : bool
+        if True the data of the gate itself is not returned
+
+    Returns
+    -------
+    data : 2D masked array
+        the data of the neighbours of each gate (ngates, nneighbours). The
+        neighbours outside the field are masked
+
+    """
+    ray_ind = np.asarray(ray_ind, dtype=int)
+    rng_ind = np.asarray(rng_ind, dtype=int)
+    nrays, ngates = field.shape
+
+    ray_offset, rng_offset = np.meshgrid(
+        np.arange(-nb, nb + 1), np.arange(-nb, nb + 1), indexing='ij')
+    ray_offset = ray_offset.ravel()
+    rng_offset = rng_offset.ravel()
+    if exclude_centre:
+        is_centre = np.logical_and(ray_offset == 0, rng_offset == 0)
+        ray_offset = ray_offset[~is_centre]
+        rng_offset = rng_offset[~is_centre]
+
+    ind_rays = ray_ind[:, np.newaxis] + ray_offset
+    ind_rngs = rng_ind[:, np.newaxis] + rng_offset
+    is_outside = np.logical_or.reduce((
+        ind_rays < 0, ind_rays >= nrays, ind_rngs < 0, ind_rngs >= ngates))
+    data = np.ma.asarray(field)[
+        np.clip(ind_rays, 0, nrays - 1), np.clip(ind_rngs, 0, ngates - 1)]
+    data[is_outside] = np.ma.masked
+
+    return data
+
+
 def get_cercle_coords(x_centre, y_centre, radius=1000., resolution=16):
     """
     Get the points defining a cercle from the position of its centre and the
@@ -888,6 +983,169 @@ def find_rng_index(rng_vec, rng, rng_tol=0.):
     return ind_rng
 
 
+def find_ray_indexes(ele_vec, azi_vec, ele, azi, ele_tol=0., azi_tol=0.,
+                     nearest='azi'):
+    """
+    Find the ray indices corresponding to a set of elevations and azimuths.
+    Vectorised version of find_ray_index
+
+    Parameters
+    ----------
+    ele_vec, azi_vec : float arrays
+        The elevation and azimuth data arrays where to look for
+    ele, azi : float arrays
+        The elevations and azimuths to search
+    ele_tol, azi_tol : floats
+        Tolerances [deg]
+    nearest : str
+        criteria to define wich ray to keep if multiple rays are within
+        tolerance. azi: nearest azimuth, ele: nearest elevation
+
+    Returns
+    -------
+    ind_ray : masked array of ints
+        The ray indices. Masked where no ray is within tolerance
+
+    """
+    ele_vec = np.asarray(ele_vec, dtype=np.float64)
+    azi_vec = np.asarray(azi_vec, dtype=np.float64)
+    ele = np.atleast_1d(np.asarray(ele, dtype=np.float64))
+    azi = np.atleast_1d(np.asarray(azi, dtype=np.float64))
+    npoints = ele.size
+    ind_ray = np.ma.masked_all(npoints, dtype=int)
+    if npoints == 0 or ele_vec.size == 0:
+        return ind_ray
+
+    # rays within the azimuth tolerance are contiguous once sorted
+    ind_sort = np.argsort(azi_vec, kind='stable')
+    azi_sorted = azi_vec[ind_sort]
+    ind_start = np.searchsorted(azi_sorted, azi - azi_tol, side='left')
+    ind_end = np.searchsorted(azi_sorted, azi + azi_tol, side='right')
+    ncandidates = np.maximum(ind_end - ind_start, 0)
+
+    # all pairs (point, candidate ray)
+    ind_point = np.repeat(np.arange(npoints), ncandidates)
+    offset = np.arange(ind_point.size) - np.repeat(
+        np.cumsum(ncandidates) - ncandidates, ncandidates)
+    ind_cand = ind_sort[ind_start[ind_point] + offset]
+
+    is_valid = np.logical_and(
+        ele_vec[ind_cand] <= ele[ind_point] + ele_tol,
+        ele_vec[ind_cand] >= ele[ind_point] - ele_tol)
+    ind_point = ind_point[is_valid]
+    ind_cand = ind_cand[is_valid]
+    if ind_point.size == 0:
+        return ind_ray
+
+    if nearest == 'azi':
+        dist = np.abs(azi_vec[ind_cand] - azi[ind_point])
+    else:
+        dist = np.abs(ele_vec[ind_cand] - ele[ind_point])
+
+    # keep the nearest ray. In case of tie the one with the lowest index
+    ind = np.lexsort((ind_cand, dist, ind_point))
+    is_first = np.ones(ind.size, dtype=bool)
+    is_first[1:] = ind_point[ind[1:]] != ind_point[ind[:-1]]
+    ind = ind[is_first]
+    ind_ray[ind_point[ind]] = ind_cand[ind]
+
+    return ind_ray
+
+
+def find_rng_indexes(rng_vec, rng, rng_tol=0.):
+    """
+    Find the range indices corresponding to a set of ranges. Vectorised
+    version of find_rng_index
+
+    Parameters
+    ----------
+    rng_vec : float array
+        The range data array where to look for
+    rng : float array
+        The ranges to search
+    rng_tol : float
+        Tolerance [m]
+
+    Returns
+    -------
+    ind_rng : masked array of ints
+        The range indices. Masked where no range is within tolerance
+
+    """
+    rng_vec = np.asarray(rng_vec, dtype=np.float64)
+    rng = np.atleast_1d(np.asarray(rng, dtype=np.float64))
+    ind_rng = np.ma.masked_all(rng.size, dtype=int)
+    if rng.size == 0 or rng_vec.size == 0:
+        return ind_rng
+
+    ind_sort = np.argsort(rng_vec, kind='stable')
+    rng_sorted = rng_vec[ind_sort]
+
+    # nearest range above and below. For repeated ranges the one with the
+    # lowest index is the first one of the sorted values
+    ind_above = np.minimum(
+        np.searchsorted(rng_sorted, rng, side='left'), rng_vec.size - 1)
+    ind_below = np.searchsorted(
+        rng_sorted, rng_sorted[np.maximum(ind_above - 1, 0)], side='left')
+    dist_above = np.abs(rng_sorted[ind_above] - rng)
+    dist_below = np.abs(rng_sorted[ind_below] - rng)
+    ind_above = ind_sort[ind_above]
+    ind_below = ind_sort[ind_below]
+    use_above = np.logical_or(
+        dist_above < dist_below,
+        np.logical_and(dist_above == dist_below, ind_above < ind_below))
+    ind = np.where(use_above, ind_above, ind_below)
+    dist = np.where(use_above, dist_above, dist_below)
+
+    is_valid = dist <= rng_tol
+    ind_rng[is_valid] = ind[is_valid]
+
+    return ind_rng
+
+
+def find_first_rng_index(is_true):
+    """
+    Finds the first gate along the range of each ray where a condition is
+    met
+
+    Parameters
+    ----------
+    is_true : 2D array of bools
+        the condition at each gate (nrays, ngates)
+
+    Returns
+    -------
+    ind_rng : masked array of ints
+        the range index of the first gate of each ray where the condition
+        is met. Masked if it is never met
+
+    """
+    is_true = np.ma.filled(is_true, False)
+    return np.ma.masked_where(
+        np.logical_not(np.any(is_true, axis=1)), np.argmax(is_true, axis=1))
+
+
+def get_blocked_gates(is_blocking):
+    """
+    Gets the gates blocked by a gate closer to the radar. A gate is
+    considered blocked if it or any gate before it in the ray is blocking
+
+    Parameters
+    ----------
+    is_blocking : 2D array of bools
+        True at the gates that block the beam (nrays, ngates)
+
+    Returns
+    -------
+    is_blocked : 2D array of bools
+        True at the blocking gates and at all the gates behind them
+
+    """
+    ngates = np.shape(is_blocking)[1]
+    ind_rng = find_first_rng_index(is_blocking).filled(ngates)
+    return np.arange(ngates) >= ind_rng[:, np.newaxis]
+
+
 def find_ang_index(ang_vec, ang, ang_tol=0.):
     """
     Find the angle index corresponding to a particular fixed angle
@@ -991,41 +1249,26 @@ def find_colocated_indexes(radar1, radar2, rad1_ele, rad1_azi, rad1_rng,
         the ray and range indexes of each radar gate
 
     """
-    ngates = len(rad1_ele)
-    ind_ray_rad1 = np.ma.masked_all(ngates, dtype=int)
-    ind_rng_rad1 = np.ma.masked_all(ngates, dtype=int)
-    ind_ray_rad2 = np.ma.masked_all(ngates, dtype=int)
-    ind_rng_rad2 = np.ma.masked_all(ngates, dtype=int)
-    for i in range(ngates):
-        ind_ray_rad1_aux = find_ray_index(
-            radar1.elevation['data'], radar1.azimuth['data'], rad1_ele[i],
-            rad1_azi[i], ele_tol=ele_tol, azi_tol=azi_tol)
-        if ind_ray_rad1_aux is None:
-            continue
-        ind_rng_rad1_aux = find_rng_index(
-            radar1.range['data'], rad1_rng[i], rng_tol=rng_tol)
-        if ind_rng_rad1_aux is None:
-            continue
-
-        ind_ray_rad2_aux = find_ray_index(
-            radar2.elevation['data'], radar2.azimuth['data'], rad2_ele[i],
-            rad2_azi[i], ele_tol=ele_tol, azi_tol=azi_tol)
-        if ind_ray_rad2_aux is None:
-            continue
-        ind_rng_rad2_aux = find_rng_index(
-            radar2.range['data'], rad2_rng[i], rng_tol=rng_tol)
-        if ind_rng_rad2_aux is None:
-            continue
+    ind_ray_rad1 = find_ray_indexes(
+        radar1.elevation['data'], radar1.azimuth['data'], rad1_ele,
+        rad1_azi, ele_tol=ele_tol, azi_tol=azi_tol)
+    ind_rng_rad1 = find_rng_indexes(
+        radar1.range['data'], rad1_rng, rng_tol=rng_tol)
+    ind_ray_rad2 = find_ray_indexes(
+        radar2.elevation['data'], radar2.azimuth['data'], rad2_ele,
+        rad2_azi, ele_tol=ele_tol, azi_tol=azi_tol)
+    ind_rng_rad2 = find_rng_indexes(
+        radar2.range['data'], rad2_rng, rng_tol=rng_tol)
 
-        ind_ray_rad1[i] = ind_ray_rad1_aux
-        ind_rng_rad1[i] = ind_rng_rad1_aux
-        ind_ray_rad2[i] = ind_ray_rad2_aux
-        ind_rng_rad2[i] = ind_rng_rad2_aux
+    # keep only the gates found in both radars
+    is_valid = np.logical_not(np.logical_or.reduce((
+        np.ma.getmaskarray(ind_ray_rad1), np.ma.getmaskarray(ind_rng_rad1),
+        np.ma.getmaskarray(ind_ray_rad2), np.ma.getmaskarray(ind_rng_rad2))))
 
-    ind_ray_rad1 = ind_ray_rad1.compressed()
-    ind_rng_rad1 = ind_rng_rad1.compressed()
-    ind_ray_rad2 = ind_ray_rad2.compressed()
-    ind_rng_rad2 = ind_rng_rad2.compressed()
+    ind_ray_rad1 = ind_ray_rad1.data[is_valid]
+    ind_rng_rad1 = ind_rng_rad1.data[is_valid]
+    ind_ray_rad2 = ind_ray_rad2.data[is_valid]
+    ind_rng_rad2 = ind_rng_rad2.data[is_valid]
 
     return ind_ray_rad1, ind_rng_rad1, ind_ray_rad2, ind_rng_rad2
 
@@ -1137,7 +1380,11 @@ def get_fixed_rng_data(radar, field_names, fixed_rng, rng_tol=50.,
         The radar object containing only the desired data
 
     """
-    radar_aux = deepcopy(radar)
+    # only the fields of interest are copied
+    radar_aux = get_radar_skeleton(radar)
+    for field_name in field_names:
+        if field_name in radar.fields:
+            radar_aux.add_field(field_name, dict(radar.fields[field_name]))
 
     ind_rng = find_rng_index(
         radar_aux.range['data'], fixed_rng, rng_tol=rng_tol)
@@ -1587,6 +1834,44 @@ def compute_histogram_sweep(field, ray_start, ray_end, field_name, step=None,
     return bin_edges, values
 
 
+def compute_histogram_rays(field, bin_edges):
+    """
+    computes the histogram of the data of each ray. The data in each bin is
+    counted as in np.histogram: the bins include their left edge and the
+    last bin also its right edge
+
+    Parameters
+    ----------
+    field : ndarray 2D
+        the radar field (nrays, ngates)
+    bin_edges : ndarray 1D
+        the bin edges
+
+    Returns
+    -------
+    hist : 2D array of ints
+        the number of valid gates of each ray in each bin (nrays, nbins)
+
+    """
+    bin_edges = np.asarray(bin_edges)
+    nbins = bin_edges.size - 1
+    nrays = np.shape(field)[0]
+
+    values = np.ma.getdata(field)
+    ind_bin = np.searchsorted(bin_edges, values, side='right') - 1
+    ind_bin[values == bin_edges[-1]] = nbins - 1
+    is_valid = np.logical_and.reduce((
+        np.logical_not(np.ma.getmaskarray(field)), ind_bin >= 0,
+        ind_bin < nbins))
+
+    ind_rays = np.broadcast_to(
+        np.arange(nrays)[:, np.newaxis], is_valid.shape)[is_valid]
+    hist = np.bincount(
+        ind_rays * nbins + ind_bin[is_valid], minlength=nrays * nbins)
+
+    return hist.reshape(nrays, nbins)
+
+
 def get_histogram_bins(field_name, step=None, vmin=None, vmax=None):
     """
     gets the histogram bins. If vmin or vmax are not define the range limits
@@ -2104,3 +2389,234 @@ def compute_average_vad(radar_list, z_want, signs, lat0, lon0):
             u_avg, mask=np.isnan(u_avg)), np.ma.array(
             v_avg, mask=np.isnan(v_avg)))
     return vad_avg
+
+
+# attributes of the radar object computed on demand from its geometry
+_RADAR_LAZY_ATTRS = (
+    'rays_per_sweep', 'gate_x', 'gate_y', 'gate_z', 'gate_longitude',
+    'gate_latitude', 'gate_altitude')
+
+
+def get_radar_skeleton(radar):
+    """
+    Gets a copy of a radar object without fields. The arrays of the metadata
+    and geometry of the radar (time, range, azimuth, elevation, etc.) are
+    shared with the original radar object as read-only views instead of
+    being copied. The dictionaries containing them are new objects so that
+    their entries can be replaced without affecting the original radar.
+    The gate positions are computed again from the geometry of the new
+    radar object when they are accessed
+
+    Parameters
+    ----------
+    radar : radar object
+        the radar object to copy
+
+    Returns
+    -------
+    radar_out : radar object
+        the radar object without fields
+
+    """
+    radar_out = object.__new__(type(radar))
+    for attr, value in radar.__dict__.items():
+        if attr in _RADAR_LAZY_ATTRS:
+            continue
+        if attr == 'fields':
+            radar_out.fields = dict()
+            continue
+        setattr(radar_out, attr, _get_shared_view(value))
+
+    radar_out.init_rays_per_sweep()
+    radar_out.init_gate_x_y_z()
+    radar_out.init_gate_longitude_latitude()
+    radar_out.init_gate_altitude()
+
+    return radar_out
+
+
+def join_radars(radar_list, rng_min=None, rng_max=None, ele_min=None,
+                ele_max=None, azi_min=None, azi_max=None):
+    """
+    Joins a list of radar objects into a single one and crops it to the
+    given limits. Gives the same result as joining the radar objects one by
+    one with pyart.util.join_radar and cropping the result with
+    pyart.util.subset_radar but the final field arrays are allocated only
+    once and filled in place with the gates that are kept. Fields whose
+    data has not been loaded yet (e.g. CFRadial files read with
+    delay_field_loading) are only read for the rays and gates kept. Only
+    the fields present in all the radar objects are kept
+
+    Parameters
+    ----------
+    radar_list : list of radar objects
+        the radar objects to join. None elements are ignored
+    rng_min, rng_max : float
+        The range limits [m]. If None the entire coverage of the radar is
+        going to be used
+    ele_min, ele_max, azi_min, azi_max : float or None
+        The limits of the grid [deg]. If None the limits will be the limits
+        of the radar volume
+
+    Returns
+    -------
+    radar_out : radar object or None
+        the joined radar object. None if there was no radar object to join
+        or no data within the limits
+
+    """
+    radar_list = [radar for radar in radar_list if radar is not None]
+    if not radar_list:
+        return None
+
+    crop = (
+        rng_min is not None or rng_max is not None or ele_min is not None
+        or ele_max is not None or azi_min is not None or azi_max is not None)
+    if len(radar_list) == 1 and not crop:
+        return radar_list[0]
+
+    # join the metadata of the radar objects
+    radar_out = get_radar_skeleton(radar_list[0])
+    ray_offsets = [0]
+    for radar in radar_list[1:]:
+        ray_offsets.append(radar_out.nrays)
+        radar_out = pyart.util.radar_utils.join_radar(
+            radar_out, get_radar_skeleton(radar))
+
+    field_names = [
+        field_name for field_name in radar_list[0].fields
+        if all(field_name in radar.fields for radar in radar_list[1:])]
+
+    # get the rays and gates within the limits
+    ind_rays = np.arange(radar_out.nrays)
+    ind_rng = np.arange(radar_out.ngates)
+    if crop:
+        rng = radar_out.range['data']
+        if rng_min is None:
+            rng_min = 0.
+        if rng_max is None:
+            rng_max = np.max(rng)
+        ind_rng = np.where(np.logical_and(rng >= rng_min, rng <= rng_max))[0]
+        if ind_rng.size == 0:
+            warn('No range bins between ' + str(rng_min) + ' and ' +
+                 str(rng_max) + ' m')
+            return None
+
+        # the rays are selected and sorted by subset_radar on a radar
+        # object with a single gate containing the ray indices
+        radar_out.range = dict(radar_out.range)
+        radar_out.range['data'] = np.array([0.])
+        radar_out.ngates = 1
+        radar_out.init_gate_x_y_z()
+        radar_out.init_gate_longitude_latitude()
+        radar_out.init_gate_altitude()
+        radar_out.fields = dict()
+        radar_out.add_field('ray_index', {
+            'data': np.expand_dims(np.arange(radar_out.nrays), axis=1)})
+        radar_out = pyart.util.subset_radar(
+            radar_out, ['ray_index'], ele_min=ele_min, ele_max=ele_max,
+            azi_min=azi_min, azi_max=azi_max, rng_min=0.)
+        if radar_out is None:
+            return None
+        ind_rays = radar_out.fields['ray_index']['data'][:, 0]
+        radar_out.fields = dict()
+        radar_out.range['data'] = rng[ind_rng]
+        radar_out.ngates = ind_rng.size
+
+    radar_out.init_rays_per_sweep()
+    radar_out.init_gate_x_y_z()
+    radar_out.init_gate_longitude_latitude()
+    radar_out.init_gate_altitude()
+
+    # fill the fields
+    for field_name in field_names:
+        # part of the output filled by each radar object and its data
+        slabs = []
+        for radar, ray_offset in zip(radar_list, ray_offsets):
+            ngates = np.count_nonzero(ind_rng < radar.ngates)
+            if not crop:
+                slabs.append((
+                    slice(ray_offset, ray_offset+radar.nrays),
+                    slice(0, ngates), radar.fields[field_name]['data']))
+                continue
+            ind_out = np.where(np.logical_and(
+                ind_rays >= ray_offset,
+                ind_rays < ray_offset+radar.nrays))[0]
+            if ind_out.size == 0 or ngates == 0:
+                continue
+            slabs.append((ind_out, slice(0, ngates), _get_field_hyperslab(
+                radar.fields[field_name], ind_rays[ind_out]-ray_offset,
+                ind_rng[:ngates])))
+
+        # the merged fields are float64 as with pyart join_radar
+        data = np.ma.masked_all((radar_out.nrays, radar_out.ngates),
+                                dtype=np.float64)
+        data.set_fill_value(pyart.config.get_fillvalue())
+        for ind_out, ind_gates, data_in in slabs:
+            data[ind_out, ind_gates] = data_in
+
+        # the data is not accessed so that it is not loaded if it is lazy
+        field_in = radar_list[0].fields[field_name]
+        field_dict = {
+            key: deepcopy(field_in[key]) for key in field_in if key != 'data'}
+        field_dict['data'] = data
+        radar_out.add_field(field_name, field_dict)
+
+    return radar_out
+
+
+def _get_field_hyperslab(field_dict, ind_rays, ind_rng):
+    """
+    Gets the data of a field at the given rays and gates. If the data of
+    the field has not been loaded yet and it is stored in a netCDF variable
+    (e.g. CFRadial file read with delay_field_loading) only the block of
+    rays and gates containing the requested ones is read from the file
+
+    Parameters
+    ----------
+    field_dict : dict
+        the field dictionary
+    ind_rays, ind_rng : 1D int arrays
+        the indices of the rays and gates to get
+
+    Returns
+    -------
+    data : 2D array
+        the field data
+
+    """
+    loader = getattr(field_dict, '_lazyload', dict()).get('data', None)
+    ncvar = getattr(loader, 'ncvar', None)
+    if ncvar is None or ncvar.ndim != 2:
+        return field_dict['data'][np.ix_(ind_rays, ind_rng)]
+
+    ray_start = np.min(ind_rays)
+    rng_start = np.min(ind_rng)
+    data = ncvar[ray_start:np.max(ind_rays)+1, rng_start:np.max(ind_rng)+1]
+    return data[np.ix_(ind_rays-ray_start, ind_rng-rng_start)]
+
+
+def _get_shared_view(value):
+    """
+    Gets a copy of the dictionaries in value where the numpy arrays are
+    replaced by read-only views of the original arrays. Masked arrays and
+    any other object are deep copied
+
+    Parameters
+    ----------
+    value : object
+        the object to copy
+
+    Returns
+    -------
+    value_out : object
+        the copy of the object
+
+    """
+    if isinstance(value, dict):
+        return {key: _get_shared_view(val) for key, val in value.items()}
+    if isinstance(value, np.ndarray) and not np.ma.isMaskedArray(value):
+        value_out = value.view()
+        value_out.flags.writeable = False
+        return value_out
+    return deepcopy(value)
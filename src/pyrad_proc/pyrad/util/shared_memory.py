@@ -0,0 +1,325 @@
+"""
+pyrad.util.shared_memory
+========================
+
+Functions to share radar objects between processes without copying the
+field data
+
+.. autosummary::
+    :toctree: generated/
+
+    radar_to_shared_memory
+    unlink_shared_arrays
+    SharedArray
+    SharedRadar
+
+"""
+import os
+import mmap
+from warnings import warn
+from copy import copy
+
+import numpy as np
+
+try:
+    from multiprocessing import shared_memory
+    _SHARED_MEMORY_AVAILABLE = True
+except ImportError:
+    warn('multiprocessing.shared_memory not available. '
+         'Radar objects will be copied between processes')
+    _SHARED_MEMORY_AVAILABLE = False
+
+# directory where the POSIX shared memory blocks can be mapped as files
+_SHM_DIR = '/dev/shm'
+
+
+class SharedArray:
+    """
+    A picklable reference to a (masked) array stored in shared memory.
+
+    Attributes
+    ----------
+    name : str
+        name of the shared memory block containing the data
+    mask_name : str or None
+        name of the shared memory block containing the mask. None if the
+        array is not masked
+    shape : tuple
+        shape of the array
+    dtype : numpy dtype
+        data type of the array
+    fill_value : scalar or None
+        fill value of the masked array
+    nbytes : int
+        number of bytes of the data and mask
+
+    """
+
+    def __init__(self, array):
+        """ Copies the array into new shared memory blocks """
+        self.shape = array.shape
+        self.dtype = array.dtype
+        self.nbytes = 0
+        self.fill_value = None
+        self.mask_name = None
+        if isinstance(array, np.ma.MaskedArray):
+            self.fill_value = array.fill_value
+            if array.mask is not np.ma.nomask:
+                self.mask_name = _copy_to_block(
+                    np.ma.getmaskarray(array))
+                self.nbytes += array.size
+            array = array.data
+        self.name = _copy_to_block(array)
+        self.nbytes += array.nbytes
+
+    def get(self, readonly=False, copy_on_write=False):
+        """
+        Maps the shared memory into an array without copying the data
+
+        Parameters
+        ----------
+        readonly : bool
+            If True the array returned is not writeable
+        copy_on_write : bool
+            If True the changes made to the array are not seen by the other
+            processes. The pages modified are copied
+
+        Returns
+        -------
+        array : numpy masked array
+            the array pointing to the shared memory
+
+        """
+        data = _attach_block(
+            self.name, self.shape, self.dtype, readonly=readonly,
+            copy_on_write=copy_on_write)
+        mask = np.ma.nomask
+        if self.mask_name is not None:
+            mask = _attach_block(
+                self.mask_name, self.shape, np.bool_, readonly=readonly,
+                copy_on_write=copy_on_write)
+        return np.ma.masked_array(
+            data, mask=mask, fill_value=self.fill_value, copy=False)
+
+    def unlink(self):
+        """
+        Requests the destruction of the shared memory blocks. The memory is
+        freed once all the processes using them have released them
+
+        """
+        for name in (self.name, self.mask_name):
+            if name is None:
+                continue
+            try:
+                block = shared_memory.SharedMemory(name=name)
+                block.close()
+                block.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class SharedRadar:
+    """
+    A picklable reference to a radar object the field data of which is
+    stored in shared memory. Pickling it only transfers the metadata and the
+    geometry of the radar object.
+
+    Attributes
+    ----------
+    radar : radar object
+        the radar object without field data
+    fields : dict
+        dictionary containing the SharedArray of each field
+    nbytes : int
+        number of bytes of the field data in shared memory
+
+    """
+
+    def __init__(self, radar, shared_arrays=None):
+        """
+        Copies the field data of the radar into shared memory. If
+        shared_arrays is a dictionary the field data already copied by other
+        SharedRadar objects is not copied again. The shared memory blocks
+        are then owned by the dictionary and are unlinked with
+        unlink_shared_arrays
+        """
+        self.fields = dict()
+        self.nbytes = 0
+        try:
+            for field_name, field in radar.fields.items():
+                if shared_arrays is None:
+                    self.fields[field_name] = SharedArray(field['data'])
+                else:
+                    # the array is kept in the dictionary so that its id is
+                    # not reused
+                    key = id(field['data'])
+                    if key not in shared_arrays:
+                        shared_arrays[key] = (
+                            field['data'], SharedArray(field['data']))
+                    self.fields[field_name] = shared_arrays[key][1]
+                self.nbytes += self.fields[field_name].nbytes
+        except Exception:
+            if shared_arrays is None:
+                self.unlink()
+            raise
+
+        self.radar = copy(radar)
+        self.radar.fields = dict()
+        for field_name, field in radar.fields.items():
+            self.radar.fields[field_name] = {
+                key: value for key, value in field.items() if key != 'data'}
+
+    def to_radar(self, readonly=False, copy_on_write=False):
+        """
+        Gets a radar object the field data of which points to the shared
+        memory
+
+        Parameters
+        ----------
+        readonly : bool
+            If True the field data is not writeable
+        copy_on_write : bool
+            If True the changes made to the field data are not seen by the
+            other processes
+
+        Returns
+        -------
+        radar : radar object
+            the radar object
+
+        """
+        radar = copy(self.radar)
+        radar.fields = dict()
+        for field_name, field in self.radar.fields.items():
+            radar.fields[field_name] = dict(field)
+            radar.fields[field_name]['data'] = self.fields[field_name].get(
+                readonly=readonly, copy_on_write=copy_on_write)
+        return radar
+
+    def unlink(self):
+        """
+        Requests the destruction of the shared memory blocks of all fields
+
+        """
+        for shared_array in self.fields.values():
+            shared_array.unlink()
+
+
+def radar_to_shared_memory(radar, shared_arrays=None):
+    """
+    Copies the field data of a radar object into shared memory so that it
+    can be sent to other processes without being pickled.
+
+    Parameters
+    ----------
+    radar : radar object
+        the radar object
+    shared_arrays : dict or None
+        If set, dictionary with the field data already in shared memory. The
+        field data of the radar object found in it is not copied again and
+        the new one is added to it. The shared memory blocks have then to be
+        released with unlink_shared_arrays instead of the method unlink of
+        the object returned
+
+    Returns
+    -------
+    shared_radar : SharedRadar or radar object
+        the picklable reference to the radar object in shared memory. The
+        process that receives it must call its method unlink once all the
+        processes have mapped it. If shared memory is not available the
+        radar object is returned unchanged
+
+    """
+    if not _SHARED_MEMORY_AVAILABLE or radar is None:
+        return radar
+    return SharedRadar(radar, shared_arrays=shared_arrays)
+
+
+def unlink_shared_arrays(shared_arrays):
+    """
+    Requests the destruction of the shared memory blocks of a dictionary of
+    field data filled by radar_to_shared_memory
+
+    Parameters
+    ----------
+    shared_arrays : dict
+        the dictionary with the field data in shared memory. It is emptied
+
+    """
+    for _, shared_array in shared_arrays.values():
+        shared_array.unlink()
+    shared_arrays.clear()
+
+
+def _copy_to_block(array):
+    """
+    Copies an array into a new shared memory block
+
+    Parameters
+    ----------
+    array : numpy array
+        the array to copy
+
+    Returns
+    -------
+    name : str
+        the name of the shared memory block
+
+    """
+    block = shared_memory.SharedMemory(
+        create=True, size=max(array.nbytes, 1))
+    array_shared = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+    array_shared[...] = array
+    del array_shared
+    block.close()
+
+    return block.name
+
+
+def _attach_block(name, shape, dtype, readonly=False, copy_on_write=False):
+    """
+    Maps an existing shared memory block into an array. The memory is
+    unmapped automatically once no array points to it anymore
+
+    Parameters
+    ----------
+    name : str
+        the name of the shared memory block
+    shape : tuple
+        shape of the array
+    dtype : numpy dtype
+        data type of the array
+    readonly : bool
+        If True the array returned is not writeable
+    copy_on_write : bool
+        If True the changes made to the array are not written in the shared
+        memory block
+
+    Returns
+    -------
+    array : numpy array
+        the array pointing to the shared memory block
+
+    """
+    count = int(np.prod(shape))
+    fname = os.path.join(_SHM_DIR, name)
+    if os.path.isfile(fname):
+        if copy_on_write and not readonly:
+            with open(fname, 'rb') as fid:
+                buf = mmap.mmap(fid.fileno(), 0, access=mmap.ACCESS_COPY)
+        elif readonly:
+            with open(fname, 'rb') as fid:
+                buf = mmap.mmap(fid.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            with open(fname, 'r+b') as fid:
+                buf = mmap.mmap(fid.fileno(), 0, access=mmap.ACCESS_WRITE)
+        return np.frombuffer(buf, dtype=dtype, count=count).reshape(shape)
+
+    # the shared memory is not accessible as a file. The data is copied
+    block = shared_memory.SharedMemory(name=name)
+    array = np.ndarray(shape, dtype=dtype, buffer=block.buf).copy()
+    block.close()
+    if readonly:
+        array.setflags(write=False)
+
+    return array
@@ -8,6 +8,7 @@ Miscellaneous functions dealing with statistics
     :toctree: generated/
 
     quantiles_weighted
+    quantiles_weighted_segments
     ratio_bootstrapping
 
 """
@@ -122,6 +123,136 @@ def quantiles_weighted(values, weight_vector=None, quantiles=np.array([0.5]),
     return (avg, quants, nvalid)
 
 
+def quantiles_weighted_segments(values, weight_vector, indptr,
+                                quantiles=np.array([0.5]),
+                                weight_threshold=None, data_is_log=False,
+                                nvalid_min=3):
+    """
+    Computes the weighted quantile(s) and average of several sets of values
+    at once. Vectorised version of quantiles_weighted
+
+    Parameters
+    ----------
+    values : 1D array of floats
+        The values of all the sets one after the other. Can be masked
+    weight_vector : 1D array of floats
+        The weight of each value
+    indptr : 1D array of ints
+        The values of set i are values[indptr[i]:indptr[i+1]]
+    quantiles : array of floats
+        The quantiles to be computed
+    weight_threshold : float or None
+        If weight_threshold is set quantiles will be computed only if the
+        total weight (sum of the weights of valid data) exceeds this threshold
+    data_is_log : Bool
+        If true the values will be considered to be in logarithmic scale and
+        transformed into linear scale before computing the quantiles and
+        average
+    nvalid_min : int
+        Minimum number of valid points to consider the computation valid
+
+    Returns
+    -------
+    avg : masked array of floats
+        the weighted average of each set. Masked if there are not enough
+        valid points
+    quants : 2D masked array of floats
+        the weighted quantiles of each set (nsets, nquantiles). Masked if
+        not computed
+    nvalid : array of ints
+        Number of valid points of each set
+
+    """
+    quantiles = np.atleast_1d(quantiles)
+    nsets = indptr.size - 1
+    lengths = np.diff(indptr)
+    maxlen = max(int(np.max(lengths, initial=0)), 1)
+
+    # put the sets in the rows of a 2D array padded with invalid data
+    ind_set = np.repeat(np.arange(nsets), lengths)
+    ind_pos = np.arange(indptr[-1] - indptr[0]) - np.repeat(
+        indptr[:-1] - indptr[0], lengths)
+    values = values[indptr[0]:indptr[-1]]
+    valid = np.zeros((nsets, maxlen), dtype=bool)
+    valid[ind_set, ind_pos] = np.logical_not(np.ma.getmaskarray(values))
+    values_2d = np.zeros((nsets, maxlen), dtype=np.ma.getdata(values).dtype)
+    values_2d[ind_set, ind_pos] = np.ma.getdata(values)
+    weights_2d = np.zeros((nsets, maxlen), dtype=float)
+    weights_2d[ind_set, ind_pos] = weight_vector[indptr[0]:indptr[-1]]
+    weights_2d[~valid] = 0.
+
+    nvalid = np.count_nonzero(valid, axis=1)
+    has_data = nvalid >= nvalid_min
+
+    total_weight = np.sum(weights_2d, axis=1)
+
+    if data_is_log:
+        # Convert log to lin
+        values_2d = 10.**(values_2d / 10.)
+    values_2d[~valid] = 0.
+
+    # Average
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg = np.sum(values_2d * weights_2d, axis=1) / total_weight
+
+    has_quants = has_data
+    if weight_threshold is not None:
+        has_quants = np.logical_and(
+            has_quants, np.logical_not(total_weight < weight_threshold))
+
+    # sort the valid data of each set
+    sorter = np.lexsort((values_2d, ~valid), axis=1)
+    values_2d = np.take_along_axis(values_2d, sorter, axis=1).astype(float)
+    weights_2d = np.take_along_axis(weights_2d, sorter, axis=1)
+    valid = np.take_along_axis(valid, sorter, axis=1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weighted_quantiles = (
+            np.cumsum(weights_2d, axis=1) - 0.5 * weights_2d)
+        weighted_quantiles /= total_weight[:, np.newaxis]
+    weighted_quantiles[~valid] = np.inf
+
+    # linear interpolation as done by np.interp
+    ind_sets = np.arange(nsets)
+    ind_last = np.maximum(nvalid - 1, 0)
+    quants = np.empty((nsets, quantiles.size), dtype=float)
+    for i, quant in enumerate(quantiles):
+        ind = np.count_nonzero(weighted_quantiles <= quant, axis=1) - 1
+        ind_low = np.clip(ind, 0, ind_last)
+        ind_high = np.minimum(ind_low + 1, ind_last)
+        x_low = weighted_quantiles[ind_sets, ind_low]
+        x_high = weighted_quantiles[ind_sets, ind_high]
+        y_low = values_2d[ind_sets, ind_low]
+        y_high = values_2d[ind_sets, ind_high]
+        with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+            slope = (y_high - y_low) / (x_high - x_low)
+            quants_aux = slope * (quant - x_low) + y_low
+            is_nan = np.isnan(quants_aux)
+            quants_aux[is_nan] = (
+                slope[is_nan] * (quant - x_high[is_nan]) + y_high[is_nan])
+        is_nan = np.logical_and(np.isnan(quants_aux), y_low == y_high)
+        quants_aux[is_nan] = y_low[is_nan]
+
+        # no extrapolation
+        is_edge = np.logical_or(
+            np.logical_or(ind < 0, ind >= ind_last), x_low == quant)
+        quants_aux[is_edge] = y_low[is_edge]
+        quants[:, i] = quants_aux
+
+    if data_is_log:
+        # Convert lin to log
+        with np.errstate(invalid='ignore', divide='ignore'):
+            avg = 10. * np.log10(avg)
+            quants = 10. * np.log10(quants)
+
+    avg = np.ma.masked_where(~has_data, avg)
+    quants = np.ma.masked_array(
+        quants, mask=np.repeat(
+            ~has_quants[:, np.newaxis], quantiles.size, axis=1))
+
+    return avg, quants, nvalid
+
+
 def ratio_bootstrapping(nominator, denominator, nsamples=1000):
     """
     Computes a set of samples obtained as sum(nominator)/sum(denominator)
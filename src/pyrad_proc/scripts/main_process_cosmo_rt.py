@@ -24,6 +24,11 @@ proc_period is the time that has to pass before attempting to restart the
 processing in [s]
 if proc_finish is not none it indicates the time the program is allowed to ran
 berfore forcing it to end
+if file_watch is set (inotify or poll) the data directories are followed and
+the processing starts as soon as new files arrive. Use poll for directories
+written by other hosts (e.g. NFS)
+if telemetry_file is set the time, memory and I/O of each processing step are
+written to it (Prometheus text format if its extension is .prom)
 
 
 Example:
@@ -82,6 +87,15 @@ def main():
     parser.add_argument(
         '--proc_finish', type=int, default=None,
         help='Processing time allowed before shutdown (s)')
+    parser.add_argument(
+        '--file_watch', type=str, default=None,
+        help=('Follow the data directories to start processing as soon as '
+              'new files arrive. Can be inotify or poll'))
+    parser.add_argument(
+        '--telemetry_file', type=str, default=None,
+        help=('File where the time, memory and I/O of each processing step '
+              'are written. Prometheus text format if the extension is '
+              '.prom, JSON lines otherwise'))
 
     args = parser.parse_args()
 
@@ -103,6 +117,10 @@ def main():
         print('end time: ' + args.endtime)
     else:
         print('end time not defined by user')
+    if args.file_watch is not None:
+        print('file watch: ' + args.file_watch)
+    if args.telemetry_file is not None:
+        print('telemetry file: ' + args.telemetry_file)
 
     proc_starttime = None
     if args.starttime is not None:
@@ -117,7 +135,9 @@ def main():
         try:
             end_proc = main_cosmo_rt(
                 cfgfile_list, starttime=proc_starttime, endtime=proc_endtime,
-                proc_period=args.proc_period, proc_finish=args.proc_finish)
+                proc_period=args.proc_period, proc_finish=args.proc_finish,
+                file_watch=args.file_watch,
+                telemetry_file=args.telemetry_file)
         except Exception:
             traceback.print_exc()
             if args.proc_finish is None:
@@ -86,13 +86,37 @@ def main():
                         "flash number the data of which will be processed"
                         "0 means that all lightning data will be processed")
     parser.add_argument("--MULTIPROCESSING_DSET", type=int, default=0,
-                        help="If 1 the generation of the datasets at the "
-                        "same processing level will be parallelized")
+                        help="If 1 the generation of the datasets will be "
+                        "parallelized. Each dataset is generated as soon as "
+                        "the datasets it depends on are available, by "
+                        "threads or by the dask processes if a dask client "
+                        "is started")
     parser.add_argument("--MULTIPROCESSING_PROD", type=int, default=0,
                         help="If 1 the generation of the products of each "
                         "dataset will be parallelized")
     parser.add_argument("--PROFILE_MULTIPROCESSING", type=int, default=0,
                         help="If 1 the multiprocessing is profiled")
+    parser.add_argument("--READ_AHEAD", type=int, default=0,
+                        help="Number of volumes read in the background while "
+                        "the current volume is processed. 0 means no read "
+                        "ahead")
+    parser.add_argument("--READ_AHEAD_MAX_MEMORY", type=float, default=None,
+                        help="Maximum memory (MB) used by the volumes read "
+                        "ahead and waiting to be processed")
+    parser.add_argument("--READ_AHEAD_PROCESSES", type=int, default=0,
+                        help="If 1 the volumes are read ahead in a pool of "
+                        "processes instead of threads")
+    parser.add_argument("--TELEMETRY_FILE", type=str, default=None,
+                        help="File where the time, memory and I/O of each "
+                        "processing step are written. Prometheus text format "
+                        "if the extension is .prom, JSON lines otherwise")
+    parser.add_argument("--PROD_POOL_WORKERS", type=int, default=0,
+                        help="Number of processes of a pool generating the "
+                        "products of each dataset concurrently. 0 means no "
+                        "pool")
+    parser.add_argument("--RESUME", type=int, default=0,
+                        help="If 1 the processing is resumed from the "
+                        "checkpoint file defined in the main config file")
 
     args = parser.parse_args()
 
@@ -118,6 +142,14 @@ def main():
         print('Product generation will be parallelized')
     if args.PROFILE_MULTIPROCESSING:
         print('Parallel processing performance will be profiled')
+    if args.READ_AHEAD:
+        print('Number of volumes read ahead: ' + str(args.READ_AHEAD))
+    if args.TELEMETRY_FILE is not None:
+        print('telemetry file: ' + args.TELEMETRY_FILE)
+    if args.PROD_POOL_WORKERS:
+        print('Number of product workers: ' + str(args.PROD_POOL_WORKERS))
+    if args.RESUME:
+        print('Processing resumed from checkpoint')
 
     proc_starttime = None
     if args.starttime is not None:
@@ -138,7 +170,13 @@ def main():
                trajtype=args.trajtype, flashnr=args.flashnr,
                MULTIPROCESSING_DSET=args.MULTIPROCESSING_DSET,
                MULTIPROCESSING_PROD=args.MULTIPROCESSING_PROD,
-               PROFILE_MULTIPROCESSING=args.PROFILE_MULTIPROCESSING)
+               PROFILE_MULTIPROCESSING=args.PROFILE_MULTIPROCESSING,
+               READ_AHEAD=args.READ_AHEAD,
+               READ_AHEAD_MAX_MEMORY=args.READ_AHEAD_MAX_MEMORY,
+               READ_AHEAD_PROCESSES=args.READ_AHEAD_PROCESSES,
+               TELEMETRY_FILE=args.TELEMETRY_FILE,
+               PROD_POOL_WORKERS=args.PROD_POOL_WORKERS,
+               RESUME=args.RESUME)
 
     if args.postproc_cfgfile is not None:
         cfgfile_postproc = args.cfgpath + args.postproc_cfgfile
@@ -148,7 +186,13 @@ def main():
                    flashnr=args.flashnr,
                    MULTIPROCESSING_DSET=args.MULTIPROCESSING_DSET,
                    MULTIPROCESSING_PROD=args.MULTIPROCESSING_PROD,
-                   PROFILE_MULTIPROCESSING=args.PROFILE_MULTIPROCESSING)
+                   PROFILE_MULTIPROCESSING=args.PROFILE_MULTIPROCESSING,
+                   READ_AHEAD=args.READ_AHEAD,
+                   READ_AHEAD_MAX_MEMORY=args.READ_AHEAD_MAX_MEMORY,
+                   READ_AHEAD_PROCESSES=args.READ_AHEAD_PROCESSES,
+                   TELEMETRY_FILE=args.TELEMETRY_FILE,
+                   PROD_POOL_WORKERS=args.PROD_POOL_WORKERS,
+                   RESUME=args.RESUME)
 
 
 def _print_end_msg(text):
@@ -22,6 +22,11 @@ postproc_cfgfile is an optional argument with default: None
 cfgpath is an optional argument with default: \
 '$HOME/pyrad/config/processing/'
 
+With --CHUNK_WORKERS or --CHUNK_SCHEDULER the period from startdate \
+starttime to enddate endtime is split into chunks of --CHUNK_HOURS that are \
+processed in parallel by local processes or by a dask cluster and their \
+products are merged at the end.
+
 Example:
     python main_process_data_period.py 'paradiso_fvj_vol.txt' '20140523' \
 '20140525' --starttime '000000' --endtime '001000' \
@@ -39,6 +44,7 @@ import atexit
 import os
 
 from pyrad.flow import main as pyrad_main
+from pyrad.flow import main_period as pyrad_main_period
 
 print(__doc__)
 
@@ -75,13 +81,47 @@ def main():
                         default="")
 
     parser.add_argument("--MULTIPROCESSING_DSET", type=int, default=0,
-                        help="If 1 the generation of the datasets at the "
-                        "same processing level will be parallelized")
+                        help="If 1 the generation of the datasets will be "
+                        "parallelized. Each dataset is generated as soon as "
+                        "the datasets it depends on are available, by "
+                        "threads or by the dask processes if a dask client "
+                        "is started")
     parser.add_argument("--MULTIPROCESSING_PROD", type=int, default=0,
                         help="If 1 the generation of the products of each "
                         "dataset will be parallelized")
     parser.add_argument("--PROFILE_MULTIPROCESSING", type=int, default=0,
                         help="If 1 the multiprocessing is profiled")
+    parser.add_argument("--READ_AHEAD", type=int, default=0,
+                        help="Number of volumes read in the background while "
+                        "the current volume is processed. 0 means no read "
+                        "ahead")
+    parser.add_argument("--READ_AHEAD_MAX_MEMORY", type=float, default=None,
+                        help="Maximum memory (MB) used by the volumes read "
+                        "ahead and waiting to be processed")
+    parser.add_argument("--READ_AHEAD_PROCESSES", type=int, default=0,
+                        help="If 1 the volumes are read ahead in a pool of "
+                        "processes instead of threads")
+    parser.add_argument("--TELEMETRY_FILE", type=str, default=None,
+                        help="File where the time, memory and I/O of each "
+                        "processing step are written. Prometheus text format "
+                        "if the extension is .prom, JSON lines otherwise")
+    parser.add_argument("--PROD_POOL_WORKERS", type=int, default=0,
+                        help="Number of processes of a pool generating the "
+                        "products of each dataset concurrently. 0 means no "
+                        "pool")
+    parser.add_argument("--RESUME", type=int, default=0,
+                        help="If 1 the processing is resumed from the "
+                        "checkpoint file defined in the main config file")
+    parser.add_argument("--CHUNK_WORKERS", type=int, default=0,
+                        help="If larger than 0 the period from startdate "
+                        "starttime to enddate endtime is split into chunks "
+                        "processed in parallel by this number of local "
+                        "processes")
+    parser.add_argument("--CHUNK_SCHEDULER", type=str, default=None,
+                        help="Address of a dask scheduler. If set the "
+                        "chunks are processed by the dask cluster")
+    parser.add_argument("--CHUNK_HOURS", type=float, default=24.,
+                        help="Length of the chunks (hours)")
 
     parser.add_argument(
         '--postproc_cfgfile', type=str, default=None,
@@ -111,6 +151,19 @@ def main():
         print('Product generation will be parallelized')
     if args.PROFILE_MULTIPROCESSING:
         print('Parallel processing performance will be profiled')
+    if args.READ_AHEAD:
+        print('Number of volumes read ahead: ' + str(args.READ_AHEAD))
+    if args.TELEMETRY_FILE is not None:
+        print('telemetry file: ' + args.TELEMETRY_FILE)
+    if args.PROD_POOL_WORKERS:
+        print('Number of product workers: ' + str(args.PROD_POOL_WORKERS))
+    if args.RESUME:
+        print('Processing resumed from checkpoint')
+    if args.CHUNK_SCHEDULER is not None:
+        print('Chunks processed by dask cluster: ' + args.CHUNK_SCHEDULER)
+    elif args.CHUNK_WORKERS:
+        print('Number of chunks processed in parallel: ' +
+              str(args.CHUNK_WORKERS))
 
     proc_startdate = datetime.datetime.strptime(
         args.startdate, '%Y%m%d')
@@ -135,6 +188,25 @@ def main():
     else:
         infostr = args.infostr
 
+    if args.CHUNK_WORKERS > 0 or args.CHUNK_SCHEDULER is not None:
+        postproc_cfgfile = None
+        if args.postproc_cfgfile is not None:
+            postproc_cfgfile = cfgfile_postproc
+        pyrad_main_period(
+            cfgfile_proc, proc_startdate + proc_starttime,
+            proc_enddate + proc_endtime, postproc_cfgfile=postproc_cfgfile,
+            chunk_length=args.CHUNK_HOURS * 3600.,
+            nworkers=args.CHUNK_WORKERS, scheduler=args.CHUNK_SCHEDULER,
+            infostr=infostr,
+            MULTIPROCESSING_DSET=args.MULTIPROCESSING_DSET,
+            MULTIPROCESSING_PROD=args.MULTIPROCESSING_PROD,
+            READ_AHEAD=args.READ_AHEAD,
+            READ_AHEAD_MAX_MEMORY=args.READ_AHEAD_MAX_MEMORY,
+            READ_AHEAD_PROCESSES=args.READ_AHEAD_PROCESSES,
+            TELEMETRY_FILE=args.TELEMETRY_FILE,
+            PROD_POOL_WORKERS=args.PROD_POOL_WORKERS)
+        return
+
     for day in range(ndays):
         current_date = proc_startdate + datetime.timedelta(days=day)
         proc_startdatetime = current_date + proc_starttime
@@ -144,7 +216,13 @@ def main():
                        endtime=proc_enddatetime, infostr=infostr,
                        MULTIPROCESSING_DSET=args.MULTIPROCESSING_DSET,
                        MULTIPROCESSING_PROD=args.MULTIPROCESSING_PROD,
-                       PROFILE_MULTIPROCESSING=args.PROFILE_MULTIPROCESSING)
+                       PROFILE_MULTIPROCESSING=args.PROFILE_MULTIPROCESSING,
+                       READ_AHEAD=args.READ_AHEAD,
+                       READ_AHEAD_MAX_MEMORY=args.READ_AHEAD_MAX_MEMORY,
+                       READ_AHEAD_PROCESSES=args.READ_AHEAD_PROCESSES,
+                       TELEMETRY_FILE=args.TELEMETRY_FILE,
+                       PROD_POOL_WORKERS=args.PROD_POOL_WORKERS,
+                       RESUME=args.RESUME)
             if args.postproc_cfgfile is not None:
                 pyrad_main(
                     cfgfile_postproc,
@@ -153,7 +231,13 @@ def main():
                     infostr=infostr,
                     MULTIPROCESSING_DSET=args.MULTIPROCESSING_DSET,
                     MULTIPROCESSING_PROD=args.MULTIPROCESSING_PROD,
-                    PROFILE_MULTIPROCESSING=args.PROFILE_MULTIPROCESSING)
+                    PROFILE_MULTIPROCESSING=args.PROFILE_MULTIPROCESSING,
+                    READ_AHEAD=args.READ_AHEAD,
+                    READ_AHEAD_MAX_MEMORY=args.READ_AHEAD_MAX_MEMORY,
+                    READ_AHEAD_PROCESSES=args.READ_AHEAD_PROCESSES,
+                    TELEMETRY_FILE=args.TELEMETRY_FILE,
+                    PROD_POOL_WORKERS=args.PROD_POOL_WORKERS,
+                    RESUME=args.RESUME)
         except ValueError:
             print(ValueError)
 
@@ -24,6 +24,11 @@ proc_period is the time that has to pass before attempting to restart the
 processing in [s]
 if proc_finish is not none it indicates the time the program is allowed to ran
 berfore forcing it to end
+if file_watch is set (inotify or poll) the data directories are followed and
+the processing starts as soon as new files arrive. Use poll for directories
+written by other hosts (e.g. NFS)
+if telemetry_file is set the time, memory and I/O of each processing step are
+written to it (Prometheus text format if its extension is .prom)
 
 
 Example:
@@ -85,6 +90,19 @@ def main():
     parser.add_argument(
         '--hide_warnings', type=int, default=0,
         help='Disables warnings shown during pyrad processing')
+    parser.add_argument(
+        '--file_watch', type=str, default=None,
+        help=('Follow the data directories to start processing as soon as '
+              'new files arrive. Can be inotify or poll'))
+    parser.add_argument(
+        '--telemetry_file', type=str, default=None,
+        help=('File where the time, memory and I/O of each processing step '
+              'are written. Prometheus text format if the extension is '
+              '.prom, JSON lines otherwise'))
+    parser.add_argument(
+        '--prod_pool_workers', type=int, default=0,
+        help=('Number of processes of a pool generating the products of '
+              'each dataset concurrently. 0 means no pool'))
 
     args = parser.parse_args()
 
@@ -106,6 +124,12 @@ def main():
         print('end time: ' + args.endtime)
     else:
         print('end time not defined by user')
+    if args.file_watch is not None:
+        print('file watch: ' + args.file_watch)
+    if args.telemetry_file is not None:
+        print('telemetry file: ' + args.telemetry_file)
+    if args.prod_pool_workers:
+        print('number of product workers: ' + str(args.prod_pool_workers))
 
     proc_starttime = None
     if args.starttime is not None:
@@ -121,7 +145,9 @@ def main():
             end_proc = pyrad_main(
                 cfgfile_list, starttime=proc_starttime, endtime=proc_endtime,
                 proc_period=args.proc_period, proc_finish=args.proc_finish,
-                hide_warnings=args.hide_warnings)
+                hide_warnings=args.hide_warnings, file_watch=args.file_watch,
+                telemetry_file=args.telemetry_file,
+                prod_pool_workers=args.prod_pool_workers)
         except Exception:
             traceback.print_exc()
             if args.proc_finish is None:
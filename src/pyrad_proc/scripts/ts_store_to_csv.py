@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+================================================
+ts_store_to_csv
+================================================
+
+This program exports time series stored in the pyrad binary time series
+store (.h5 files) to csv files with the same layout as the csv files written
+by pyrad
+
+To run the program type:
+    python ts_store_to_csv.py [store_files] --outpath [output_path]
+
+outpath is an optional argument. If not specified the csv files are written
+next to the store files
+
+Example:
+    python ts_store_to_csv.py ts_MONITORING_PhiDP0.h5 --outpath /tmp/
+
+"""
+
+# License: BSD 3 clause
+
+import argparse
+import os
+
+from pyrad.io import ts_store_to_csv
+
+
+def main():
+    """
+    """
+
+    # parse the arguments
+    parser = argparse.ArgumentParser(
+        description='Exports pyrad time series stores to csv files')
+
+    # positional arguments
+    parser.add_argument(
+        'fnames', type=str, nargs='+', help='names of the store files')
+
+    # keyword arguments
+    parser.add_argument(
+        '--outpath', type=str, default=None,
+        help='path where to write the csv files')
+
+    args = parser.parse_args()
+
+    for fname in args.fnames:
+        fname_csv = None
+        if args.outpath is not None:
+            fname_csv = os.path.join(
+                args.outpath,
+                os.path.splitext(os.path.basename(fname))[0] + '.csv')
+        fname_csv = ts_store_to_csv(fname, fname_csv=fname_csv)
+        if fname_csv is None:
+            print('Unable to export ' + fname)
+            continue
+        print('saved CSV file: ' + fname_csv)
+
+
+# ---------------------------------------------------------
+# Start main:
+# ---------------------------------------------------------
+if __name__ == "__main__":
+    main()